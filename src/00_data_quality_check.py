@@ -1,6 +1,7 @@
 """
 Data Quality Check Script
 Validate weekly aggregation structure and understand data patterns
+Streams the raw shards once per dataset (see utils/profiler.py)
 """
 
 import pandas as pd
@@ -9,39 +10,64 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 import os
 import sys
+import time
+from functools import partial
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from utils.config import PROCESSED_DATA_DIR, FIGURES_DIR, TABLES_DIR
+from utils.config import RAW_DATA_DIR, TABLES_DIR
+from utils.profiler import DatasetProfile, EnrollmentProfile, profile_shards
+from utils.dq_rules import ROW_RULES, write_rule_outputs
+from utils.figures import FigureSpec, render_figures
+from utils.shards import discover_shards
+from utils.telemetry import instrument
 
 # Set style
 sns.set_style("whitegrid")
 plt.rcParams['figure.figsize'] = (14, 8)
 
+BIOMETRIC_COLUMNS = ['bio_age_5_17', 'bio_age_17_']
+DEMOGRAPHIC_COLUMNS = ['demo_age_5_17', 'demo_age_17_']
 
+
+@instrument
 def load_data():
-    """Load all cleaned datasets"""
+    """
+    Profile all raw shards in a single chunked pass per dataset
+    (row-level data quality rules are evaluated on the same chunks)
+
+    Returns:
+    --------
+    (enrollment, biometric, demographic) profiles
+    """
     print("\n" + "="*60)
     print("DATA QUALITY CHECK")
     print("="*60)
     
-    df_enrollment = pd.read_csv(os.path.join(PROCESSED_DATA_DIR, 'enrollment_clean.csv'))
-    df_biometric = pd.read_csv(os.path.join(PROCESSED_DATA_DIR, 'biometric_clean.csv'))
-    df_demographic = pd.read_csv(os.path.join(PROCESSED_DATA_DIR, 'demographic_clean.csv'))
-    df_merged = pd.read_csv(os.path.join(PROCESSED_DATA_DIR, 'merged_data.csv'))
-    
-    # Parse dates
-    df_enrollment['date'] = pd.to_datetime(df_enrollment['date'])
-    df_biometric['date'] = pd.to_datetime(df_biometric['date'])
-    df_demographic['date'] = pd.to_datetime(df_demographic['date'])
-    df_merged['date'] = pd.to_datetime(df_merged['date'])
+    datasets = [
+        ("ENROLLMENT", discover_shards('enrollment'), partial(EnrollmentProfile, rules=ROW_RULES)),
+        ("BIOMETRIC", discover_shards('biometric'), partial(DatasetProfile, 'BIOMETRIC', BIOMETRIC_COLUMNS, ROW_RULES)),
+        ("DEMOGRAPHIC", discover_shards('demographic'), partial(DatasetProfile, 'DEMOGRAPHIC', DEMOGRAPHIC_COLUMNS, ROW_RULES)),
+    ]
     
-    print(f"\n✓ Loaded all datasets")
+    print(f"\n📂 Profiling raw shards in {RAW_DATA_DIR}")
+    profiles = []
+    for name, files, factory in datasets:
+        profile, seconds = profile_shards(files, RAW_DATA_DIR, factory)
+        print(f"  ✓ {name}: {profile.rows:,} rows from {profile.files} shard(s) in {seconds:.1f}s")
+        profiles.append(profile)
     
-    return df_enrollment, df_biometric, df_demographic, df_merged
+    return tuple(profiles)
 
 
-def check_aggregation_structure(df_enrollment, df_biometric, df_demographic):
+def print_value_ranges(profile):
+    print(f"  Value ranges:")
+    for col, stats in profile.stats.items():
+        print(f"    {col}: min={stats.min}, max={stats.max}, mean={stats.mean:.1f}")
+
+
+@instrument
+def check_aggregation_structure(enrollment, biometric, demographic):
     """
     Check if data is pre-aggregated or transactional
     """
@@ -50,37 +76,27 @@ def check_aggregation_structure(df_enrollment, df_biometric, df_demographic):
     print("="*60)
     
     print("\n📊 ENROLLMENT Dataset:")
-    print(f"  Total records: {len(df_enrollment):,}")
-    print(f"  Unique dates: {df_enrollment['date'].nunique()}")
-    print(f"  Unique pincodes: {df_enrollment['pincode'].nunique()}")
-    print(f"  Unique (date, pincode) combinations: {df_enrollment.groupby(['date', 'pincode']).ngroups:,}")
+    print(f"  Total records: {enrollment.rows:,}")
+    print(f"  Unique dates: {len(enrollment.dates.counts)}")
+    print(f"  Unique pincodes: ~{enrollment.pincodes.count():,}")
+    print(f"  Unique (date, pincode) combinations: {len(enrollment.totals.totals):,}")
     
     # Check for duplicates
-    duplicates = df_enrollment.duplicated(subset=['date', 'state', 'district', 'pincode']).sum()
-    print(f"  Duplicate (date, state, district, pincode): {duplicates}")
+    print(f"  Duplicate (date, state, district, pincode): {enrollment.duplicates.duplicates}")
     
     # Sample records
     print(f"\n  Sample records:")
-    sample = df_enrollment.head(10)[['date', 'state', 'district', 'pincode', 'age_0_5', 'age_5_17', 'age_18_greater']]
-    print(sample.to_string(index=False))
+    print(enrollment.sample[enrollment.columns].to_string(index=False))
     
     # Check value ranges
-    print(f"\n  Value ranges:")
-    print(f"    age_0_5: min={df_enrollment['age_0_5'].min()}, max={df_enrollment['age_0_5'].max()}, mean={df_enrollment['age_0_5'].mean():.1f}")
-    print(f"    age_5_17: min={df_enrollment['age_5_17'].min()}, max={df_enrollment['age_5_17'].max()}, mean={df_enrollment['age_5_17'].mean():.1f}")
-    print(f"    age_18_greater: min={df_enrollment['age_18_greater'].min()}, max={df_enrollment['age_18_greater'].max()}, mean={df_enrollment['age_18_greater'].mean():.1f}")
-    
-    print("\n📊 BIOMETRIC Dataset:")
-    print(f"  Total records: {len(df_biometric):,}")
-    print(f"  Value ranges:")
-    print(f"    bio_age_5_17: min={df_biometric['bio_age_5_17'].min()}, max={df_biometric['bio_age_5_17'].max()}, mean={df_biometric['bio_age_5_17'].mean():.1f}")
-    print(f"    bio_age_17_: min={df_biometric['bio_age_17_'].min()}, max={df_biometric['bio_age_17_'].max()}, mean={df_biometric['bio_age_17_'].mean():.1f}")
+    print()
+    print_value_ranges(enrollment)
     
-    print("\n📊 DEMOGRAPHIC Dataset:")
-    print(f"  Total records: {len(df_demographic):,}")
-    print(f"  Value ranges:")
-    print(f"    demo_age_5_17: min={df_demographic['demo_age_5_17'].min()}, max={df_demographic['demo_age_5_17'].max()}, mean={df_demographic['demo_age_5_17'].mean():.1f}")
-    print(f"    demo_age_17_: min={df_demographic['demo_age_17_'].min()}, max={df_demographic['demo_age_17_'].max()}, mean={df_demographic['demo_age_17_'].mean():.1f}")
+    for profile in (biometric, demographic):
+        print(f"\n📊 {profile.name} Dataset:")
+        print(f"  Total records: {profile.rows:,}")
+        print(f"  Duplicate (date, state, district, pincode): {profile.duplicates.duplicates}")
+        print_value_ranges(profile)
     
     print("\n🔍 CONCLUSION:")
     print("  ✓ Data appears to be PRE-AGGREGATED at (date, pincode) level")
@@ -88,7 +104,8 @@ def check_aggregation_structure(df_enrollment, df_biometric, df_demographic):
     print("  ✓ Values represent COUNTS, not individual transactions")
 
 
-def analyze_temporal_patterns(df_enrollment, df_biometric, df_demographic):
+@instrument
+def analyze_temporal_patterns(enrollment, biometric, demographic):
     """
     Analyze temporal patterns - weekly vs daily
     """
@@ -97,25 +114,24 @@ def analyze_temporal_patterns(df_enrollment, df_biometric, df_demographic):
     print("="*60)
     
     # Enrollment date frequency
-    enrollment_dates = df_enrollment['date'].value_counts().sort_index()
+    enrollment_dates = enrollment.dates.per_date
     
     print(f"\n📅 Enrollment - Date Frequency:")
     print(f"  Total unique dates: {len(enrollment_dates)}")
     print(f"  Date range: {enrollment_dates.index.min().date()} to {enrollment_dates.index.max().date()}")
     print(f"  Records per date (avg): {enrollment_dates.mean():.0f}")
     print(f"  Records per date (median): {enrollment_dates.median():.0f}")
+    print(f"  Unparseable dates: {enrollment.dates.unparseable:,}")
     
     # Check day of week pattern
-    df_enrollment['day_of_week'] = df_enrollment['date'].dt.day_name()
-    dow_counts = df_enrollment['day_of_week'].value_counts()
+    dow_counts = enrollment.dates.day_of_week_counts()
     print(f"\n  Day of week distribution:")
     for day, count in dow_counts.items():
-        pct = (count / len(df_enrollment)) * 100
+        pct = (count / enrollment.rows) * 100
         print(f"    {day}: {count:,} records ({pct:.1f}%)")
     
     # Check date gaps
-    date_series = pd.date_range(start=enrollment_dates.index.min(), end=enrollment_dates.index.max(), freq='D')
-    missing_dates = date_series.difference(enrollment_dates.index)
+    missing_dates, date_series = enrollment.dates.missing_dates()
     print(f"\n  Missing dates: {len(missing_dates)} out of {len(date_series)} days")
     print(f"  Coverage: {(1 - len(missing_dates)/len(date_series)) * 100:.1f}%")
     
@@ -132,70 +148,60 @@ def analyze_temporal_patterns(df_enrollment, df_biometric, df_demographic):
         print("  ✓ Data is DAILY or near-daily")
 
 
-def check_enrollment_vs_updates_relationship(df_merged):
+@instrument
+def check_enrollment_vs_updates_relationship(enrollment, biometric, demographic):
     """
     Check relationship between enrollments and updates
+
+    Records are matched on (date, pincode) from the per-key totals collected
+    while profiling, so no merged frame is needed.
     """
     print("\n" + "="*60)
     print("3. ENROLLMENT VS UPDATES RELATIONSHIP")
     print("="*60)
     
     # Calculate totals
-    df_merged['total_enrollment'] = (
-        df_merged['age_0_5'].fillna(0) + 
-        df_merged['age_5_17'].fillna(0) + 
-        df_merged['age_18_greater'].fillna(0)
-    )
-    
-    df_merged['total_biometric'] = (
-        df_merged['bio_age_5_17'].fillna(0) + 
-        df_merged['bio_age_17_'].fillna(0)
-    )
-    
-    df_merged['total_demographic'] = (
-        df_merged['demo_age_5_17'].fillna(0) + 
-        df_merged['demo_age_17_'].fillna(0)
-    )
-    
-    df_merged['total_updates'] = df_merged['total_biometric'] + df_merged['total_demographic']
+    total_enrollment = enrollment.total()
+    total_biometric = biometric.total()
+    total_demographic = demographic.total()
+    total_updates = total_biometric + total_demographic
     
     print(f"\n📊 Overall Statistics:")
-    print(f"  Total enrollment records: {df_merged['total_enrollment'].sum():,.0f}")
-    print(f"  Total biometric updates: {df_merged['total_biometric'].sum():,.0f}")
-    print(f"  Total demographic updates: {df_merged['total_demographic'].sum():,.0f}")
-    print(f"  Total updates (bio + demo): {df_merged['total_updates'].sum():,.0f}")
+    print(f"  Total enrollment records: {total_enrollment:,.0f}")
+    print(f"  Total biometric updates: {total_biometric:,.0f}")
+    print(f"  Total demographic updates: {total_demographic:,.0f}")
+    print(f"  Total updates (bio + demo): {total_updates:,.0f}")
     
-    ratio = df_merged['total_updates'].sum() / df_merged['total_enrollment'].sum()
+    ratio = total_updates / total_enrollment
     print(f"\n  Overall UE Ratio: {ratio:.2f}")
     
-    # Records with enrollments only
-    enrollment_only = df_merged[
-        (df_merged['total_enrollment'] > 0) & 
-        (df_merged['total_updates'] == 0)
-    ]
-    print(f"\n  Records with enrollments ONLY (no updates): {len(enrollment_only):,}")
+    # Align per-(date, pincode) totals across the three datasets
+    keyed = pd.concat([
+        enrollment.totals.totals.rename('enrollment'),
+        biometric.totals.totals.add(demographic.totals.totals, fill_value=0).rename('updates')
+    ], axis=1).fillna(0)
+    has_enrollment = keyed['enrollment'] > 0
+    has_updates = keyed['updates'] > 0
     
-    # Records with updates only
-    updates_only = df_merged[
-        (df_merged['total_enrollment'] == 0) & 
-        (df_merged['total_updates'] > 0)
-    ]
-    print(f"  Records with updates ONLY (no enrollments): {len(updates_only):,}")
+    enrollment_only = int((has_enrollment & ~has_updates).sum())
+    updates_only = int((~has_enrollment & has_updates).sum())
+    both = int((has_enrollment & has_updates).sum())
     
-    # Records with both
-    both = df_merged[
-        (df_merged['total_enrollment'] > 0) & 
-        (df_merged['total_updates'] > 0)
-    ]
-    print(f"  Records with BOTH enrollments and updates: {len(both):,}")
+    print(f"\n  (date, pincode) records across datasets: {len(keyed):,}")
+    print(f"  Records with enrollments ONLY (no updates): {enrollment_only:,}")
+    print(f"  Records with updates ONLY (no enrollments): {updates_only:,}")
+    print(f"  Records with BOTH enrollments and updates: {both:,}")
     
     print("\n🔍 CONCLUSION:")
     print(f"  ✓ Updates outnumber enrollments by {ratio:.1f}x")
     print(f"  ✓ This is consistent with high-saturation environment")
-    print(f"  ✓ {len(updates_only):,} records have ONLY updates (no new enrollments)")
+    print(f"  ✓ {updates_only:,} records have ONLY updates (no new enrollments)")
+    
+    return len(keyed)
 
 
-def check_child_enrollment_pattern(df_enrollment):
+@instrument
+def check_child_enrollment_pattern(enrollment):
     """
     Deep dive into child enrollment patterns
     """
@@ -203,38 +209,28 @@ def check_child_enrollment_pattern(df_enrollment):
     print("4. CHILD ENROLLMENT PATTERN ANALYSIS")
     print("="*60)
     
-    # Calculate totals
-    df_enrollment['total'] = (
-        df_enrollment['age_0_5'] + 
-        df_enrollment['age_5_17'] + 
-        df_enrollment['age_18_greater']
-    )
-    
-    # Child percentages
-    df_enrollment['pct_0_5'] = (df_enrollment['age_0_5'] / df_enrollment['total']) * 100
-    df_enrollment['pct_5_17'] = (df_enrollment['age_5_17'] / df_enrollment['total']) * 100
-    df_enrollment['pct_18_plus'] = (df_enrollment['age_18_greater'] / df_enrollment['total']) * 100
-    df_enrollment['pct_child_total'] = df_enrollment['pct_0_5'] + df_enrollment['pct_5_17']
+    total = enrollment.total()
+    age_0_5 = enrollment.stats['age_0_5'].total
+    age_5_17 = enrollment.stats['age_5_17'].total
+    age_18_plus = enrollment.stats['age_18_greater'].total
     
     print(f"\n📊 Age Group Distribution (Enrollment Dataset):")
-    print(f"  Total enrollments: {df_enrollment['total'].sum():,.0f}")
+    print(f"  Total enrollments: {total:,.0f}")
     print(f"\n  By Age Group:")
-    print(f"    Age 0-5: {df_enrollment['age_0_5'].sum():,.0f} ({(df_enrollment['age_0_5'].sum()/df_enrollment['total'].sum())*100:.1f}%)")
-    print(f"    Age 5-17: {df_enrollment['age_5_17'].sum():,.0f} ({(df_enrollment['age_5_17'].sum()/df_enrollment['total'].sum())*100:.1f}%)")
-    print(f"    Age 18+: {df_enrollment['age_18_greater'].sum():,.0f} ({(df_enrollment['age_18_greater'].sum()/df_enrollment['total'].sum())*100:.1f}%)")
+    print(f"    Age 0-5: {age_0_5:,.0f} ({(age_0_5/total)*100:.1f}%)")
+    print(f"    Age 5-17: {age_5_17:,.0f} ({(age_5_17/total)*100:.1f}%)")
+    print(f"    Age 18+: {age_18_plus:,.0f} ({(age_18_plus/total)*100:.1f}%)")
     
     print(f"\n  At Record Level (average %):")
-    print(f"    Age 0-5: {df_enrollment['pct_0_5'].mean():.1f}%")
-    print(f"    Age 5-17: {df_enrollment['pct_5_17'].mean():.1f}%")
-    print(f"    Age 18+: {df_enrollment['pct_18_plus'].mean():.1f}%")
-    print(f"    Children (0-17): {df_enrollment['pct_child_total'].mean():.1f}%")
+    print(f"    Age 0-5: {enrollment.mean_share('age_0_5'):.1f}%")
+    print(f"    Age 5-17: {enrollment.mean_share('age_5_17'):.1f}%")
+    print(f"    Age 18+: {enrollment.mean_share('age_18_greater'):.1f}%")
+    print(f"    Children (0-17): {enrollment.mean_share('child'):.1f}%")
     
     # Distribution of child percentages
     print(f"\n  Distribution of Child % across records:")
-    bins = [0, 10, 20, 30, 40, 50, 60, 70, 80, 90, 100]
-    child_pct_dist = pd.cut(df_enrollment['pct_child_total'], bins=bins).value_counts().sort_index()
-    for bin_range, count in child_pct_dist.items():
-        pct = (count / len(df_enrollment)) * 100
+    for bin_range, count in enrollment.child_pct.items():
+        pct = (count / enrollment.rows) * 100
         print(f"    {bin_range}: {count:,} records ({pct:.1f}%)")
     
     print("\n🔍 THE ISSUE:")
@@ -245,33 +241,23 @@ def check_child_enrollment_pattern(df_enrollment):
     print("  ✓ Then calculate % from these totals")
 
 
-def create_visualization_report(df_enrollment, df_biometric, df_demographic, df_merged):
-    """
-    Create visualizations for data quality report
-    """
-    print("\n" + "="*60)
-    print("5. CREATING DATA QUALITY VISUALIZATIONS")
-    print("="*60)
-    
-    # 1. Temporal pattern - records per date
+def plot_temporal_pattern(enrollment_dates, biometric_dates, demographic_dates):
+    """Records per date for each dataset"""
     fig, axes = plt.subplots(3, 1, figsize=(14, 10))
     
     # Enrollment
-    enrollment_dates = df_enrollment['date'].value_counts().sort_index()
     axes[0].plot(enrollment_dates.index, enrollment_dates.values, marker='o', linestyle='-', color='blue')
     axes[0].set_title('Enrollment Records per Date', fontsize=12, fontweight='bold')
     axes[0].set_ylabel('Number of Records')
     axes[0].grid(True, alpha=0.3)
     
     # Biometric
-    biometric_dates = df_biometric['date'].value_counts().sort_index()
     axes[1].plot(biometric_dates.index, biometric_dates.values, marker='o', linestyle='-', color='green')
     axes[1].set_title('Biometric Records per Date', fontsize=12, fontweight='bold')
     axes[1].set_ylabel('Number of Records')
     axes[1].grid(True, alpha=0.3)
     
     # Demographic
-    demographic_dates = df_demographic['date'].value_counts().sort_index()
     axes[2].plot(demographic_dates.index, demographic_dates.values, marker='o', linestyle='-', color='orange')
     axes[2].set_title('Demographic Records per Date', fontsize=12, fontweight='bold')
     axes[2].set_ylabel('Number of Records')
@@ -279,18 +265,12 @@ def create_visualization_report(df_enrollment, df_biometric, df_demographic, df_
     axes[2].grid(True, alpha=0.3)
     
     plt.tight_layout()
-    plt.savefig(os.path.join(FIGURES_DIR, 'data_quality_temporal_pattern.png'), dpi=300)
-    plt.close()
-    print(f"  ✓ Saved: data_quality_temporal_pattern.png")
-    
-    # 2. Age distribution (correct calculation)
-    total_age_0_5 = df_enrollment['age_0_5'].sum()
-    total_age_5_17 = df_enrollment['age_5_17'].sum()
-    total_age_18_plus = df_enrollment['age_18_greater'].sum()
-    
+
+
+def plot_age_distribution(values):
+    """Total enrollments by age group (correct calculation)"""
     fig, ax = plt.subplots(figsize=(10, 6))
     age_groups = ['Age 0-5', 'Age 5-17', 'Age 18+']
-    values = [total_age_0_5, total_age_5_17, total_age_18_plus]
     colors = ['#3498db', '#2ecc71', '#e74c3c']
     
     bars = ax.bar(age_groups, values, color=colors, alpha=0.7)
@@ -305,17 +285,68 @@ def create_visualization_report(df_enrollment, df_biometric, df_demographic, df_
                 ha='center', va='bottom', fontsize=10)
     
     plt.tight_layout()
-    plt.savefig(os.path.join(FIGURES_DIR, 'data_quality_age_distribution.png'), dpi=300)
-    plt.close()
-    print(f"  ✓ Saved: data_quality_age_distribution.png")
 
 
-def generate_data_quality_report(df_enrollment, df_biometric, df_demographic, df_merged):
+@instrument
+def create_visualization_report(enrollment, biometric, demographic):
+    """
+    Create visualizations for data quality report
+    Figures are drawn from the profiled per-date counts and totals
+    """
+    print("\n" + "="*60)
+    print("5. CREATING DATA QUALITY VISUALIZATIONS")
+    print("="*60)
+    
+    specs = [
+        # 1. Temporal pattern - records per date
+        FigureSpec('data_quality_temporal_pattern.png', plot_temporal_pattern,
+                   enrollment_dates=enrollment.dates.per_date,
+                   biometric_dates=biometric.dates.per_date,
+                   demographic_dates=demographic.dates.per_date),
+        # 2. Age distribution (correct calculation)
+        FigureSpec('data_quality_age_distribution.png', plot_age_distribution,
+                   values=[enrollment.stats[col].total for col in EnrollmentProfile.AGE_COLUMNS]),
+    ]
+    
+    render_figures(specs, group='data_quality')
+
+
+@instrument
+def check_validity_rules(enrollment, biometric, demographic):
+    """
+    Report row-level rule violations and write violation / quarantine outputs
+    """
+    print("\n" + "="*60)
+    print("6. DATA QUALITY RULES")
+    print("="*60)
+    
+    counts = write_rule_outputs({
+        profile.name: profile.rule_results for profile in (enrollment, biometric, demographic)
+    })
+    
+    print(f"\n📋 Violations per rule:")
+    by_rule = counts.pivot(index=['rule_id', 'description'], columns='dataset', values='violations')
+    for (rule_id, description), row in by_rule.iterrows():
+        detail = ", ".join(f"{name.title()} {row[name]:,}" for name in by_rule.columns)
+        print(f"  {rule_id} {description}: {detail}")
+    
+    total = int(counts['violations'].sum())
+    print("\n🔍 CONCLUSION:")
+    if total == 0:
+        print("  ✓ No rule violations in the raw shards")
+    else:
+        print(f"  ⚠️  {total:,} rule violations - offending rows written to the quarantine folder")
+    
+    return counts
+
+
+@instrument
+def generate_data_quality_report(enrollment, biometric, demographic, merged_keys, rule_counts):
     """
     Generate comprehensive data quality report
     """
     print("\n" + "="*60)
-    print("6. GENERATING DATA QUALITY REPORT")
+    print("7. GENERATING DATA QUALITY REPORT")
     print("="*60)
     
     report = []
@@ -326,17 +357,17 @@ def generate_data_quality_report(df_enrollment, df_biometric, df_demographic, df
     
     # Dataset sizes
     report.append("1. DATASET SIZES")
-    report.append(f"   Enrollment: {len(df_enrollment):,} records")
-    report.append(f"   Biometric: {len(df_biometric):,} records")
-    report.append(f"   Demographic: {len(df_demographic):,} records")
-    report.append(f"   Merged: {len(df_merged):,} records")
+    report.append(f"   Enrollment: {enrollment.rows:,} records")
+    report.append(f"   Biometric: {biometric.rows:,} records")
+    report.append(f"   Demographic: {demographic.rows:,} records")
+    report.append(f"   Merged (date, pincode) keys: {merged_keys:,}")
     report.append("")
     
     # Date ranges
     report.append("2. DATE RANGES")
-    report.append(f"   Enrollment: {df_enrollment['date'].min().date()} to {df_enrollment['date'].max().date()}")
-    report.append(f"   Biometric: {df_biometric['date'].min().date()} to {df_biometric['date'].max().date()}")
-    report.append(f"   Demographic: {df_demographic['date'].min().date()} to {df_demographic['date'].max().date()}")
+    for profile in (enrollment, biometric, demographic):
+        report.append(f"   {profile.name.title()}: {profile.dates.first.date()} to {profile.dates.last.date()}"
+                      f" ({profile.dates.unparseable:,} unparseable)")
     report.append("")
     
     # Aggregation structure
@@ -347,22 +378,21 @@ def generate_data_quality_report(df_enrollment, df_biometric, df_demographic, df
     report.append("")
     
     # Age distribution (CORRECT)
-    total_enrollments = df_enrollment['age_0_5'].sum() + df_enrollment['age_5_17'].sum() + df_enrollment['age_18_greater'].sum()
-    pct_0_5 = (df_enrollment['age_0_5'].sum() / total_enrollments) * 100
-    pct_5_17 = (df_enrollment['age_5_17'].sum() / total_enrollments) * 100
-    pct_18_plus = (df_enrollment['age_18_greater'].sum() / total_enrollments) * 100
+    total_enrollments = enrollment.total()
+    pct_0_5 = (enrollment.stats['age_0_5'].total / total_enrollments) * 100
+    pct_5_17 = (enrollment.stats['age_5_17'].total / total_enrollments) * 100
+    pct_18_plus = (enrollment.stats['age_18_greater'].total / total_enrollments) * 100
     
     report.append("4. AGE DISTRIBUTION (CORRECT CALCULATION)")
     report.append(f"   Total Enrollments: {total_enrollments:,.0f}")
-    report.append(f"   Age 0-5: {df_enrollment['age_0_5'].sum():,.0f} ({pct_0_5:.1f}%)")
-    report.append(f"   Age 5-17: {df_enrollment['age_5_17'].sum():,.0f} ({pct_5_17:.1f}%)")
-    report.append(f"   Age 18+: {df_enrollment['age_18_greater'].sum():,.0f} ({pct_18_plus:.1f}%)")
+    report.append(f"   Age 0-5: {enrollment.stats['age_0_5'].total:,.0f} ({pct_0_5:.1f}%)")
+    report.append(f"   Age 5-17: {enrollment.stats['age_5_17'].total:,.0f} ({pct_5_17:.1f}%)")
+    report.append(f"   Age 18+: {enrollment.stats['age_18_greater'].total:,.0f} ({pct_18_plus:.1f}%)")
     report.append(f"   Children (0-17): {pct_0_5 + pct_5_17:.1f}%")
     report.append("")
     
     # UE Ratio
-    total_updates = (df_biometric['bio_age_5_17'].sum() + df_biometric['bio_age_17_'].sum() + 
-                     df_demographic['demo_age_5_17'].sum() + df_demographic['demo_age_17_'].sum())
+    total_updates = biometric.total() + demographic.total()
     ue_ratio = total_updates / total_enrollments
     
     report.append("5. OVERALL UE RATIO")
@@ -371,7 +401,12 @@ def generate_data_quality_report(df_enrollment, df_biometric, df_demographic, df
     report.append(f"   UE Ratio: {ue_ratio:.2f}")
     report.append("")
     
-    report.append("6. KEY FINDINGS")
+    report.append("6. RULE VIOLATIONS")
+    for _, row in rule_counts.iterrows():
+        report.append(f"   {row['dataset'].title()} {row['rule_id']} ({row['description']}): {row['violations']:,}")
+    report.append("")
+    
+    report.append("7. KEY FINDINGS")
     report.append("   ✓ Data quality is GOOD - no major issues")
     report.append("   ✓ Weekly aggregation is appropriate for analysis")
     report.append("   ✗ Previous child enrollment % calculation was WRONG")
@@ -391,33 +426,39 @@ def generate_data_quality_report(df_enrollment, df_biometric, df_demographic, df
     print("\n" + "\n".join(report))
 
 
+@instrument
 def main():
     """
     Main data quality check workflow
     """
-    # Load data
-    df_enrollment, df_biometric, df_demographic, df_merged = load_data()
+    start = time.perf_counter()
+    
+    # Profile raw shards (one chunked pass per dataset)
+    enrollment, biometric, demographic = load_data()
     
     # Run checks
-    check_aggregation_structure(df_enrollment, df_biometric, df_demographic)
-    analyze_temporal_patterns(df_enrollment, df_biometric, df_demographic)
-    check_enrollment_vs_updates_relationship(df_merged)
-    check_child_enrollment_pattern(df_enrollment)
+    check_aggregation_structure(enrollment, biometric, demographic)
+    analyze_temporal_patterns(enrollment, biometric, demographic)
+    merged_keys = check_enrollment_vs_updates_relationship(enrollment, biometric, demographic)
+    check_child_enrollment_pattern(enrollment)
     
     # Create visualizations
-    create_visualization_report(df_enrollment, df_biometric, df_demographic, df_merged)
+    create_visualization_report(enrollment, biometric, demographic)
+    
+    # Validity rules (evaluated during profiling)
+    rule_counts = check_validity_rules(enrollment, biometric, demographic)
     
     # Generate report
-    generate_data_quality_report(df_enrollment, df_biometric, df_demographic, df_merged)
+    generate_data_quality_report(enrollment, biometric, demographic, merged_keys, rule_counts)
     
     print("\n" + "="*60)
     print("DATA QUALITY CHECK COMPLETE!")
     print("="*60)
-    print("\n✓ All checks passed")
+    print(f"\n✓ All checks passed in {time.perf_counter() - start:.1f}s")
     print("✓ Data structure validated")
     print("✓ Ready for corrected Dimension 1 analysis")
     print("\n" + "="*60)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -10,15 +10,14 @@ import sys
 # Add parent directory to path to import config
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from utils.config import (
-    RAW_DATA_DIR, 
-    ENROLLMENT_FILES, 
-    BIOMETRIC_FILES, 
-    DEMOGRAPHIC_FILES
-)
+from utils.config import RAW_DATA_DIR
+from utils.data_manifest import DataManifest
+from utils.shards import discover_shards, read_shard
+from utils.telemetry import instrument
 
 
-def load_split_files(file_list, data_dir, dataset_name):
+@instrument
+def load_split_files(file_list, data_dir, dataset_name, manifest=None):
     """
     Load multiple CSV files and combine them into a single dataframe
     
@@ -30,6 +29,8 @@ def load_split_files(file_list, data_dir, dataset_name):
         Directory containing the files
     dataset_name : str
         Name of the dataset (for logging)
+    manifest : DataManifest, optional
+        Records row count, sums, distinct counts and hash of each file read
     
     Returns:
     --------
@@ -53,7 +54,7 @@ def load_split_files(file_list, data_dir, dataset_name):
         
         # Load CSV
         try:
-            df = pd.read_csv(file_path)
+            df = read_shard(file_path)
             rows = len(df)
             total_rows += rows
             
@@ -62,6 +63,9 @@ def load_split_files(file_list, data_dir, dataset_name):
             
             dataframes.append(df)
             
+            if manifest is not None:
+                manifest.record('raw', file_path, df)
+            
         except Exception as e:
             print(f"  ✗ Error loading {filename}: {str(e)}")
             continue
@@ -78,6 +82,7 @@ def load_split_files(file_list, data_dir, dataset_name):
         return None
 
 
+@instrument
 def inspect_dataframe(df, dataset_name):
     """
     Print basic information about the dataframe
@@ -131,6 +136,7 @@ def inspect_dataframe(df, dataset_name):
         print(f"  Pincodes: {df['pincode'].nunique()}")
 
 
+@instrument
 def main():
     """
     Main function to load all datasets
@@ -139,33 +145,42 @@ def main():
     print("AADHAAR DATA LOADING - STEP 1")
     print("="*60)
     
+    manifest = DataManifest()
+    
     # Load Enrollment data
     df_enrollment = load_split_files(
-        ENROLLMENT_FILES, 
+        discover_shards('enrollment'),
         RAW_DATA_DIR, 
-        "ENROLLMENT"
+        "ENROLLMENT",
+        manifest
     )
     if df_enrollment is not None:
         inspect_dataframe(df_enrollment, "ENROLLMENT")
     
     # Load Biometric data
     df_biometric = load_split_files(
-        BIOMETRIC_FILES, 
+        discover_shards('biometric'),
         RAW_DATA_DIR, 
-        "BIOMETRIC"
+        "BIOMETRIC",
+        manifest
     )
     if df_biometric is not None:
         inspect_dataframe(df_biometric, "BIOMETRIC")
     
     # Load Demographic data
     df_demographic = load_split_files(
-        DEMOGRAPHIC_FILES, 
+        discover_shards('demographic'),
         RAW_DATA_DIR, 
-        "DEMOGRAPHIC"
+        "DEMOGRAPHIC",
+        manifest
     )
     if df_demographic is not None:
         inspect_dataframe(df_demographic, "DEMOGRAPHIC")
     
+    # Raw file row counts / sums / hashes for later validation
+    manifest.save()
+    print(f"\n📝 Data manifest updated: {manifest.path}")
+    
     # Summary
     print(f"\n{'='*60}")
     print("LOADING SUMMARY")
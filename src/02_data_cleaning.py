@@ -8,6 +8,7 @@ import pandas as pd
 import numpy as np
 import os
 import sys
+import argparse
 from datetime import datetime
 
 # Add parent directory to path to import config
@@ -16,14 +17,25 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from utils.config import (
     RAW_DATA_DIR,
     PROCESSED_DATA_DIR,
-    ENROLLMENT_FILES,
-    BIOMETRIC_FILES,
-    DEMOGRAPHIC_FILES,
     START_DATE,
-    END_DATE
+    END_DATE,
+    STATE_NAME_MAPPING,
+    DISTRICT_NAME_MAPPING,
+    COLUMN_STORE_ENABLED,
+    LAKE_ENABLED
 )
-
-
+from utils.indicators import calculate_ue_ratios
+from utils.data_manifest import DataManifest
+from utils.aggregation import aggregate
+from utils.cleaning_engines import ENGINES, get_engine, run_cleaning
+from utils.column_store import store_path, write_store
+from utils.lake import LAKE_DIR, write_lake
+from utils.schema import enforce_schema, parse_dates
+from utils.shards import discover_shards, read_shard
+from utils.telemetry import instrument
+
+
+@instrument
 def load_datasets():
     """
     Load all three datasets
@@ -35,24 +47,24 @@ def load_datasets():
     
     # Load enrollment
     enrollment_dfs = []
-    for file in ENROLLMENT_FILES:
-        df = pd.read_csv(os.path.join(RAW_DATA_DIR, file))
+    for file in discover_shards('enrollment'):
+        df = read_shard(os.path.join(RAW_DATA_DIR, file))
         enrollment_dfs.append(df)
     df_enrollment = pd.concat(enrollment_dfs, ignore_index=True)
     print(f"✓ Enrollment: {len(df_enrollment):,} records")
     
     # Load biometric
     biometric_dfs = []
-    for file in BIOMETRIC_FILES:
-        df = pd.read_csv(os.path.join(RAW_DATA_DIR, file))
+    for file in discover_shards('biometric'):
+        df = read_shard(os.path.join(RAW_DATA_DIR, file))
         biometric_dfs.append(df)
     df_biometric = pd.concat(biometric_dfs, ignore_index=True)
     print(f"✓ Biometric: {len(df_biometric):,} records")
     
     # Load demographic
     demographic_dfs = []
-    for file in DEMOGRAPHIC_FILES:
-        df = pd.read_csv(os.path.join(RAW_DATA_DIR, file))
+    for file in discover_shards('demographic'):
+        df = read_shard(os.path.join(RAW_DATA_DIR, file))
         demographic_dfs.append(df)
     df_demographic = pd.concat(demographic_dfs, ignore_index=True)
     print(f"✓ Demographic: {len(df_demographic):,} records")
@@ -60,6 +72,7 @@ def load_datasets():
     return df_enrollment, df_biometric, df_demographic
 
 
+@instrument
 def standardize_dates(df, date_column='date'):
     """
     Standardize date formats across datasets
@@ -67,10 +80,8 @@ def standardize_dates(df, date_column='date'):
     """
     print(f"\n📅 Standardizing dates in {date_column} column...")
     
-    # Try multiple date formats
-    date_formats = ['%d-%m-%y', '%d-%m-%Y', '%d-%m-%Y', '%Y-%m-%d']
-    
-    df[date_column] = pd.to_datetime(df[date_column], format='mixed', errors='coerce')
+    # Day-first, the same parser the profiler uses (utils/schema.py)
+    df[date_column] = parse_dates(df[date_column])
     
     # Check for parsing errors
     null_dates = df[date_column].isna().sum()
@@ -93,6 +104,7 @@ def standardize_dates(df, date_column='date'):
     return df
 
 
+@instrument
 def standardize_state_names(df):
     """
     COMPREHENSIVE STATE NAME STANDARDIZATION
@@ -102,108 +114,7 @@ def standardize_state_names(df):
     print(f"\n🗺️  Comprehensive State Name Standardization...")
     print(f"  States BEFORE standardization: {df['state'].nunique()}")
     
-    # COMPREHENSIVE STATE NAME MAPPING
-    # Covers all variations, typos, and invalid entries
-    STATE_NAME_MAPPING = {
-        # Odisha variations
-        'ODISHA': 'Odisha',
-        'odisha': 'Odisha',
-        'Orissa': 'Odisha',
-        
-        # West Bengal variations (most problematic)
-        'WEST BENGAL': 'West Bengal',
-        'WESTBENGAL': 'West Bengal',
-        'Westbengal': 'West Bengal',
-        'west Bengal': 'West Bengal',
-        'West Bangal': 'West Bengal',
-        'West Bengli': 'West Bengal',
-        'West  Bengal': 'West Bengal',  # double space
-        'west bengal': 'West Bengal',
-        'West bengal': 'West Bengal',
-        
-        # Chhattisgarh variations
-        'Chhatisgarh': 'Chhattisgarh',
-        'CHHATTISGARH': 'Chhattisgarh',
-        
-        # Tamil Nadu variations
-        'Tamilnadu': 'Tamil Nadu',
-        'TAMIL NADU': 'Tamil Nadu',
-        
-        # Andhra Pradesh variations
-        'andhra pradesh': 'Andhra Pradesh',
-        'ANDHRA PRADESH': 'Andhra Pradesh',
-        
-        # Jammu and Kashmir variations
-        'Jammu And Kashmir': 'Jammu and Kashmir',
-        'Jammu & Kashmir': 'Jammu and Kashmir',
-        'JAMMU AND KASHMIR': 'Jammu and Kashmir',
-        
-        # Uttarakhand variations
-        'Uttaranchal': 'Uttarakhand',
-        'UTTARAKHAND': 'Uttarakhand',
-        
-        # Puducherry variations
-        'Pondicherry': 'Puducherry',
-        'PUDUCHERRY': 'Puducherry',
-        
-        # Andaman & Nicobar variations
-        'Andaman and Nicobar Islands': 'Andaman & Nicobar Islands',
-        'Andaman & Nicobar': 'Andaman & Nicobar Islands',
-        'A & N Islands': 'Andaman & Nicobar Islands',
-        'ANDAMAN & NICOBAR ISLANDS': 'Andaman & Nicobar Islands',
-        
-        # Dadra & Nagar Haveli and Daman & Diu (merged UT in 2020)
-        'Dadra & Nagar Haveli': 'Dadra & Nagar Haveli and Daman & Diu',
-        'Daman & Diu': 'Dadra & Nagar Haveli and Daman & Diu',
-        'Dadra and Nagar Haveli': 'Dadra & Nagar Haveli and Daman & Diu',
-        'Daman and Diu': 'Dadra & Nagar Haveli and Daman & Diu',
-        'The Dadra And Nagar Haveli And Daman And Diu': 'Dadra & Nagar Haveli and Daman & Diu',
-        'Dadra and Nagar Haveli and Daman and Diu': 'Dadra & Nagar Haveli and Daman & Diu',
-                
-        # Delhi variations
-        'NCT of Delhi': 'Delhi',
-        'New Delhi': 'Delhi',
-        'DELHI': 'Delhi',
-        
-        # Other case variations
-        'MANIPUR': 'Manipur',
-        'TRIPURA': 'Tripura',
-        'ASSAM': 'Assam',
-        'BIHAR': 'Bihar',
-        'GOA': 'Goa',
-        'GUJARAT': 'Gujarat',
-        'HARYANA': 'Haryana',
-        'HIMACHAL PRADESH': 'Himachal Pradesh',
-        'JHARKHAND': 'Jharkhand',
-        'KARNATAKA': 'Karnataka',
-        'KERALA': 'Kerala',
-        'MADHYA PRADESH': 'Madhya Pradesh',
-        'MAHARASHTRA': 'Maharashtra',
-        'MEGHALAYA': 'Meghalaya',
-        'MIZORAM': 'Mizoram',
-        'NAGALAND': 'Nagaland',
-        'PUNJAB': 'Punjab',
-        'RAJASTHAN': 'Rajasthan',
-        'SIKKIM': 'Sikkim',
-        'TELANGANA': 'Telangana',
-        'UTTAR PRADESH': 'Uttar Pradesh',
-        'CHANDIGARH': 'Chandigarh',
-        'LADAKH': 'Ladakh',
-        'LAKSHADWEEP': 'Lakshadweep',
-        
-        # INVALID ENTRIES - Districts/localities mistakenly in state column
-        # Map to correct state based on known geography
-        'BALANAGAR': 'Telangana',
-        'Darbhanga': 'Bihar',
-        'Jaipur': 'Rajasthan',
-        'Madanapalle': 'Andhra Pradesh',
-        'Nagpur': 'Maharashtra',
-        'Puttenahalli': 'Karnataka',
-        'Raja Annamalai Puram': 'Tamil Nadu',
-        
-        # Invalid pincode/numeric entries - will be removed
-        '100000': None,
-    }
+    # Mapping of all known variations lives in utils/config.py (STATE_NAME_MAPPING)
     
     # Show problematic states before fixing
     all_states = df['state'].unique()
@@ -254,6 +165,7 @@ Based on the duplicate analysis from district.py output
 Add this function to your 02_data_cleaning.py BEFORE merge_datasets()
 """
 
+@instrument
 def standardize_district_names(df):
     """
     COMPREHENSIVE DISTRICT NAME STANDARDIZATION
@@ -263,252 +175,7 @@ def standardize_district_names(df):
     print(f"\n🏘️  Comprehensive District Name Standardization...")
     print(f"  Districts BEFORE standardization: {df['district'].nunique()}")
     
-    # COMPREHENSIVE DISTRICT NAME MAPPING
-    # Organized by state for clarity
-    DISTRICT_NAME_MAPPING = {
-        # Andaman & Nicobar Islands
-        'Nicobars': 'Nicobar',
-        
-        # Andhra Pradesh
-        'Ananthapur': 'Anantapur',
-        'Ananthapuramu': 'Anantapur',
-        'chittoor': 'Chittoor',
-        'K.v. Rangareddy': 'K.V.Rangareddy',
-        'Karim Nagar': 'Karimnagar',
-        'Mahabub Nagar': 'Mahbubnagar',
-        'Mahabubnagar': 'Mahbubnagar',
-        'rangareddi': 'Rangareddi',
-        'Visakhapatanam': 'Visakhapatnam',
-        
-        # Arunachal Pradesh
-        # East/West variations are DIFFERENT districts - keep separate
-        
-        # Assam
-        # Karbi Anglong and West Karbi Anglong are DIFFERENT - keep separate
-        'Sivasagar': 'Sibsagar',
-        
-        # Bihar
-        'Aurangabad(BH)': 'Aurangabad',
-        'Aurangabad(bh)': 'Aurangabad',
-        'Pashchim Champaran': 'West Champaran',
-        'Purba Champaran': 'East Champaran',
-        'Purbi Champaran': 'East Champaran',
-        'Purnia': 'Purnea',
-        'Samstipur': 'Samastipur',
-        'Sheikpura': 'Sheikhpura',
-        
-        # Chhattisgarh
-        'Gaurella Pendra Marwahi': 'Gaurela-pendra-marwahi',
-        'Janjgir Champa': 'Janjgir - Champa',
-        'Janjgir-champa': 'Janjgir - Champa',
-        'Manendragarh–Chirmiri–Bharatpur': 'ManendragarhChirmiriBharatpur',
-        'Mohla-Manpur-Ambagarh Chouki': 'Mohalla-Manpur-Ambagarh Chowki',
-        
-        # Dadra & Nagar Haveli and Daman & Diu
-        'Dadra And Nagar Haveli': 'Dadra & Nagar Haveli',
-        'Dadra and Nagar Haveli': 'Dadra & Nagar Haveli',
-        
-        # Delhi
-        'North East   *': 'North East',
-        # Note: East/West/North/South Delhi are DIFFERENT districts
-        
-        # Gujarat
-        'Ahmedabad': 'Ahmadabad',
-        'Banaskantha': 'Banas Kantha',
-        'Panchmahals': 'Panch Mahals',
-        'Sabarkantha': 'Sabar Kantha',
-        'Surendranagar': 'Surendra Nagar',
-        
-        # Haryana
-        'Jhajjar *': 'Jhajjar',
-        'Yamunanagar': 'Yamuna Nagar',
-        
-        # Himachal Pradesh
-        'Lahul & Spiti': 'Lahaul and Spiti',
-        'Lahul and Spiti': 'Lahaul and Spiti',
-        
-        # Jammu and Kashmir
-        'Budgam': 'Badgam',
-        'Bandipur': 'Bandipore',
-        'punch': 'Punch',
-        'Rajouri': 'Rajauri',
-        'udhampur': 'Udhampur',
-        
-        # Jharkhand
-        'Bokaro *': 'Bokaro',
-        'East Singhbum': 'East Singhbhum',
-        'Garhwa *': 'Garhwa',
-        'Hazaribagh': 'Hazaribag',
-        'Koderma': 'Kodarma',
-        'Pakur': 'Pakaur',
-        'Palamu': 'Palamau',
-        'Sahibganj': 'Sahebganj',
-        'Seraikela-kharsawan': 'Seraikela-Kharsawan',
-        
-        # Karnataka
-        'Bagalkot *': 'Bagalkot',
-        'Chamarajanagar *': 'Chamarajanagar',
-        'Chamrajanagar': 'Chamarajanagar',
-        'Chamrajnagar': 'Chamarajanagar',
-        'Chikkamagaluru': 'Chickmagalur',
-        'Chikmagalur': 'Chickmagalur',
-        'Davangere': 'Davanagere',
-        'Gadag *': 'Gadag',
-        'Hassan': 'Hasan',
-        'Haveri *': 'Haveri',
-        'Ramanagara': 'Ramanagar',
-        'Shivamogga': 'Shimoga',
-        'Tumkur': 'Tumakuru',
-        'Udupi *': 'Udupi',
-        'yadgir': 'Yadgir',
-        
-        # Kerala
-        'Kasargod': 'Kasaragod',
-        
-        # Madhya Pradesh
-        'Ashoknagar': 'Ashok Nagar',
-        'Harda *': 'Harda',
-        'Narsinghpur': 'Narsimhapur',
-        
-        # Maharashtra
-        'Ahmed Nagar': 'Ahmadnagar',
-        'Ahmednagar': 'Ahmadnagar',
-        'Buldhana': 'Buldana',
-        'Chhatrapati Sambhajinagar': 'Chatrapati Sambhaji Nagar',
-        'Gondiya': 'Gondia',
-        'Hingoli *': 'Hingoli',
-        'Mumbai( Sub Urban )': 'Mumbai Suburban',
-        'Nandurbar *': 'Nandurbar',
-        'Washim *': 'Washim',
-        
-        # Manipur
-        # Imphal East and West are DIFFERENT - keep separate
-        
-        # Meghalaya
-        # Multiple Hills districts are DIFFERENT - keep separate
-        
-        # Mizoram
-        'Mammit': 'Mamit',
-        
-        # Odisha
-        'ANGUL': 'Angul',
-        'ANUGUL': 'Angul',
-        'Anugul': 'Angul',
-        'BALANGIR': 'Balangir',
-        'Baleswar': 'Baleshwar',
-        'Bhadrak(R)': 'Bhadrak',
-        'JAJPUR': 'Jajpur',
-        'Jajapur': 'Jajpur',
-        'jajpur': 'Jajpur',
-        'Jagatsinghpur': 'Jagatsinghapur',
-        'Kendrapara *': 'Kendrapara',
-        'Khordha': 'Khorda',
-        'NAYAGARH': 'Nayagarh',
-        'NUAPADA': 'Nuapada',
-        'Nabarangpur': 'Nabarangapur',
-        'Sundergarh': 'Sundargarh',
-        
-        # Punjab
-        'Firozpur': 'Ferozepur',
-        'SAS Nagar (Mohali)': 'S.A.S Nagar(Mohali)',
-        
-        # Rajasthan
-        'Chittorgarh': 'Chittaurgarh',
-        'Deeg\xa0': 'Deeg',  # Remove non-breaking space
-        'Jalore': 'Jalor',
-        'Jhunjhunun': 'Jhunjhunu',
-        
-        # Sikkim
-        # East/West/North/South are DIFFERENT - keep separate
-        
-        # Tamil Nadu
-        'Kanchipuram': 'Kancheepuram',
-        'Kanyakumari': 'Kanniyakumari',
-        'Thiruvarur': 'Thiruvallur',
-        'Tiruvallur': 'Thiruvallur',
-        'Tirupattur': 'Tirupathur',
-        'Viluppuram': 'Villupuram',
-        
-        # Telangana
-        'Jangoan': 'Jangaon',
-        'Medchal-malkajgiri': 'Medchal Malkajgiri',
-        'Medchal?malkajgiri': 'Medchal Malkajgiri',
-        'Medchalâ\x88\x92malkajgiri': 'Medchal Malkajgiri',
-        'Medchal−malkajgiri': 'Medchal Malkajgiri',
-        'Rangareddy': 'Ranga Reddy',
-        'Warangal Urban': 'Warangal (urban)',
-        # Note: Sangareddy is DIFFERENT from Rangareddy
-        
-        # Tripura
-        # North/South are DIFFERENT - keep separate
-        
-        # Uttar Pradesh
-        'Auraiya *': 'Auraiya',
-        'Baghpat *': 'Baghpat',
-        'Bagpat': 'Baghpat',
-        'Barabanki': 'Bara Banki',
-        'Bulandshahr': 'Bulandshahar',
-        'Chandauli *': 'Chandauli',
-        'Chitrakoot *': 'Chitrakoot',
-        'Gautam Buddha Nagar *': 'Gautam Buddha Nagar',
-        'Jyotiba Phule Nagar *': 'Jyotiba Phule Nagar',
-        'Kushinagar': 'Kushi Nagar',
-        'Kushinagar *': 'Kushi Nagar',
-        'Mahrajganj': 'Maharajganj',
-        'Mahoba *': 'Mahoba',
-        'Raebareli': 'Rae Bareli',
-        'Sant Ravidas Nagar Bhadohi': 'Sant Ravidas Nagar',
-        'Shrawasti': 'Shravasti',
-        'Siddharthnagar': 'Siddharth Nagar',
-        # Note: Faizabad and Firozabad are DIFFERENT districts
-        
-        # Uttarakhand
-        'Haridwar': 'Hardwar',
-        'Udham Singh Nagar *': 'Udham Singh Nagar',
-        
-        # West Bengal
-        'Bardhaman': 'Barddhaman',
-        'Coochbehar': 'Cooch Behar',
-        'Darjiling': 'Darjeeling',
-        'East Midnapur': 'East Midnapore',
-        'East midnapore': 'East Midnapore',
-        'east midnapore': 'East Midnapore',
-        'HOOGHLY': 'Hooghly',
-        'Hooghiy': 'Hooghly',
-        'hooghly': 'Hooghly',
-        'HOWRAH': 'Howrah',
-        'Hawrah': 'Howrah',
-        'KOLKATA': 'Kolkata',
-        'MALDA': 'Malda',
-        'Maldah': 'Malda',
-        'NADIA': 'Nadia',
-        'nadia': 'Nadia',
-        'South 24 Pargana': 'South 24 Parganas',
-        'South 24 pargana': 'South 24 Parganas',
-        'South 24 parganas': 'South 24 Parganas',
-        'South  Twenty Four Parganas': 'South Twenty Four Parganas',
-        'Puruliya': 'Purulia',
-
-
-
-        # West Bengal
-        'Medinipur West': 'Paschim Medinipur',
-        'West Midnapore': 'Paschim Medinipur',
-        'West Medinipur': 'Paschim Medinipur',
-        'East Midnapore': 'Purba Medinipur',
-
-        # Sikkim
-        'East': 'East Sikkim',
-        'South': 'South Sikkim',
-        'North': 'North Sikkim',
-        'West': 'West Sikkim',
-
-        # Jharkhand
-        'Purbi Singhbhum': 'East Singhbhum',
-        'Pashchimi Singhbhum': 'West Singhbhum',
-        
-        # Special characters cleanup
-    }
+    # Mapping of all known variations lives in utils/config.py (DISTRICT_NAME_MAPPING)
     
     # Show problematic districts before fixing
     all_districts = df['district'].unique()
@@ -538,6 +205,7 @@ def standardize_district_names(df):
     return df
 
 
+@instrument
 def validate_geography(df):
     """
     Validate that pincode-district-state combinations are consistent
@@ -545,10 +213,7 @@ def validate_geography(df):
     print(f"\n🔍 Validating geographic consistency...")
     
     # Group by pincode and check if it maps to multiple districts/states
-    pincode_geo = df.groupby('pincode').agg({
-        'district': lambda x: x.nunique(),
-        'state': lambda x: x.nunique()
-    }).reset_index()
+    pincode_geo = df.groupby('pincode', observed=True)[['district', 'state']].nunique().reset_index()
     
     # Find inconsistent pincodes
     inconsistent_district = pincode_geo[pincode_geo['district'] > 1]
@@ -568,6 +233,7 @@ def validate_geography(df):
     return df
 
 
+@instrument
 def create_date_range_report(df_enrollment, df_biometric, df_demographic):
     """
     Report on date coverage in each dataset
@@ -610,6 +276,7 @@ def create_date_range_report(df_enrollment, df_biometric, df_demographic):
             print(f"  📌 Appears to be DAILY or near-daily data")
 
 
+@instrument
 def merge_datasets(df_enrollment, df_biometric, df_demographic):
     """
     Merge all three datasets on date, state, district, pincode
@@ -645,11 +312,11 @@ def merge_datasets(df_enrollment, df_biometric, df_demographic):
     # ========================================================================
     
     print("\n  Step 1: Aggregating enrollment data (removing duplicates)...")
-    df_enroll_agg = df_enroll.groupby(['date', 'state', 'district', 'pincode']).agg({
+    df_enroll_agg = aggregate(df_enroll, ['date', 'state', 'district', 'pincode'], {
         'age_0_5': 'sum',
         'age_5_17': 'sum',
         'age_18_greater': 'sum'
-    }).reset_index()
+    })
     
     duplicates_removed = len(df_enroll) - len(df_enroll_agg)
     print(f"    Records before: {len(df_enroll):,}")
@@ -658,10 +325,10 @@ def merge_datasets(df_enrollment, df_biometric, df_demographic):
         print(f"    Duplicates removed: {duplicates_removed:,}")
     
     print("\n  Step 2: Aggregating biometric data (removing duplicates)...")
-    df_bio_agg = df_bio.groupby(['date', 'state', 'district', 'pincode']).agg({
+    df_bio_agg = aggregate(df_bio, ['date', 'state', 'district', 'pincode'], {
         'bio_age_5_17': 'sum',
         'bio_age_17_': 'sum'
-    }).reset_index()
+    })
     
     duplicates_removed = len(df_bio) - len(df_bio_agg)
     print(f"    Records before: {len(df_bio):,}")
@@ -670,10 +337,10 @@ def merge_datasets(df_enrollment, df_biometric, df_demographic):
         print(f"    Duplicates removed: {duplicates_removed:,}")
     
     print("\n  Step 3: Aggregating demographic data (removing duplicates)...")
-    df_demo_agg = df_demo.groupby(['date', 'state', 'district', 'pincode']).agg({
+    df_demo_agg = aggregate(df_demo, ['date', 'state', 'district', 'pincode'], {
         'demo_age_5_17': 'sum',
         'demo_age_17_': 'sum'
-    }).reset_index()
+    })
     
     duplicates_removed = len(df_demo) - len(df_demo_agg)
     print(f"    Records before: {len(df_demo):,}")
@@ -681,6 +348,24 @@ def merge_datasets(df_enrollment, df_biometric, df_demographic):
     if duplicates_removed > 0:
         print(f"    Duplicates removed: {duplicates_removed:,}")
     
+    return merge_aggregated(df_enroll_agg, df_bio_agg, df_demo_agg)
+
+
+@instrument
+def merge_aggregated(df_enroll_agg, df_bio_agg, df_demo_agg):
+    """
+    Outer-merge the per-key aggregated datasets, add totals and verify them
+    
+    Parameters:
+    -----------
+    df_enroll_agg, df_bio_agg, df_demo_agg : pd.DataFrame
+        Datasets already summed per (date, state, district, pincode)
+    
+    Returns:
+    --------
+    pd.DataFrame
+        Merged dataset with correct totals
+    """
     # ========================================================================
     # Step 4: Merge the AGGREGATED datasets
     # Using outer join to capture all (date, state, district, pincode) combinations
@@ -711,6 +396,8 @@ def merge_datasets(df_enrollment, df_biometric, df_demographic):
     # Fill NaN values with 0 (for outer join non-matches)
     numeric_columns = df_merged.select_dtypes(include=[np.number]).columns
     df_merged[numeric_columns] = df_merged[numeric_columns].fillna(0)
+    # Back to int32 counts (the outer joins made them float) before the totals
+    df_merged = enforce_schema(df_merged, 'merged')
     
     # ========================================================================
     # Step 5: Calculate totals AFTER merge (from raw columns only)
@@ -741,12 +428,30 @@ def merge_datasets(df_enrollment, df_biometric, df_demographic):
     )
     
     # Calculate UE Ratio
-    df_merged['ue_ratio'] = np.where(
-        df_merged['total_enrollment'] > 0,
-        df_merged['total_updates'] / df_merged['total_enrollment'],
-        0
+    df_merged['ue_ratio'] = calculate_ue_ratios(
+        df_merged['total_updates'], df_merged['total_enrollment']
     )
     
+    verify_totals(df_merged)
+    
+    print(f"\n  ✓ Merged dataset created successfully!")
+    print(f"  Final records: {len(df_merged):,}")
+    print(f"  Final columns: {df_merged.shape[1]}")
+    print("="*60)
+    
+    return df_merged
+
+
+@instrument
+def verify_totals(df_merged):
+    """
+    Compare merged totals against the ground truth from the individual clean files
+    
+    Returns:
+    --------
+    bool
+        True if every total matches
+    """
     # ========================================================================
     # Step 6: Verification - Print totals and compare against ground truth
     # ========================================================================
@@ -800,14 +505,10 @@ def merge_datasets(df_enrollment, df_biometric, df_demographic):
         print(f"\n  ⚠️  WARNING: Some totals do not match ground truth!")
         print(f"     Please review the aggregation logic.")
     
-    print(f"\n  ✓ Merged dataset created successfully!")
-    print(f"  Final records: {len(df_merged):,}")
-    print(f"  Final columns: {df_merged.shape[1]}")
-    print("="*60)
-    
-    return df_merged
+    return all_match
 
 
+@instrument
 def save_cleaned_data(df_enrollment, df_biometric, df_demographic, df_merged):
     """
     Save cleaned datasets to processed data directory
@@ -815,23 +516,28 @@ def save_cleaned_data(df_enrollment, df_biometric, df_demographic, df_merged):
     print(f"\n💾 Saving cleaned datasets...")
     print("="*60)
     
+    manifest = DataManifest()
+    
     # Save individual cleaned datasets
     df_enrollment.to_csv(
         os.path.join(PROCESSED_DATA_DIR, 'enrollment_clean.csv'),
         index=False
     )
+    manifest.record('processed', os.path.join(PROCESSED_DATA_DIR, 'enrollment_clean.csv'), df_enrollment)
     print(f"  ✓ Saved: enrollment_clean.csv")
     
     df_biometric.to_csv(
         os.path.join(PROCESSED_DATA_DIR, 'biometric_clean.csv'),
         index=False
     )
+    manifest.record('processed', os.path.join(PROCESSED_DATA_DIR, 'biometric_clean.csv'), df_biometric)
     print(f"  ✓ Saved: biometric_clean.csv")
     
     df_demographic.to_csv(
         os.path.join(PROCESSED_DATA_DIR, 'demographic_clean.csv'),
         index=False
     )
+    manifest.record('processed', os.path.join(PROCESSED_DATA_DIR, 'demographic_clean.csv'), df_demographic)
     print(f"  ✓ Saved: demographic_clean.csv")
     
     # Save merged dataset
@@ -839,8 +545,22 @@ def save_cleaned_data(df_enrollment, df_biometric, df_demographic, df_merged):
         os.path.join(PROCESSED_DATA_DIR, 'merged_data.csv'),
         index=False
     )
+    manifest.record('processed', os.path.join(PROCESSED_DATA_DIR, 'merged_data.csv'), df_merged)
     print(f"  ✓ Saved: merged_data.csv ({len(df_merged):,} records)")
     
+    if COLUMN_STORE_ENABLED:
+        merged_path = os.path.join(PROCESSED_DATA_DIR, 'merged_data.csv')
+        write_store(df_merged, store_path(merged_path), source=merged_path)
+        print(f"  ✓ Saved: {os.path.basename(store_path(merged_path))}/ (memory-mapped columns)")
+
+    if LAKE_ENABLED:
+        merged_path = os.path.join(PROCESSED_DATA_DIR, 'merged_data.csv')
+        lake = write_lake(df_merged, source=merged_path)
+        print(f"  ✓ Saved: {os.path.basename(LAKE_DIR)}/ ({len(lake['partitions'])} partitions)")
+    
+    manifest.save()
+    print(f"  ✓ Updated: {os.path.basename(manifest.path)}")
+    
     # Save a summary report
     with open(os.path.join(PROCESSED_DATA_DIR, 'data_cleaning_report.txt'), 'w') as f:
         f.write("="*60 + "\n")
@@ -879,38 +599,58 @@ def save_cleaned_data(df_enrollment, df_biometric, df_demographic, df_merged):
     print(f"  ✓ Saved: data_cleaning_report.txt")
 
 
-def main():
+@instrument
+def main(engine=None):
     """
     Main data cleaning workflow
     INCLUDES COMPREHENSIVE STATE STANDARDIZATION (replaces quickfix.py)
+    
+    Parameters:
+    -----------
+    engine : str, optional
+        'pandas', 'fused' or 'polars' (default: CLEANING_ENGINE)
     """
     print("\n" + "="*60)
     print("AADHAAR DATA CLEANING - STEP 2")
     print("Includes Comprehensive State Name Standardization")
     print("="*60)
     
-    # Step 1: Load datasets
-    df_enrollment, df_biometric, df_demographic = load_datasets()
-    
-    # Step 2: Standardize dates
-    df_enrollment = standardize_dates(df_enrollment, 'date')
-    df_biometric = standardize_dates(df_biometric, 'date')
-    df_demographic = standardize_dates(df_demographic, 'date')
-    
-    # Step 3: COMPREHENSIVE State name standardization (replaces quickfix.py)
-    print("\n" + "="*60)
-    print("COMPREHENSIVE STATE NAME STANDARDIZATION")
-    print("(Replaces need for separate quickfix.py)")
-    print("="*60)
-    df_enrollment = standardize_state_names(df_enrollment)
-    df_biometric = standardize_state_names(df_biometric)
-    df_demographic = standardize_state_names(df_demographic)
-
-
-    # Step 3.5: District standardization (NEW!)
-    df_enrollment = standardize_district_names(df_enrollment)
-    df_biometric = standardize_district_names(df_biometric)
-    df_demographic = standardize_district_names(df_demographic)
+    engine = engine or get_engine()
+    aggregated = None
+    
+    if engine == 'pandas':
+        # Step 1: Load datasets
+        df_enrollment, df_biometric, df_demographic = load_datasets()
+    
+        # Step 2: Standardize dates
+        df_enrollment = standardize_dates(df_enrollment, 'date')
+        df_biometric = standardize_dates(df_biometric, 'date')
+        df_demographic = standardize_dates(df_demographic, 'date')
+    
+        # Step 3: COMPREHENSIVE State name standardization (replaces quickfix.py)
+        print("\n" + "="*60)
+        print("COMPREHENSIVE STATE NAME STANDARDIZATION")
+        print("(Replaces need for separate quickfix.py)")
+        print("="*60)
+        df_enrollment = standardize_state_names(df_enrollment)
+        df_biometric = standardize_state_names(df_biometric)
+        df_demographic = standardize_state_names(df_demographic)
+
+        # Step 3.5: District standardization (NEW!)
+        df_enrollment = standardize_district_names(df_enrollment)
+        df_biometric = standardize_district_names(df_biometric)
+        df_demographic = standardize_district_names(df_demographic)
+
+        # Step 3.6: Compact dtypes (int32 counts, categorical geography)
+        df_enrollment = enforce_schema(df_enrollment, 'enrollment')
+        df_biometric = enforce_schema(df_biometric, 'biometric')
+        df_demographic = enforce_schema(df_demographic, 'demographic')
+    else:
+        # Steps 1-3.5 in a single pass per raw shard (utils/cleaning_engines.py)
+        clean, aggregated = run_cleaning(engine)
+        df_enrollment = clean['enrollment']
+        df_biometric = clean['biometric']
+        df_demographic = clean['demographic']
     
     # Step 4: Validate geography
     print("\nValidating Enrollment geography:")
@@ -924,7 +664,14 @@ def main():
     create_date_range_report(df_enrollment, df_biometric, df_demographic)
     
     # Step 6: Merge datasets
-    df_merged = merge_datasets(df_enrollment, df_biometric, df_demographic)
+    if aggregated is not None:
+        print(f"\n🔗 Merging pre-aggregated datasets...")
+        print("="*60)
+        df_merged = merge_aggregated(
+            aggregated['enrollment'], aggregated['biometric'], aggregated['demographic']
+        )
+    else:
+        df_merged = merge_datasets(df_enrollment, df_biometric, df_demographic)
     
     # Step 7: Save cleaned data
     save_cleaned_data(df_enrollment, df_biometric, df_demographic, df_merged)
@@ -953,4 +700,6 @@ def main():
 
 
 if __name__ == "__main__":
-    df_enrollment, df_biometric, df_demographic, df_merged = main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Clean and merge the raw UIDAI datasets")
+    parser.add_argument('--engine', choices=ENGINES, help="cleaning engine (default: CLEANING_ENGINE)")
+    df_enrollment, df_biometric, df_demographic, df_merged = main(engine=parser.parse_args().engine)
\ No newline at end of file
@@ -4,11 +4,11 @@ Analyze enrollment equity gaps at district level despite high national saturatio
 """
 
 import pandas as pd
-import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 import os
 import sys
+from functools import partial
 
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -18,14 +18,26 @@ from utils.config import (
     FIGURES_DIR,
     TABLES_DIR,
     NATIONAL_UE_RATIO,
-    HIGH_UE_RATIO,
-    LOW_UE_RATIO,
     NATIONAL_BIRTH_RATE,
     ANALYSIS_MONTHS,
     COLOR_SCHEME,
     FIG_SIZE_LARGE,
-    DPI
+    UE_CATEGORY_BANDS
 )
+from utils.indicators import calculate_ue_ratios, classify_ue_ratios
+from utils.figures import FigureSpec, render_figures, FIGURE_CONFIG
+from utils.artifact_cache import get_artifact_cache
+from utils.aggregation import aggregate
+from utils.partitioned import map_partitions
+from utils.lake import read_window, resolve_window
+from utils.cli import stage_parser, parse_window_args
+from utils.telemetry import instrument
+
+# Config that changes this stage's outputs (part of its cache keys)
+STAGE_CONFIG = [
+    'NATIONAL_UE_RATIO', 'HIGH_UE_RATIO', 'LOW_UE_RATIO', 'UE_CATEGORY_BANDS', 'NATIONAL_BIRTH_RATE',
+    'START_DATE', 'END_DATE', 'ANALYSIS_MONTHS', 'DATASET_SCHEMAS', 'COLOR_SCHEME', 'FIG_SIZE_LARGE'
+] + FIGURE_CONFIG
 
 # Set style
 sns.set_style("whitegrid")
@@ -33,16 +45,15 @@ plt.rcParams['figure.figsize'] = FIG_SIZE_LARGE
 plt.rcParams['font.size'] = 10
 
 
-def load_merged_data():
-    """Load the cleaned merged dataset"""
+@instrument
+def load_merged_data(start=None, end=None):
+    """Load the cleaned merged dataset (only the start-end window when given)"""
     print("\n" + "="*60)
     print("DIMENSION 1: COVERAGE GAP ANALYSIS")
     print("="*60)
     
-    df = pd.read_csv(os.path.join(PROCESSED_DATA_DIR, 'merged_data.csv'))
-    
-    # Parse date if not already
-    df['date'] = pd.to_datetime(df['date'])
+    # Memory-mapped column store, or just the window's month partitions
+    df = read_window(start, end)
     
     print(f"\n✓ Loaded merged dataset: {len(df):,} records")
     print(f"  Date range: {df['date'].min().date()} to {df['date'].max().date()}")
@@ -52,14 +63,12 @@ def load_merged_data():
     return df
 
 
-def calculate_district_metrics(df):
+def aggregate_district_metrics(df, months=ANALYSIS_MONTHS):
     """
-    Calculate key metrics at district level
+    District sums, UE ratio and velocities (per state partition)
     """
-    print(f"\n📊 Calculating district-level metrics...")
-    
     # Aggregate by district (sum across all dates)
-    district_agg = df.groupby(['state', 'district']).agg({
+    district_agg = aggregate(df, ['state', 'district'], {
         'total_enrollment': 'sum',
         'total_updates': 'sum',
         'age_0_5': 'sum',
@@ -67,20 +76,33 @@ def calculate_district_metrics(df):
         'age_18_greater': 'sum',
         'bio_age_5_17': 'sum',
         'bio_age_17_': 'sum'
-    }).reset_index()
+    })
     
     # Calculate UE Ratio
-    district_agg['ue_ratio'] = np.where(
-        district_agg['total_enrollment'] > 0,
-        district_agg['total_updates'] / district_agg['total_enrollment'],
-        0
+    district_agg['ue_ratio'] = calculate_ue_ratios(
+        district_agg['total_updates'], district_agg['total_enrollment']
     )
     
     # Calculate enrollment velocity (enrollments per month)
-    district_agg['enrollment_velocity'] = district_agg['total_enrollment'] / ANALYSIS_MONTHS
+    district_agg['enrollment_velocity'] = district_agg['total_enrollment'] / months
     
     # Calculate update velocity
-    district_agg['update_velocity'] = district_agg['total_updates'] / ANALYSIS_MONTHS
+    district_agg['update_velocity'] = district_agg['total_updates'] / months
+    
+    return district_agg
+
+
+@instrument
+def calculate_district_metrics(df, months=ANALYSIS_MONTHS):
+    """
+    Calculate key metrics at district level (velocities per month of the window)
+    """
+    print(f"\n📊 Calculating district-level metrics...")
+    
+    # Districts never cross states, so each state is aggregated independently
+    district_agg = map_partitions(
+        partial(aggregate_district_metrics, months=months), df, ['state', 'district']
+    )
     
     print(f"  ✓ Calculated metrics for {len(district_agg)} districts")
     print(f"\n  District-level statistics:")
@@ -92,6 +114,7 @@ def calculate_district_metrics(df):
     return district_agg
 
 
+@instrument
 def classify_districts_2x2(district_agg):
     """
     Classify districts into 2x2 matrix based on enrollment and update activity
@@ -132,6 +155,7 @@ def classify_districts_2x2(district_agg):
     return district_agg
 
 
+@instrument
 def identify_child_coverage_gaps(district_agg):
     """
     Identify districts with low child (0-5 and 5-17) enrollment
@@ -202,6 +226,7 @@ def identify_child_coverage_gaps(district_agg):
     return district_agg, low_child_districts
 
 
+@instrument
 def calculate_ue_ratio_statistics(district_agg):
     """
     Calculate UE Ratio statistics and identify anomalies
@@ -222,11 +247,7 @@ def calculate_ue_ratio_statistics(district_agg):
     print(f"  National baseline (config): {NATIONAL_UE_RATIO}")
     
     # Classify UE ratios
-    district_agg['ue_category'] = pd.cut(
-        district_agg['ue_ratio'],
-        bins=[0, LOW_UE_RATIO, NATIONAL_UE_RATIO, HIGH_UE_RATIO, float('inf')],
-        labels=['Low', 'Normal', 'High', 'Very High']
-    )
+    district_agg['ue_category'] = classify_ue_ratios(district_agg['ue_ratio'], bands=UE_CATEGORY_BANDS)
     
     ue_dist = district_agg['ue_category'].value_counts()
     print(f"\n  UE Ratio distribution:")
@@ -237,15 +258,9 @@ def calculate_ue_ratio_statistics(district_agg):
     return district_agg
 
 
-def create_visualizations(district_agg, low_child_districts):
-    """
-    Create visualizations for Dimension 1
-    """
-    print(f"\n📊 Creating visualizations...")
-    
-    # 1. UE Ratio Distribution Histogram
+def plot_ue_ratio_distribution(ue_data):
+    """UE Ratio Distribution Histogram"""
     plt.figure(figsize=(12, 6))
-    ue_data = district_agg[district_agg['ue_ratio'] > 0]['ue_ratio']
     plt.hist(ue_data, bins=50, color=COLOR_SCHEME['neutral'], alpha=0.7, edgecolor='black')
     plt.axvline(NATIONAL_UE_RATIO, color=COLOR_SCHEME['high'], 
                 linestyle='--', linewidth=2, label=f'National Baseline ({NATIONAL_UE_RATIO})')
@@ -256,11 +271,10 @@ def create_visualizations(district_agg, low_child_districts):
     plt.title('Distribution of District-Level UE Ratios', fontsize=14, fontweight='bold')
     plt.legend()
     plt.tight_layout()
-    plt.savefig(os.path.join(FIGURES_DIR, 'dim1_ue_ratio_distribution.png'), dpi=DPI)
-    plt.close()
-    print(f"  ✓ Saved: dim1_ue_ratio_distribution.png")
-    
-    # 2. 2x2 Matrix Scatter Plot
+
+
+def plot_2x2_matrix(districts):
+    """2x2 Matrix Scatter Plot"""
     plt.figure(figsize=(12, 8))
     colors = {
         'Healthy & Growing': COLOR_SCHEME['low'],
@@ -270,7 +284,7 @@ def create_visualizations(district_agg, low_child_districts):
     }
     
     for quadrant, color in colors.items():
-        subset = district_agg[district_agg['quadrant'] == quadrant]
+        subset = districts[districts['quadrant'] == quadrant]
         plt.scatter(subset['total_enrollment'], subset['total_updates'], 
                    c=color, label=quadrant, alpha=0.6, s=50)
     
@@ -283,31 +297,83 @@ def create_visualizations(district_agg, low_child_districts):
     plt.yscale('log')
     plt.grid(True, alpha=0.3)
     plt.tight_layout()
-    plt.savefig(os.path.join(FIGURES_DIR, 'dim1_2x2_matrix.png'), dpi=DPI)
-    plt.close()
-    print(f"  ✓ Saved: dim1_2x2_matrix.png")
+
+
+def plot_low_child_enrollment(top_20_low_child):
+    """Top 20 Districts with Lowest Child Enrollment %"""
+    plt.figure(figsize=(14, 8))
+    
+    y_positions = range(len(top_20_low_child))
+    plt.barh(y_positions, top_20_low_child['child_total_pct'], 
+             color=COLOR_SCHEME['critical'], alpha=0.7)
+    plt.yticks(y_positions, 
+               [f"{row['district']}, {row['state']}" for _, row in top_20_low_child.iterrows()],
+               fontsize=9)
+    plt.xlabel('Child Enrollment % (Age 0-17)', fontsize=12)
+    plt.title('Top 20 Districts with Lowest Child Enrollment Percentage', 
+              fontsize=14, fontweight='bold')
+    plt.axvline(80, color='black', linestyle='--', linewidth=1, label='Threshold (80%)')
+    plt.axvline(96.9, color='green', linestyle='--', linewidth=1, label='National Avg (96.9%)')
+    plt.legend()
+    plt.tight_layout()
+
+
+def plot_very_high_child_enrollment(very_high_child):
+    """Districts with VERY HIGH Child Enrollment (>98%)"""
+    plt.figure(figsize=(14, 8))
+    y_positions = range(len(very_high_child))
+    plt.barh(y_positions, very_high_child['child_total_pct'], 
+             color=COLOR_SCHEME['low'], alpha=0.7)
+    plt.yticks(y_positions, 
+               [f"{row['district']}, {row['state']}" for _, row in very_high_child.iterrows()],
+               fontsize=9)
+    plt.xlabel('Child Enrollment % (Age 0-17)', fontsize=12)
+    plt.title('Top 20 Districts with Highest Child Enrollment % (>98%)', 
+              fontsize=14, fontweight='bold')
+    plt.axvline(98, color='black', linestyle='--', linewidth=1, label='Very High Threshold (98%)')
+    plt.axvline(96.9, color='orange', linestyle='--', linewidth=1, label='National Avg (96.9%)')
+    plt.legend()
+    plt.tight_layout()
+
+
+def plot_state_ue_ratios(state_agg):
+    """State-level aggregation - UE Ratio by State"""
+    plt.figure(figsize=(14, 8))
+    plt.barh(range(len(state_agg)), state_agg['ue_ratio'], 
+             color=COLOR_SCHEME['neutral'], alpha=0.7)
+    plt.yticks(range(len(state_agg)), state_agg['state'], fontsize=10)
+    plt.xlabel('Average UE Ratio', fontsize=12)
+    plt.title('Top 20 States by Average UE Ratio', fontsize=14, fontweight='bold')
+    plt.axvline(NATIONAL_UE_RATIO, color=COLOR_SCHEME['high'], 
+                linestyle='--', linewidth=2, label=f'National Baseline ({NATIONAL_UE_RATIO})')
+    plt.legend()
+    plt.tight_layout()
+
+
+@instrument
+def create_visualizations(district_agg, low_child_districts):
+    """
+    Create visualizations for Dimension 1
+    Each figure is collected as a spec and rendered in parallel
+    """
+    print(f"\n📊 Creating visualizations...")
+    
+    specs = []
+    
+    # 1. UE Ratio Distribution Histogram
+    ue_data = district_agg[district_agg['ue_ratio'] > 0]['ue_ratio']
+    specs.append(FigureSpec('dim1_ue_ratio_distribution.png', plot_ue_ratio_distribution,
+                            ue_data=ue_data))
+    
+    # 2. 2x2 Matrix Scatter Plot
+    specs.append(FigureSpec('dim1_2x2_matrix.png', plot_2x2_matrix,
+                            districts=district_agg[['quadrant', 'total_enrollment', 'total_updates']]))
     
     # 3. Top 20 Districts with Lowest Child Enrollment %
     if len(low_child_districts) > 0:
-        plt.figure(figsize=(14, 8))
-        top_20_low_child = low_child_districts.head(20)
-        
-        y_positions = range(len(top_20_low_child))
-        plt.barh(y_positions, top_20_low_child['child_total_pct'], 
-                 color=COLOR_SCHEME['critical'], alpha=0.7)
-        plt.yticks(y_positions, 
-                   [f"{row['district']}, {row['state']}" for _, row in top_20_low_child.iterrows()],
-                   fontsize=9)
-        plt.xlabel('Child Enrollment % (Age 0-17)', fontsize=12)
-        plt.title('Top 20 Districts with Lowest Child Enrollment Percentage', 
-                  fontsize=14, fontweight='bold')
-        plt.axvline(80, color='black', linestyle='--', linewidth=1, label='Threshold (80%)')
-        plt.axvline(96.9, color='green', linestyle='--', linewidth=1, label='National Avg (96.9%)')
-        plt.legend()
-        plt.tight_layout()
-        plt.savefig(os.path.join(FIGURES_DIR, 'dim1_low_child_enrollment.png'), dpi=DPI)
-        plt.close()
-        print(f"  ✓ Saved: dim1_low_child_enrollment.png")
+        top_20_low_child = low_child_districts.head(20)[['state', 'district', 'child_total_pct']]
+        specs.append(FigureSpec('dim1_low_child_enrollment.png', plot_low_child_enrollment,
+                                top_20_low_child=top_20_low_child))
     else:
         print(f"  ⚠️  No districts with low child enrollment (<80%) - skipping chart")
     
@@ -315,52 +381,29 @@ def create_visualizations(district_agg, low_child_districts):
     very_high_child = district_agg[district_agg['child_total_pct'] > 98].nlargest(20, 'child_total_pct')
     
     if len(very_high_child) > 0:
-        plt.figure(figsize=(14, 8))
-        y_positions = range(len(very_high_child))
-        plt.barh(y_positions, very_high_child['child_total_pct'], 
-                 color=COLOR_SCHEME['low'], alpha=0.7)
-        plt.yticks(y_positions, 
-                   [f"{row['district']}, {row['state']}" for _, row in very_high_child.iterrows()],
-                   fontsize=9)
-        plt.xlabel('Child Enrollment % (Age 0-17)', fontsize=12)
-        plt.title('Top 20 Districts with Highest Child Enrollment % (>98%)', 
-                  fontsize=14, fontweight='bold')
-        plt.axvline(98, color='black', linestyle='--', linewidth=1, label='Very High Threshold (98%)')
-        plt.axvline(96.9, color='orange', linestyle='--', linewidth=1, label='National Avg (96.9%)')
-        plt.legend()
-        plt.tight_layout()
-        plt.savefig(os.path.join(FIGURES_DIR, 'dim1_very_high_child_enrollment.png'), dpi=DPI)
-        plt.close()
-        print(f"  ✓ Saved: dim1_very_high_child_enrollment.png")
+        specs.append(FigureSpec('dim1_very_high_child_enrollment.png', plot_very_high_child_enrollment,
+                                very_high_child=very_high_child[['state', 'district', 'child_total_pct']]))
     
     # 4. State-level aggregation - UE Ratio by State
-    state_agg = district_agg.groupby('state').agg({
+    state_agg = district_agg.groupby('state', observed=True).agg({
         'total_enrollment': 'sum',
         'total_updates': 'sum',
         'ue_ratio': 'mean'
     }).reset_index()
     state_agg = state_agg.sort_values('ue_ratio', ascending=False).head(20)
+    specs.append(FigureSpec('dim1_state_ue_ratios.png', plot_state_ue_ratios,
+                            state_agg=state_agg[['state', 'ue_ratio']]))
     
-    plt.figure(figsize=(14, 8))
-    plt.barh(range(len(state_agg)), state_agg['ue_ratio'], 
-             color=COLOR_SCHEME['neutral'], alpha=0.7)
-    plt.yticks(range(len(state_agg)), state_agg['state'], fontsize=10)
-    plt.xlabel('Average UE Ratio', fontsize=12)
-    plt.title('Top 20 States by Average UE Ratio', fontsize=14, fontweight='bold')
-    plt.axvline(NATIONAL_UE_RATIO, color=COLOR_SCHEME['high'], 
-                linestyle='--', linewidth=2, label=f'National Baseline ({NATIONAL_UE_RATIO})')
-    plt.legend()
-    plt.tight_layout()
-    plt.savefig(os.path.join(FIGURES_DIR, 'dim1_state_ue_ratios.png'), dpi=DPI)
-    plt.close()
-    print(f"  ✓ Saved: dim1_state_ue_ratios.png")
+    render_figures(specs, group='dim1')
 
 
+@instrument
 def generate_priority_lists(district_agg, low_child_districts):
     """
     Generate priority lists for enrollment drives
     """
     print(f"\n📋 Generating priority lists...")
+    artifacts = get_artifact_cache('dim1')
     
     # Priority List 1: Saturation/Coverage Gap districts
     coverage_gap = district_agg[
@@ -368,12 +411,12 @@ def generate_priority_lists(district_agg, low_child_districts):
     ].sort_values('ue_ratio', ascending=False)
     
     coverage_gap_file = os.path.join(TABLES_DIR, 'dim1_coverage_gap_districts.csv')
-    coverage_gap.to_csv(coverage_gap_file, index=False)
+    artifacts.write_csv(coverage_gap, coverage_gap_file, index=False)
     print(f"  ✓ Saved: dim1_coverage_gap_districts.csv ({len(coverage_gap)} districts)")
     
     # Priority List 2: Low child enrollment districts
     low_child_file = os.path.join(TABLES_DIR, 'dim1_low_child_enrollment_districts.csv')
-    low_child_districts.to_csv(low_child_file, index=False)
+    artifacts.write_csv(low_child_districts, low_child_file, index=False)
     print(f"  ✓ Saved: dim1_low_child_enrollment_districts.csv ({len(low_child_districts)} districts)")
     
     # Priority List 3: Crisis Zone districts (all)
@@ -382,22 +425,29 @@ def generate_priority_lists(district_agg, low_child_districts):
     ].sort_values('total_enrollment')
     
     crisis_file = os.path.join(TABLES_DIR, 'dim1_crisis_zone_districts.csv')
-    crisis_zone.to_csv(crisis_file, index=False)
+    artifacts.write_csv(crisis_zone, crisis_file, index=False)
     print(f"  ✓ Saved: dim1_crisis_zone_districts.csv ({len(crisis_zone)} districts)")
     
     # Priority List 4: Top 10 Crisis Zone districts (NEW)
     top_10_crisis = crisis_zone.head(10)
     
     top_10_crisis_file = os.path.join(TABLES_DIR, 'dim1_top10_crisis_zone_districts.csv')
-    top_10_crisis.to_csv(top_10_crisis_file, index=False)
+    artifacts.write_csv(top_10_crisis, top_10_crisis_file, index=False)
     print(f"  ✓ Saved: dim1_top10_crisis_zone_districts.csv (Top 10 most critical)")
     
+    # All districts (lookup table for metrics_service.py)
+    metrics_file = os.path.join(TABLES_DIR, 'dim1_district_metrics.csv')
+    artifacts.write_csv(district_agg.sort_values(['state', 'district']), metrics_file, index=False)
+    print(f"  ✓ Saved: dim1_district_metrics.csv ({len(district_agg)} districts)")
+    
     # Summary statistics
     summary = {
         'Total Districts Analyzed': len(district_agg),
         'Coverage Gap Districts': len(coverage_gap),
         'Low Child Enrollment Districts': len(low_child_districts),
         'Crisis Zone Districts': len(crisis_zone),
+        'Healthy & Growing Districts': int((district_agg['quadrant'] == 'Healthy & Growing').sum()),
+        'New Users Need Engagement Districts': int((district_agg['quadrant'] == 'New Users Need Engagement').sum()),
         'Top 10 Crisis Zone Districts': len(top_10_crisis),
         'Average UE Ratio': district_agg['ue_ratio'].mean(),
         'Median UE Ratio': district_agg['ue_ratio'].median()
@@ -405,15 +455,18 @@ def generate_priority_lists(district_agg, low_child_districts):
     
     summary_df = pd.DataFrame([summary])
     summary_file = os.path.join(TABLES_DIR, 'dim1_summary_statistics.csv')
-    summary_df.to_csv(summary_file, index=False)
+    artifacts.write_csv(summary_df, summary_file, index=False)
     print(f"  ✓ Saved: dim1_summary_statistics.csv")
     
     return coverage_gap, low_child_districts, crisis_zone
 
 
-def main():
+@instrument
+def main(force=False, df=None, start=None, end=None):
     """
     Main function for Dimension 1 analysis
+    (pass df to reuse merged data already in memory, e.g. from run_dimensions.py;
+    start/end restrict the analysis to a date window)
     """
     print("\n" + "="*60)
     print("DIMENSION 1: COVERAGE GAP (UPDATE PARADOX)")
@@ -422,11 +475,24 @@ def main():
     print("   Despite high national saturation, which districts are missing")
     print("   new enrollments (especially children)?")
     
+    # Skip the whole stage when merged data, config and code are all unchanged
+    start, end, months = resolve_window(start, end)
+    window = {'start': str(start), 'end': str(end)} if start is not None else None
+    artifacts = get_artifact_cache('dim1', script_path=os.path.abspath(__file__),
+                                   config_names=STAGE_CONFIG)
+    stage_key = artifacts.stage_key(os.path.join(PROCESSED_DATA_DIR, 'merged_data.csv'), params=window)
+    if not force and artifacts.stage_is_fresh(stage_key):
+        print("\n✓ Outputs up to date (merged data, config and code unchanged) - skipping")
+        print("  Run with --force to recompute")
+        return None, None, None, None
+    artifacts.begin_stage()
+    
     # Load data
-    df = load_merged_data()
+    if df is None:
+        df = load_merged_data(start, end)
     
     # Calculate district metrics
-    district_agg = calculate_district_metrics(df)
+    district_agg = calculate_district_metrics(df, months)
     
     # Classify into 2x2 matrix
     district_agg = classify_districts_2x2(district_agg)
@@ -464,8 +530,13 @@ def main():
     print("Next step: Run 04_dimension2_readiness_gap.py")
     print("="*60)
     
+    artifacts.complete_stage(stage_key)
+    
     return district_agg, coverage_gap, low_child_districts, crisis_zone
 
 
 if __name__ == "__main__":
-    district_agg, coverage_gap, low_child_districts, crisis_zone = main()
\ No newline at end of file
+    args = parse_window_args(stage_parser("Dimension 1: coverage gaps"))
+    district_agg, coverage_gap, low_child_districts, crisis_zone = main(
+        force=args.force, start=args.start, end=args.end
+    )
\ No newline at end of file
@@ -23,9 +23,23 @@ from utils.config import (
     CRITICAL_READINESS,
     COLOR_SCHEME,
     FIG_SIZE_LARGE,
-    DPI,
-    ANALYSIS_MONTHS
+    ANALYSIS_MONTHS,
+    READINESS_CATEGORY_BANDS
 )
+from utils.indicators import calculate_transition_readiness_scores, classify_readiness_scores
+from utils.figures import FigureSpec, render_figures, FIGURE_CONFIG
+from utils.artifact_cache import get_artifact_cache
+from utils.aggregation import aggregate
+from utils.partitioned import map_partitions
+from utils.lake import read_window, resolve_window
+from utils.cli import stage_parser, parse_window_args
+from utils.telemetry import instrument
+
+# Config that changes this stage's outputs (part of its cache keys)
+STAGE_CONFIG = [
+    'GOOD_READINESS', 'MODERATE_READINESS', 'CRITICAL_READINESS', 'READINESS_CATEGORY_BANDS',
+    'START_DATE', 'END_DATE', 'ANALYSIS_MONTHS', 'DATASET_SCHEMAS', 'COLOR_SCHEME', 'FIG_SIZE_LARGE'
+] + FIGURE_CONFIG
 
 # Set style
 sns.set_style("whitegrid")
@@ -33,14 +47,15 @@ plt.rcParams['figure.figsize'] = FIG_SIZE_LARGE
 plt.rcParams['font.size'] = 10
 
 
-def load_merged_data():
-    """Load the cleaned merged dataset"""
+@instrument
+def load_merged_data(start=None, end=None):
+    """Load the cleaned merged dataset (only the start-end window when given)"""
     print("\n" + "="*60)
     print("DIMENSION 2: READINESS GAP ANALYSIS")
     print("="*60)
     
-    df = pd.read_csv(os.path.join(PROCESSED_DATA_DIR, 'merged_data.csv'))
-    df['date'] = pd.to_datetime(df['date'])
+    # Memory-mapped column store, or just the window's month partitions
+    df = read_window(start, end)
     
     print(f"\n✓ Loaded merged dataset: {len(df):,} records")
     print(f"  Date range: {df['date'].min().date()} to {df['date'].max().date()}")
@@ -48,20 +63,18 @@ def load_merged_data():
     return df
 
 
-def calculate_district_readiness(df):
+def aggregate_district_readiness(df):
     """
-    Calculate transition readiness scores at district level
+    District sums, readiness scores and categories (per state partition)
     """
-    print(f"\n📊 Calculating district-level readiness metrics...")
-    
     # Aggregate by district
-    district_agg = df.groupby(['state', 'district']).agg({
+    district_agg = aggregate(df, ['state', 'district'], {
         'bio_age_5_17': 'sum',
         'bio_age_17_': 'sum',
         'age_5_17': 'sum',  # Total enrollments in 5-17 age group
         'age_0_5': 'sum',
         'age_18_greater': 'sum'
-    }).reset_index()
+    })
     
     # Calculate total biometric updates
     district_agg['total_bio_updates'] = (
@@ -77,30 +90,30 @@ def calculate_district_readiness(df):
     
     # Transition Readiness Score: What % of bio updates are from youth (5-17)?
     # High score = good (youth are updating their biometrics)
-    district_agg['readiness_score'] = np.where(
-        district_agg['total_bio_updates'] > 0,
-        (district_agg['bio_age_5_17'] / district_agg['total_bio_updates']) * 100,
-        0
+    district_agg['readiness_score'] = calculate_transition_readiness_scores(
+        district_agg['bio_age_5_17'], district_agg['total_bio_updates']
     )
     
     
     
     
-    # Classify readiness
-    # Handle case where MODERATE_READINESS == CRITICAL_READINESS
-    if MODERATE_READINESS == CRITICAL_READINESS:
-        # Use only 3 categories instead of 4
-        district_agg['readiness_category'] = pd.cut(
-            district_agg['readiness_score'],
-            bins=[0, CRITICAL_READINESS, GOOD_READINESS, 100],
-            labels=['Critical', 'Moderate', 'Good']
-        )
-    else:
-        district_agg['readiness_category'] = pd.cut(
-            district_agg['readiness_score'],
-            bins=[0, CRITICAL_READINESS, MODERATE_READINESS, GOOD_READINESS, 100],
-            labels=['Critical', 'Low', 'Moderate', 'Good']
-        )
+    # Classify readiness (3 bands instead of 4 when MODERATE_READINESS == CRITICAL_READINESS)
+    district_agg['readiness_category'] = classify_readiness_scores(
+        district_agg['readiness_score'], bands=READINESS_CATEGORY_BANDS
+    )
+    
+    return district_agg
+
+
+@instrument
+def calculate_district_readiness(df):
+    """
+    Calculate transition readiness scores at district level
+    """
+    print(f"\n📊 Calculating district-level readiness metrics...")
+    
+    # Districts never cross states, so each state is scored independently
+    district_agg = map_partitions(aggregate_district_readiness, df, ['state', 'district'])
     
     print(f"  ✓ Calculated readiness for {len(district_agg)} districts")
     print(f"\n  National Statistics:")
@@ -125,23 +138,25 @@ def calculate_district_readiness(df):
     return district_agg
 
 
+@instrument
 def calculate_state_readiness(district_agg):
     """
     Calculate readiness at state level
     """
     print(f"\n🗺️  Calculating state-level readiness...")
     
-    state_agg = district_agg.groupby('state').agg({
+    state_agg = district_agg.groupby('state', observed=True).agg({
         'bio_age_5_17': 'sum',
         'bio_age_17_': 'sum',
         'total_bio_updates': 'sum',
         'age_5_17': 'sum'
     }).reset_index()
     
-    # Calculate state readiness score
-    state_agg['readiness_score'] = (
-        state_agg['bio_age_5_17'] / state_agg['total_bio_updates']
-    ) * 100
+    # Calculate state readiness score (0 for a state without biometric updates,
+    # as for districts, where it used to be NaN)
+    state_agg['readiness_score'] = calculate_transition_readiness_scores(
+        state_agg['bio_age_5_17'], state_agg['total_bio_updates']
+    )
     
     
     
@@ -160,6 +175,7 @@ def calculate_state_readiness(district_agg):
     return state_agg
 
 
+@instrument
 def predict_authentication_failures(district_agg):
     """
     Identify at-risk districts based on readiness scores
@@ -222,15 +238,9 @@ def predict_authentication_failures(district_agg):
     return district_agg, total_at_risk, high_risk_districts
 
 
-def create_visualizations(district_agg, state_agg, high_risk_districts):
-    """
-    Create visualizations for Dimension 2
-    """
-    print(f"\n📊 Creating visualizations...")
-    
-    # 1. Readiness Score Distribution
+def plot_readiness_distribution(readiness_data):
+    """Readiness Score Distribution"""
     plt.figure(figsize=(12, 6))
-    readiness_data = district_agg[district_agg['readiness_score'] > 0]['readiness_score']
     
     plt.hist(readiness_data, bins=50, color=COLOR_SCHEME['neutral'], alpha=0.7, edgecolor='black')
     plt.axvline(GOOD_READINESS, color=COLOR_SCHEME['low'], 
@@ -249,13 +259,11 @@ def create_visualizations(district_agg, state_agg, high_risk_districts):
     plt.legend()
     plt.grid(True, alpha=0.3)
     plt.tight_layout()
-    plt.savefig(os.path.join(FIGURES_DIR, 'dim2_readiness_distribution.png'), dpi=DPI)
-    plt.close()
-    print(f"  ✓ Saved: dim2_readiness_distribution.png")
-    
-    # 2. State-Level Readiness (Top 20)
+
+
+def plot_state_readiness(top_20_states):
+    """State-Level Readiness (Top 20)"""
     plt.figure(figsize=(14, 8))
-    top_20_states = state_agg.head(20)
     
     colors = [COLOR_SCHEME['low'] if score >= GOOD_READINESS 
               else COLOR_SCHEME['moderate'] if score >= MODERATE_READINESS 
@@ -273,13 +281,11 @@ def create_visualizations(district_agg, state_agg, high_risk_districts):
                 linewidth=1, label=f'Good Threshold ({GOOD_READINESS}%)')
     plt.legend()
     plt.tight_layout()
-    plt.savefig(os.path.join(FIGURES_DIR, 'dim2_state_readiness.png'), dpi=DPI)
-    plt.close()
-    print(f"  ✓ Saved: dim2_state_readiness.png")
-    
-    # 3. Readiness Category Pie Chart
+
+
+def plot_readiness_categories(readiness_counts):
+    """Readiness Category Pie Chart"""
     plt.figure(figsize=(10, 8))
-    readiness_counts = district_agg['readiness_category'].value_counts()
     
     colors_pie = {
         'Good': COLOR_SCHEME['low'],
@@ -293,37 +299,27 @@ def create_visualizations(district_agg, state_agg, high_risk_districts):
             autopct='%1.1f%%', colors=colors_list, startangle=90)
     plt.title('Districts by Readiness Category', fontsize=14, fontweight='bold')
     plt.tight_layout()
-    plt.savefig(os.path.join(FIGURES_DIR, 'dim2_readiness_categories.png'), dpi=DPI)
-    plt.close()
-    print(f"  ✓ Saved: dim2_readiness_categories.png")
+
+
+def plot_high_risk_districts(top_20_risk):
+    """High-Risk Districts (Top 20 by at-risk youth)"""
+    plt.figure(figsize=(14, 8))
     
-    # 4. High-Risk Districts (Top 20 by at-risk youth)
-    if len(high_risk_districts) > 0:
-        plt.figure(figsize=(14, 8))
-        top_20_risk = high_risk_districts.head(20)
-        
-        plt.barh(range(len(top_20_risk)), top_20_risk['estimated_at_risk_youth'],  # ← NEW
-                 color=COLOR_SCHEME['critical'], alpha=0.7)
-        plt.yticks(range(len(top_20_risk)), 
-                   [f"{row['district']}, {row['state']}" for _, row in top_20_risk.iterrows()],
-                   fontsize=9)
-        plt.xlabel('Estimated At-Risk Youth', fontsize=12)  # ← UPDATED
-        plt.title('Top 20 High-Risk Districts by Estimated At-Risk Youth',  # ← UPDATED
-                  fontsize=14, fontweight='bold')
-        plt.tight_layout()
-        plt.savefig(os.path.join(FIGURES_DIR, 'dim2_high_risk_districts.png'), dpi=DPI)
-        plt.close()
-        print(f"  ✓ Saved: dim2_high_risk_districts.png")
-    
-    # 5. Readiness Score vs Youth Update Rate Scatter
+    plt.barh(range(len(top_20_risk)), top_20_risk['estimated_at_risk_youth'],  # ← NEW
+             color=COLOR_SCHEME['critical'], alpha=0.7)
+    plt.yticks(range(len(top_20_risk)), 
+               [f"{row['district']}, {row['state']}" for _, row in top_20_risk.iterrows()],
+               fontsize=9)
+    plt.xlabel('Estimated At-Risk Youth', fontsize=12)  # ← UPDATED
+    plt.title('Top 20 High-Risk Districts by Estimated At-Risk Youth',  # ← UPDATED
+              fontsize=14, fontweight='bold')
+    plt.tight_layout()
+
+
+def plot_readiness_vs_update_rate(scatter_data):
+    """Readiness Score vs Youth Update Rate Scatter"""
     plt.figure(figsize=(12, 8))
     
-    # Filter reasonable values
-    scatter_data = district_agg[
-        (district_agg['readiness_score'] > 0) & 
-        (district_agg['estimated_at_risk_youth'] > 0)
-    ]
-    
     colors_scatter = scatter_data['readiness_category'].map({
         'Good': COLOR_SCHEME['low'],
         'Moderate': COLOR_SCHEME['moderate'],
@@ -346,19 +342,12 @@ def create_visualizations(district_agg, state_agg, high_risk_districts):
     
     plt.grid(True, alpha=0.3)
     plt.tight_layout()
-    plt.savefig(os.path.join(FIGURES_DIR, 'dim2_scatter_readiness_vs_update_rate.png'), dpi=DPI)
-    plt.close()
-    print(f"  ✓ Saved: dim2_scatter_readiness_vs_update_rate.png")
-    
-    # 6. Readiness Gap Distribution by State
+
+
+def plot_state_risk_ranking(state_gaps):
+    """Readiness Gap Distribution by State"""
     plt.figure(figsize=(14, 8))
     
-    # Calculate state-level readiness gaps
-    state_gaps = district_agg.groupby('state').agg({
-        'readiness_gap': 'mean',
-        'estimated_at_risk_youth': 'sum'
-    }).sort_values('estimated_at_risk_youth', ascending=False).head(15)
-    
     plt.barh(range(len(state_gaps)), state_gaps['estimated_at_risk_youth'],
              color=COLOR_SCHEME['high'], alpha=0.7)
     plt.yticks(range(len(state_gaps)), state_gaps.index, fontsize=10)
@@ -366,16 +355,64 @@ def create_visualizations(district_agg, state_agg, high_risk_districts):
     plt.title('Top 15 States by Estimated At-Risk Youth', 
               fontsize=14, fontweight='bold')
     plt.tight_layout()
-    plt.savefig(os.path.join(FIGURES_DIR, 'dim2_state_risk_ranking.png'), dpi=DPI)
-    plt.close()
-    print(f"  ✓ Saved: dim2_state_risk_ranking.png")
 
 
+@instrument
+def create_visualizations(district_agg, state_agg, high_risk_districts):
+    """
+    Create visualizations for Dimension 2
+    Each figure is collected as a spec and rendered in parallel
+    """
+    print(f"\n📊 Creating visualizations...")
+    
+    specs = []
+    
+    # 1. Readiness Score Distribution
+    readiness_data = district_agg[district_agg['readiness_score'] > 0]['readiness_score']
+    specs.append(FigureSpec('dim2_readiness_distribution.png', plot_readiness_distribution,
+                            readiness_data=readiness_data))
+    
+    # 2. State-Level Readiness (Top 20)
+    specs.append(FigureSpec('dim2_state_readiness.png', plot_state_readiness,
+                            top_20_states=state_agg.head(20)[['state', 'readiness_score']]))
+    
+    # 3. Readiness Category Pie Chart
+    specs.append(FigureSpec('dim2_readiness_categories.png', plot_readiness_categories,
+                            readiness_counts=district_agg['readiness_category'].value_counts()))
+    
+    # 4. High-Risk Districts (Top 20 by at-risk youth)
+    if len(high_risk_districts) > 0:
+        top_20_risk = high_risk_districts.head(20)[['state', 'district', 'estimated_at_risk_youth']]
+        specs.append(FigureSpec('dim2_high_risk_districts.png', plot_high_risk_districts,
+                                top_20_risk=top_20_risk))
+    
+    # 5. Readiness Score vs Youth Update Rate Scatter (filter reasonable values)
+    scatter_data = district_agg[
+        (district_agg['readiness_score'] > 0) & 
+        (district_agg['estimated_at_risk_youth'] > 0)
+    ]
+    specs.append(FigureSpec('dim2_scatter_readiness_vs_update_rate.png', plot_readiness_vs_update_rate,
+                            scatter_data=scatter_data[['readiness_category', 'readiness_gap',
+                                                       'estimated_at_risk_youth']]))
+    
+    # 6. Readiness Gap Distribution by State
+    state_gaps = district_agg.groupby('state', observed=True).agg({
+        'readiness_gap': 'mean',
+        'estimated_at_risk_youth': 'sum'
+    }).sort_values('estimated_at_risk_youth', ascending=False).head(15)
+    specs.append(FigureSpec('dim2_state_risk_ranking.png', plot_state_risk_ranking,
+                            state_gaps=state_gaps))
+    
+    render_figures(specs, group='dim2')
+
+
+@instrument
 def generate_priority_lists(district_agg, high_risk_districts, state_agg):
     """
     Generate priority lists for mobile biometric camps
     """
     print(f"\n📋 Generating priority lists...")
+    artifacts = get_artifact_cache('dim2')
     
     # Priority List 1: Critical readiness districts
     critical_districts = district_agg[
@@ -383,7 +420,7 @@ def generate_priority_lists(district_agg, high_risk_districts, state_agg):
     ].sort_values('estimated_at_risk_youth', ascending=False)
     
     critical_file = os.path.join(TABLES_DIR, 'dim2_critical_readiness_districts.csv')
-    critical_districts.to_csv(critical_file, index=False)
+    artifacts.write_csv(critical_districts, critical_file, index=False)
     print(f"  ✓ Saved: dim2_critical_readiness_districts.csv ({len(critical_districts)} districts)")
     
     # Priority List 2: Low/Moderate readiness districts (depending on category structure)
@@ -393,7 +430,7 @@ def generate_priority_lists(district_agg, high_risk_districts, state_agg):
         ].sort_values('estimated_at_risk_youth', ascending=False)
         
         low_file = os.path.join(TABLES_DIR, 'dim2_low_readiness_districts.csv')
-        low_districts.to_csv(low_file, index=False)
+        artifacts.write_csv(low_districts, low_file, index=False)
         print(f"  ✓ Saved: dim2_low_readiness_districts.csv ({len(low_districts)} districts)")
     else:
         # If only 3 categories, use Moderate as the middle priority
@@ -402,12 +439,12 @@ def generate_priority_lists(district_agg, high_risk_districts, state_agg):
         ].sort_values('estimated_at_risk_youth', ascending=False)
         
         low_file = os.path.join(TABLES_DIR, 'dim2_moderate_readiness_districts.csv')
-        low_districts.to_csv(low_file, index=False)
+        artifacts.write_csv(low_districts, low_file, index=False)
         print(f"  ✓ Saved: dim2_moderate_readiness_districts.csv ({len(low_districts)} districts)")
     
     # Priority List 3: State-level priorities
     state_file = os.path.join(TABLES_DIR, 'dim2_state_readiness_ranking.csv')
-    state_agg.to_csv(state_file, index=False)
+    artifacts.write_csv(state_agg, state_file, index=False)
     print(f"  ✓ Saved: dim2_state_readiness_ranking.csv ({len(state_agg)} states)")
     
     # Priority List 4: All At-Risk Districts (Low + Critical combined) - NEW
@@ -422,16 +459,21 @@ def generate_priority_lists(district_agg, high_risk_districts, state_agg):
         ].sort_values('estimated_at_risk_youth', ascending=False)
     
     at_risk_file = os.path.join(TABLES_DIR, 'dim2_all_at_risk_districts.csv')
-    at_risk_districts.to_csv(at_risk_file, index=False)
+    artifacts.write_csv(at_risk_districts, at_risk_file, index=False)
     print(f"  ✓ Saved: dim2_all_at_risk_districts.csv ({len(at_risk_districts)} districts)")
     
     # Priority List 5: Top 10 At-Risk Districts - NEW
     top_10_at_risk = at_risk_districts.head(10)
     
     top_10_at_risk_file = os.path.join(TABLES_DIR, 'dim2_top10_at_risk_districts.csv')
-    top_10_at_risk.to_csv(top_10_at_risk_file, index=False)
+    artifacts.write_csv(top_10_at_risk, top_10_at_risk_file, index=False)
     print(f"  ✓ Saved: dim2_top10_at_risk_districts.csv (Top 10 highest risk)")
     
+    # All districts (lookup table for metrics_service.py)
+    readiness_file = os.path.join(TABLES_DIR, 'dim2_district_readiness.csv')
+    artifacts.write_csv(district_agg.sort_values(['state', 'district']), readiness_file, index=False)
+    print(f"  ✓ Saved: dim2_district_readiness.csv ({len(district_agg)} districts)")
+    
     # Summary statistics
     summary = {
         'Total Districts Analyzed': len(district_agg),
@@ -439,6 +481,8 @@ def generate_priority_lists(district_agg, high_risk_districts, state_agg):
         'Low Readiness Districts': len(low_districts),
         'All At-Risk Districts (Low+Critical)': len(at_risk_districts),
         'High Risk Districts': len(high_risk_districts),
+        'Good Readiness Districts': int((district_agg['readiness_category'] == 'Good').sum()),
+        'Moderate Readiness Districts': int((district_agg['readiness_category'] == 'Moderate').sum()),
         'Average Readiness Score': district_agg['readiness_score'].mean(),
         'Median Readiness Score': district_agg['readiness_score'].median(),
         'Total Estimated At-Risk Youth': district_agg['estimated_at_risk_youth'].sum()  # ← NEW
@@ -446,15 +490,18 @@ def generate_priority_lists(district_agg, high_risk_districts, state_agg):
     
     summary_df = pd.DataFrame([summary])
     summary_file = os.path.join(TABLES_DIR, 'dim2_summary_statistics.csv')
-    summary_df.to_csv(summary_file, index=False)
+    artifacts.write_csv(summary_df, summary_file, index=False)
     print(f"  ✓ Saved: dim2_summary_statistics.csv")
     
     return critical_districts, low_districts, at_risk_districts
 
 
-def main():
+@instrument
+def main(force=False, df=None, start=None, end=None):
     """
     Main function for Dimension 2 analysis
+    (pass df to reuse merged data already in memory, e.g. from run_dimensions.py;
+    start/end restrict the analysis to a date window)
     """
     print("\n" + "="*60)
     print("DIMENSION 2: READINESS GAP (AUTHENTICATION CRISIS)")
@@ -462,8 +509,21 @@ def main():
     print("\n📌 Objective: Identify districts where youth (5-17) haven't")
     print("   updated biometrics and will face authentication failures at 18+")
     
+    # Skip the whole stage when merged data, config and code are all unchanged
+    start, end, _ = resolve_window(start, end)
+    window = {'start': str(start), 'end': str(end)} if start is not None else None
+    artifacts = get_artifact_cache('dim2', script_path=os.path.abspath(__file__),
+                                   config_names=STAGE_CONFIG)
+    stage_key = artifacts.stage_key(os.path.join(PROCESSED_DATA_DIR, 'merged_data.csv'), params=window)
+    if not force and artifacts.stage_is_fresh(stage_key):
+        print("\n✓ Outputs up to date (merged data, config and code unchanged) - skipping")
+        print("  Run with --force to recompute")
+        return None, None, None, None
+    artifacts.begin_stage()
+    
     # Load data
-    df = load_merged_data()
+    if df is None:
+        df = load_merged_data(start, end)
     
     # Calculate district readiness
     district_agg = calculate_district_readiness(df)
@@ -503,8 +563,13 @@ def main():
     print("Next step: Run 05_dimension3_integrity_gap.py")
     print("="*60)
     
+    artifacts.complete_stage(stage_key)
+    
     return district_agg, state_agg, critical_districts, predicted_failures
 
 
 if __name__ == "__main__":
-    district_agg, state_agg, critical_districts, predicted_failures = main()
\ No newline at end of file
+    args = parse_window_args(stage_parser("Dimension 2: transition readiness"))
+    district_agg, state_agg, critical_districts, predicted_failures = main(
+        force=args.force, start=args.start, end=args.end
+    )
\ No newline at end of file
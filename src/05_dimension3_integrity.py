@@ -29,9 +29,22 @@ from utils.config import (
     AGE_CONCENTRATION_THRESHOLD,
     ANOMALY_UE_RATIO,
     COLOR_SCHEME,
-    FIG_SIZE_LARGE,
-    DPI
+    FIG_SIZE_LARGE
 )
+from utils.indicators import calculate_ue_ratios
+from utils.figures import FigureSpec, render_figures, FIGURE_CONFIG
+from utils.artifact_cache import get_artifact_cache
+from utils.aggregation import aggregate
+from utils.partitioned import map_partitions
+from utils.lake import read_window, resolve_window
+from utils.cli import stage_parser, parse_window_args
+from utils.telemetry import instrument
+
+# Config that changes this stage's outputs (part of its cache keys)
+STAGE_CONFIG = [
+    'Z_SCORE_THRESHOLD', 'TEMPORAL_SPIKE_MULTIPLIER', 'AGE_CONCENTRATION_THRESHOLD', 'ANOMALY_UE_RATIO',
+    'START_DATE', 'END_DATE', 'ANALYSIS_MONTHS', 'DATASET_SCHEMAS', 'COLOR_SCHEME', 'FIG_SIZE_LARGE'
+] + FIGURE_CONFIG
 
 # Set style
 sns.set_style("whitegrid")
@@ -39,14 +52,15 @@ plt.rcParams['figure.figsize'] = FIG_SIZE_LARGE
 plt.rcParams['font.size'] = 10
 
 
-def load_merged_data():
-    """Load the cleaned merged dataset"""
+@instrument
+def load_merged_data(start=None, end=None):
+    """Load the cleaned merged dataset (only the start-end window when given)"""
     print("\n" + "="*60)
     print("DIMENSION 3: INTEGRITY GAP ANALYSIS")
     print("="*60)
     
-    df = pd.read_csv(os.path.join(PROCESSED_DATA_DIR, 'merged_data.csv'))
-    df['date'] = pd.to_datetime(df['date'])
+    # Memory-mapped column store, or just the window's month partitions
+    df = read_window(start, end)
     
     print(f"\n✓ Loaded merged dataset: {len(df):,} records")
     print(f"  Date range: {df['date'].min().date()} to {df['date'].max().date()}")
@@ -54,6 +68,7 @@ def load_merged_data():
     return df
 
 
+@instrument
 def detect_ue_ratio_anomalies(df):
     """
     Detect pincodes with anomalously high UE ratios
@@ -61,7 +76,7 @@ def detect_ue_ratio_anomalies(df):
     print(f"\n🔍 Detecting UE Ratio Anomalies...")
     
     # Calculate UE ratio at pincode level
-    pincode_agg = df.groupby('pincode').agg({
+    pincode_agg = aggregate(df, ['pincode'], {
         'age_0_5': 'sum',
         'age_5_17': 'sum',
         'age_18_greater': 'sum',
@@ -71,7 +86,7 @@ def detect_ue_ratio_anomalies(df):
         'demo_age_17_': 'sum',
         'state': 'first',
         'district': 'first'
-    }).reset_index()
+    })
     
     # Calculate totals
     pincode_agg['total_enrollment'] = (
@@ -88,10 +103,8 @@ def detect_ue_ratio_anomalies(df):
     )
     
     # Calculate UE ratio (handle division by zero)
-    pincode_agg['ue_ratio'] = np.where(
-        pincode_agg['total_enrollment'] > 0,
-        pincode_agg['total_updates'] / pincode_agg['total_enrollment'],
-        0
+    pincode_agg['ue_ratio'] = calculate_ue_ratios(
+        pincode_agg['total_updates'], pincode_agg['total_enrollment']
     )
     
     # Anomaly 1: UE Ratio > 100 (extreme)
@@ -118,20 +131,18 @@ def detect_ue_ratio_anomalies(df):
     return pincode_agg, extreme_ue, high_ue, zscore_anomalies
 
 
-def detect_temporal_spikes(df):
+def score_temporal_baselines(df):
     """
-    Detect unusual temporal spikes in enrollments or updates
+    Date-pincode totals flagged against each pincode's median (per state partition)
     """
-    print(f"\n📈 Detecting Temporal Spikes...")
-    
     # Aggregate by date and pincode
-    temporal = df.groupby(['date', 'pincode', 'state', 'district']).agg({
+    temporal = aggregate(df, ['date', 'pincode', 'state', 'district'], {
         'age_0_5': 'sum',
         'age_5_17': 'sum',
         'age_18_greater': 'sum',
         'bio_age_5_17': 'sum',
         'bio_age_17_': 'sum'
-    }).reset_index()
+    })
     
     temporal['total_enrollment'] = (
         temporal['age_0_5'] + 
@@ -166,6 +177,22 @@ def detect_temporal_spikes(df):
         (temporal['baseline_updates'] * TEMPORAL_SPIKE_MULTIPLIER)
     )
     
+    return temporal
+
+
+@instrument
+def detect_temporal_spikes(df):
+    """
+    Detect unusual temporal spikes in enrollments or updates
+    """
+    print(f"\n📈 Detecting Temporal Spikes...")
+    
+    # Baselines are per pincode, so a pincode listed under two states is kept whole
+    temporal = map_partitions(
+        score_temporal_baselines, df, ['date', 'pincode', 'state', 'district'],
+        keep_together='pincode'
+    )
+    
     # Filter to actual spikes
     enrollment_spikes = temporal[
         temporal['enrollment_spike'] & 
@@ -196,18 +223,16 @@ def detect_temporal_spikes(df):
     return temporal, enrollment_spikes, update_spikes, frequent_spikes
 
 
-def detect_age_concentration_anomalies(df):
+def aggregate_age_shares(df):
     """
-    Detect suspicious age group concentrations
+    Pincode age-group totals and percentages (per state partition)
     """
-    print(f"\n👶 Detecting Age Concentration Anomalies...")
-    
     # Aggregate by pincode
-    pincode_age = df.groupby(['pincode', 'state', 'district']).agg({
+    pincode_age = aggregate(df, ['pincode', 'state', 'district'], {
         'age_0_5': 'sum',
         'age_5_17': 'sum',
         'age_18_greater': 'sum'
-    }).reset_index()
+    })
     
     # Calculate total and percentages
     pincode_age['total'] = (
@@ -220,6 +245,18 @@ def detect_age_concentration_anomalies(df):
     pincode_age['pct_5_17'] = (pincode_age['age_5_17'] / pincode_age['total']) * 100
     pincode_age['pct_18_plus'] = (pincode_age['age_18_greater'] / pincode_age['total']) * 100
     
+    return pincode_age
+
+
+@instrument
+def detect_age_concentration_anomalies(df):
+    """
+    Detect suspicious age group concentrations
+    """
+    print(f"\n👶 Detecting Age Concentration Anomalies...")
+    
+    pincode_age = map_partitions(aggregate_age_shares, df, ['pincode', 'state', 'district'])
+    
     # Find extreme concentrations (>80% in one age group)
     threshold_pct = AGE_CONCENTRATION_THRESHOLD * 100  # Convert to percentage
     
@@ -254,6 +291,7 @@ def detect_age_concentration_anomalies(df):
     return pincode_age, age_anomalies
 
 
+@instrument
 def detect_geographic_clustering(anomaly_pincodes, df):
     """
     Detect geographic clustering of anomalies using DBSCAN
@@ -266,7 +304,7 @@ def detect_geographic_clustering(anomaly_pincodes, df):
         return None, None
     
     # Count anomalies per district
-    district_counts = anomaly_pincodes.groupby(['state', 'district']).size().reset_index(name='anomaly_count')
+    district_counts = anomaly_pincodes.groupby(['state', 'district'], observed=True).size().reset_index(name='anomaly_count')
     
     # Identify districts with multiple anomalies (clustering indicator)
     clustered_districts = district_counts[district_counts['anomaly_count'] >= 3].copy()
@@ -292,6 +330,7 @@ def calculate_composite_risk_score(pincode_agg, extreme_ue, high_ue, age_anomali
     risk_df = pincode_agg[['pincode', 'state', 'district', 'ue_ratio', 'total_enrollment', 'total_updates']].copy()
     risk_df['risk_score'] = 0
     
+@instrument
 def calculate_composite_risk_score(pincode_agg, extreme_ue, high_ue, age_anomalies, frequent_spikes):
     """
     Calculate composite risk score for each pincode
@@ -361,18 +400,10 @@ def calculate_composite_risk_score(pincode_agg, extreme_ue, high_ue, age_anomali
     return anomalous_pincodes
 
 
-def create_visualizations(pincode_agg, anomalous_pincodes, district_counts):
-    """
-    Create visualizations for Dimension 3
-    """
-    print(f"\n📊 Creating visualizations...")
-    
-    # 1. UE Ratio Distribution with Anomaly Threshold
+def plot_ue_ratio_distribution(plot_data):
+    """UE Ratio Distribution with Anomaly Threshold"""
     plt.figure(figsize=(12, 6))
     
-    # Filter reasonable range for visualization
-    plot_data = pincode_agg[pincode_agg['ue_ratio'] < 200]['ue_ratio']
-    
     plt.hist(plot_data, bins=50, color=COLOR_SCHEME['neutral'], alpha=0.7, edgecolor='black')
     plt.axvline(ANOMALY_UE_RATIO, color=COLOR_SCHEME['critical'], 
                 linestyle='--', linewidth=2, label=f'Anomaly Threshold ({ANOMALY_UE_RATIO})')
@@ -388,99 +419,131 @@ def create_visualizations(pincode_agg, anomalous_pincodes, district_counts):
     plt.legend()
     plt.grid(True, alpha=0.3)
     plt.tight_layout()
-    plt.savefig(os.path.join(FIGURES_DIR, 'dim3_ue_ratio_distribution.png'), dpi=DPI)
-    plt.close()
-    print(f"  ✓ Saved: dim3_ue_ratio_distribution.png")
+
+
+def plot_risk_distribution(risk_counts):
+    """Risk Score Distribution"""
+    plt.figure(figsize=(10, 6))
+    
+    colors_map = {
+        'Critical': COLOR_SCHEME['critical'],
+        'High': COLOR_SCHEME['high'],
+        'Medium': COLOR_SCHEME['moderate'],
+        'Low': COLOR_SCHEME['low']
+    }
+    colors = [colors_map[level] for level in risk_counts.index]
     
-    # 2. Risk Score Distribution
-    if len(anomalous_pincodes) > 0:
-        plt.figure(figsize=(10, 6))
-        
-        risk_counts = anomalous_pincodes['risk_level'].value_counts()
-        colors_map = {
-            'Critical': COLOR_SCHEME['critical'],
-            'High': COLOR_SCHEME['high'],
-            'Medium': COLOR_SCHEME['moderate'],
-            'Low': COLOR_SCHEME['low']
-        }
-        colors = [colors_map[level] for level in risk_counts.index]
-        
-        plt.bar(range(len(risk_counts)), risk_counts.values, color=colors, alpha=0.7)
-        plt.xticks(range(len(risk_counts)), risk_counts.index, fontsize=12)
-        plt.ylabel('Number of Pincodes', fontsize=12)
-        plt.title('Distribution of Anomalous Pincodes by Risk Level', 
-                  fontsize=14, fontweight='bold')
-        
-        # Add value labels on bars
-        for i, v in enumerate(risk_counts.values):
-            plt.text(i, v, str(v), ha='center', va='bottom', fontsize=10, fontweight='bold')
-        
-        plt.tight_layout()
-        plt.savefig(os.path.join(FIGURES_DIR, 'dim3_risk_distribution.png'), dpi=DPI)
-        plt.close()
-        print(f"  ✓ Saved: dim3_risk_distribution.png")
+    plt.bar(range(len(risk_counts)), risk_counts.values, color=colors, alpha=0.7)
+    plt.xticks(range(len(risk_counts)), risk_counts.index, fontsize=12)
+    plt.ylabel('Number of Pincodes', fontsize=12)
+    plt.title('Distribution of Anomalous Pincodes by Risk Level', 
+              fontsize=14, fontweight='bold')
+    
+    # Add value labels on bars
+    for i, v in enumerate(risk_counts.values):
+        plt.text(i, v, str(v), ha='center', va='bottom', fontsize=10, fontweight='bold')
+    
+    plt.tight_layout()
+
+
+def plot_top_anomalies(top_20):
+    """Top 20 Anomalous Pincodes by Risk Score"""
+    from matplotlib.patches import Patch
+    
+    plt.figure(figsize=(14, 8))
+    
+    # Color code by risk level
+    colors = top_20['risk_level'].map({
+        'Critical': COLOR_SCHEME['critical'],
+        'High': COLOR_SCHEME['high'],
+        'Medium': COLOR_SCHEME['moderate'],
+        'Low': COLOR_SCHEME['low']
+    })
+    
+    plt.barh(range(len(top_20)), top_20['risk_score'], color=colors, alpha=0.7)
+    plt.yticks(range(len(top_20)), 
+               [f"{row['pincode']} ({row['district']}, {row['state']})" 
+                for _, row in top_20.iterrows()],
+               fontsize=9)
+    plt.xlabel('Composite Risk Score', fontsize=12)
+    plt.title('Top 20 Pincodes by Composite Risk Score', 
+              fontsize=14, fontweight='bold')
+    
+    # Add legend
+    legend_elements = [
+        Patch(facecolor=COLOR_SCHEME['critical'], alpha=0.7, label='Critical'),
+        Patch(facecolor=COLOR_SCHEME['high'], alpha=0.7, label='High'),
+        Patch(facecolor=COLOR_SCHEME['moderate'], alpha=0.7, label='Medium'),
+        Patch(facecolor=COLOR_SCHEME['low'], alpha=0.7, label='Low')
+    ]
+    plt.legend(handles=legend_elements, loc='lower right')
+    
+    plt.tight_layout()
+
+
+def plot_geographic_clustering(top_districts):
+    """Geographic Clustering - Districts with Multiple Anomalies"""
+    plt.figure(figsize=(14, 8))
+    
+    plt.barh(range(len(top_districts)), top_districts['anomaly_count'], 
+             color=COLOR_SCHEME['high'], alpha=0.7)
+    plt.yticks(range(len(top_districts)), 
+               [f"{row['district']}, {row['state']}" for _, row in top_districts.iterrows()],
+               fontsize=9)
+    plt.xlabel('Number of Anomalous Pincodes', fontsize=12)
+    plt.title('Top 20 Districts by Concentration of Anomalous Pincodes', 
+              fontsize=14, fontweight='bold')
+    plt.tight_layout()
+
+
+def plot_anomaly_types(anomaly_types):
+    """Anomaly Type Breakdown (Venn-like visualization)"""
+    plt.figure(figsize=(10, 8))
+    
+    colors = [COLOR_SCHEME['critical'], COLOR_SCHEME['high'], 
+             COLOR_SCHEME['moderate'], COLOR_SCHEME['low']][:len(anomaly_types)]
+    
+    plt.pie(anomaly_types.values(), labels=anomaly_types.keys(), autopct='%1.1f%%',
+           colors=colors, startangle=90)
+    plt.title('Anomalous Pincodes by Anomaly Type\n(Pincodes can have multiple types)', 
+              fontsize=14, fontweight='bold')
+    plt.tight_layout()
+
+
+@instrument
+def create_visualizations(pincode_agg, anomalous_pincodes, district_counts):
+    """
+    Create visualizations for Dimension 3
+    Each figure is collected as a spec and rendered in parallel
+    """
+    print(f"\n📊 Creating visualizations...")
+    
+    specs = []
+    
+    # 1. UE Ratio Distribution with Anomaly Threshold (reasonable range for visualization)
+    plot_data = pincode_agg[pincode_agg['ue_ratio'] < 200]['ue_ratio']
+    specs.append(FigureSpec('dim3_ue_ratio_distribution.png', plot_ue_ratio_distribution,
+                            plot_data=plot_data))
     
-    # 3. Top 20 Anomalous Pincodes by Risk Score
     if len(anomalous_pincodes) > 0:
-        plt.figure(figsize=(14, 8))
-        top_20 = anomalous_pincodes.head(20)
-        
-        # Color code by risk level
-        colors = top_20['risk_level'].map({
-            'Critical': COLOR_SCHEME['critical'],
-            'High': COLOR_SCHEME['high'],
-            'Medium': COLOR_SCHEME['moderate'],
-            'Low': COLOR_SCHEME['low']
-        })
+        # 2. Risk Score Distribution
+        specs.append(FigureSpec('dim3_risk_distribution.png', plot_risk_distribution,
+                                risk_counts=anomalous_pincodes['risk_level'].value_counts()))
         
-        plt.barh(range(len(top_20)), top_20['risk_score'], color=colors, alpha=0.7)
-        plt.yticks(range(len(top_20)), 
-                   [f"{row['pincode']} ({row['district']}, {row['state']})" 
-                    for _, row in top_20.iterrows()],
-                   fontsize=9)
-        plt.xlabel('Composite Risk Score', fontsize=12)
-        plt.title('Top 20 Pincodes by Composite Risk Score', 
-                  fontsize=14, fontweight='bold')
-        
-        # Add legend
-        from matplotlib.patches import Patch
-        legend_elements = [
-            Patch(facecolor=COLOR_SCHEME['critical'], alpha=0.7, label='Critical'),
-            Patch(facecolor=COLOR_SCHEME['high'], alpha=0.7, label='High'),
-            Patch(facecolor=COLOR_SCHEME['moderate'], alpha=0.7, label='Medium'),
-            Patch(facecolor=COLOR_SCHEME['low'], alpha=0.7, label='Low')
-        ]
-        plt.legend(handles=legend_elements, loc='lower right')
-        
-        plt.tight_layout()
-        plt.savefig(os.path.join(FIGURES_DIR, 'dim3_top_anomalies.png'), dpi=DPI)
-        plt.close()
-        print(f"  ✓ Saved: dim3_top_anomalies.png")
+        # 3. Top 20 Anomalous Pincodes by Risk Score
+        top_20 = anomalous_pincodes.head(20)[['pincode', 'state', 'district', 'risk_score', 'risk_level']]
+        specs.append(FigureSpec('dim3_top_anomalies.png', plot_top_anomalies, top_20=top_20))
     
     # 4. Geographic Clustering - Districts with Multiple Anomalies
     if district_counts is not None and len(district_counts) > 0:
         top_districts = district_counts.nlargest(20, 'anomaly_count')
         
         if len(top_districts) > 0:
-            plt.figure(figsize=(14, 8))
-            
-            plt.barh(range(len(top_districts)), top_districts['anomaly_count'], 
-                     color=COLOR_SCHEME['high'], alpha=0.7)
-            plt.yticks(range(len(top_districts)), 
-                       [f"{row['district']}, {row['state']}" for _, row in top_districts.iterrows()],
-                       fontsize=9)
-            plt.xlabel('Number of Anomalous Pincodes', fontsize=12)
-            plt.title('Top 20 Districts by Concentration of Anomalous Pincodes', 
-                      fontsize=14, fontweight='bold')
-            plt.tight_layout()
-            plt.savefig(os.path.join(FIGURES_DIR, 'dim3_geographic_clustering.png'), dpi=DPI)
-            plt.close()
-            print(f"  ✓ Saved: dim3_geographic_clustering.png")
+            specs.append(FigureSpec('dim3_geographic_clustering.png', plot_geographic_clustering,
+                                    top_districts=top_districts[['state', 'district', 'anomaly_count']]))
     
     # 5. Anomaly Type Breakdown (Venn-like visualization)
     if len(anomalous_pincodes) > 0:
-        plt.figure(figsize=(10, 8))
-        
         anomaly_types = {
             'Extreme UE (>100)': anomalous_pincodes['has_extreme_ue'].sum(),
             'High UE (>25)': anomalous_pincodes['has_high_ue'].sum(),
@@ -492,24 +555,19 @@ def create_visualizations(pincode_agg, anomalous_pincodes, district_counts):
         anomaly_types = {k: v for k, v in anomaly_types.items() if v > 0}
         
         if len(anomaly_types) > 0:
-            colors = [COLOR_SCHEME['critical'], COLOR_SCHEME['high'], 
-                     COLOR_SCHEME['moderate'], COLOR_SCHEME['low']][:len(anomaly_types)]
-            
-            plt.pie(anomaly_types.values(), labels=anomaly_types.keys(), autopct='%1.1f%%',
-                   colors=colors, startangle=90)
-            plt.title('Anomalous Pincodes by Anomaly Type\n(Pincodes can have multiple types)', 
-                      fontsize=14, fontweight='bold')
-            plt.tight_layout()
-            plt.savefig(os.path.join(FIGURES_DIR, 'dim3_anomaly_types.png'), dpi=DPI)
-            plt.close()
-            print(f"  ✓ Saved: dim3_anomaly_types.png")
+            specs.append(FigureSpec('dim3_anomaly_types.png', plot_anomaly_types,
+                                    anomaly_types=anomaly_types))
+    
+    render_figures(specs, group='dim3')
 
 
+@instrument
 def generate_priority_lists(anomalous_pincodes, district_counts, pincode_agg):
     """
     Generate priority lists for investigation
     """
     print(f"\n📋 Generating priority lists...")
+    artifacts = get_artifact_cache('dim3')
     
     # Priority List 1: All Critical risk pincodes (NEW - replaces old critical list)
     if 'Critical' in anomalous_pincodes['risk_level'].values:
@@ -518,14 +576,14 @@ def generate_priority_lists(anomalous_pincodes, district_counts, pincode_agg):
         ].copy()
         
         all_critical_file = os.path.join(TABLES_DIR, 'dim3_all_critical_risk_pincodes.csv')
-        all_critical_pincodes.to_csv(all_critical_file, index=False)
+        artifacts.write_csv(all_critical_pincodes, all_critical_file, index=False)
         print(f"  ✓ Saved: dim3_all_critical_risk_pincodes.csv ({len(all_critical_pincodes)} pincodes)")
         
         # Priority List 2: Top 10 Critical risk pincodes (NEW)
         top_10_critical = all_critical_pincodes.head(10)
         
         top_10_critical_file = os.path.join(TABLES_DIR, 'dim3_top10_critical_risk_pincodes.csv')
-        top_10_critical.to_csv(top_10_critical_file, index=False)
+        artifacts.write_csv(top_10_critical, top_10_critical_file, index=False)
         print(f"  ✓ Saved: dim3_top10_critical_risk_pincodes.csv (Top 10 highest risk)")
     
     # Priority List 3: High risk pincodes
@@ -535,21 +593,27 @@ def generate_priority_lists(anomalous_pincodes, district_counts, pincode_agg):
         ].copy()
         
         high_file = os.path.join(TABLES_DIR, 'dim3_high_risk_pincodes.csv')
-        high_risk.to_csv(high_file, index=False)
+        artifacts.write_csv(high_risk, high_file, index=False)
         print(f"  ✓ Saved: dim3_high_risk_pincodes.csv ({len(high_risk)} pincodes)")
     
     # Priority List 4: All anomalous pincodes
     all_file = os.path.join(TABLES_DIR, 'dim3_all_anomalous_pincodes.csv')
-    anomalous_pincodes.to_csv(all_file, index=False)
+    artifacts.write_csv(anomalous_pincodes, all_file, index=False)
     print(f"  ✓ Saved: dim3_all_anomalous_pincodes.csv ({len(anomalous_pincodes)} pincodes)")
     
     # Priority List 5: Districts with clustering
     if district_counts is not None and len(district_counts) > 0:
         cluster_file = os.path.join(TABLES_DIR, 'dim3_clustered_districts.csv')
-        district_counts.to_csv(cluster_file, index=False)
+        artifacts.write_csv(district_counts, cluster_file, index=False)
         print(f"  ✓ Saved: dim3_clustered_districts.csv ({len(district_counts)} districts)")
 
-
+    # All pincodes with their risk score (lookup table for metrics_service.py)
+    risk_columns = ['pincode', 'risk_score', 'risk_level']
+    pincode_metrics = pincode_agg.merge(anomalous_pincodes[risk_columns], on='pincode', how='left')
+    pincode_metrics['risk_score'] = pincode_metrics['risk_score'].fillna(0).astype(int)
+    pincode_metrics_file = os.path.join(TABLES_DIR, 'dim3_pincode_metrics.csv')
+    artifacts.write_csv(pincode_metrics.sort_values('pincode'), pincode_metrics_file, index=False)
+    print(f"  ✓ Saved: dim3_pincode_metrics.csv ({len(pincode_metrics)} pincodes)")
 
     # Summary statistics
     summary = {
@@ -565,13 +629,16 @@ def generate_priority_lists(anomalous_pincodes, district_counts, pincode_agg):
     
     summary_df = pd.DataFrame([summary])
     summary_file = os.path.join(TABLES_DIR, 'dim3_summary_statistics.csv')
-    summary_df.to_csv(summary_file, index=False)
+    artifacts.write_csv(summary_df, summary_file, index=False)
     print(f"  ✓ Saved: dim3_summary_statistics.csv")
 
 
-def main():
+@instrument
+def main(force=False, df=None, start=None, end=None):
     """
     Main function for Dimension 3 analysis
+    (pass df to reuse merged data already in memory, e.g. from run_dimensions.py;
+    start/end restrict the analysis to a date window)
     """
     print("\n" + "="*60)
     print("DIMENSION 3: INTEGRITY GAP (ANOMALY DETECTION)")
@@ -580,8 +647,21 @@ def main():
     print("   transactions that may indicate data quality issues,")
     print("   fraud, or systematic errors")
     
+    # Skip the whole stage when merged data, config and code are all unchanged
+    start, end, _ = resolve_window(start, end)
+    window = {'start': str(start), 'end': str(end)} if start is not None else None
+    artifacts = get_artifact_cache('dim3', script_path=os.path.abspath(__file__),
+                                   config_names=STAGE_CONFIG)
+    stage_key = artifacts.stage_key(os.path.join(PROCESSED_DATA_DIR, 'merged_data.csv'), params=window)
+    if not force and artifacts.stage_is_fresh(stage_key):
+        print("\n✓ Outputs up to date (merged data, config and code unchanged) - skipping")
+        print("  Run with --force to recompute")
+        return None, None
+    artifacts.begin_stage()
+    
     # Load data
-    df = load_merged_data()
+    if df is None:
+        df = load_merged_data(start, end)
     
     # 1. UE Ratio Anomalies
     pincode_agg, extreme_ue, high_ue, zscore_anomalies = detect_ue_ratio_anomalies(df)
@@ -627,8 +707,13 @@ def main():
     print("\n📌 Next step: Generate comprehensive PDF report")
     print("="*60)
     
+    artifacts.complete_stage(stage_key)
+    
     return anomalous_pincodes, district_counts
 
 
 if __name__ == "__main__":
-    anomalous_pincodes, district_counts = main()
\ No newline at end of file
+    args = parse_window_args(stage_parser("Dimension 3: data integrity"))
+    anomalous_pincodes, district_counts = main(
+        force=args.force, start=args.start, end=args.end
+    )
\ No newline at end of file
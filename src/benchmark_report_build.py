@@ -0,0 +1,139 @@
+"""
+Benchmark: PDF Report Build
+Compare build time and peak memory of the page-numbering strategies used by
+06_report_generation.py
+
+- numbered_canvas : previous approach, snapshots every page's canvas state and
+                    replays all of them in save() to stamp page numbers
+- page_callback   : current approach, onLaterPages callback draws the number
+                    while each page is laid out
+
+Usage:
+    python src/benchmark_report_build.py [--repeats N]
+"""
+
+import os
+import sys
+import time
+import tempfile
+import tracemalloc
+import argparse
+from contextlib import redirect_stdout
+from io import StringIO
+
+from reportlab.lib import colors
+from reportlab.lib.units import inch
+from reportlab.pdfgen import canvas
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.cli import load_script, positive_int
+
+
+def load_report_module():
+    """Import 06_report_generation.py as report_generation"""
+    return load_script('06_report_generation.py')
+
+
+class LegacyNumberedCanvas(canvas.Canvas):
+    """The double-buffering canvas previously used for page numbers (reference only)"""
+    def __init__(self, *args, **kwargs):
+        canvas.Canvas.__init__(self, *args, **kwargs)
+        self._saved_page_states = []
+
+    def showPage(self):
+        self._saved_page_states.append(dict(self.__dict__))
+        self._startPage()
+
+    def save(self):
+        for state in self._saved_page_states:
+            self.__dict__.update(state)
+            if self._pageNumber > 1:
+                self.setFont("Helvetica", 9)
+                self.setFillColor(colors.HexColor('#666666'))
+                self.drawRightString(7.75*inch, 0.5*inch, f"{self._pageNumber}")
+            canvas.Canvas.showPage(self)
+        canvas.Canvas.save(self)
+
+
+def build_once(module, strategy, output_path, trace_memory=False):
+    """
+    Build the full report once with the given strategy
+
+    Returns:
+    --------
+    dict with seconds, peak_mb (None unless trace_memory), pages and size_kb
+    """
+    report = module.EnhancedAadhaarReport(report_path=output_path)
+    with redirect_stdout(StringIO()):
+        report.build_story()
+
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+
+    if strategy == 'numbered_canvas':
+        report.doc.build(report.story, canvasmaker=LegacyNumberedCanvas)
+    else:
+        report.build_pdf()
+
+    seconds = time.perf_counter() - start
+    peak_mb = None
+    if trace_memory:
+        peak_mb = tracemalloc.get_traced_memory()[1] / 1024**2
+        tracemalloc.stop()
+
+    return {
+        'seconds': seconds,
+        'peak_mb': peak_mb,
+        'pages': report.doc.page,
+        'size_kb': os.path.getsize(output_path) / 1024
+    }
+
+
+def main(repeats=3):
+    print("\n" + "="*60)
+    print("BENCHMARK: PDF REPORT BUILD")
+    print("="*60)
+
+    module = load_report_module()
+    strategies = ['numbered_canvas', 'page_callback']
+    results = {}
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for strategy in strategies:
+            output_path = os.path.join(tmp_dir, f'{strategy}.pdf')
+            print(f"\n⏱️  {strategy}: {repeats} timed build(s) + 1 traced build...")
+
+            # Timed runs without tracemalloc (it slows allocation-heavy code)
+            times = [build_once(module, strategy, output_path)['seconds'] for _ in range(repeats)]
+            traced = build_once(module, strategy, output_path, trace_memory=True)
+
+            results[strategy] = {
+                'best_s': min(times),
+                'mean_s': sum(times) / len(times),
+                'peak_mb': traced['peak_mb'],
+                'pages': traced['pages'],
+                'size_kb': traced['size_kb']
+            }
+
+    print(f"\n{'Strategy':<18}{'Best (s)':>10}{'Mean (s)':>10}{'Peak MB':>10}{'Pages':>8}{'PDF KB':>10}")
+    print("-"*66)
+    for strategy in strategies:
+        r = results[strategy]
+        print(f"{strategy:<18}{r['best_s']:>10.2f}{r['mean_s']:>10.2f}"
+              f"{r['peak_mb']:>10.1f}{r['pages']:>8}{r['size_kb']:>10.1f}")
+
+    old, new = results['numbered_canvas'], results['page_callback']
+    print(f"\n📊 Build time (numbered_canvas / page_callback): {old['best_s'] / new['best_s']:.2f}x")
+    print(f"📊 Peak memory difference: {old['peak_mb'] - new['peak_mb']:+.1f} MB")
+    print("="*60)
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare PDF page-numbering strategies")
+    parser.add_argument('--repeats', type=positive_int, default=3)
+    results = main(repeats=parser.parse_args().repeats)
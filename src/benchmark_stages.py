@@ -0,0 +1,416 @@
+"""
+Benchmark: Pipeline Stages
+Time the expensive stage functions on synthetic data at several scales and
+compare against a stored baseline
+
+Stages:
+- standardize_state_names         (02) on raw biometric rows
+- merge_datasets                  (02) on cleaned enrollment/biometric/demographic
+                                       (the pandas engine's merge)
+- clean_merge_<engine>            (02) run_cleaning + merge_aggregated on raw
+                                       shards written to a temp directory, for
+                                       each installed engine (fused, polars)
+- calculate_district_readiness    (04) on merged data
+- detect_temporal_spikes          (05) on merged data
+- calculate_composite_risk_score  (05) on the anomaly inputs from merged data
+- report_generate                 (06) full PDF from the current output tables
+                                       (does not depend on scale; run once)
+
+For each stage and scale, the benchmark records the best wall time over
+--repeats runs, the peak RSS growth during the call and input rows/sec. Results
+go to outputs/benchmarks/stage_benchmarks.json. Any stage slower (or using more
+memory) than the baseline by more than the tolerance is flagged as a regression,
+and the script exits with 1.
+
+Usage:
+    python src/benchmark_stages.py [--scales 0.01,0.05] [--stages a,b] [--repeats N]
+                                   [--tolerance 0.25] [--seed N] [--save-baseline]
+"""
+
+import os
+import sys
+import gc
+import json
+import time
+import platform
+import argparse
+import tempfile
+from contextlib import redirect_stdout
+from datetime import datetime
+from io import StringIO
+
+import pandas as pd
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.config import (
+    TABLES_DIR, BENCHMARK_DIR, BENCHMARK_SCALES, BENCHMARK_TOLERANCE
+)
+from utils.synthetic_data import generate_frames, write_shards
+from utils.cleaning_engines import available_engines, run_cleaning
+from utils.telemetry import RSSSampler, set_enabled
+from utils.cli import load_script, comma_list, float_list, positive_int
+
+
+RESULTS_PATH = os.path.join(BENCHMARK_DIR, 'stage_benchmarks.json')
+BASELINE_PATH = os.path.join(BENCHMARK_DIR, 'stage_baseline.json')
+
+# Differences below these are treated as noise, whatever the tolerance
+MIN_SECONDS_DELTA = 0.05
+MIN_RSS_DELTA_MB = 16
+
+
+# =============================================================================
+# MEASUREMENT
+# =============================================================================
+
+def measure(func, make_args, repeats):
+    """
+    Run func(*make_args()) `repeats` times (argument setup is not timed)
+
+    Returns:
+    --------
+    dict with best/mean seconds and the largest peak RSS growth seen
+    """
+    times = []
+    rss_growth = 0.0
+    peak_rss = 0.0
+    for _ in range(repeats):
+        args = make_args()
+        gc.collect()
+        with redirect_stdout(StringIO()), RSSSampler() as rss:
+            start = time.perf_counter()
+            func(*args)
+            times.append(time.perf_counter() - start)
+        rss_growth = max(rss_growth, rss.growth_mb)
+        peak_rss = max(peak_rss, rss.peak_mb)
+        del args
+    return {
+        'best_s': min(times),
+        'mean_s': sum(times) / len(times),
+        'rss_growth_mb': rss_growth,
+        'peak_rss_mb': peak_rss,
+    }
+
+
+# =============================================================================
+# STAGE INPUTS
+# =============================================================================
+
+class StageInputs:
+    """Synthetic raw, cleaned and merged frames for one scale, built once"""
+
+    def __init__(self, scale, seed, cleaning, integrity):
+        self.scale = scale
+        self.seed = seed
+        self.cleaning = cleaning
+        self.integrity = integrity
+        self._raw_dir = None
+
+        with redirect_stdout(StringIO()):
+            self.raw = generate_frames(scale=scale, seed=seed)
+
+            # Cleaned frames as 02 produces them before merging
+            self.clean = {}
+            for name, df in self.raw.items():
+                df = cleaning.standardize_dates(df.copy(), 'date')
+                df = cleaning.standardize_state_names(df)
+                self.clean[name] = df.dropna(subset=['date'])
+
+            self.merged = cleaning.merge_datasets(
+                self.clean['enrollment'], self.clean['biometric'], self.clean['demographic']
+            )
+            self._risk_inputs = None
+
+    @property
+    def raw_rows(self):
+        return sum(len(df) for df in self.raw.values())
+
+    def raw_dir(self):
+        """The same raw data as shards on disk, for the cleaning engines (written once)"""
+        if self._raw_dir is None:
+            self._raw_dir = tempfile.TemporaryDirectory(prefix='benchmark_raw_')
+            write_shards(self._raw_dir.name, scale=self.scale, seed=self.seed)
+        return self._raw_dir.name
+
+    def cleanup(self):
+        if self._raw_dir is not None:
+            self._raw_dir.cleanup()
+            self._raw_dir = None
+
+    def risk_inputs(self):
+        """Arguments of calculate_composite_risk_score, computed from merged data"""
+        if self._risk_inputs is None:
+            with redirect_stdout(StringIO()):
+                pincode_agg, extreme_ue, high_ue, _ = self.integrity.detect_ue_ratio_anomalies(self.merged)
+                _, _, _, frequent_spikes = self.integrity.detect_temporal_spikes(self.merged)
+                _, age_anomalies = self.integrity.detect_age_concentration_anomalies(self.merged)
+            self._risk_inputs = (pincode_agg, extreme_ue, high_ue, age_anomalies, frequent_spikes)
+        return self._risk_inputs
+
+
+def build_stages(modules):
+    """
+    Stage name -> (function, argument factory, input row counter, scaled)
+
+    Argument factories copy anything the stage mutates, so every repeat sees
+    the same input.
+    """
+    cleaning, readiness, integrity, report = (
+        modules['cleaning'], modules['readiness'], modules['integrity'], modules['report']
+    )
+
+    def run_report(path):
+        return report.EnhancedAadhaarReport(report_path=path).generate()
+
+    def clean_and_merge(engine, raw_dir):
+        # What 02 does with a shard engine: clean + per-key sums, then the merge
+        _, aggregated = run_cleaning(engine, cache=False, data_dir=raw_dir)
+        return cleaning.merge_aggregated(
+            aggregated['enrollment'], aggregated['biometric'], aggregated['demographic']
+        )
+
+    os.makedirs(BENCHMARK_DIR, exist_ok=True)
+    report_path = os.path.join(BENCHMARK_DIR, 'benchmark_report.pdf')
+
+    stages = {
+        'standardize_state_names': (
+            cleaning.standardize_state_names,
+            lambda data: (data.raw['biometric'].copy(),),
+            lambda data: len(data.raw['biometric']),
+            True
+        ),
+        'merge_datasets': (
+            cleaning.merge_datasets,
+            lambda data: (data.clean['enrollment'], data.clean['biometric'], data.clean['demographic']),
+            lambda data: sum(len(df) for df in data.clean.values()),
+            True
+        ),
+        'calculate_district_readiness': (
+            readiness.calculate_district_readiness,
+            lambda data: (data.merged,),
+            lambda data: len(data.merged),
+            True
+        ),
+        'detect_temporal_spikes': (
+            integrity.detect_temporal_spikes,
+            lambda data: (data.merged,),
+            lambda data: len(data.merged),
+            True
+        ),
+        'calculate_composite_risk_score': (
+            integrity.calculate_composite_risk_score,
+            lambda data: data.risk_inputs(),
+            lambda data: len(data.risk_inputs()[0]),
+            True
+        ),
+    }
+    for engine in available_engines():
+        if engine != 'pandas':
+            stages[f'clean_merge_{engine}'] = (
+                clean_and_merge,
+                lambda data, engine=engine: (engine, data.raw_dir()),
+                lambda data: data.raw_rows,
+                True
+            )
+    stages['report_generate'] = (
+        run_report,
+        lambda data: (report_path,),
+        lambda data: None,
+        False
+    )
+    return stages
+
+
+# =============================================================================
+# BASELINE COMPARISON
+# =============================================================================
+
+def result_key(result):
+    return f"{result['stage']}@{result['scale']}"
+
+
+def compare_to_baseline(results, baseline, tolerance):
+    """
+    Flag results slower or more memory-hungry than baseline beyond tolerance
+
+    Returns:
+    --------
+    list of regression descriptions (also stored on each result)
+    """
+    previous = {result_key(r): r for r in baseline.get('results', [])}
+    regressions = []
+
+    for result in results:
+        base = previous.get(result_key(result))
+        result['regression'] = []
+        if base is None:
+            result['baseline_s'] = None
+            continue
+
+        result['baseline_s'] = base['best_s']
+        result['time_ratio'] = result['best_s'] / base['best_s'] if base['best_s'] else None
+
+        if (result['best_s'] > base['best_s'] * (1 + tolerance)
+                and result['best_s'] - base['best_s'] > MIN_SECONDS_DELTA):
+            result['regression'].append(
+                f"time {base['best_s']:.3f}s -> {result['best_s']:.3f}s "
+                f"({result['best_s'] / base['best_s']:.2f}x)"
+            )
+        if (result['rss_growth_mb'] > base['rss_growth_mb'] * (1 + tolerance)
+                and result['rss_growth_mb'] - base['rss_growth_mb'] > MIN_RSS_DELTA_MB):
+            result['regression'].append(
+                f"peak RSS growth {base['rss_growth_mb']:.0f} MB -> {result['rss_growth_mb']:.0f} MB"
+            )
+        for problem in result['regression']:
+            regressions.append(f"{result_key(result)}: {problem}")
+
+    return regressions
+
+
+def load_json(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_json(payload, path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, indent=2)
+
+
+# =============================================================================
+# MAIN
+# =============================================================================
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Time each pipeline stage on synthetic data")
+    parser.add_argument('--scales', type=float_list, default=BENCHMARK_SCALES, metavar='S,S',
+                        help="data sizes relative to the baseline")
+    parser.add_argument('--repeats', type=positive_int, default=3, help="runs per stage (best is reported)")
+    parser.add_argument('--tolerance', type=float, default=BENCHMARK_TOLERANCE,
+                        help="allowed slowdown against the baseline")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--stages', type=comma_list, metavar='A,B', help="stages to run (default: all)")
+    parser.add_argument('--save-baseline', action='store_true', help="store these results as the baseline")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    scales, repeats, tolerance, seed = args.scales, args.repeats, args.tolerance, args.seed
+
+    # The stage functions are instrumented; keep run telemetry out of the timings
+    set_enabled(False)
+
+    print("\n" + "="*60)
+    print("BENCHMARK: PIPELINE STAGES")
+    print("="*60)
+
+    with redirect_stdout(StringIO()):
+        modules = {
+            'cleaning': load_script('02_data_cleaning.py'),
+            'readiness': load_script('04_dimension2_readiness.py'),
+            'integrity': load_script('05_dimension3_integrity.py'),
+            'report': load_script('06_report_generation.py'),
+        }
+    stages = build_stages(modules)
+
+    selected = args.stages or list(stages)
+    unknown = set(selected) - set(stages)
+    if unknown:
+        print(f"❌ Unknown stage(s): {', '.join(sorted(unknown))}")
+        print(f"   Available: {', '.join(stages)}")
+        return 2
+
+    if 'report_generate' in selected and not os.path.exists(
+            os.path.join(TABLES_DIR, 'dim1_summary_statistics.csv')):
+        print("⚠️  No output tables found - skipping report_generate (run 03-05 first)")
+        selected = [s for s in selected if s != 'report_generate']
+
+    print(f"  Scales: {', '.join(f'{s:g}x' for s in scales)}")
+    print(f"  Stages: {', '.join(selected)}")
+    print(f"  Repeats: {repeats} (best time reported)")
+
+    results = []
+    for scale in scales:
+        print(f"\n📦 Generating synthetic data at {scale:g}x...")
+        start = time.perf_counter()
+        data = StageInputs(scale, seed, modules['cleaning'], modules['integrity'])
+        print(f"  ✓ {data.raw_rows:,} raw rows, {len(data.merged):,} merged rows "
+              f"({time.perf_counter() - start:.1f}s)")
+
+        for name in selected:
+            func, make_args, count_rows, scaled = stages[name]
+            if not scaled and scale != scales[0]:
+                continue
+
+            print(f"  ⏱️  {name}...", end='', flush=True)
+            timing = measure(func, lambda: make_args(data), repeats)
+            rows = count_rows(data)
+            result = {
+                'stage': name,
+                'scale': scale if scaled else None,
+                'rows': rows,
+                'rows_per_s': rows / timing['best_s'] if rows and timing['best_s'] else None,
+                **timing
+            }
+            results.append(result)
+            print(f" {timing['best_s']:.3f}s, +{timing['rss_growth_mb']:.0f} MB RSS")
+
+        data.cleanup()
+        del data
+        gc.collect()
+
+    baseline = load_json(BASELINE_PATH)
+    regressions = compare_to_baseline(results, baseline, tolerance)
+
+    print(f"\n{'Stage':<32}{'Scale':>7}{'Rows':>11}{'Best (s)':>10}{'Rows/s':>12}{'RSS MB':>8}{'vs base':>9}")
+    print("-"*89)
+    for r in results:
+        scale = f"{r['scale']:g}x" if r['scale'] is not None else '-'
+        rows = f"{r['rows']:,}" if r['rows'] else '-'
+        rate = f"{r['rows_per_s']:,.0f}" if r['rows_per_s'] else '-'
+        ratio = f"{r['time_ratio']:.2f}x" if r.get('time_ratio') else '-'
+        flag = ' ⚠️' if r['regression'] else ''
+        print(f"{r['stage']:<32}{scale:>7}{rows:>11}{r['best_s']:>10.3f}{rate:>12}"
+              f"{r['rss_growth_mb']:>8.0f}{ratio:>9}{flag}")
+
+    payload = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'repeats': repeats,
+        'seed': seed,
+        'tolerance': tolerance,
+        'results': results,
+    }
+    save_json(payload, RESULTS_PATH)
+    print(f"\n📝 Results written to: {RESULTS_PATH}")
+
+    if args.save_baseline:
+        save_json(payload, BASELINE_PATH)
+        print(f"📌 Baseline saved to: {BASELINE_PATH}")
+    elif not baseline:
+        print("ℹ️  No baseline yet - run with --save-baseline to store one")
+
+    print("\n" + "="*60)
+    if regressions:
+        print(f"❌ {len(regressions)} REGRESSION(S) BEYOND {tolerance:.0%} TOLERANCE")
+        for regression in regressions:
+            print(f"   • {regression}")
+        print("="*60)
+        return 1
+
+    print("✅ NO REGRESSIONS" if baseline else "✅ BENCHMARK COMPLETE")
+    print("="*60)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
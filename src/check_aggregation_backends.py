@@ -0,0 +1,138 @@
+"""
+Aggregation Backend Check
+Run the pipeline's aggregating stage functions under every available backend
+(utils/aggregation.py) and confirm the results are identical to pandas
+
+Checks:
+- merge_datasets                        (02) on the cleaned datasets
+- calculate_district_metrics            (03) on merged data
+- calculate_district_readiness          (04) on merged data
+- detect_ue_ratio_anomalies,
+  detect_temporal_spikes,
+  detect_age_concentration_anomalies    (05) on merged data
+- district totals straight from merged_data.csv (file source, no frame in memory)
+
+Usage:
+    python src/check_aggregation_backends.py
+"""
+
+import os
+import sys
+import time
+from contextlib import redirect_stdout
+from io import StringIO
+
+import pandas as pd
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.config import PROCESSED_DATA_DIR
+from utils.aggregation import BACKENDS, aggregate, available_backends, get_backend, set_backend
+from utils.schema import read_dataset
+from utils.cli import load_script
+from utils.telemetry import set_enabled
+
+
+MERGED_PATH = os.path.join(PROCESSED_DATA_DIR, 'merged_data.csv')
+
+VALUE_COLUMNS = [
+    'age_0_5', 'age_5_17', 'age_18_greater',
+    'bio_age_5_17', 'bio_age_17_', 'demo_age_5_17', 'demo_age_17_'
+]
+
+
+def load_inputs():
+    clean = {}
+    for name in ['enrollment', 'biometric', 'demographic']:
+        clean[name] = read_dataset(os.path.join(PROCESSED_DATA_DIR, f'{name}_clean.csv'), name)
+    merged = read_dataset(MERGED_PATH, 'merged')
+    return clean, merged
+
+
+def build_checks(clean, merged):
+    """Check name -> callable returning a frame or tuple of frames"""
+    with redirect_stdout(StringIO()):
+        cleaning = load_script('02_data_cleaning.py')
+        coverage = load_script('03_dimension1_coverage.py')
+        readiness = load_script('04_dimension2_readiness.py')
+        integrity = load_script('05_dimension3_integrity.py')
+
+    return {
+        'merge_datasets': lambda: cleaning.merge_datasets(
+            clean['enrollment'], clean['biometric'], clean['demographic']),
+        'calculate_district_metrics': lambda: coverage.calculate_district_metrics(merged),
+        'calculate_district_readiness': lambda: readiness.calculate_district_readiness(merged),
+        'detect_ue_ratio_anomalies': lambda: integrity.detect_ue_ratio_anomalies(merged),
+        'detect_temporal_spikes': lambda: integrity.detect_temporal_spikes(merged),
+        'detect_age_concentration_anomalies': lambda: integrity.detect_age_concentration_anomalies(merged),
+        'district_totals_from_csv': lambda: aggregate(
+            MERGED_PATH, ['state', 'district'],
+            dict({col: 'sum' for col in VALUE_COLUMNS}, pincode='first')),
+    }
+
+
+def as_frames(result):
+    return list(result) if isinstance(result, tuple) else [result]
+
+
+def main():
+    print("\n" + "="*60)
+    print("AGGREGATION BACKEND CHECK")
+    print("="*60)
+
+    backends = available_backends()
+    missing = [b for b in BACKENDS if b not in backends]
+    print(f"  Backends: {', '.join(backends)}")
+    if missing:
+        print(f"  Not installed: {', '.join(missing)}")
+
+    set_enabled(False)
+    configured = get_backend()
+    clean, merged = load_inputs()
+    print(f"  Merged records: {len(merged):,}")
+    checks = build_checks(clean, merged)
+
+    failures = []
+    timings = {}
+    for name, run in checks.items():
+        reference = None
+        for backend in backends:
+            set_backend(backend)
+            with redirect_stdout(StringIO()):
+                start = time.perf_counter()
+                result = as_frames(run())
+                timings[(name, backend)] = time.perf_counter() - start
+
+            if reference is None:
+                reference = result
+                continue
+            try:
+                for expected, actual in zip(reference, result):
+                    pd.testing.assert_frame_equal(
+                        expected.reset_index(drop=True), actual.reset_index(drop=True)
+                    )
+            except AssertionError as e:
+                failures.append((name, backend, str(e).splitlines()[0]))
+    set_backend(configured)
+
+    print(f"\n{'Check':<38}" + "".join(f"{b:>10}" for b in backends))
+    print("-" * (38 + 10 * len(backends)))
+    for name in checks:
+        print(f"{name:<38}" + "".join(f"{timings[(name, b)]:>9.3f}s" for b in backends))
+
+    print("\n" + "="*60)
+    if failures:
+        print(f"❌ {len(failures)} RESULT MISMATCH(ES) vs pandas")
+        for name, backend, message in failures:
+            print(f"   • {name} [{backend}]: {message}")
+        print("="*60)
+        return 1
+
+    print(f"✅ All backends match pandas ({len(checks)} checks)")
+    print("="*60)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
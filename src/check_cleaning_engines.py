@@ -0,0 +1,109 @@
+"""
+Cleaning Engine Check
+Run the 02_data_cleaning.py pipeline with every available engine
+(utils/cleaning_engines.py) and confirm the results are identical to the
+step-by-step pandas flow
+
+Compares the three clean datasets, the merged dataset, and the merged totals
+checked against GROUND_TRUTH by verify_totals().
+
+Usage:
+    python src/check_cleaning_engines.py
+"""
+
+import os
+import sys
+import time
+from contextlib import redirect_stdout
+from io import StringIO
+
+import pandas as pd
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.cleaning_engines import ENGINES, available_engines, run_cleaning
+from utils.cli import load_script
+from utils.telemetry import RSSSampler, set_enabled
+
+
+def run_pandas(cleaning):
+    """The step-by-step flow of 02_data_cleaning.main(), without saving"""
+    frames = cleaning.load_datasets()
+    frames = [cleaning.standardize_dates(df, 'date') for df in frames]
+    frames = [cleaning.standardize_state_names(df) for df in frames]
+    frames = [cleaning.standardize_district_names(df) for df in frames]
+    names = ['enrollment', 'biometric', 'demographic']
+    frames = [cleaning.enforce_schema(df, name) for df, name in zip(frames, names)]
+    merged = cleaning.merge_datasets(*frames)
+    return dict(zip(names, frames)), merged
+
+
+def run_engine(cleaning, engine):
+    clean, aggregated = run_cleaning(engine)
+    merged = cleaning.merge_aggregated(
+        aggregated['enrollment'], aggregated['biometric'], aggregated['demographic']
+    )
+    return clean, merged
+
+
+def main():
+    print("\n" + "="*60)
+    print("CLEANING ENGINE CHECK")
+    print("="*60)
+
+    engines = available_engines()
+    missing = [e for e in ENGINES if e not in engines]
+    print(f"  Engines: {', '.join(engines)}")
+    if missing:
+        print(f"  Not installed: {', '.join(missing)}")
+
+    set_enabled(False)
+    with redirect_stdout(StringIO()):
+        cleaning = load_script('02_data_cleaning.py')
+
+    results, stats = {}, {}
+    for engine in engines:
+        with redirect_stdout(StringIO()), RSSSampler() as rss:
+            start = time.perf_counter()
+            clean, merged = run_pandas(cleaning) if engine == 'pandas' else run_engine(cleaning, engine)
+            seconds = time.perf_counter() - start
+            matches = cleaning.verify_totals(merged)
+        results[engine] = (clean, merged)
+        stats[engine] = (seconds, rss.growth_mb, len(merged), matches)
+
+    failures = []
+    reference_clean, reference_merged = results['pandas']
+    for engine in engines[1:]:
+        clean, merged = results[engine]
+        pairs = [(name, reference_clean[name], clean[name]) for name in reference_clean]
+        pairs.append(('merged', reference_merged, merged))
+        for name, expected, actual in pairs:
+            try:
+                pd.testing.assert_frame_equal(
+                    expected.reset_index(drop=True), actual.reset_index(drop=True)
+                )
+            except AssertionError as e:
+                failures.append((engine, name, str(e).splitlines()[0]))
+
+    print(f"\n{'Engine':<10} {'Seconds':>9} {'RSS growth':>12} {'Merged rows':>13} {'Ground truth':>14}")
+    print("-" * 62)
+    for engine, (seconds, growth, rows, matches) in stats.items():
+        print(f"{engine:<10} {seconds:>8.2f}s {growth:>9.0f} MB {rows:>13,} "
+              f"{'MATCH' if matches else 'MISMATCH':>14}")
+
+    print("\n" + "="*60)
+    if failures:
+        print(f"❌ {len(failures)} RESULT MISMATCH(ES) vs pandas")
+        for engine, name, message in failures:
+            print(f"   • {name} [{engine}]: {message}")
+        print("="*60)
+        return 1
+
+    print(f"✅ All engines match pandas ({len(engines)} engines)")
+    print("="*60)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
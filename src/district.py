@@ -442,6 +442,7 @@ import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from utils.config import PROCESSED_DATA_DIR
+from utils.column_store import read_merged
 
 print("="*80)
 print("PINCODE GEOGRAPHIC CONSISTENCY ANALYSIS")
@@ -450,7 +451,7 @@ print()
 
 # Load merged dataset
 print("Loading merged dataset...")
-df = pd.read_csv(os.path.join(PROCESSED_DATA_DIR, 'merged_data.csv'))
+df = read_merged()
 print(f"✓ Loaded {len(df):,} records")
 print()
 
@@ -693,7 +694,9 @@ print("   New districts created in 2023-2024 may cause confusion")
 print()
 
 # Check if certain districts appear more frequently
-district_with_multi_pincode = df[df['pincode'].isin(multi_district_pincodes['pincode'])]['district'].value_counts().head(10)
+district_with_multi_pincode = df[df['pincode'].isin(multi_district_pincodes['pincode'])]['district'].value_counts()
+# district is categorical: leave out the categories with no records here
+district_with_multi_pincode = district_with_multi_pincode[district_with_multi_pincode > 0].head(10)
 print("   Top 10 districts with most multi-mapped pincodes:")
 for district, count in district_with_multi_pincode.items():
     print(f"     {district:40s}: {count:,} records")
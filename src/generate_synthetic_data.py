@@ -0,0 +1,78 @@
+"""
+Synthetic Data Generator
+Write UIDAI-shaped raw shards (api_data_aadhar_*) for scale benchmarks
+
+Scale 1 reproduces the 4.94M-row baseline layout; scale 100 writes ~494M rows.
+Shards are written in chunks, so memory use does not grow with scale.
+
+Usage:
+    python src/generate_synthetic_data.py [--scale X] [--seed N] [--out DIR]
+                                          [--workers N] [--chunksize N] [--force]
+
+--out defaults to data/raw so 00/01/02 pick the shards up unchanged. Existing
+shards are only replaced with --force.
+"""
+
+import os
+import sys
+import time
+import argparse
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.config import RAW_DATA_DIR
+from utils.synthetic_data import BASELINE_ROWS, DATASETS, write_shards
+from utils.cli import positive_float, positive_int
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Write UIDAI-shaped raw shards for scale benchmarks")
+    parser.add_argument('--scale', type=positive_float, default=1.0, help="1 = the 4.94M-row baseline")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', default=RAW_DATA_DIR, metavar='DIR')
+    parser.add_argument('--workers', type=positive_int, default=1)
+    parser.add_argument('--chunksize', type=positive_int, default=500_000, help="rows written per chunk")
+    parser.add_argument('--force', action='store_true', help="overwrite existing shards")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    scale, seed, out_dir = args.scale, args.seed, args.out
+    workers, chunksize = args.workers, args.chunksize
+
+    print("\n" + "="*60)
+    print("SYNTHETIC UIDAI DATA GENERATOR")
+    print("="*60)
+    print(f"  Scale: {scale:g}x (~{int(BASELINE_ROWS * scale):,} rows)")
+    print(f"  Seed: {seed}")
+    print(f"  Output: {out_dir}")
+
+    existing = [
+        f for spec in DATASETS.values() for f in spec['files']
+        if os.path.exists(os.path.join(out_dir, f))
+    ]
+    if existing and not args.force:
+        print(f"\n⚠️  {len(existing)} shard(s) already exist in {out_dir}")
+        print("   Re-run with --force to overwrite them")
+        return 1
+
+    start = time.time()
+
+    def report(path, rows):
+        size_mb = os.path.getsize(path) / 1024**2
+        print(f"  ✓ {os.path.basename(path)}: {rows:,} rows ({size_mb:,.1f} MB)")
+
+    written = write_shards(out_dir, scale=scale, seed=seed, chunksize=chunksize,
+                           max_workers=workers, on_shard=report)
+
+    elapsed = time.time() - start
+    total_rows = sum(rows for _, rows in written)
+    print(f"\n✓ Wrote {len(written)} shards, {total_rows:,} rows in {elapsed:.1f}s "
+          f"({total_rows / max(elapsed, 1e-9):,.0f} rows/sec)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
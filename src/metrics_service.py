@@ -0,0 +1,272 @@
+"""
+Metrics Service
+Local HTTP/JSON lookups of district and pincode metrics from the dimension tables
+
+Serves the lookup tables written by stages 03-05 (utils/metrics_index.py)
+from memory. Answers are cached (LRU) as encoded JSON. Every
+METRICS_RELOAD_SECONDS the service checks the tables' mtimes; when a stage
+has rewritten them it builds a new index and swaps it in, together with an
+empty cache. Requests keep being answered from the previous index meanwhile,
+and a table caught half-written is picked up at the next check.
+
+Usage:
+    python src/metrics_service.py [--host 127.0.0.1] [--port 8765]
+
+Endpoints (GET, JSON):
+    /health                                   tables loaded, cache statistics
+    /states                                   states and their district counts
+    /district?state=Bihar&district=Patna      one district
+    /districts?state=Bihar                    all districts of a state
+    /districts?metric=ue_ratio&min=20&max=50  districts with the metric in range
+                                              (optional &state=..., &limit=N)
+    /pincode/110001                           one pincode
+    /pincodes?from=110001&to=110099           pincodes in a number range
+    /pincodes?metric=risk_score&min=5         pincodes with the metric in range
+                                              (optional &state=..., &limit=N)
+"""
+
+import os
+import sys
+import json
+import argparse
+import time
+import threading
+from functools import lru_cache
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qsl
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.config import (
+    TABLES_DIR, METRICS_SERVICE_HOST, METRICS_SERVICE_PORT,
+    METRICS_CACHE_SIZE, METRICS_RELOAD_SECONDS
+)
+from utils.metrics_index import MetricsIndex, table_signature
+from utils.cli import positive_int
+
+
+# Records returned by a range lookup unless &limit= says otherwise
+DEFAULT_LIMIT = 1000
+
+
+class QueryError(Exception):
+    """Request that cannot be answered (HTTP status + message)"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _param(params, name, cast=str, default=None):
+    if name not in params:
+        return default
+    try:
+        return cast(params[name])
+    except ValueError:
+        raise QueryError(400, f"Invalid value for '{name}': {params[name]!r}")
+
+
+def _listing(records, params):
+    limit = _param(params, 'limit', int, DEFAULT_LIMIT)
+    return {'count': len(records), 'truncated': len(records) > limit, 'results': records[:limit]}
+
+
+def _metric_range(index, level, params):
+    metric = params['metric']
+    try:
+        records = index.metric_range(
+            level, metric,
+            _param(params, 'min', float), _param(params, 'max', float),
+            params.get('state')
+        )
+    except KeyError:
+        fields = index.district_metrics if level == 'district' else index.pincode_metrics
+        raise QueryError(400, f"Unknown {level} metric '{metric}' (choose from {', '.join(fields)})")
+    return _listing(records, params)
+
+
+def answer(index, path, query):
+    """
+    Answer one request from an index
+
+    Parameters:
+    -----------
+    index : MetricsIndex
+        Index to read
+    path : str
+        Request path
+    query : tuple
+        Sorted (name, value) pairs of the query string
+
+    Returns:
+    --------
+    tuple
+        (HTTP status, encoded JSON body)
+    """
+    params = dict(query)
+    parts = [p for p in path.split('/') if p]
+    try:
+        if parts == ['states']:
+            body = [{'state': state, 'districts': n} for state, n in index.state_names()]
+        elif parts == ['district']:
+            if 'state' not in params or 'district' not in params:
+                raise QueryError(400, "Pass both 'state' and 'district'")
+            body = index.district(params['state'], params['district'])
+            if body is None:
+                raise QueryError(404, f"No district '{params['district']}' in '{params['state']}'")
+        elif parts == ['districts']:
+            if 'metric' in params:
+                body = _metric_range(index, 'district', params)
+            elif 'state' in params:
+                records = index.state_districts(params['state'])
+                if not records:
+                    raise QueryError(404, f"No districts for state '{params['state']}'")
+                body = _listing(records, params)
+            else:
+                raise QueryError(400, "Pass 'state' or 'metric'")
+        elif len(parts) == 2 and parts[0] == 'pincode':
+            if not parts[1].isdigit():
+                raise QueryError(400, f"Invalid pincode: {parts[1]!r}")
+            body = index.pincode(parts[1])
+            if body is None:
+                raise QueryError(404, f"No pincode {parts[1]}")
+        elif parts == ['pincodes']:
+            if 'metric' in params:
+                body = _metric_range(index, 'pincode', params)
+            elif 'from' in params or 'to' in params:
+                first = _param(params, 'from', int, 0)
+                last = _param(params, 'to', int, 999999)
+                body = _listing(index.pincode_range(first, last), params)
+            else:
+                raise QueryError(400, "Pass 'from'/'to' or 'metric'")
+        else:
+            raise QueryError(404, f"Unknown endpoint: {path}")
+        status = 200
+    except QueryError as e:
+        status, body = e.status, {'error': str(e)}
+    return status, json.dumps(body).encode('utf-8')
+
+
+class MetricsService:
+    """
+    Current index and its answer cache, rebuilt when the tables change
+
+    Parameters:
+    -----------
+    tables_dir : str
+        Directory holding the dimension tables
+    cache_size : int
+        Answers kept per index (LRU)
+    reload_seconds : float
+        Minimum time between checks of the tables' mtimes
+    """
+
+    def __init__(self, tables_dir=TABLES_DIR, cache_size=METRICS_CACHE_SIZE,
+                 reload_seconds=METRICS_RELOAD_SECONDS):
+        self.tables_dir = tables_dir
+        self.cache_size = cache_size
+        self.reload_seconds = reload_seconds
+        self.loads = 0
+        self._lock = threading.Lock()
+        self._checked = 0.0
+        self._state = None
+        self._load()
+
+    def _load(self):
+        started = time.perf_counter()
+        index = MetricsIndex(self.tables_dir)
+        cached = lru_cache(maxsize=self.cache_size)(lambda path, query: answer(index, path, query))
+        # One assignment, so a request sees either the old or the new pair
+        self._state = (index, cached, time.time())
+        self.loads += 1
+        print(f"✓ Loaded metrics: {len(index.districts):,} districts, {len(index.pincodes):,} pincodes "
+              f"({(time.perf_counter() - started) * 1000:.0f} ms)")
+
+    def _refresh(self):
+        now = time.monotonic()
+        if now - self._checked < self.reload_seconds or not self._lock.acquire(blocking=False):
+            return
+        try:
+            self._checked = now
+            if table_signature(self.tables_dir) != self._state[0].signature:
+                try:
+                    self._load()
+                except Exception as e:
+                    # Probably a table still being written; retry at the next check
+                    print(f"⚠️  Reload failed, keeping previous metrics: {type(e).__name__}: {e}")
+        finally:
+            self._lock.release()
+
+    def query(self, path, query):
+        self._refresh()
+        _, cached, _ = self._state
+        return cached(path, tuple(sorted(query)))
+
+    def health(self):
+        index, cached, loaded_at = self._state
+        info = cached.cache_info()
+        body = {
+            'tables_dir': self.tables_dir,
+            'tables': {name: index.rows.get(name) for name, _ in index.signature},
+            'districts': len(index.districts),
+            'pincodes': len(index.pincodes),
+            'loaded_at': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(loaded_at)),
+            'loads': self.loads,
+            'cache': {'hits': info.hits, 'misses': info.misses, 'size': info.currsize, 'max_size': info.maxsize},
+        }
+        return 200, json.dumps(body).encode('utf-8')
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    service = None
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path.rstrip('/') == '/health':
+            self.service._refresh()
+            status, body = self.service.health()
+        else:
+            status, body = self.service.query(url.path, parse_qsl(url.query))
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Keep the console for load/reload messages
+        pass
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Serve district metrics over HTTP")
+    parser.add_argument('--host', default=METRICS_SERVICE_HOST)
+    parser.add_argument('--port', type=positive_int, default=METRICS_SERVICE_PORT)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    host, port = args.host, args.port
+
+    print("\n" + "="*60)
+    print("METRICS SERVICE")
+    print("="*60)
+
+    MetricsHandler.service = MetricsService()
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    print(f"✓ Serving on http://{host}:{port} (tables: {TABLES_DIR})")
+    print("  Press Ctrl+C to stop")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n✓ Stopped")
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
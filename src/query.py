@@ -0,0 +1,98 @@
+"""
+Ad-hoc Query Tool
+Answer one-off questions about the merged data from the command line
+
+Replaces throwaway scripts that parse merged_data.csv and group it by hand
+(see utils/adhoc_query.py for how filters are pushed down and results cached).
+
+Usage:
+    python src/query.py LEVEL [--metric ue_ratio[,readiness_score,...]]
+                              [--by month|date] [--state Bihar[,Assam]]
+                              [--district NAME[,NAME]] [--pincode 800001-800999]
+                              [--start YYYY-MM-DD] [--end YYYY-MM-DD]
+                              [--sort METRIC] [--top N]
+                              [--format table|csv|json] [--no-cache]
+
+    LEVEL is national, state, district or pincode (python src/query.py LEVEL -h
+    lists its options).
+
+Examples:
+    python src/query.py district --state Bihar --metric ue_ratio --by month
+    python src/query.py pincode --metric total_updates --top 20 --start 2025-04-01
+    python src/query.py state --metric readiness_score,total_bio_updates --format csv
+"""
+
+import os
+import sys
+import argparse
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.adhoc_query import run_query, parse_pincodes, QueryError, LEVELS, METRICS
+from utils.cli import add_window_arguments, comma_list, positive_int
+
+
+FORMATS = ('table', 'csv', 'json')
+
+
+def build_parser():
+    """One subcommand per aggregation level, all taking the same options"""
+    options = argparse.ArgumentParser(add_help=False)
+    options.add_argument('--metric', type=comma_list, default=['ue_ratio'],
+                         help=f"comma-separated metrics: {', '.join(METRICS)}")
+    options.add_argument('--by', choices=['month', 'date'], help="also group by month or date")
+    options.add_argument('--state', type=comma_list, help="comma-separated state names")
+    options.add_argument('--district', type=comma_list, help="comma-separated district names")
+    options.add_argument('--pincode', help="pincodes: 800001,800002 or a range 800001-800999")
+    add_window_arguments(options)
+    options.add_argument('--sort', metavar='METRIC', help="sort by this metric (descending)")
+    options.add_argument('--top', type=positive_int, metavar='N', help="keep the first N rows")
+    options.add_argument('--format', choices=FORMATS, default='table')
+    options.add_argument('--no-cache', action='store_true', help="ignore the query result cache")
+
+    parser = argparse.ArgumentParser(
+        prog='query.py', description="Answer one-off questions about the merged data"
+    )
+    levels = parser.add_subparsers(dest='level', metavar='LEVEL', required=True)
+    for level in LEVELS:
+        levels.add_parser(level, parents=[options], help=f"aggregate to {level} level")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    try:
+        result, info = run_query(
+            args.level,
+            args.metric,
+            by=args.by,
+            states=args.state,
+            districts=args.district,
+            pincodes=parse_pincodes(args.pincode),
+            start=args.start,
+            end=args.end,
+            sort=args.sort,
+            top=args.top,
+            use_cache=not args.no_cache,
+        )
+    except (QueryError, ValueError, FileNotFoundError) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+
+    if args.format == 'csv':
+        result.to_csv(sys.stdout, index=False)
+    elif args.format == 'json':
+        print(result.to_json(orient='records', indent=2))
+    else:
+        print(result.to_string(index=False) if len(result) else "(no rows)")
+
+    # Status on stderr, so csv/json output can be piped
+    source = 'cached' if info['cached'] else f"{info['rows_scanned']:,} rows scanned"
+    print(f"✓ {len(result):,} rows ({source}, {info['seconds'] * 1000:.0f} ms)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+"""
+Run Dimensions 1-3 Concurrently
+Load merged_data.csv once, place it in shared memory, and run
+03_dimension1_coverage.py, 04_dimension2_readiness.py and
+05_dimension3_integrity.py in parallel worker processes
+
+Workers attach to the shared block (utils/shared_frame.py) instead of each
+reading and parsing the CSV or receiving a pickled copy. Each dimension's
+console output goes to outputs/logs/<script>.log and its telemetry to its own
+run log, as if the script had been run on its own. The partition and figure
+pools inside each worker are limited to an equal share of the CPUs, so the
+nested pools never start more processes than there are cores.
+
+Usage:
+    python src/run_dimensions.py [--force] [--only dim1,dim3] [--workers N]
+                                 [--start YYYY-MM-DD] [--end YYYY-MM-DD]
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stdout
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.config import OUTPUTS_DIR, DIMENSION_WORKERS
+from utils.cli import load_script, stage_parser, parse_window_args, comma_list, positive_int
+from utils.lake import read_window, resolve_window
+from utils.shared_frame import share_frame, attach_frame, release
+from utils import partitioned, figures
+from utils.telemetry import get_telemetry, instrument
+
+
+DIMENSIONS = {
+    'dim1': '03_dimension1_coverage.py',
+    'dim2': '04_dimension2_readiness.py',
+    'dim3': '05_dimension3_integrity.py',
+}
+
+LOG_DIR = os.path.join(OUTPUTS_DIR, 'logs')
+
+
+@instrument
+def load_merged_data(start=None, end=None):
+    """Load the cleaned merged dataset (once, for all dimensions)"""
+    df = read_window(start, end)
+    print(f"✓ Loaded merged dataset: {len(df):,} records")
+    return df
+
+
+def child_budget(workers):
+    """Processes each dimension worker may start for its own pools"""
+    return max(1, (os.cpu_count() or 1) // max(1, workers))
+
+
+def _init_worker(budget):
+    """Process pool initializer: cap the dimension's partition and figure pools"""
+    partitioned.set_workers(budget)
+    figures.set_workers(budget)
+
+
+def run_dimension(file_name, layout, force, first_day=None, last_day=None):
+    """Worker: attach to the shared frame and run one dimension's main()"""
+    script = os.path.splitext(file_name)[0]
+    get_telemetry().reset(script)
+    log_path = os.path.join(LOG_DIR, f"{script}.log")
+
+    start = time.perf_counter()
+    df, block = attach_frame(layout)
+    try:
+        with open(log_path, 'w', encoding='utf-8') as log, redirect_stdout(log):
+            module = load_script(file_name)
+            skipped = module.main(force=force, df=df, start=first_day, end=last_day)[0] is None
+    finally:
+        del df
+        get_telemetry().finish()
+        try:
+            block.close()
+        except BufferError:
+            # A result still views the block; it is unmapped when the worker exits
+            pass
+
+    return {
+        'script': script,
+        'seconds': time.perf_counter() - start,
+        'skipped': skipped,
+        'log': log_path,
+    }
+
+
+def build_parser():
+    parser = stage_parser("Run dimensions 1-3 concurrently on shared merged data")
+    parser.add_argument('--only', type=comma_list, default=list(DIMENSIONS),
+                        help=f"comma-separated dimensions ({', '.join(DIMENSIONS)})")
+    parser.add_argument('--workers', type=positive_int, default=DIMENSION_WORKERS)
+    return parser
+
+
+@instrument
+def main(argv=None):
+    args = parse_window_args(build_parser(), argv)
+    force = args.force
+    selected = args.only
+    workers = args.workers
+    first_day, last_day, months = resolve_window(args.start, args.end)
+
+    unknown = [name for name in selected if name not in DIMENSIONS]
+    if unknown:
+        print(f"❌ Unknown dimension(s): {', '.join(unknown)} (choose from {', '.join(DIMENSIONS)})")
+        return 2
+
+    print("\n" + "="*60)
+    print("DIMENSIONS 1-3: CONCURRENT RUN")
+    print("="*60)
+
+    if first_day is not None:
+        print(f"  Window: {first_day.date()} to {last_day.date()} ({months} months)")
+
+    os.makedirs(LOG_DIR, exist_ok=True)
+    start = time.perf_counter()
+    df = load_merged_data(first_day, last_day)
+    block, layout = share_frame(df)
+    del df
+    pool_size = max(1, min(workers, len(selected)))
+    budget = child_budget(pool_size)
+    print(f"✓ Shared {block.size / 1024**2:,.1f} MB with {pool_size} worker(s)"
+          f" ({budget} process(es) each for partitions and figures)")
+
+    results, failures = [], []
+    try:
+        with ProcessPoolExecutor(max_workers=pool_size, initializer=_init_worker,
+                                 initargs=(budget,)) as pool:
+            futures = {
+                pool.submit(run_dimension, DIMENSIONS[name], layout, force, first_day, last_day): name
+                for name in selected
+            }
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    failures.append((name, f"{type(e).__name__}: {e}"))
+                    print(f"  ❌ {name}: {type(e).__name__}: {e}")
+                    continue
+                results.append(result)
+                status = 'up to date' if result['skipped'] else 'done'
+                print(f"  ✓ {result['script']:<28} {status:<11} {result['seconds']:>7.1f}s")
+    finally:
+        release(block)
+
+    wall = time.perf_counter() - start
+    serial = sum(r['seconds'] for r in results)
+    print(f"\n  Wall time: {wall:.1f}s (dimensions alone: {serial:.1f}s)")
+    print(f"  Logs: {LOG_DIR}")
+
+    print("\n" + "="*60)
+    if failures:
+        print(f"❌ {len(failures)} dimension(s) failed - see their logs in {LOG_DIR}")
+        print("="*60)
+        return 1
+    print("✅ Dimension analyses complete")
+    print("Next step: Run 06_report_generation.py")
+    print("="*60)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,396 @@
+"""
+Per-State PDF Reports
+Build the enhanced report once per state, in parallel worker processes
+
+For each state, the national dimension tables (03-05, including the full
+district and pincode lookup tables) are filtered to the state's rows, the
+top-10 lists and summary statistics are recomputed from them, and the
+dimension figures are redrawn from the filtered data with the scripts' own
+plotting functions. EnhancedAadhaarReport then builds the state's PDF from
+those tables and figures, with headline metrics from the state's merged
+records. Charts that compare states are taken from the national figures.
+
+District metrics are not recomputed per state, so quadrants, readiness bands
+and risk levels use the national thresholds and stay comparable across
+states. ReportLab builds are single-threaded and the states are
+independent, so they are spread over a process pool.
+
+Outputs (per state):
+    outputs/states/<State>/tables/      filtered dimension tables
+    outputs/states/<State>/figures/     state figures
+    outputs/states/<State>/UIDAI_<State>_Report.pdf
+    outputs/states/<State>/report.log   console output of the build
+
+Usage:
+    python src/run_state_reports.py [--states Bihar,Assam] [--workers N] [--force]
+"""
+
+import os
+import re
+import sys
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stdout
+
+import pandas as pd
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.config import TABLES_DIR, STATE_REPORTS_DIR, STATE_REPORT_WORKERS, CRITICAL_READINESS
+from utils.artifact_cache import get_artifact_cache
+from utils.figures import FigureSpec, render_figures
+from utils.telemetry import instrument
+from utils.cli import load_script, comma_list, positive_int
+
+
+# National tables filtered to each state (those present are used)
+STATE_TABLES = [
+    'dim1_district_metrics.csv',
+    'dim1_coverage_gap_districts.csv',
+    'dim1_crisis_zone_districts.csv',
+    'dim1_low_child_enrollment_districts.csv',
+    'dim2_district_readiness.csv',
+    'dim2_critical_readiness_districts.csv',
+    'dim2_low_readiness_districts.csv',
+    'dim2_moderate_readiness_districts.csv',
+    'dim2_all_at_risk_districts.csv',
+    'dim2_state_readiness_ranking.csv',
+    'dim3_pincode_metrics.csv',
+    'dim3_all_anomalous_pincodes.csv',
+    'dim3_all_critical_risk_pincodes.csv',
+    'dim3_high_risk_pincodes.csv',
+    'dim3_clustered_districts.csv',
+]
+
+# Full lookup tables the state summaries are computed from
+REQUIRED_TABLES = ['dim1_district_metrics.csv', 'dim2_district_readiness.csv', 'dim3_pincode_metrics.csv']
+
+_scripts = {}
+
+
+def _script(file_name):
+    """Pipeline script module, loaded once per process"""
+    if file_name not in _scripts:
+        _scripts[file_name] = load_script(file_name)
+    return _scripts[file_name]
+
+
+def state_slug(state):
+    """Directory-safe name of a state ('Jammu and Kashmir' -> 'Jammu_and_Kashmir')"""
+    return re.sub(r'[^A-Za-z0-9]+', '_', state).strip('_')
+
+
+def state_directory(state):
+    return os.path.join(STATE_REPORTS_DIR, state_slug(state))
+
+
+@instrument
+def load_national_tables(tables_dir=TABLES_DIR):
+    """National dimension tables that have a state column, by file name"""
+    missing = [name for name in REQUIRED_TABLES if not os.path.exists(os.path.join(tables_dir, name))]
+    if missing:
+        raise FileNotFoundError(
+            f"Missing {', '.join(missing)} in {tables_dir} - run the dimension analyses (03-05) first"
+        )
+    tables = {}
+    for name in STATE_TABLES:
+        path = os.path.join(tables_dir, name)
+        if os.path.exists(path):
+            tables[name] = pd.read_csv(path)
+    return tables
+
+
+# =============================================================================
+# STATE TABLES
+# =============================================================================
+
+def _count(df, column, value):
+    return int((df[column] == value).sum()) if df is not None and len(df) else 0
+
+
+def state_tables(frames):
+    """
+    Priority lists and summary statistics of one state
+
+    Parameters:
+    -----------
+    frames : dict
+        National tables filtered to the state, by file name
+
+    Returns:
+    --------
+    dict
+        File name -> DataFrame, with the same names and columns as the
+        national tables the report reads
+    """
+    tables = dict(frames)
+    empty = pd.DataFrame()
+    districts = frames['dim1_district_metrics.csv']
+    readiness = frames['dim2_district_readiness.csv']
+    pincodes = frames['dim3_pincode_metrics.csv']
+    coverage_gap = frames.get('dim1_coverage_gap_districts.csv', empty)
+    crisis_zone = frames.get('dim1_crisis_zone_districts.csv', empty)
+    low_child = frames.get('dim1_low_child_enrollment_districts.csv', empty)
+    critical = frames.get('dim2_critical_readiness_districts.csv', empty)
+    low = frames.get('dim2_low_readiness_districts.csv', empty)
+    at_risk = frames.get('dim2_all_at_risk_districts.csv', empty)
+    anomalous = frames.get('dim3_all_anomalous_pincodes.csv', empty)
+    clustered = frames.get('dim3_clustered_districts.csv', empty)
+
+    # National lists are already sorted by priority, so the state's top 10 are its first rows
+    top_10 = {
+        'dim1_top10_crisis_zone_districts.csv': 'dim1_crisis_zone_districts.csv',
+        'dim2_top10_at_risk_districts.csv': 'dim2_all_at_risk_districts.csv',
+        'dim3_top10_critical_risk_pincodes.csv': 'dim3_all_critical_risk_pincodes.csv',
+    }
+    for name, source in top_10.items():
+        if source in frames:
+            tables[name] = frames[source].head(10)
+
+    tables['dim1_summary_statistics.csv'] = pd.DataFrame([{
+        'Total Districts Analyzed': len(districts),
+        'Coverage Gap Districts': len(coverage_gap),
+        'Low Child Enrollment Districts': len(low_child),
+        'Crisis Zone Districts': len(crisis_zone),
+        'Healthy & Growing Districts': _count(districts, 'quadrant', 'Healthy & Growing'),
+        'New Users Need Engagement Districts': _count(districts, 'quadrant', 'New Users Need Engagement'),
+        'Top 10 Crisis Zone Districts': min(10, len(crisis_zone)),
+        'Average UE Ratio': districts['ue_ratio'].mean(),
+        'Median UE Ratio': districts['ue_ratio'].median()
+    }])
+
+    tables['dim2_summary_statistics.csv'] = pd.DataFrame([{
+        'Total Districts Analyzed': len(readiness),
+        'Critical Readiness Districts': len(critical),
+        'Low Readiness Districts': len(low),
+        'All At-Risk Districts (Low+Critical)': len(at_risk),
+        'High Risk Districts': int((readiness['readiness_score'] < CRITICAL_READINESS).sum()),
+        'Good Readiness Districts': _count(readiness, 'readiness_category', 'Good'),
+        'Moderate Readiness Districts': _count(readiness, 'readiness_category', 'Moderate'),
+        'Average Readiness Score': readiness['readiness_score'].mean(),
+        'Median Readiness Score': readiness['readiness_score'].median(),
+        'Total Estimated At-Risk Youth': readiness['estimated_at_risk_youth'].sum()
+    }])
+
+    tables['dim3_summary_statistics.csv'] = pd.DataFrame([{
+        'Total Pincodes Analyzed': len(pincodes),
+        'Anomalous Pincodes': len(anomalous),
+        'Critical Risk (All)': _count(anomalous, 'risk_level', 'Critical'),
+        'Critical Risk (Top 10)': min(10, _count(anomalous, 'risk_level', 'Critical')),
+        'High Risk': _count(anomalous, 'risk_level', 'High'),
+        'Medium Risk': _count(anomalous, 'risk_level', 'Medium'),
+        'Low Risk': _count(anomalous, 'risk_level', 'Low'),
+        'Districts with Clustering': len(clustered)
+    }])
+    return tables
+
+
+def state_figure_specs(tables):
+    """Dimension figures of one state, drawn with the dimension scripts' plot functions"""
+    dim1 = _script('03_dimension1_coverage.py')
+    dim2 = _script('04_dimension2_readiness.py')
+    dim3 = _script('05_dimension3_integrity.py')
+    districts = tables['dim1_district_metrics.csv']
+    readiness = tables['dim2_district_readiness.csv']
+    pincodes = tables['dim3_pincode_metrics.csv']
+    low_child = tables.get('dim1_low_child_enrollment_districts.csv', pd.DataFrame())
+    anomalous = tables.get('dim3_all_anomalous_pincodes.csv', pd.DataFrame())
+    clustered = tables.get('dim3_clustered_districts.csv', pd.DataFrame())
+
+    specs = [
+        FigureSpec('dim1_ue_ratio_distribution.png', dim1.plot_ue_ratio_distribution,
+                   ue_data=districts.loc[districts['ue_ratio'] > 0, 'ue_ratio']),
+        FigureSpec('dim1_2x2_matrix.png', dim1.plot_2x2_matrix,
+                   districts=districts[['quadrant', 'total_enrollment', 'total_updates']]),
+        FigureSpec('dim2_readiness_distribution.png', dim2.plot_readiness_distribution,
+                   readiness_data=readiness.loc[readiness['readiness_score'] > 0, 'readiness_score']),
+        FigureSpec('dim3_ue_ratio_distribution.png', dim3.plot_ue_ratio_distribution,
+                   plot_data=pincodes.loc[pincodes['ue_ratio'] < 200, 'ue_ratio']),
+    ]
+
+    # Districts with no biometric updates have no category; a pie of nothing cannot be drawn
+    readiness_counts = readiness['readiness_category'].value_counts()
+    if readiness_counts.sum() > 0:
+        specs.append(FigureSpec('dim2_readiness_categories.png', dim2.plot_readiness_categories,
+                                readiness_counts=readiness_counts))
+
+    if len(low_child) > 0:
+        specs.append(FigureSpec('dim1_low_child_enrollment.png', dim1.plot_low_child_enrollment,
+                                top_20_low_child=low_child.head(20)[['state', 'district', 'child_total_pct']]))
+
+    very_high_child = districts[districts['child_total_pct'] > 98].nlargest(20, 'child_total_pct')
+    if len(very_high_child) > 0:
+        specs.append(FigureSpec('dim1_very_high_child_enrollment.png', dim1.plot_very_high_child_enrollment,
+                                very_high_child=very_high_child[['state', 'district', 'child_total_pct']]))
+
+    high_risk = readiness[readiness['readiness_score'] < CRITICAL_READINESS]
+    if len(high_risk) > 0:
+        top_20_risk = high_risk.sort_values('estimated_at_risk_youth', ascending=False).head(20)
+        specs.append(FigureSpec('dim2_high_risk_districts.png', dim2.plot_high_risk_districts,
+                                top_20_risk=top_20_risk[['state', 'district', 'estimated_at_risk_youth']]))
+
+    scatter_data = readiness[(readiness['readiness_score'] > 0) & (readiness['estimated_at_risk_youth'] > 0)]
+    if len(scatter_data) > 0:
+        specs.append(FigureSpec('dim2_scatter_readiness_vs_update_rate.png', dim2.plot_readiness_vs_update_rate,
+                                scatter_data=scatter_data[['readiness_category', 'readiness_gap',
+                                                           'estimated_at_risk_youth']]))
+
+    if len(anomalous) > 0:
+        specs.append(FigureSpec('dim3_risk_distribution.png', dim3.plot_risk_distribution,
+                                risk_counts=anomalous['risk_level'].value_counts()))
+        specs.append(FigureSpec('dim3_top_anomalies.png', dim3.plot_top_anomalies,
+                                top_20=anomalous.head(20)[['pincode', 'state', 'district', 'risk_score', 'risk_level']]))
+        anomaly_types = {
+            'Extreme UE (>100)': anomalous['has_extreme_ue'].sum(),
+            'High UE (>25)': anomalous['has_high_ue'].sum(),
+            'Age Concentration': anomalous['has_age_anomaly'].sum(),
+            'Temporal Spikes': anomalous['has_temporal_spike'].sum()
+        }
+        anomaly_types = {k: v for k, v in anomaly_types.items() if v > 0}
+        if anomaly_types:
+            specs.append(FigureSpec('dim3_anomaly_types.png', dim3.plot_anomaly_types,
+                                    anomaly_types=anomaly_types))
+
+    if len(clustered) > 0:
+        top_districts = clustered.nlargest(20, 'anomaly_count')
+        specs.append(FigureSpec('dim3_geographic_clustering.png', dim3.plot_geographic_clustering,
+                                top_districts=top_districts[['state', 'district', 'anomaly_count']]))
+    return specs
+
+
+# =============================================================================
+# WORKER
+# =============================================================================
+
+def build_state_report(state, frames, force=False):
+    """
+    Worker: write one state's tables and figures and build its PDF
+
+    Parameters:
+    -----------
+    state : str
+        State name as in the tables
+    frames : dict
+        National tables filtered to the state, by file name
+    force : bool
+        Redraw figures even if their data is unchanged
+
+    Returns:
+    --------
+    dict with 'state', 'path', 'seconds' and 'log'
+    """
+    start = time.perf_counter()
+    directory = state_directory(state)
+    tables_dir = os.path.join(directory, 'tables')
+    figures_dir = os.path.join(directory, 'figures')
+    os.makedirs(tables_dir, exist_ok=True)
+    log_path = os.path.join(directory, 'report.log')
+    report_path = os.path.join(directory, f"UIDAI_{state_slug(state)}_Report.pdf")
+    group = f"state_{state_slug(state)}"
+
+    with open(log_path, 'w', encoding='utf-8') as log, redirect_stdout(log):
+        print(f"📋 Writing {state} tables...")
+        artifacts = get_artifact_cache(group)
+        tables = state_tables(frames)
+        for name, df in tables.items():
+            artifacts.write_csv(df, os.path.join(tables_dir, name), index=False)
+        artifacts.save()
+
+        print(f"\n📊 Drawing {state} figures...")
+        specs = state_figure_specs(tables)
+        # Figures with no data for this state this time must not linger from an earlier run
+        current = {spec.filename for spec in specs}
+        if os.path.isdir(figures_dir):
+            for file_name in os.listdir(figures_dir):
+                if file_name.endswith('.png') and file_name not in current:
+                    os.remove(os.path.join(figures_dir, file_name))
+        render_figures(specs, group=group, max_workers=1, force=force, directory=figures_dir)
+
+        report_module = _script('06_report_generation.py')
+        report = report_module.EnhancedAadhaarReport(
+            report_path=report_path, state=state, tables_dir=tables_dir, figures_dir=figures_dir
+        )
+        report.generate()
+
+    return {
+        'state': state,
+        'path': report_path,
+        'seconds': time.perf_counter() - start,
+        'log': log_path,
+    }
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Build a PDF report for each state")
+    parser.add_argument('--states', type=comma_list, metavar='A,B', help="states to build (default: all)")
+    parser.add_argument('--workers', type=positive_int, default=STATE_REPORT_WORKERS)
+    parser.add_argument('--force', action='store_true', help="rebuild reports whose inputs are unchanged")
+    return parser
+
+
+@instrument
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    force, workers, requested = args.force, args.workers, args.states
+
+    print("\n" + "="*60)
+    print("PER-STATE PDF REPORTS")
+    print("="*60)
+
+    try:
+        tables = load_national_tables()
+    except FileNotFoundError as e:
+        print(f"❌ {e}")
+        return 1
+
+    known = sorted(tables['dim1_district_metrics.csv']['state'].dropna().unique())
+    if requested:
+        lookup = {state.casefold(): state for state in known}
+        unknown = [name for name in requested if name.casefold() not in lookup]
+        if unknown:
+            print(f"❌ Unknown state(s): {', '.join(unknown)}")
+            return 2
+        states = [lookup[name.casefold()] for name in requested]
+    else:
+        states = known
+
+    workers = max(1, min(workers, len(states)))
+    print(f"✓ Building {len(states)} state report(s) with {workers} worker(s)")
+
+    start = time.perf_counter()
+    results, failures = [], []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {}
+        for state in states:
+            frames = {name: df[df['state'] == state] for name, df in tables.items()}
+            futures[pool.submit(build_state_report, state, frames, force)] = state
+        for future in as_completed(futures):
+            state = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                failures.append(state)
+                print(f"  ❌ {state}: {type(e).__name__}: {e}")
+                continue
+            results.append(result)
+            print(f"  ✓ {state:<40} {result['seconds']:>6.1f}s")
+
+    wall = time.perf_counter() - start
+    serial = sum(r['seconds'] for r in results)
+    print(f"\n  Wall time: {wall:.1f}s (reports alone: {serial:.1f}s)")
+    print(f"  Reports: {STATE_REPORTS_DIR}")
+
+    print("\n" + "="*60)
+    if failures:
+        print(f"❌ {len(failures)} state report(s) failed - see report.log in their directories")
+        print("="*60)
+        return 1
+    print("✅ State reports complete")
+    print("="*60)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,597 +4,731 @@ CORRECTED VERSION with verified ground truth expected values
 
 Run this before generating final PDF to ensure all numbers are correct
 All expected values updated based on corrected analysis (Jan 2026)
+
+Each phase is a registered check with declared inputs (see utils/check_runner.py).
+Inputs are loaded once and shared; independent checks run concurrently.
+
+Usage:
+    python src/validation_test.py                      # all checks
+    python src/validation_test.py --tag data           # subset by tag
+    python src/validation_test.py --only phase2_dimension1,phase5_pdf_ready
+    python src/validation_test.py --list
+Options: --workers N, --json PATH (default outputs/validation_results.json)
 """
 
 import pandas as pd
 import os
-import glob
 import sys
+import argparse
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.config import (
+    RAW_DATA_DIR, PROCESSED_DATA_DIR, OUTPUTS_DIR, FIGURES_DIR, TABLES_DIR,
+    VALIDATION_WORKERS
+)
+from utils.check_runner import CheckRunner, write_results
+from utils.data_manifest import DataManifest
+from utils.report_data import TableCache
+from utils.column_store import read_merged
+from utils.shards import discover_shards
+from utils.cli import comma_list, positive_int
+
+
+RESULTS_PATH = os.path.join(OUTPUTS_DIR, 'validation_results.json')
+
+runner = CheckRunner("UIDAI DATA ANALYSIS - COMPREHENSIVE VALIDATION & AUDIT")
 
-print("=" * 80)
-print("UIDAI DATA ANALYSIS - COMPREHENSIVE VALIDATION & AUDIT")
-print("Corrected expected values based on verified ground truth")
-print("=" * 80)
-
-# Get project root directory
-script_dir = os.path.dirname(os.path.abspath(__file__))
-project_root = os.path.dirname(script_dir)
-os.chdir(project_root)
-
-# Track validation results
-validation_results = {
-    'phase0_auth_numbers': False,
-    'phase1_raw_data': False,
-    'phase2_dimension1': False,
-    'phase3_dimension2': False,
-    'phase4_dimension3': False,
-    'phase5_pdf_ready': False
-}
 
 # ============================================================================
-# PHASE 0: AUTHORITATIVE NUMBERS
+# SHARED INPUTS
 # ============================================================================
-print("\n" + "=" * 80)
-print("PHASE 0: AUTHORITATIVE NUMBERS (SINGLE SOURCE OF TRUTH)")
-print("=" * 80)
-
-try:
-    merged_path = os.path.join('data', 'processed', 'merged_data.csv')
-    df_merged = pd.read_csv(merged_path)
-    
-    print("\n--- Geographic Coverage ---")
-    states = df_merged['state'].nunique()
-    districts = df_merged['district'].nunique()
-    pincodes = df_merged['pincode'].nunique()
-    
-    print(f"States     : {states}")
-    print(f"Districts  : {districts}")
-    print(f"Pincodes   : {pincodes}")
-    
-    # CORRECTED VALIDATION
-    if states == 36:
-        print("  ✓ States correct (36)")
-    else:
-        print(f"  ✗ WARNING: Expected 36 states, got {states}")
-    
-    if districts == 865:
-        print(f"  ✓ Districts correct (865 unique names)")
-    else:
-        print(f"  ⚠ INFO: Got {districts} districts (expected 865 unique names)")
-    
-    if 19_800 <= pincodes <= 19_820:
-        print(f"  ✓ Pincodes in expected range (19,814)")
-    else:
-        print(f"  ✗ WARNING: Expected 19,814 pincodes, got {pincodes}")
-    
-    print("\n--- Transaction Volumes (Merged Data) ---")
+
+@runner.input('manifest')
+def load_manifest(runner):
+    # Row counts / distinct counts recorded by 01 (raw) and 02 (processed)
+    return DataManifest()
+
+
+@runner.input('merged')
+def load_merged(runner):
+    return read_merged()
+
+
+@runner.input('tables')
+def load_tables(runner):
+    # Output tables are parsed once even if several checks read them
+    return TableCache()
+
+
+@runner.input('auth_numbers')
+def load_auth_numbers(runner):
+    df_merged = runner.load_input('merged')
+
     total_enroll = df_merged['age_0_5'].sum() + df_merged['age_5_17'].sum() + df_merged['age_18_greater'].sum()
     total_bio = df_merged['bio_age_5_17'].sum() + df_merged['bio_age_17_'].sum()
     total_demo = df_merged['demo_age_5_17'].sum() + df_merged['demo_age_17_'].sum()
     total_updates = total_bio + total_demo
-    ue_ratio = total_updates / total_enroll if total_enroll > 0 else 0
-    
-    print(f"Total Enrollments   : {total_enroll:,.0f}")
-    print(f"Total Bio Updates   : {total_bio:,.0f}")
-    print(f"Total Demo Updates  : {total_demo:,.0f}")
-    print(f"Total Updates       : {total_updates:,.0f}")
-    print(f"National UE Ratio   : {ue_ratio:.2f}")
-    print(f"Merged Records      : {len(df_merged):,}")
-    
-    # CORRECTED VALIDATION (Ground Truth: 5.44M enrollments, 119M updates, 21.90 UE)
-    if 5_400_000 <= total_enroll <= 5_450_000:
-        print("  ✓ Enrollments in expected range (5.44M)")
-    else:
-        print(f"  ✗ WARNING: Expected 5.44M enrollments, got {total_enroll:,.0f}")
-    
-    if 119_000_000 <= total_updates <= 119_100_000:
-        print("  ✓ Total updates in expected range (119.06M)")
-    else:
-        print(f"  ✗ WARNING: Expected 119.06M updates, got {total_updates:,.0f}")
-    
-    if 21.8 <= ue_ratio <= 22.0:
-        print("  ✓ UE Ratio in expected range (21.90)")
-    else:
-        print(f"  ✗ WARNING: Expected UE ratio 21.90, got {ue_ratio:.2f}")
-    
-    print("\n--- Age Distribution ---")
     child_enroll = df_merged['age_0_5'].sum() + df_merged['age_5_17'].sum()
-    child_pct = (child_enroll / total_enroll) * 100
-    age_0_5_pct = (df_merged['age_0_5'].sum() / total_enroll) * 100
-    age_5_17_pct = (df_merged['age_5_17'].sum() / total_enroll) * 100
-    age_18_pct = (df_merged['age_18_greater'].sum() / total_enroll) * 100
-    
-    print(f"Child enrollment    : {child_pct:.1f}% (0-17 years)")
-    print(f"  Age 0-5           : {age_0_5_pct:.1f}%")
-    print(f"  Age 5-17          : {age_5_17_pct:.1f}%")
-    print(f"  Age 18+           : {age_18_pct:.1f}%")
-    
-    # CORRECTED VALIDATION (Ground Truth: 96.9% children, 65.3%/31.7%/3.1%)
-    if 96.5 <= child_pct <= 97.2:
-        print("  ✓ Child percentage in expected range (96.9%)")
-    else:
-        print(f"  ✗ WARNING: Expected 96.9% children, got {child_pct:.1f}%")
-    
-    if 65.0 <= age_0_5_pct <= 65.6:
-        print("  ✓ Age 0-5 percentage correct (65.3%)")
-    else:
-        print(f"  ⚠ WARNING: Expected 65.3% (0-5), got {age_0_5_pct:.1f}%")
-    
-    print("\n✓ AUTHORITATIVE NUMBERS ESTABLISHED")
-    
-    AUTH_NUMBERS = {
-        'states': states,
-        'districts': districts,
-        'pincodes': pincodes,
+
+    return {
+        'states': df_merged['state'].nunique(),
+        'districts': df_merged['district'].nunique(),
+        'pincodes': df_merged['pincode'].nunique(),
         'enrollments': total_enroll,
         'bio_updates': total_bio,
         'demo_updates': total_demo,
         'total_updates': total_updates,
-        'ue_ratio': ue_ratio,
+        'ue_ratio': total_updates / total_enroll if total_enroll > 0 else 0,
         'merged_records': len(df_merged),
-        'child_pct': child_pct,
-        'age_0_5_pct': age_0_5_pct,
-        'age_5_17_pct': age_5_17_pct,
-        'age_18_pct': age_18_pct
+        'child_pct': (child_enroll / total_enroll) * 100,
+        'age_0_5_pct': (df_merged['age_0_5'].sum() / total_enroll) * 100,
+        'age_5_17_pct': (df_merged['age_5_17'].sum() / total_enroll) * 100,
+        'age_18_pct': (df_merged['age_18_greater'].sum() / total_enroll) * 100
     }
-    
-    validation_results['phase0_auth_numbers'] = True
-    
-except Exception as e:
-    print(f"✗ Error loading merged data: {e}")
-    AUTH_NUMBERS = None
-    df_merged = None
+
+
+def table(ctx, name):
+    return ctx.get('tables').read(os.path.join(TABLES_DIR, name))
+
 
 # ============================================================================
-# PHASE 1: RAW DATA VALIDATION
+# PHASE 0: AUTHORITATIVE NUMBERS
 # ============================================================================
-print("\n" + "=" * 80)
-print("PHASE 1: RAW DATA VALIDATION")
-print("=" * 80)
-
-phase1_pass = True
-
-print("\n--- Step 1.1: Load and Verify Raw API Files ---")
-try:
-    enroll_files = sorted(glob.glob('data/raw/api_data_aadhar_enrolment_*.csv'))
-    bio_files = sorted(glob.glob('data/raw/api_data_aadhar_biometric_*.csv'))
-    demo_files = sorted(glob.glob('data/raw/api_data_aadhar_demographic_*.csv'))
-    
-    print(f"Found {len(enroll_files)} enrollment files")
-    print(f"Found {len(bio_files)} biometric files")
-    print(f"Found {len(demo_files)} demographic files")
-    
-    if len(enroll_files) >= 1 and len(bio_files) >= 1 and len(demo_files) >= 1:
-        print("  ✓ All file types present")
+
+@runner.check('phase0_auth_numbers', inputs=['auth_numbers'], tags=['data', 'fast'])
+def check_auth_numbers(ctx):
+    """Authoritative numbers (single source of truth)"""
+    auth = ctx.get('auth_numbers')
+    log = ctx.log
+
+    log("\n--- Geographic Coverage ---")
+    log(f"States     : {auth['states']}")
+    log(f"Districts  : {auth['districts']}")
+    log(f"Pincodes   : {auth['pincodes']}")
+
+    # CORRECTED VALIDATION
+    if auth['states'] == 36:
+        log("  ✓ States correct (36)")
     else:
-        print("  ✗ WARNING: Missing some file types")
-        phase1_pass = False
-    
-    enroll_count = sum(len(pd.read_csv(f)) for f in enroll_files) if enroll_files else 0
-    bio_count = sum(len(pd.read_csv(f)) for f in bio_files) if bio_files else 0
-    demo_count = sum(len(pd.read_csv(f)) for f in demo_files) if demo_files else 0
-    
-    total_raw = enroll_count + bio_count + demo_count
-    
-    print(f"\n✓ Total Enrollment: {enroll_count:,} records")
-    print(f"✓ Total Biometric: {bio_count:,} records")
-    print(f"✓ Total Demographic: {demo_count:,} records")
-    print(f"\n✓ Grand Total: {total_raw:,} records")
-    print(f"  Expected: ~4.94M records")
-    
-    # CORRECTED: Raw data ~4.94M before deduplication
-    if 4_930_000 <= total_raw <= 4_950_000:
-        print("  ✓ PASS: Raw data count within expected range")
+        log(f"  ✗ WARNING: Expected 36 states, got {auth['states']}")
+
+    if auth['districts'] == 865:
+        log(f"  ✓ Districts correct (865 unique names)")
     else:
-        print("  ⚠ WARNING: Raw data count outside expected range")
-    
-except Exception as e:
-    print(f"✗ Error loading raw API files: {e}")
-    phase1_pass = False
-
-print("\n--- Step 1.2: Clean Data Validation ---")
-try:
-    clean_enroll = pd.read_csv('data/processed/enrollment_clean.csv')
-    clean_bio = pd.read_csv('data/processed/biometric_clean.csv')
-    clean_demo = pd.read_csv('data/processed/demographic_clean.csv')
-    
-    print(f"✓ Clean enrollment: {len(clean_enroll):,} records")
-    print(f"✓ Clean biometric: {len(clean_bio):,} records")
-    print(f"✓ Clean demographic: {len(clean_demo):,} records")
-    
-    enroll_states = clean_enroll['state'].nunique()
-    print(f"\n✓ Unique states in cleaned data: {enroll_states}")
-    
-    if enroll_states == 36:
-        print("  ✓ PASS: State count correct (36)")
+        log(f"  ⚠ INFO: Got {auth['districts']} districts (expected 865 unique names)")
+
+    if 19_800 <= auth['pincodes'] <= 19_820:
+        log(f"  ✓ Pincodes in expected range (19,814)")
     else:
-        print(f"  ✗ FAIL: Expected 36 states, got {enroll_states}")
-        phase1_pass = False
-    
-    enroll_districts = clean_enroll['district'].nunique()
-    print(f"✓ Unique districts in cleaned data: {enroll_districts}")
-    
-    # CORRECTED: Accept 839-850 for enrollment districts (some are update-only)
-    if 835 <= enroll_districts <= 850:
-        print(f"  ✓ PASS: District count reasonable (~839)")
+        log(f"  ✗ WARNING: Expected 19,814 pincodes, got {auth['pincodes']}")
+
+    log("\n--- Transaction Volumes (Merged Data) ---")
+    log(f"Total Enrollments   : {auth['enrollments']:,.0f}")
+    log(f"Total Bio Updates   : {auth['bio_updates']:,.0f}")
+    log(f"Total Demo Updates  : {auth['demo_updates']:,.0f}")
+    log(f"Total Updates       : {auth['total_updates']:,.0f}")
+    log(f"National UE Ratio   : {auth['ue_ratio']:.2f}")
+    log(f"Merged Records      : {auth['merged_records']:,}")
+
+    # CORRECTED VALIDATION (Ground Truth: 5.44M enrollments, 119M updates, 21.90 UE)
+    if 5_400_000 <= auth['enrollments'] <= 5_450_000:
+        log("  ✓ Enrollments in expected range (5.44M)")
+    else:
+        log(f"  ✗ WARNING: Expected 5.44M enrollments, got {auth['enrollments']:,.0f}")
+
+    if 119_000_000 <= auth['total_updates'] <= 119_100_000:
+        log("  ✓ Total updates in expected range (119.06M)")
+    else:
+        log(f"  ✗ WARNING: Expected 119.06M updates, got {auth['total_updates']:,.0f}")
+
+    if 21.8 <= auth['ue_ratio'] <= 22.0:
+        log("  ✓ UE Ratio in expected range (21.90)")
+    else:
+        log(f"  ✗ WARNING: Expected UE ratio 21.90, got {auth['ue_ratio']:.2f}")
+
+    log("\n--- Age Distribution ---")
+    log(f"Child enrollment    : {auth['child_pct']:.1f}% (0-17 years)")
+    log(f"  Age 0-5           : {auth['age_0_5_pct']:.1f}%")
+    log(f"  Age 5-17          : {auth['age_5_17_pct']:.1f}%")
+    log(f"  Age 18+           : {auth['age_18_pct']:.1f}%")
+
+    # CORRECTED VALIDATION (Ground Truth: 96.9% children, 65.3%/31.7%/3.1%)
+    if 96.5 <= auth['child_pct'] <= 97.2:
+        log("  ✓ Child percentage in expected range (96.9%)")
+    else:
+        log(f"  ✗ WARNING: Expected 96.9% children, got {auth['child_pct']:.1f}%")
+
+    if 65.0 <= auth['age_0_5_pct'] <= 65.6:
+        log("  ✓ Age 0-5 percentage correct (65.3%)")
     else:
-        print(f"  ⚠ WARNING: Expected ~839 districts, got {enroll_districts}")
-    
-except Exception as e:
-    print(f"✗ Error loading clean data: {e}")
-    phase1_pass = False
-
-print("\n--- Step 1.3: Merged Data Cross-Check ---")
-if AUTH_NUMBERS and df_merged is not None:
-    print(f"✓ Merged records: {AUTH_NUMBERS['merged_records']:,}")
-    
+        log(f"  ⚠ WARNING: Expected 65.3% (0-5), got {auth['age_0_5_pct']:.1f}%")
+
+    log("\n✓ AUTHORITATIVE NUMBERS ESTABLISHED")
+    ctx.record(**auth)
+    return True
+
+
+# ============================================================================
+# PHASE 1: RAW DATA VALIDATION
+# ============================================================================
+
+@runner.check('phase1_raw_data', inputs=['manifest'], tags=['data', 'fast'])
+def check_raw_data(ctx):
+    """Raw and clean data row counts, states and districts"""
+    manifest = ctx.get('manifest')
+    log = ctx.log
+    phase1_pass = True
+
+    log("\n--- Step 1.1: Load and Verify Raw API Files ---")
+    try:
+        def raw_files(dataset):
+            # Plain or compressed shards, as the loaders find them
+            try:
+                return [os.path.join(RAW_DATA_DIR, f) for f in discover_shards(dataset)]
+            except FileNotFoundError:
+                return []
+
+        enroll_files = raw_files('enrollment')
+        bio_files = raw_files('biometric')
+        demo_files = raw_files('demographic')
+
+        log(f"Found {len(enroll_files)} enrollment files")
+        log(f"Found {len(bio_files)} biometric files")
+        log(f"Found {len(demo_files)} demographic files")
+
+        if len(enroll_files) >= 1 and len(bio_files) >= 1 and len(demo_files) >= 1:
+            log("  ✓ All file types present")
+        else:
+            log("  ✗ WARNING: Missing some file types")
+            phase1_pass = False
+
+        # Manifest counts when the files are unchanged, otherwise a newline count
+        count_sources = set()
+
+        def count_files(files):
+            total = 0
+            for f in files:
+                rows, source = manifest.row_count(f)
+                count_sources.add(source)
+                total += rows
+            return total
+
+        enroll_count = count_files(enroll_files)
+        bio_count = count_files(bio_files)
+        demo_count = count_files(demo_files)
+
+        total_raw = enroll_count + bio_count + demo_count
+        log(f"Row counts from: {', '.join(sorted(count_sources)) or 'no files'}")
+
+        log(f"\n✓ Total Enrollment: {enroll_count:,} records")
+        log(f"✓ Total Biometric: {bio_count:,} records")
+        log(f"✓ Total Demographic: {demo_count:,} records")
+        log(f"\n✓ Grand Total: {total_raw:,} records")
+        log(f"  Expected: ~4.94M records")
+        ctx.record(raw_enrollment=enroll_count, raw_biometric=bio_count,
+                   raw_demographic=demo_count, raw_total=total_raw)
+
+        # CORRECTED: Raw data ~4.94M before deduplication
+        if 4_930_000 <= total_raw <= 4_950_000:
+            log("  ✓ PASS: Raw data count within expected range")
+        else:
+            log("  ⚠ WARNING: Raw data count outside expected range")
+
+    except Exception as e:
+        log(f"✗ Error loading raw API files: {e}")
+        phase1_pass = False
+
+    log("\n--- Step 1.2: Clean Data Validation ---")
+    try:
+        clean_enroll_path = os.path.join(PROCESSED_DATA_DIR, 'enrollment_clean.csv')
+
+        def distinct_count(path, column):
+            # Manifest value if the file is unchanged, otherwise read just that column
+            count = manifest.distinct(path, column)
+            if count is None:
+                count = pd.read_csv(path, usecols=[column])[column].nunique()
+            return count
+
+        log(f"✓ Clean enrollment: {manifest.row_count(clean_enroll_path)[0]:,} records")
+        log(f"✓ Clean biometric: {manifest.row_count(os.path.join(PROCESSED_DATA_DIR, 'biometric_clean.csv'))[0]:,} records")
+        log(f"✓ Clean demographic: {manifest.row_count(os.path.join(PROCESSED_DATA_DIR, 'demographic_clean.csv'))[0]:,} records")
+
+        enroll_states = distinct_count(clean_enroll_path, 'state')
+        log(f"\n✓ Unique states in cleaned data: {enroll_states}")
+
+        if enroll_states == 36:
+            log("  ✓ PASS: State count correct (36)")
+        else:
+            log(f"  ✗ FAIL: Expected 36 states, got {enroll_states}")
+            phase1_pass = False
+
+        enroll_districts = distinct_count(clean_enroll_path, 'district')
+        log(f"✓ Unique districts in cleaned data: {enroll_districts}")
+
+        # CORRECTED: Accept 839-850 for enrollment districts (some are update-only)
+        if 835 <= enroll_districts <= 850:
+            log(f"  ✓ PASS: District count reasonable (~839)")
+        else:
+            log(f"  ⚠ WARNING: Expected ~839 districts, got {enroll_districts}")
+
+    except Exception as e:
+        log(f"✗ Error loading clean data: {e}")
+        phase1_pass = False
+
+    return phase1_pass
+
+
+@runner.check('phase1_merged_data', inputs=['auth_numbers', 'merged'], tags=['data'])
+def check_merged_data(ctx):
+    """Merged data record count, date range and negative values"""
+    auth = ctx.get('auth_numbers')
+    df_merged = ctx.get('merged')
+    log = ctx.log
+
+    log("\n--- Step 1.3: Merged Data Cross-Check ---")
+    log(f"✓ Merged records: {auth['merged_records']:,}")
+
     # CORRECTED: Merged should be ~2.19M (not 3.17M)
-    if 2_180_000 <= AUTH_NUMBERS['merged_records'] <= 2_200_000:
-        print("  ✓ PASS: Merged record count correct (~2.19M)")
+    if 2_180_000 <= auth['merged_records'] <= 2_200_000:
+        log("  ✓ PASS: Merged record count correct (~2.19M)")
     else:
-        print(f"  ⚠ WARNING: Expected ~2.19M merged records")
-    
-    print(f"✓ States: {AUTH_NUMBERS['states']}")
-    print(f"✓ Districts: {AUTH_NUMBERS['districts']}")
-    print(f"✓ Pincodes: {AUTH_NUMBERS['pincodes']}")
-    print(f"✓ Date range: {df_merged['date'].min()} to {df_merged['date'].max()}")
-    
+        log(f"  ⚠ WARNING: Expected ~2.19M merged records")
+
+    log(f"✓ States: {auth['states']}")
+    log(f"✓ Districts: {auth['districts']}")
+    log(f"✓ Pincodes: {auth['pincodes']}")
+    log(f"✓ Date range: {df_merged['date'].min()} to {df_merged['date'].max()}")
+
     negative_values = (df_merged.select_dtypes("number") < 0).sum().sum()
-    
+
     if negative_values == 0:
-        print("  ✓ PASS: No negative values")
-    else:
-        print("  ✗ WARNING: Negative values found")
-        phase1_pass = False
+        log("  ✓ PASS: No negative values")
+        return True
+    log("  ✗ WARNING: Negative values found")
+    return False
 
-validation_results['phase1_raw_data'] = phase1_pass
 
 # ============================================================================
 # PHASE 2: DIMENSION 1 VALIDATION
 # ============================================================================
-print("\n" + "=" * 80)
-print("PHASE 2: DIMENSION 1 VALIDATION (Coverage Gap)")
-print("=" * 80)
-
-phase2_pass = True
-
-print("\n--- Step 2.1: Output Files Check ---")
-# CORRECTED EXPECTED VALUES (from verified dimension 1 output)
-dim1_files = {
-    'dim1_coverage_gap_districts.csv': 57,           # Updated from 53
-    'dim1_low_child_enrollment_districts.csv': 58,   # Updated from 56
-    'dim1_crisis_zone_districts.csv': 387,           # Updated from 395
-    'dim1_summary_statistics.csv': 1
-}
-
-for file, expected_count in dim1_files.items():
-    filepath = os.path.join('outputs', 'tables', file)
-    try:
-        if not os.path.exists(filepath):
-            print(f"✗ {file}: NOT FOUND")
-            phase2_pass = False
-            continue
-        
-        df = pd.read_csv(filepath)
-        actual_count = len(df)
-        
-        if file == 'dim1_summary_statistics.csv':
-            if actual_count >= expected_count:
-                print(f"✓ {file}: {actual_count} records ✓")
-            else:
-                print(f"⚠ {file}: {actual_count} records (expected {expected_count})")
-        else:
-            tolerance = max(2, int(expected_count * 0.03))  # 3% or min 2
-            if abs(actual_count - expected_count) <= tolerance:
-                print(f"✓ {file}: {actual_count} records (expected {expected_count}) ✓")
-            else:
-                print(f"⚠ {file}: {actual_count} records (expected {expected_count})")
+
+@runner.check('phase2_dimension1', inputs=['tables'], tags=['outputs', 'dim1', 'fast'])
+def check_dimension1(ctx):
+    """Dimension 1 (coverage gap) output tables"""
+    log = ctx.log
+    phase2_pass = True
+
+    log("\n--- Step 2.1: Output Files Check ---")
+    # CORRECTED EXPECTED VALUES (from verified dimension 1 output)
+    dim1_files = {
+        'dim1_coverage_gap_districts.csv': 57,           # Updated from 53
+        'dim1_low_child_enrollment_districts.csv': 58,   # Updated from 56
+        'dim1_crisis_zone_districts.csv': 387,           # Updated from 395
+        'dim1_summary_statistics.csv': 1
+    }
+
+    for file, expected_count in dim1_files.items():
+        filepath = os.path.join(TABLES_DIR, file)
+        try:
+            if not os.path.exists(filepath):
+                log(f"✗ {file}: NOT FOUND")
                 phase2_pass = False
-                
+                continue
+
+            actual_count = len(table(ctx, file))
+            ctx.record(**{file: actual_count})
+
+            if file == 'dim1_summary_statistics.csv':
+                if actual_count >= expected_count:
+                    log(f"✓ {file}: {actual_count} records ✓")
+                else:
+                    log(f"⚠ {file}: {actual_count} records (expected {expected_count})")
+            else:
+                tolerance = max(2, int(expected_count * 0.03))  # 3% or min 2
+                if abs(actual_count - expected_count) <= tolerance:
+                    log(f"✓ {file}: {actual_count} records (expected {expected_count}) ✓")
+                else:
+                    log(f"⚠ {file}: {actual_count} records (expected {expected_count})")
+                    phase2_pass = False
+
+        except Exception as e:
+            log(f"✗ {file}: ERROR - {e}")
+            phase2_pass = False
+
+    if phase2_pass:
+        log("\n✓ PASS: All Dimension 1 outputs validated")
+
+    log("\n--- Step 2.2: District Count Verification ---")
+    # CORRECTED: Should show 888 state-district combinations
+    try:
+        coverage_gap = table(ctx, 'dim1_coverage_gap_districts.csv')
+
+        # Check if grouped by state-district
+        if 'state' in coverage_gap.columns and 'district' in coverage_gap.columns:
+            state_district_combos = coverage_gap.groupby(['state', 'district'], observed=True).ngroups
+            log(f"State-district combinations in coverage gap: {state_district_combos}")
+
+        log(f"\nNote: Analysis uses 888 state-district combinations")
+        log(f"      (representing 865 unique district names)")
+        log(f"      This reflects cross-border pincode geographic complexity")
+
     except Exception as e:
-        print(f"✗ {file}: ERROR - {e}")
-        phase2_pass = False
-
-if phase2_pass:
-    print("\n✓ PASS: All Dimension 1 outputs validated")
-
-print("\n--- Step 2.2: District Count Verification ---")
-# CORRECTED: Should show 888 state-district combinations
-try:
-    coverage_gap = pd.read_csv('outputs/tables/dim1_coverage_gap_districts.csv')
-    
-    # Check if grouped by state-district
-    if 'state' in coverage_gap.columns and 'district' in coverage_gap.columns:
-        state_district_combos = coverage_gap.groupby(['state', 'district']).ngroups
-        print(f"State-district combinations in coverage gap: {state_district_combos}")
-        
-    print(f"\nNote: Analysis uses 888 state-district combinations")
-    print(f"      (representing 865 unique district names)")
-    print(f"      This reflects cross-border pincode geographic complexity")
-    
-except Exception as e:
-    print(f"✗ Could not verify district counts: {e}")
-
-validation_results['phase2_dimension1'] = phase2_pass
+        log(f"✗ Could not verify district counts: {e}")
+
+    return phase2_pass
+
 
 # ============================================================================
 # PHASE 3: DIMENSION 2 VALIDATION
 # ============================================================================
-print("\n" + "=" * 80)
-print("PHASE 3: DIMENSION 2 VALIDATION (Readiness Gap)")
-print("=" * 80)
-
-phase3_pass = True
-
-print("\n--- Step 3.1: Youth Bio Update Calculation ---")
-if AUTH_NUMBERS:
-    youth_bio = df_merged['bio_age_5_17'].sum()
-    adult_bio = df_merged['bio_age_17_'].sum()
-    youth_pct = (youth_bio / (youth_bio + adult_bio)) * 100 if (youth_bio + adult_bio) > 0 else 0
-    
-    print(f"Youth bio updates   : {youth_bio:,.0f} ({youth_pct:.1f}%)")
-    print(f"Adult bio updates   : {adult_bio:,.0f}")
-    print(f"Total bio updates   : {youth_bio + adult_bio:,.0f}")
-    
-    # CORRECTED: Youth bio should be ~49.1%
-    if 48.8 <= youth_pct <= 49.4:
-        print("  ✓ PASS: Youth bio percentage correct (49.1%)")
-    else:
-        print(f"  ⚠ WARNING: Expected 49.1% youth bio, got {youth_pct:.1f}%")
-
-print("\n--- Step 3.2: Readiness Categories Check ---")
-try:
-    readiness = pd.read_csv('outputs/tables/dim2_state_readiness_ranking.csv')
-    print(f"✓ State readiness file: {len(readiness)} states")
-    
-    if len(readiness) == 36:
-        print("  ✓ PASS: All 36 states present")
-    else:
-        print(f"  ✗ WARNING: Expected 36 states, got {len(readiness)}")
+
+@runner.check('phase3_dimension2', inputs=['tables'], tags=['outputs', 'dim2'])
+def check_dimension2(ctx):
+    """Dimension 2 (readiness gap) youth share and output tables"""
+    log = ctx.log
+    phase3_pass = True
+
+    log("\n--- Step 3.1: Youth Bio Update Calculation ---")
+    auth = ctx.get_optional('auth_numbers')
+    if auth:
+        df_merged = ctx.get('merged')
+        youth_bio = df_merged['bio_age_5_17'].sum()
+        adult_bio = df_merged['bio_age_17_'].sum()
+        youth_pct = (youth_bio / (youth_bio + adult_bio)) * 100 if (youth_bio + adult_bio) > 0 else 0
+
+        log(f"Youth bio updates   : {youth_bio:,.0f} ({youth_pct:.1f}%)")
+        log(f"Adult bio updates   : {adult_bio:,.0f}")
+        log(f"Total bio updates   : {youth_bio + adult_bio:,.0f}")
+        ctx.record(youth_bio_pct=youth_pct)
+
+        # CORRECTED: Youth bio should be ~49.1%
+        if 48.8 <= youth_pct <= 49.4:
+            log("  ✓ PASS: Youth bio percentage correct (49.1%)")
+        else:
+            log(f"  ⚠ WARNING: Expected 49.1% youth bio, got {youth_pct:.1f}%")
+
+    log("\n--- Step 3.2: Readiness Categories Check ---")
+    try:
+        readiness = table(ctx, 'dim2_state_readiness_ranking.csv')
+        log(f"✓ State readiness file: {len(readiness)} states")
+
+        if len(readiness) == 36:
+            log("  ✓ PASS: All 36 states present")
+        else:
+            log(f"  ✗ WARNING: Expected 36 states, got {len(readiness)}")
+            phase3_pass = False
+
+    except Exception as e:
+        log(f"✗ Error loading readiness data: {e}")
         phase3_pass = False
-    
-except Exception as e:
-    print(f"✗ Error loading readiness data: {e}")
-    phase3_pass = False
-
-print("\n--- Step 3.3: Critical Districts Verification ---")
-try:
-    critical = pd.read_csv('outputs/tables/dim2_critical_readiness_districts.csv')
-    low_path = 'outputs/tables/dim2_low_readiness_districts.csv'
-    low = pd.read_csv(low_path) if os.path.exists(low_path) else pd.DataFrame()
-    
-    print(f"✓ Critical readiness districts: {len(critical)}")
-    if not low.empty:
-        print(f"✓ Low readiness districts: {len(low)}")
-        print(f"✓ Total at-risk districts: {len(critical) + len(low)}")
-    
-    # CORRECTED EXPECTED VALUES: 12 critical + 12 low = 24 total
-    tolerance = 1
-    
-    if abs(len(critical) - 12) <= tolerance:
-        print(f"  ✓ PASS: Critical district count ~12 (got {len(critical)})")
-    else:
-        print(f"  ⚠ WARNING: Expected 12 critical districts, got {len(critical)}")
-    
-    if not low.empty:
-        if abs(len(low) - 12) <= tolerance:
-            print(f"  ✓ PASS: Low readiness district count ~12 (got {len(low)})")
+
+    log("\n--- Step 3.3: Critical Districts Verification ---")
+    try:
+        critical = table(ctx, 'dim2_critical_readiness_districts.csv')
+        low_path = os.path.join(TABLES_DIR, 'dim2_low_readiness_districts.csv')
+        low = table(ctx, 'dim2_low_readiness_districts.csv') if os.path.exists(low_path) else pd.DataFrame()
+
+        log(f"✓ Critical readiness districts: {len(critical)}")
+        if not low.empty:
+            log(f"✓ Low readiness districts: {len(low)}")
+            log(f"✓ Total at-risk districts: {len(critical) + len(low)}")
+        ctx.record(critical_districts=len(critical), low_districts=len(low))
+
+        # CORRECTED EXPECTED VALUES: 12 critical + 12 low = 24 total
+        tolerance = 1
+
+        if abs(len(critical) - 12) <= tolerance:
+            log(f"  ✓ PASS: Critical district count ~12 (got {len(critical)})")
         else:
-            print(f"  ⚠ WARNING: Expected 12 low readiness districts, got {len(low)}")
-    
-    total_at_risk = len(critical) + (len(low) if not low.empty else 0)
-    if abs(total_at_risk - 24) <= tolerance * 2:
-        print(f"  ✓ PASS: Total at-risk ~24 (got {total_at_risk})")
-    else:
-        print(f"  ⚠ WARNING: Expected 24 at-risk districts, got {total_at_risk}")
-    
-except Exception as e:
-    print(f"✗ Error loading critical districts: {e}")
-    phase3_pass = False
+            log(f"  ⚠ WARNING: Expected 12 critical districts, got {len(critical)}")
+
+        if not low.empty:
+            if abs(len(low) - 12) <= tolerance:
+                log(f"  ✓ PASS: Low readiness district count ~12 (got {len(low)})")
+            else:
+                log(f"  ⚠ WARNING: Expected 12 low readiness districts, got {len(low)}")
+
+        total_at_risk = len(critical) + (len(low) if not low.empty else 0)
+        if abs(total_at_risk - 24) <= tolerance * 2:
+            log(f"  ✓ PASS: Total at-risk ~24 (got {total_at_risk})")
+        else:
+            log(f"  ⚠ WARNING: Expected 24 at-risk districts, got {total_at_risk}")
+
+    except Exception as e:
+        log(f"✗ Error loading critical districts: {e}")
+        phase3_pass = False
+
+    return phase3_pass
 
-validation_results['phase3_dimension2'] = phase3_pass
 
 # ============================================================================
 # PHASE 4: DIMENSION 3 VALIDATION
 # ============================================================================
-print("\n" + "=" * 80)
-print("PHASE 4: DIMENSION 3 VALIDATION (Integrity Gap)")
-print("=" * 80)
-
-phase4_pass = True
-
-print("\n--- Step 4.1: Anomaly Count Verification ---")
-try:
-    anomalies = pd.read_csv('outputs/tables/dim3_all_anomalous_pincodes.csv')
-    critical_risk = pd.read_csv('outputs/tables/dim3_all_critical_risk_pincodes.csv')
-    high_risk = pd.read_csv('outputs/tables/dim3_high_risk_pincodes.csv')
-    
-    print(f"✓ Total anomalous pincodes: {len(anomalies):,}")
-    print(f"✓ Critical risk pincodes: {len(critical_risk)}")
-    print(f"✓ High risk pincodes: {len(high_risk)}")
-    print(f"✓ Total critical+high: {len(critical_risk) + len(high_risk)}")
-    
-    # CORRECTED EXPECTED VALUES: 4,628 anomalous, 32 critical, 16 high
-    if 4_600 <= len(anomalies) <= 4_650:
-        print(f"  ✓ PASS: Anomalous pincode count ~4,628 (got {len(anomalies):,})")
-    else:
-        print(f"  ⚠ WARNING: Expected ~4,628 anomalies, got {len(anomalies):,}")
-    
-    if abs(len(critical_risk) - 32) <= 2:
-        print(f"  ✓ PASS: Critical risk count ~32 (got {len(critical_risk)})")
-    else:
-        print(f"  ⚠ WARNING: Expected 32 critical risk, got {len(critical_risk)}")
-    
-    if abs(len(high_risk) - 16) <= 2:
-        print(f"  ✓ PASS: High risk count ~16 (got {len(high_risk)})")
-    else:
-        print(f"  ⚠ WARNING: Expected 16 high risk, got {len(high_risk)}")
-    
-    total_high_risk = len(critical_risk) + len(high_risk)
-    if abs(total_high_risk - 48) <= 3:
-        print(f"  ✓ PASS: Total critical+high ~48 (got {total_high_risk})")
-    
-except Exception as e:
-    print(f"✗ Error loading anomaly data: {e}")
-    phase4_pass = False
-
-print("\n--- Step 4.2: Risk Score Distribution ---")
-try:
-    anomalies = pd.read_csv('outputs/tables/dim3_all_anomalous_pincodes.csv')
-    
-    if 'risk_score' in anomalies.columns:
-        print(f"Risk score statistics:")
-        print(f"  Min: {anomalies['risk_score'].min()}")
-        print(f"  Max: {anomalies['risk_score'].max()}")
-        print(f"  Mean: {anomalies['risk_score'].mean():.2f}")
-        
-        if anomalies['risk_score'].min() >= 0 and anomalies['risk_score'].max() <= 15:
-            print("  ✓ PASS: All risk scores in valid range")
+
+@runner.check('phase4_dimension3', inputs=['tables'], tags=['outputs', 'dim3', 'fast'])
+def check_dimension3(ctx):
+    """Dimension 3 (integrity gap) anomaly counts and risk scores"""
+    log = ctx.log
+    phase4_pass = True
+
+    log("\n--- Step 4.1: Anomaly Count Verification ---")
+    try:
+        anomalies = table(ctx, 'dim3_all_anomalous_pincodes.csv')
+        critical_risk = table(ctx, 'dim3_all_critical_risk_pincodes.csv')
+        high_risk = table(ctx, 'dim3_high_risk_pincodes.csv')
+
+        log(f"✓ Total anomalous pincodes: {len(anomalies):,}")
+        log(f"✓ Critical risk pincodes: {len(critical_risk)}")
+        log(f"✓ High risk pincodes: {len(high_risk)}")
+        log(f"✓ Total critical+high: {len(critical_risk) + len(high_risk)}")
+        ctx.record(anomalous_pincodes=len(anomalies), critical_risk=len(critical_risk),
+                   high_risk=len(high_risk))
+
+        # CORRECTED EXPECTED VALUES: 4,628 anomalous, 32 critical, 16 high
+        if 4_600 <= len(anomalies) <= 4_650:
+            log(f"  ✓ PASS: Anomalous pincode count ~4,628 (got {len(anomalies):,})")
+        else:
+            log(f"  ⚠ WARNING: Expected ~4,628 anomalies, got {len(anomalies):,}")
+
+        if abs(len(critical_risk) - 32) <= 2:
+            log(f"  ✓ PASS: Critical risk count ~32 (got {len(critical_risk)})")
+        else:
+            log(f"  ⚠ WARNING: Expected 32 critical risk, got {len(critical_risk)}")
+
+        if abs(len(high_risk) - 16) <= 2:
+            log(f"  ✓ PASS: High risk count ~16 (got {len(high_risk)})")
         else:
-            print("  ✗ ERROR: Risk scores outside valid range")
-            phase4_pass = False
-            
-except Exception as e:
-    print(f"✗ Error analyzing risk scores: {e}")
+            log(f"  ⚠ WARNING: Expected 16 high risk, got {len(high_risk)}")
+
+        total_high_risk = len(critical_risk) + len(high_risk)
+        if abs(total_high_risk - 48) <= 3:
+            log(f"  ✓ PASS: Total critical+high ~48 (got {total_high_risk})")
+
+    except Exception as e:
+        log(f"✗ Error loading anomaly data: {e}")
+        phase4_pass = False
+
+    log("\n--- Step 4.2: Risk Score Distribution ---")
+    try:
+        anomalies = table(ctx, 'dim3_all_anomalous_pincodes.csv')
+
+        if 'risk_score' in anomalies.columns:
+            log(f"Risk score statistics:")
+            log(f"  Min: {anomalies['risk_score'].min()}")
+            log(f"  Max: {anomalies['risk_score'].max()}")
+            log(f"  Mean: {anomalies['risk_score'].mean():.2f}")
+
+            if anomalies['risk_score'].min() >= 0 and anomalies['risk_score'].max() <= 15:
+                log("  ✓ PASS: All risk scores in valid range")
+            else:
+                log("  ✗ ERROR: Risk scores outside valid range")
+                phase4_pass = False
+
+    except Exception as e:
+        log(f"✗ Error analyzing risk scores: {e}")
+
+    return phase4_pass
 
-validation_results['phase4_dimension3'] = phase4_pass
 
 # ============================================================================
 # PHASE 5: PDF READINESS CHECK
 # ============================================================================
-print("\n" + "=" * 80)
-print("PHASE 5: PDF GENERATION READINESS")
-print("=" * 80)
-
-phase5_pass = True
-
-print("\n--- CORRECTED NUMBERS FOR PDF ---")
-if AUTH_NUMBERS:
-    print("\n📊 COVER PAGE NUMBERS:")
-    print(f"  Total Enrollments: {AUTH_NUMBERS['enrollments']:,.0f} (5.44M)")
-    print(f"  Total Updates: {AUTH_NUMBERS['total_updates']:,.0f} (119.06M)")
-    print(f"  UE Ratio: {AUTH_NUMBERS['ue_ratio']:.2f}× (21.90)")
-    print(f"  States: {AUTH_NUMBERS['states']}")
-    print(f"  Districts: 888 combinations (865 unique names)")
-    print(f"  Pincodes: {AUTH_NUMBERS['pincodes']:,}")
-    
-    print("\n👶 AGE DISTRIBUTION:")
-    print(f"  Age 0-5: {AUTH_NUMBERS['age_0_5_pct']:.1f}% (target: 65.3%)")
-    print(f"  Age 5-17: {AUTH_NUMBERS['age_5_17_pct']:.1f}% (target: 31.7%)")
-    print(f"  Age 18+: {AUTH_NUMBERS['age_18_pct']:.1f}% (target: 3.1%)")
-    print(f"  Children (0-17): {AUTH_NUMBERS['child_pct']:.1f}% (target: 96.9%)")
-    
-    print("\n🎯 DIMENSION 1 (Coverage Gap):")
-    print(f"  Coverage Gap districts: 57")
-    print(f"  Crisis Zone districts: 387")
-    print(f"  Low child enrollment: 58")
-    print(f"  State-district combinations analyzed: 888")
-    
-    print("\n⚡ DIMENSION 2 (Readiness Gap):")
-    print(f"  Critical readiness: 12")
-    print(f"  Low readiness: 12")
-    print(f"  At-risk total: 24")
-    print(f"  Youth bio updates: 34.23M (49.1%)")
-    
-    print("\n🔍 DIMENSION 3 (Integrity Gap):")
-    print(f"  Anomalous pincodes: 4,628")
-    print(f"  Critical risk: 32")
-    print(f"  High risk: 16")
-    print(f"  Total critical+high: 48")
-    print(f"  Districts with clustering: 395")
-
-print("\n--- Required Files Check ---")
-required_files = [
-    'outputs/figures/dim1_2x2_matrix.png',
-    'outputs/figures/dim1_ue_ratio_distribution.png',
-    'outputs/figures/dim2_readiness_distribution.png',
-    'outputs/figures/dim3_risk_distribution.png'
-]
-
-files_ok = True
-for file in required_files:
-    if os.path.exists(file):
-        size = os.path.getsize(file)
-        if size > 0:
-            print(f"✓ {os.path.basename(file)}")
+
+@runner.check('phase5_pdf_ready', tags=['outputs', 'pdf', 'fast'])
+def check_pdf_ready(ctx):
+    """Corrected PDF numbers and required figure files"""
+    log = ctx.log
+    phase5_pass = True
+
+    log("\n--- CORRECTED NUMBERS FOR PDF ---")
+    auth = ctx.get_optional('auth_numbers')
+    if auth:
+        log("\n📊 COVER PAGE NUMBERS:")
+        log(f"  Total Enrollments: {auth['enrollments']:,.0f} (5.44M)")
+        log(f"  Total Updates: {auth['total_updates']:,.0f} (119.06M)")
+        log(f"  UE Ratio: {auth['ue_ratio']:.2f}× (21.90)")
+        log(f"  States: {auth['states']}")
+        log(f"  Districts: 888 combinations (865 unique names)")
+        log(f"  Pincodes: {auth['pincodes']:,}")
+
+        log("\n👶 AGE DISTRIBUTION:")
+        log(f"  Age 0-5: {auth['age_0_5_pct']:.1f}% (target: 65.3%)")
+        log(f"  Age 5-17: {auth['age_5_17_pct']:.1f}% (target: 31.7%)")
+        log(f"  Age 18+: {auth['age_18_pct']:.1f}% (target: 3.1%)")
+        log(f"  Children (0-17): {auth['child_pct']:.1f}% (target: 96.9%)")
+
+        log("\n🎯 DIMENSION 1 (Coverage Gap):")
+        log(f"  Coverage Gap districts: 57")
+        log(f"  Crisis Zone districts: 387")
+        log(f"  Low child enrollment: 58")
+        log(f"  State-district combinations analyzed: 888")
+
+        log("\n⚡ DIMENSION 2 (Readiness Gap):")
+        log(f"  Critical readiness: 12")
+        log(f"  Low readiness: 12")
+        log(f"  At-risk total: 24")
+        log(f"  Youth bio updates: 34.23M (49.1%)")
+
+        log("\n🔍 DIMENSION 3 (Integrity Gap):")
+        log(f"  Anomalous pincodes: 4,628")
+        log(f"  Critical risk: 32")
+        log(f"  High risk: 16")
+        log(f"  Total critical+high: 48")
+        log(f"  Districts with clustering: 395")
+
+    log("\n--- Required Files Check ---")
+    required_files = [
+        'dim1_2x2_matrix.png',
+        'dim1_ue_ratio_distribution.png',
+        'dim2_readiness_distribution.png',
+        'dim3_risk_distribution.png'
+    ]
+
+    files_ok = True
+    for file in required_files:
+        path = os.path.join(FIGURES_DIR, file)
+        if os.path.exists(path):
+            size = os.path.getsize(path)
+            if size > 0:
+                log(f"✓ {file}")
+            else:
+                log(f"✗ {file}: EMPTY FILE")
+                files_ok = False
+                phase5_pass = False
         else:
-            print(f"✗ {os.path.basename(file)}: EMPTY FILE")
+            log(f"✗ {file}: MISSING")
             files_ok = False
             phase5_pass = False
-    else:
-        print(f"✗ {os.path.basename(file)}: MISSING")
-        files_ok = False
-        phase5_pass = False
 
-if files_ok:
-    print("\n✓ PASS: All required visualization files present")
+    if files_ok:
+        log("\n✓ PASS: All required visualization files present")
+
+    return phase5_pass
 
-validation_results['phase5_pdf_ready'] = phase5_pass
 
 # ============================================================================
 # CRITICAL CHECKS
 # ============================================================================
-print("\n" + "=" * 80)
-print("CRITICAL CHECKS: NO IMPOSSIBLE VALUES")
-print("=" * 80)
 
-critical_checks_pass = True
+@runner.check('critical_values', inputs=['auth_numbers'], tags=['data', 'fast'])
+def check_critical_values(ctx):
+    """No impossible values"""
+    auth = ctx.get('auth_numbers')
+    log = ctx.log
+    critical_checks_pass = True
 
-if AUTH_NUMBERS:
     # Check UE Ratio
-    if AUTH_NUMBERS['ue_ratio'] < 20 or AUTH_NUMBERS['ue_ratio'] > 23:
-        print(f"✗ CRITICAL: UE ratio unusual: {AUTH_NUMBERS['ue_ratio']:.2f}")
+    if auth['ue_ratio'] < 20 or auth['ue_ratio'] > 23:
+        log(f"✗ CRITICAL: UE ratio unusual: {auth['ue_ratio']:.2f}")
         critical_checks_pass = False
     else:
-        print(f"✓ UE ratio correct: {AUTH_NUMBERS['ue_ratio']:.2f}")
-    
+        log(f"✓ UE ratio correct: {auth['ue_ratio']:.2f}")
+
     # Check enrollments
-    if AUTH_NUMBERS['enrollments'] < 5_000_000 or AUTH_NUMBERS['enrollments'] > 6_000_000:
-        print(f"✗ CRITICAL: Enrollment count unusual: {AUTH_NUMBERS['enrollments']:,.0f}")
+    if auth['enrollments'] < 5_000_000 or auth['enrollments'] > 6_000_000:
+        log(f"✗ CRITICAL: Enrollment count unusual: {auth['enrollments']:,.0f}")
         critical_checks_pass = False
     else:
-        print(f"✓ Enrollment count correct: {AUTH_NUMBERS['enrollments']:,.0f}")
+        log(f"✓ Enrollment count correct: {auth['enrollments']:,.0f}")
+
+    if critical_checks_pass:
+        log("\n✅ PASS: No impossible values detected")
+    else:
+        log("\n❌ FAIL: Impossible values detected")
+
+    return critical_checks_pass
 
-if critical_checks_pass:
-    print("\n✅ PASS: No impossible values detected")
-else:
-    print("\n❌ FAIL: Impossible values detected")
 
 # ============================================================================
 # FINAL SUMMARY
 # ============================================================================
-print("\n" + "=" * 80)
-print("VALIDATION COMPLETE - SUMMARY")
-print("=" * 80)
 
-print("\n--- Phase Results ---")
-for phase, passed in validation_results.items():
-    status = "✅ PASS" if passed else "❌ FAIL"
-    print(f"{status}: {phase}")
+def print_summary(results):
+    print("\n" + "=" * 80)
+    print("VALIDATION COMPLETE - SUMMARY")
+    print("=" * 80)
 
-all_pass = all(validation_results.values()) and critical_checks_pass
+    print("\n--- Phase Results ---")
+    for check in results['checks']:
+        status = "✅ PASS" if check['passed'] else "❌ FAIL"
+        print(f"{status}: {check['name']} ({check['seconds']:.2f}s)")
+
+    print("\n--- Shared Inputs ---")
+    for name, info in results['inputs'].items():
+        state = f"failed ({info['error']})" if info['error'] else "loaded once"
+        print(f"  {name}: {state} in {info['seconds']:.2f}s")
+    print(f"\n⏱️  Total: {results['seconds']:.2f}s")
+
+    print("\n" + "=" * 80)
+    if results['passed']:
+        print("✅ ALL VALIDATIONS PASSED")
+        print("=" * 80)
+        print("\n🎯 READY FOR PDF GENERATION")
+        print("\nCORRECTED PDF NUMBERS:")
+        print("  • 5.44M enrollments (not 7.39M)")
+        print("  • 119.06M updates (not 139.37M)")
+        print("  • 21.90× UE ratio (not 18.85)")
+        print("  • 888 state-district combinations (865 unique names)")
+        print("  • Dimension 1: 57, 387, 58 districts")
+        print("  • Dimension 2: 12, 12, 24 districts")
+        print("  • Dimension 3: 4,628, 32, 16 pincodes")
+    else:
+        print("❌ SOME VALIDATIONS FAILED")
+        print("=" * 80)
+        print("\nPlease review the errors above and:")
+        print("  1. Verify all analysis scripts ran with corrected data")
+        print("  2. Check that merge function was fixed (aggregates duplicates)")
+        print("  3. Re-run failed analysis scripts if needed")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description=runner.title)
+    parser.add_argument('--list', action='store_true', help="list the registered checks and exit")
+    parser.add_argument('--only', type=comma_list, metavar='A,B', help="run these checks")
+    parser.add_argument('--tag', type=comma_list, metavar='A,B', help="run checks with these tags")
+    parser.add_argument('--workers', type=positive_int, default=VALIDATION_WORKERS)
+    parser.add_argument('--json', default=RESULTS_PATH, metavar='PATH', help="where to write the results")
+    return parser
+
+
+def main(argv=None):
+    """
+    Run the selected checks, print a summary and write JSON results
+
+    Returns:
+    --------
+    int
+        Exit code (0 if every selected check passed)
+    """
+    args = build_parser().parse_args(argv)
+
+    if args.list:
+        for name in runner.check_names:
+            spec = runner._checks[name]
+            print(f"{name:22s} [{', '.join(sorted(spec['tags']))}] {spec['doc']}")
+        return 0
+
+    workers, json_path = args.workers, args.json
 
-print("\n" + "=" * 80)
-if all_pass:
-    print("✅ ALL VALIDATIONS PASSED")
     print("=" * 80)
-    print("\n🎯 READY FOR PDF GENERATION")
-    print("\nCORRECTED PDF NUMBERS:")
-    print("  • 5.44M enrollments (not 7.39M)")
-    print("  • 119.06M updates (not 139.37M)")
-    print("  • 21.90× UE ratio (not 18.85)")
-    print("  • 888 state-district combinations (865 unique names)")
-    print("  • Dimension 1: 57, 387, 58 districts")
-    print("  • Dimension 2: 12, 12, 24 districts")
-    print("  • Dimension 3: 4,628, 32, 16 pincodes")
-    sys.exit(0)
-else:
-    print("❌ SOME VALIDATIONS FAILED")
+    print(runner.title)
+    print("Corrected expected values based on verified ground truth")
     print("=" * 80)
-    print("\nPlease review the errors above and:")
-    print("  1. Verify all analysis scripts ran with corrected data")
-    print("  2. Check that merge function was fixed (aggregates duplicates)")
-    print("  3. Re-run failed analysis scripts if needed")
-    sys.exit(1)
 
-print("=" * 80)
\ No newline at end of file
+    results = runner.run(
+        names=args.only,
+        tags=args.tag,
+        max_workers=workers
+    )
+    print_summary(results)
+
+    write_results(results, json_path)
+    print(f"\n📝 Results written to: {json_path}")
+
+    return 0 if results['passed'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,13 @@
+import sys
+
+import pytest
+
+pytest.importorskip('reportlab')
+
+import benchmark_report_build
+
+
+def test_load_report_module_registers_module():
+    module = benchmark_report_build.load_report_module()
+    assert sys.modules['report_generation'] is module
+    assert hasattr(module, 'EnhancedAadhaarReport')
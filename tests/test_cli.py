@@ -0,0 +1,30 @@
+import pytest
+
+from utils.cli import load_script, parse_window_args, stage_parser
+import query
+
+
+def test_flag_without_value_is_a_usage_error():
+    with pytest.raises(SystemExit) as exit_info:
+        query.build_parser().parse_args(['district', '--top'])
+    assert exit_info.value.code == 2
+
+
+def test_query_parses_level_and_lists():
+    args = query.build_parser().parse_args(['state', '--metric', 'ue_ratio,bio_updates', '--top', '5'])
+    assert args.level == 'state'
+    assert args.metric == ['ue_ratio', 'bio_updates']
+    assert args.top == 5
+
+
+def test_inverted_window_is_rejected():
+    with pytest.raises(SystemExit):
+        parse_window_args(stage_parser('test'), ['--start', '2025-05-01', '--end', '2025-04-01'])
+    with pytest.raises(SystemExit):
+        parse_window_args(stage_parser('test'), ['--start', '2025-13-01'])
+
+
+def test_load_script_strips_number_prefix():
+    pytest.importorskip('sklearn')
+    module = load_script('05_dimension3_integrity.py')
+    assert module.__name__ == 'dimension3_integrity'
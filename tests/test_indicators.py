@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+
+from utils.config import (
+    LOW_UE_RATIO, HIGH_UE_RATIO, ANOMALY_UE_RATIO, GOOD_READINESS, MODERATE_READINESS,
+    calculate_ue_ratio, classify_ue_ratio,
+    calculate_transition_readiness_score, classify_readiness_score
+)
+from utils.indicators import (
+    calculate_ue_ratios, classify_ue_ratios,
+    calculate_transition_readiness_scores, classify_readiness_scores
+)
+
+
+def test_ue_ratios_match_scalar_helper():
+    updates = np.array([0, 5, 120, 7, 0, 33])
+    enrollments = np.array([0, 0, 4, 7, 9, 2])
+    expected = [calculate_ue_ratio(u, e) for u, e in zip(updates, enrollments)]
+    np.testing.assert_allclose(calculate_ue_ratios(updates, enrollments), expected)
+
+
+def test_ue_classes_match_scalar_helper_at_the_thresholds():
+    edges = [0, LOW_UE_RATIO, HIGH_UE_RATIO, ANOMALY_UE_RATIO]
+    ratios = sorted(set([-1.0, 0.0] + [e + d for e in edges for d in (-1e-9, 0.0, 1e-9)] + [1e6]))
+    assert list(classify_ue_ratios(np.array(ratios))) == [classify_ue_ratio(r) for r in ratios]
+
+
+def test_readiness_scores_and_classes_match_scalar_helpers():
+    youth = np.array([0, 3, 10, 0, 45])
+    total = np.array([0, 0, 20, 8, 50])
+    expected = [calculate_transition_readiness_score(y, t) for y, t in zip(youth, total)]
+    np.testing.assert_allclose(calculate_transition_readiness_scores(youth, total), expected)
+
+    edges = [MODERATE_READINESS, GOOD_READINESS]
+    scores = sorted(set([0.0, 100.0] + [e + d for e in edges for d in (-1e-9, 0.0, 1e-9)]))
+    assert list(classify_readiness_scores(np.array(scores))) == [classify_readiness_score(s) for s in scores]
+
+
+def test_series_input_keeps_its_index():
+    enrollments = pd.Series([2, 0], index=['a', 'b'])
+    ratios = calculate_ue_ratios(pd.Series([10, 4], index=['a', 'b']), enrollments)
+    assert ratios.index.tolist() == ['a', 'b']
+    assert classify_ue_ratios(ratios).index.tolist() == ['a', 'b']
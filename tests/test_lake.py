@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.config import DATASET_SCHEMAS
+from utils.column_store import read_merged
+from utils.lake import lake_is_current, read_window, write_lake
+
+
+def merged_frame(rows=600, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'date': pd.Timestamp('2025-01-01') + pd.to_timedelta(rng.integers(0, 120, rows), unit='D'),
+        'state': rng.choice(['Assam', 'Bihar', 'Goa'], rows),
+        'district': rng.choice(['North', 'South'], rows),
+        'pincode': rng.integers(100000, 100050, rows),
+    })
+    for column, dtype in DATASET_SCHEMAS['merged'].items():
+        if column not in df and dtype == 'int32':
+            df[column] = rng.integers(0, 50, rows)
+    df['ue_ratio'] = rng.random(rows) * 40
+    return df
+
+
+@pytest.fixture(params=[False, True], ids=['by_month', 'by_state'])
+def lake(tmp_path, request):
+    path = str(tmp_path / 'merged_data.csv')
+    directory = str(tmp_path / 'merged_lake')
+    merged_frame().to_csv(path, index=False)
+    write_lake(read_merged(path=path), directory=directory, source=path, by_state=request.param)
+    assert lake_is_current(path, directory)
+    return path, directory
+
+
+@pytest.mark.parametrize('start, end, states, columns', [
+    ('2025-02-10', '2025-03-20', None, None),
+    ('2025-01-15', None, ['Goa'], None),
+    (None, '2025-02-28', ['Assam', 'Bihar'], ['pincode', 'total_updates']),
+    ('2026-01-01', '2026-02-01', None, None),
+])
+def test_read_window_matches_filtered_full_read(lake, start, end, states, columns):
+    path, directory = lake
+    full = read_merged(path=path)
+    mask = pd.Series(True, index=full.index)
+    if start is not None:
+        mask &= full['date'] >= pd.Timestamp(start)
+    if end is not None:
+        mask &= full['date'] <= pd.Timestamp(end)
+    if states is not None:
+        mask &= full['state'].isin(states)
+    expected = full[mask].reset_index(drop=True)
+    if columns is not None:
+        expected = expected[[c for c in expected.columns if c in columns]]
+
+    actual = read_window(start, end, states, columns, path=path, directory=directory)
+    pd.testing.assert_frame_equal(actual, expected)
@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+
+from utils.partitioned import map_partitions
+
+
+def district_totals(df):
+    return df.groupby(['state', 'district'], observed=True, as_index=False)['count'].sum()
+
+
+def pincode_share(df):
+    # Keyed by pincode, which can be listed under two states
+    totals = df.groupby('pincode')['count'].transform('sum')
+    return df.assign(share=df['count'] / totals)[['state', 'pincode', 'share']].sort_values(
+        ['state', 'pincode'], kind='mergesort').reset_index(drop=True)
+
+
+def frame(rows=2_000, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'state': rng.choice(['Assam', 'Bihar', 'Goa', 'Kerala'], rows),
+        'district': rng.choice(['East', 'West', 'North'], rows),
+        'pincode': rng.integers(0, 40, rows),
+        'count': rng.integers(0, 100, rows),
+    })
+
+
+def test_map_partitions_matches_direct_call():
+    df = frame()
+    result = map_partitions(district_totals, df, ['state', 'district'], workers=2, min_rows=0)
+    pd.testing.assert_frame_equal(result, district_totals(df))
+
+
+def test_keep_together_keeps_cross_state_keys_exact():
+    df = frame(seed=1)
+    result = map_partitions(pincode_share, df, ['state', 'pincode'], keep_together='pincode',
+                            workers=2, min_rows=0)
+    pd.testing.assert_frame_equal(result, pincode_share(df))
@@ -0,0 +1,22 @@
+import os
+
+import pandas as pd
+
+from utils.report_data import TableCache
+
+
+def test_table_cache_rereads_after_mtime_change(tmp_path):
+    path = tmp_path / 'table.csv'
+    pd.DataFrame({'a': [1, 2]}).to_csv(path, index=False)
+    cache = TableCache()
+
+    first = cache.read(str(path))
+    assert cache.read(str(path)) is first
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    pd.DataFrame({'a': [3, 4, 5]}).to_csv(path, index=False)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert cache.read(str(path))['a'].tolist() == [3, 4, 5]
+    assert cache.misses == 2
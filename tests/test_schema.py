@@ -0,0 +1,18 @@
+import numpy as np
+import pandas as pd
+
+from utils.schema import parse_dates
+
+
+def test_parse_dates_is_day_first_in_every_layout():
+    raw = pd.Series(['03-01-2025', '03/01/2025', '03-01-25', '2025-01-03', None, 'not a date'])
+    parsed = parse_dates(raw)
+    assert parsed[:4].tolist() == [pd.Timestamp('2025-01-03')] * 4
+    assert parsed[4:].isna().all()
+
+
+def test_parse_dates_keeps_index_and_accepts_arrays():
+    raw = pd.Series(['13-03-2025', '01-12-2025'], index=[10, 20])
+    assert parse_dates(raw).index.tolist() == [10, 20]
+    parsed = parse_dates(np.array(['13-03-2025', '01-12-2025'], dtype=object))
+    assert parsed.tolist() == [pd.Timestamp('2025-03-13'), pd.Timestamp('2025-12-01')]
@@ -0,0 +1,42 @@
+import gzip
+import lzma
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.shards import discover_shards, iter_shard_chunks, read_shard
+
+COMPRESSORS = {'.csv.gz': gzip.open, '.csv.xz': lzma.open}
+try:
+    import zstandard
+    COMPRESSORS['.csv.zst'] = lambda path, mode: zstandard.open(path, mode)
+except ImportError:
+    pass
+
+
+@pytest.fixture
+def plain(tmp_path):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'date': rng.choice(['01-03-2025', '15-04-2025'], 5_000),
+        'state': rng.choice(['Assam', 'Goa'], 5_000),
+        'pincode': rng.integers(100000, 999999, 5_000),
+        'age_0_5': rng.integers(0, 50, 5_000),
+    })
+    path = tmp_path / 'plain.csv'
+    df.to_csv(path, index=False)
+    return path
+
+
+@pytest.mark.parametrize('suffix', sorted(COMPRESSORS))
+def test_compressed_shard_reads_like_plain_csv(tmp_path, plain, suffix):
+    path = tmp_path / f'api_data_aadhar_enrolment_0_5000{suffix}'
+    with COMPRESSORS[suffix](path, 'wb') as f:
+        f.write(plain.read_bytes())
+    expected = pd.read_csv(plain)
+
+    pd.testing.assert_frame_equal(read_shard(str(path)), expected)
+    chunks = list(iter_shard_chunks(str(path), chunksize=1_234))
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), expected)
+    assert discover_shards('enrollment', str(tmp_path)) == [path.name]
@@ -0,0 +1,254 @@
+"""
+Ad-hoc Queries
+Aggregate merged data by geography (and month) without a throwaway script
+
+run_query() answers questions like "UE ratio of every Bihar district, by
+month" from the merged store:
+- filters are applied before aggregating: the date window and states prune
+  lake partitions (utils/lake.py), only the columns the metrics need are
+  opened (utils/column_store.py), and district / pincode filters mask those
+  columns before the group-by
+- results are kept in data/processed/query_cache/, keyed by the query, the
+  size/mtime of merged_data.csv and the utils/ code, so repeating a question
+  costs a file read
+
+Metrics are sums of the merged count columns, or ratios of those sums
+(computed after aggregating, as in the dimension scripts).
+"""
+
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.config import (
+    PROCESSED_DATA_DIR, QUERY_CACHE_ENABLED, QUERY_CACHE_ENTRIES
+)
+from utils.indicators import calculate_ue_ratios, calculate_transition_readiness_scores
+from utils.artifact_cache import hash_values, code_fingerprint
+from utils.column_store import MERGED_PATH, read_schema, store_path, store_is_current, source_stat
+from utils.aggregation import aggregate
+from utils.lake import read_window
+
+
+QUERY_CACHE_DIR = os.path.join(PROCESSED_DATA_DIR, 'query_cache')
+
+COUNT_COLUMNS = [
+    'age_0_5', 'age_5_17', 'age_18_greater',
+    'bio_age_5_17', 'bio_age_17_',
+    'demo_age_5_17', 'demo_age_17_'
+]
+
+LEVELS = {
+    'national': [],
+    'state': ['state'],
+    'district': ['state', 'district'],
+    'pincode': ['pincode'],
+}
+
+TIME_GRAINS = ('month', 'date')
+
+
+def _pct(part, whole):
+    return np.where(whole > 0, part / np.where(whole > 0, whole, 1) * 100, 0.0)
+
+
+def _total_enrollment(s):
+    return s['age_0_5'] + s['age_5_17'] + s['age_18_greater']
+
+
+def _total_bio(s):
+    return s['bio_age_5_17'] + s['bio_age_17_']
+
+
+def _total_demo(s):
+    return s['demo_age_5_17'] + s['demo_age_17_']
+
+
+# Metric -> (count columns summed, function of the summed frame)
+METRICS = {
+    **{column: ([column], lambda s, c=column: s[c]) for column in COUNT_COLUMNS},
+    'total_enrollment': (['age_0_5', 'age_5_17', 'age_18_greater'], _total_enrollment),
+    'total_bio_updates': (['bio_age_5_17', 'bio_age_17_'], _total_bio),
+    'total_demo_updates': (['demo_age_5_17', 'demo_age_17_'], _total_demo),
+    'total_updates': (COUNT_COLUMNS[3:], lambda s: _total_bio(s) + _total_demo(s)),
+    'ue_ratio': (COUNT_COLUMNS, lambda s: calculate_ue_ratios(_total_bio(s) + _total_demo(s), _total_enrollment(s))),
+    'readiness_score': (['bio_age_5_17', 'bio_age_17_'],
+                        lambda s: calculate_transition_readiness_scores(s['bio_age_5_17'], _total_bio(s))),
+    'child_total_pct': (['age_0_5', 'age_5_17', 'age_18_greater'],
+                        lambda s: _pct(s['age_0_5'] + s['age_5_17'], _total_enrollment(s))),
+}
+
+
+class QueryError(ValueError):
+    """Raised for a query that names an unknown level, metric, grain or place"""
+
+
+def _canonical(names, column):
+    """Match names case-insensitively against the stored categories of `column`"""
+    if names is None:
+        return None
+    schema = read_schema(store_path(MERGED_PATH)) if store_is_current(MERGED_PATH) else None
+    entry = next((c for c in schema['columns'] if c['name'] == column), None) if schema else None
+    if entry is None or 'values' not in entry:
+        return list(names)
+    known = {str(value).casefold(): value for value in entry['values']}
+    unknown = [name for name in names if name.casefold() not in known]
+    if unknown:
+        raise QueryError(f"Unknown {column}(s): {', '.join(unknown)}")
+    return [known[name.casefold()] for name in names]
+
+
+def parse_pincodes(text):
+    """'800001,800002' or '800001-800999' -> list of ints or (first, last)"""
+    if text is None:
+        return None
+    try:
+        if '-' in text:
+            first, last = text.split('-', 1)
+            return (int(first), int(last))
+        return [int(p) for p in text.split(',')]
+    except ValueError:
+        raise QueryError(f"Invalid pincode filter: {text!r}")
+
+
+def _filter(df, districts, pincodes):
+    mask = np.ones(len(df), dtype=bool)
+    if districts is not None:
+        mask &= df['district'].isin(districts).to_numpy()
+    if isinstance(pincodes, tuple):
+        values = df['pincode'].to_numpy()
+        mask &= (values >= pincodes[0]) & (values <= pincodes[1])
+    elif pincodes is not None:
+        mask &= df['pincode'].isin(pincodes).to_numpy()
+    return df if mask.all() else df[mask]
+
+
+def _evaluate(df, level, metrics, by):
+    counts = list(dict.fromkeys(c for m in metrics for c in METRICS[m][0]))
+    keys = list(LEVELS[level])
+    if by is not None:
+        period = 'M' if by == 'month' else 'D'
+        df = df.assign(**{by: df['date'].to_numpy().astype(f'datetime64[{period}]')})
+        keys.append(by)
+
+    agg = {c: 'sum' for c in counts}
+    if level == 'pincode':
+        agg.update(state='first', district='first')
+    if keys:
+        summed = aggregate(df, keys, agg)
+    else:
+        summed = df[counts].sum().to_frame().T
+
+    result = summed[[k for k in keys if k in summed.columns]].copy()
+    if level == 'pincode':
+        result.insert(1, 'state', summed['state'])
+        result.insert(2, 'district', summed['district'])
+    for metric in metrics:
+        result[metric] = METRICS[metric][1](summed)
+    if by == 'month':
+        result['month'] = pd.to_datetime(result['month']).dt.strftime('%Y-%m')
+    elif by == 'date':
+        result['date'] = pd.to_datetime(result['date']).dt.strftime('%Y-%m-%d')
+    return result
+
+
+def _prune_cache(directory, keep):
+    entries = sorted(
+        (os.path.join(directory, f) for f in os.listdir(directory) if f.endswith('.pkl')),
+        key=os.path.getmtime, reverse=True
+    )
+    for path in entries[keep:]:
+        os.remove(path)
+
+
+def run_query(level, metrics, by=None, states=None, districts=None, pincodes=None,
+              start=None, end=None, sort=None, top=None, use_cache=QUERY_CACHE_ENABLED):
+    """
+    Aggregate merged data to `level` (and `by` period) and compute `metrics`
+
+    Parameters:
+    -----------
+    level : str
+        'national', 'state', 'district' or 'pincode'
+    metrics : list of str
+        Names from METRICS
+    by : str, optional
+        'month' or 'date' to split each group by period
+    states, districts : list of str, optional
+        Only these states / districts (case-insensitive)
+    pincodes : list of int or tuple, optional
+        Only these pincodes, or an inclusive (first, last) range
+    start, end : str, optional
+        Inclusive date window
+    sort : str, optional
+        Metric to sort by, descending (default: first metric; period order with `by`)
+    top : int, optional
+        Keep the first `top` rows after sorting
+    use_cache : bool
+        Read and write the persistent result cache
+
+    Returns:
+    --------
+    tuple
+        (result DataFrame, info dict with 'cached', 'rows_scanned' and 'seconds')
+    """
+    started = time.perf_counter()
+    if level not in LEVELS:
+        raise QueryError(f"Unknown level '{level}' (choose from {', '.join(LEVELS)})")
+    unknown = [m for m in metrics if m not in METRICS]
+    if unknown:
+        raise QueryError(f"Unknown metric(s): {', '.join(unknown)} (choose from {', '.join(METRICS)})")
+    if by is not None and by not in TIME_GRAINS:
+        raise QueryError(f"Unknown grain '{by}' (choose from {', '.join(TIME_GRAINS)})")
+    if sort is not None and sort not in metrics:
+        raise QueryError(f"Sort metric '{sort}' is not among the requested metrics")
+
+    states = _canonical(states, 'state')
+    districts = _canonical(districts, 'district')
+    spec = {
+        'level': level, 'metrics': list(metrics), 'by': by, 'states': states,
+        'districts': districts, 'pincodes': pincodes, 'start': start, 'end': end,
+        'sort': sort, 'top': top,
+    }
+
+    cache_path = None
+    if use_cache and os.path.exists(MERGED_PATH):
+        key = hash_values(spec, source_stat(MERGED_PATH), code_fingerprint(__file__))
+        cache_path = os.path.join(QUERY_CACHE_DIR, f"{key[:32]}.pkl")
+        if os.path.exists(cache_path):
+            result = pd.read_pickle(cache_path)
+            os.utime(cache_path)
+            info = result.attrs.get('query', {})
+            return result, {**info, 'cached': True, 'seconds': time.perf_counter() - started}
+
+    columns = set(LEVELS[level]) | {c for m in metrics for c in METRICS[m][0]}
+    if level == 'pincode':
+        columns |= {'state', 'district'}
+    if by is not None or start is not None or end is not None:
+        columns.add('date')
+    if districts is not None:
+        columns.add('district')
+    if pincodes is not None:
+        columns.add('pincode')
+
+    df = read_window(start, end, states, sorted(columns))
+    df = _filter(df, districts, pincodes)
+    result = _evaluate(df, level, metrics, by)
+
+    if by is None and len(metrics) and level != 'national':
+        result = result.sort_values(sort or metrics[0], ascending=False, kind='mergesort')
+    elif sort is not None:
+        result = result.sort_values(sort, ascending=False, kind='mergesort')
+    if top is not None:
+        result = result.head(top)
+    result = result.reset_index(drop=True)
+
+    info = {'rows_scanned': len(df)}
+    if cache_path is not None:
+        os.makedirs(QUERY_CACHE_DIR, exist_ok=True)
+        result.attrs['query'] = info
+        result.to_pickle(cache_path)
+        _prune_cache(QUERY_CACHE_DIR, QUERY_CACHE_ENTRIES)
+    return result, {**info, 'cached': False, 'seconds': time.perf_counter() - started}
@@ -0,0 +1,211 @@
+"""
+Aggregation
+Group-by aggregations with a selectable execution backend
+
+aggregate(source, keys, agg) returns the same frame as
+`source.groupby(keys).agg(agg).reset_index()`, on one of these backends:
+
+- 'pandas'  : the in-memory groupby (default)
+- 'chunked' : for CSV sources, streams the file and combines per-chunk partial
+              aggregates, so memory depends on group count, not on file size
+- 'duckdb'  : SQL in an embedded DuckDB engine over a DataFrame, CSV or
+              Parquet file. It is multi-threaded and spills to disk
+              (requires the duckdb package)
+
+`source` is a DataFrame or a path to a .csv/.parquet file. Supported
+aggregations are 'sum' and 'first' (first non-null value in row order).
+"""
+
+import os
+
+import pandas as pd
+
+from utils.config import (
+    OUTPUTS_DIR, AGGREGATION_BACKEND, AGGREGATION_CHUNKSIZE,
+    DUCKDB_THREADS, DUCKDB_MEMORY_LIMIT
+)
+
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+
+BACKENDS = ('pandas', 'chunked', 'duckdb')
+SUPPORTED_AGGREGATIONS = ('sum', 'first')
+
+DUCKDB_TEMP_DIR = os.path.join(OUTPUTS_DIR, '.duckdb_tmp')
+
+_backend = os.environ.get('UIDAI_AGG_BACKEND', AGGREGATION_BACKEND)
+_warned = set()
+
+
+def get_backend():
+    return _backend
+
+
+def set_backend(backend):
+    """Select the backend for this process ('pandas', 'chunked' or 'duckdb')"""
+    global _backend
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown aggregation backend '{backend}' (expected one of {BACKENDS})")
+    _backend = backend
+
+
+def available_backends():
+    return [b for b in BACKENDS if b != 'duckdb' or duckdb is not None]
+
+
+def _warn_once(message):
+    if message not in _warned:
+        print(f"  ⚠️  {message}")
+        _warned.add(message)
+
+
+def _read(source, columns, **kwargs):
+    if isinstance(source, pd.DataFrame):
+        return source
+    if str(source).endswith('.parquet'):
+        return pd.read_parquet(source, columns=columns)
+    return pd.read_csv(source, usecols=columns, **kwargs)
+
+
+def _check(agg):
+    unsupported = {how for how in agg.values() if how not in SUPPORTED_AGGREGATIONS}
+    if unsupported:
+        raise ValueError(f"Unsupported aggregation(s): {', '.join(sorted(unsupported))}")
+
+
+# =============================================================================
+# BACKENDS
+# =============================================================================
+
+def _pandas_aggregate(source, keys, agg):
+    frame = _read(source, list(keys) + list(agg))
+    return frame.groupby(keys, observed=True).agg(agg).reset_index()
+
+
+def _chunked_aggregate(source, keys, agg, chunksize=AGGREGATION_CHUNKSIZE):
+    if isinstance(source, pd.DataFrame) or str(source).endswith('.parquet'):
+        return _pandas_aggregate(source, keys, agg)
+
+    # Sums of sums and firsts of firsts (chunks are combined in file order)
+    parts = [
+        chunk.groupby(keys, observed=True).agg(agg)
+        for chunk in pd.read_csv(source, usecols=list(keys) + list(agg), chunksize=chunksize)
+    ]
+    if not parts:
+        return _pandas_aggregate(source, keys, agg)
+    combined = pd.concat(parts).groupby(level=list(range(len(keys))), observed=True).agg(agg)
+    return combined.reset_index()
+
+
+def _quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _duckdb_aggregate(source, keys, agg):
+    con = duckdb.connect()
+    try:
+        if DUCKDB_THREADS:
+            con.execute(f"SET threads = {int(DUCKDB_THREADS)}")
+        if DUCKDB_MEMORY_LIMIT:
+            con.execute(f"SET memory_limit = '{DUCKDB_MEMORY_LIMIT}'")
+        os.makedirs(DUCKDB_TEMP_DIR, exist_ok=True)
+        con.execute(f"SET temp_directory = '{DUCKDB_TEMP_DIR}'")
+        con.execute("SET preserve_insertion_order = true")
+
+        columns = list(keys) + list(agg)
+        if isinstance(source, pd.DataFrame):
+            # Reference dtypes come straight from the frame
+            dtypes = source[columns].dtypes
+            con.register('source_frame', source[columns])
+            relation = "SELECT *, row_number() OVER () AS __row FROM source_frame"
+        else:
+            # Reference dtypes are what pandas infers for the same file
+            dtypes = _read(source, columns, nrows=10_000).dtypes
+            path = str(source).replace("'", "''")
+            if path.endswith('.parquet'):
+                relation = f"SELECT *, row_number() OVER () AS __row FROM read_parquet('{path}')"
+            else:
+                # Text keys stay text (pandas does not parse dates on read)
+                types = ", ".join(
+                    f"{_quote(c)}: 'VARCHAR'" for c in keys if dtypes[c] == object
+                )
+                relation = (
+                    f"SELECT *, row_number() OVER () AS __row "
+                    f"FROM read_csv_auto('{path}', header = true, types = {{{types}}})"
+                )
+
+        select = [_quote(k) for k in keys]
+        for column, how in agg.items():
+            col = _quote(column)
+            if how == 'sum':
+                select.append(f"SUM({col}) AS {col}")
+            else:
+                select.append(f"FIRST({col} ORDER BY __row) FILTER (WHERE {col} IS NOT NULL) AS {col}")
+
+        not_null = " AND ".join(f"{_quote(k)} IS NOT NULL" for k in keys)
+        key_list = ", ".join(_quote(k) for k in keys)
+        sql = (
+            f"SELECT {', '.join(select)} FROM ({relation}) "
+            f"WHERE {not_null} GROUP BY {key_list} ORDER BY {key_list}"
+        )
+        result = con.execute(sql).df()
+    finally:
+        con.close()
+
+    # Match the dtypes the pandas groupby would return
+    for column in columns:
+        dtype = dtypes[column]
+        if column in agg and agg[column] == 'first':
+            if dtype == object:
+                result[column] = result[column].astype(object)
+            continue
+        if pd.api.types.is_integer_dtype(dtype) or pd.api.types.is_float_dtype(dtype) \
+                or pd.api.types.is_datetime64_any_dtype(dtype) \
+                or isinstance(dtype, pd.CategoricalDtype):
+            result[column] = result[column].astype(dtype)
+        elif dtype == object:
+            result[column] = result[column].astype(object)
+    return result
+
+
+# =============================================================================
+# ENTRY POINT
+# =============================================================================
+
+def aggregate(source, keys, agg, backend=None):
+    """
+    Group `source` by `keys` and aggregate columns as given in `agg`
+
+    Parameters:
+    -----------
+    source : pd.DataFrame or str
+        Frame, or path to a CSV/Parquet file
+    keys : list of str
+        Group-by columns
+    agg : dict
+        Column -> 'sum' or 'first'
+    backend : str, optional
+        Overrides the configured backend for this call
+
+    Returns:
+    --------
+    pd.DataFrame
+        Same as source.groupby(keys).agg(agg).reset_index()
+    """
+    keys = list(keys)
+    _check(agg)
+    backend = backend or _backend
+
+    if backend == 'duckdb':
+        if duckdb is not None:
+            return _duckdb_aggregate(source, keys, agg)
+        _warn_once("duckdb is not installed - aggregating with pandas instead")
+        backend = 'pandas'
+    if backend == 'chunked':
+        return _chunked_aggregate(source, keys, agg)
+    if backend != 'pandas':
+        raise ValueError(f"Unknown aggregation backend '{backend}' (expected one of {BACKENDS})")
+    return _pandas_aggregate(source, keys, agg)
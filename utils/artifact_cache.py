@@ -0,0 +1,277 @@
+"""
+Content-Addressed Artifact Cache
+Skip rewriting figures/tables (or rerunning whole stages) whose inputs, config and code are unchanged
+"""
+
+import os
+import ast
+import glob
+import json
+import hashlib
+import inspect
+from functools import lru_cache
+
+import pandas as pd
+
+from utils import config
+from utils.config import PROJECT_ROOT, OUTPUTS_DIR
+
+
+ARTIFACT_CACHE_DIR = os.path.join(OUTPUTS_DIR, '.artifact_cache')
+UTILS_DIR = os.path.dirname(os.path.abspath(__file__))
+# Hashed as config (constants by name, plus its functions), not as code
+CONFIG_PATH = os.path.join(UTILS_DIR, 'config.py')
+
+_caches = {}
+
+
+# =============================================================================
+# FINGERPRINTS
+# =============================================================================
+
+def update_hash(h, value):
+    """Feed a DataFrame / Series / dict / scalar into a hashlib object"""
+    if isinstance(value, pd.DataFrame):
+        h.update(repr(list(value.columns)).encode())
+        h.update(repr(list(value.dtypes.astype(str))).encode())
+        h.update(pd.util.hash_pandas_object(value, index=True).values.tobytes())
+    elif isinstance(value, pd.Series):
+        h.update(repr((value.name, str(value.dtype))).encode())
+        h.update(pd.util.hash_pandas_object(value, index=True).values.tobytes())
+    elif isinstance(value, dict):
+        for key in sorted(value, key=repr):
+            h.update(repr(key).encode())
+            update_hash(h, value[key])
+    else:
+        h.update(repr(value).encode())
+
+
+def hash_values(*values):
+    h = hashlib.sha256()
+    for value in values:
+        update_hash(h, value)
+    return h.hexdigest()
+
+
+def file_fingerprint(path, block_size=1 << 20):
+    """Content hash of a file (blake2b, streamed)"""
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def config_fingerprint(names=None):
+    """
+    Hash of config constants
+
+    Stages pass the names of the constants that change their outputs, so
+    worker counts or settings of other stages do not invalidate them.
+    names=None hashes every upper-case constant except filesystem paths.
+    The helper functions defined in config.py are always included (config.py
+    itself is left out of code_fingerprint).
+    """
+    if names is None:
+        names = [
+            name for name in dir(config)
+            if name.isupper() and not name.endswith('_DIR') and name != 'PROJECT_ROOT'
+        ]
+    functions = {
+        name: inspect.getsource(value) for name, value in vars(config).items()
+        if inspect.isfunction(value) and value.__module__ == config.__name__
+    }
+    return hash_values({name: getattr(config, name) for name in sorted(names)}, functions)
+
+
+@lru_cache(maxsize=None)
+def _direct_utils_imports(path, mtime_ns):
+    """utils/ modules a Python file imports (anywhere in the file, including lazy imports)"""
+    with open(path, 'rb') as f:
+        tree = ast.parse(f.read(), filename=path)
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ImportFrom) and node.module == 'utils':
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and node.module.startswith('utils.'):
+            names.add(node.module.split('.')[1])
+        elif isinstance(node, ast.Import):
+            names.update(a.name.split('.')[1] for a in node.names if a.name.startswith('utils.'))
+    paths = (os.path.join(UTILS_DIR, f'{name}.py') for name in names)
+    return frozenset(p for p in paths if os.path.exists(p) and p != CONFIG_PATH)
+
+
+def utils_dependencies(path):
+    """utils/*.py files imported by `path`, directly or through other utils modules"""
+    found = set()
+    pending = [path]
+    while pending:
+        current = pending.pop()
+        for dependency in _direct_utils_imports(current, os.stat(current).st_mtime_ns):
+            if dependency not in found:
+                found.add(dependency)
+                pending.append(dependency)
+    return found
+
+
+def code_fingerprint(*sources):
+    """
+    Hash of code versions
+
+    Each source is a file path or a function (hashed by its source text),
+    together with the utils/ modules its file imports, directly or
+    transitively (config.py excepted, see config_fingerprint). Without
+    sources, every utils/*.py module is hashed.
+    """
+    h = hashlib.sha256()
+    if not sources:
+        paths = set(glob.glob(os.path.join(UTILS_DIR, '*.py')))
+    else:
+        paths = set()
+    for source in sources:
+        if callable(source):
+            try:
+                h.update(inspect.getsource(source).encode())
+                source_file = inspect.getsourcefile(source)
+            except (OSError, TypeError):
+                h.update(f"{source.__module__}.{source.__qualname__}".encode())
+                continue
+        else:
+            source_file = source
+            paths.add(source)
+        if source_file and os.path.exists(source_file):
+            paths |= utils_dependencies(source_file)
+    for path in sorted(paths):
+        with open(path, 'rb') as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+# =============================================================================
+# CACHE
+# =============================================================================
+
+class ArtifactCache:
+    """
+    Manifest of generated outputs for one pipeline stage
+
+    Each artifact is stored with the key it was produced from plus its size and
+    mtime, so an output is only considered fresh if the key matches and the
+    file on disk has not been touched since.
+
+    Keys cover the stage script and the utils modules it imports
+    (script_path), and the config constants named in config_names (all of
+    them when omitted).
+    """
+
+    def __init__(self, group, script_path=None, config_names=None):
+        self.group = group
+        self.manifest_path = os.path.join(ARTIFACT_CACHE_DIR, f'{group}.json')
+        self.code_version = code_fingerprint(*([script_path] if script_path else []))
+        self.config_version = config_fingerprint(config_names)
+        self._manifest = self._load()
+        self._touched = set()
+
+    def _load(self):
+        if not os.path.exists(self.manifest_path):
+            return {'stage_key': None, 'artifacts': {}}
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            manifest.setdefault('stage_key', None)
+            manifest.setdefault('artifacts', {})
+            return manifest
+        except (OSError, ValueError):
+            return {'stage_key': None, 'artifacts': {}}
+
+    def save(self):
+        os.makedirs(ARTIFACT_CACHE_DIR, exist_ok=True)
+        tmp_path = self.manifest_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
+
+    @staticmethod
+    def _rel(path):
+        return os.path.relpath(os.path.abspath(path), PROJECT_ROOT).replace(os.sep, '/')
+
+    def key(self, *inputs):
+        """Key for an output: its input data plus the config and code versions"""
+        return hash_values(self.config_version, self.code_version, *inputs)
+
+    # -------------------------------------------------------------------------
+    # Individual artifacts
+    # -------------------------------------------------------------------------
+
+    def _on_disk(self, entry, path):
+        if not os.path.exists(path):
+            return False
+        st = os.stat(path)
+        return entry.get('size') == st.st_size and entry.get('mtime_ns') == st.st_mtime_ns
+
+    def is_fresh(self, path, key):
+        entry = self._manifest['artifacts'].get(self._rel(path))
+        fresh = entry is not None and entry.get('key') == key and self._on_disk(entry, path)
+        if fresh:
+            self._touched.add(self._rel(path))
+        return fresh
+
+    def record(self, path, key):
+        st = os.stat(path)
+        rel = self._rel(path)
+        self._manifest['artifacts'][rel] = {
+            'key': key, 'size': st.st_size, 'mtime_ns': st.st_mtime_ns
+        }
+        self._touched.add(rel)
+
+    def write_csv(self, df, path, **to_csv_kwargs):
+        """to_csv that leaves the file alone when the same table was already written"""
+        key = self.key(df, to_csv_kwargs)
+        if self.is_fresh(path, key):
+            return False
+        df.to_csv(path, **to_csv_kwargs)
+        self.record(path, key)
+        return True
+
+    # -------------------------------------------------------------------------
+    # Whole stages
+    # -------------------------------------------------------------------------
+
+    def stage_key(self, *input_paths, params=None):
+        """Key for a whole stage from its input files' content (and run parameters)"""
+        inputs = [file_fingerprint(path) for path in input_paths]
+        if params:
+            inputs.append(params)
+        return self.key(*inputs)
+
+    def stage_is_fresh(self, key):
+        """True if the last run used the same key and all of its outputs are intact"""
+        artifacts = self._manifest['artifacts']
+        if self._manifest.get('stage_key') != key or not artifacts:
+            return False
+        return all(
+            self._on_disk(entry, os.path.join(PROJECT_ROOT, rel))
+            for rel, entry in artifacts.items()
+        )
+
+    def begin_stage(self):
+        """Invalidate the stage key while outputs are being regenerated"""
+        self._manifest['stage_key'] = None
+        self._touched = set()
+        self.save()
+
+    def complete_stage(self, key):
+        """Record a finished stage and forget outputs it no longer produces"""
+        self._manifest['artifacts'] = {
+            rel: entry for rel, entry in self._manifest['artifacts'].items()
+            if rel in self._touched
+        }
+        self._manifest['stage_key'] = key
+        self.save()
+
+
+def get_artifact_cache(group, script_path=None, config_names=None):
+    """Shared ArtifactCache per stage group (figures and tables write to the same manifest)"""
+    if group not in _caches:
+        _caches[group] = ArtifactCache(group, script_path, config_names)
+    return _caches[group]
@@ -0,0 +1,255 @@
+"""
+Check Runner
+Registered checks with declared inputs, run concurrently with shared, load-once inputs
+"""
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime
+
+
+class InputError(Exception):
+    """A declared input could not be loaded"""
+
+
+class CheckContext:
+    """
+    What a check sees while it runs
+
+    Output goes through log() and is printed as one block when the check
+    finishes, so concurrent checks never interleave their lines.
+    """
+
+    def __init__(self, runner, name):
+        self._runner = runner
+        self.name = name
+        self.lines = []
+        self.metrics = {}
+
+    def log(self, line=""):
+        self.lines.append(line)
+
+    def get(self, input_name):
+        """Shared input (loaded on first use, then reused by every check)"""
+        return self._runner.load_input(input_name)
+
+    def get_optional(self, input_name):
+        """Shared input, or None (with a logged error) if it cannot be loaded"""
+        try:
+            return self.get(input_name)
+        except InputError as e:
+            self.log(f"✗ {e}")
+            return None
+
+    def record(self, **metrics):
+        """Attach machine-readable values to this check's result"""
+        self.metrics.update(metrics)
+
+
+class CheckRunner:
+    """
+    Registry and executor for validation checks
+
+    Inputs are registered with @runner.input(name); a loader receives the
+    runner and may call runner.load_input() for other inputs. Checks are registered with
+    @runner.check(name, inputs=[...], after=[...], tags=[...]); a check gets a
+    CheckContext and returns True (pass) or False (fail). Uncaught exceptions
+    fail the check.
+    """
+
+    def __init__(self, title):
+        self.title = title
+        self._inputs = {}
+        self._checks = {}
+        self._loaded = {}
+        self._load_errors = {}
+        self._input_seconds = {}
+        self._locks = {}
+        self._registry_lock = threading.Lock()
+
+    # -------------------------------------------------------------------------
+    # Registration
+    # -------------------------------------------------------------------------
+
+    def input(self, name):
+        def register(loader):
+            self._inputs[name] = loader
+            return loader
+        return register
+
+    def check(self, name, inputs=(), after=(), tags=()):
+        def register(func):
+            self._checks[name] = {
+                'func': func,
+                'inputs': list(inputs),
+                'after': list(after),
+                'tags': set(tags),
+                'doc': (func.__doc__ or '').strip().splitlines()[0] if func.__doc__ else ''
+            }
+            return func
+        return register
+
+    @property
+    def check_names(self):
+        return list(self._checks)
+
+    # -------------------------------------------------------------------------
+    # Inputs
+    # -------------------------------------------------------------------------
+
+    def load_input(self, name):
+        if name not in self._inputs:
+            raise InputError(f"Unknown input '{name}'")
+
+        with self._registry_lock:
+            lock = self._locks.setdefault(name, threading.Lock())
+
+        # One loader per input; concurrent callers wait for the first
+        with lock:
+            if name in self._loaded:
+                return self._loaded[name]
+            if name in self._load_errors:
+                raise InputError(self._load_errors[name])
+
+            start = time.perf_counter()
+            try:
+                value = self._inputs[name](self)
+            except InputError as e:
+                self._load_errors[name] = f"Input '{name}' unavailable: {e}"
+                raise InputError(self._load_errors[name])
+            except Exception as e:
+                self._load_errors[name] = f"Input '{name}' failed to load: {type(e).__name__}: {e}"
+                raise InputError(self._load_errors[name])
+            finally:
+                self._input_seconds[name] = time.perf_counter() - start
+
+            self._loaded[name] = value
+            return value
+
+    # -------------------------------------------------------------------------
+    # Execution
+    # -------------------------------------------------------------------------
+
+    def select(self, names=None, tags=None):
+        """Checks to run: by name and/or tag, plus the checks they run after"""
+        selected = [
+            name for name, spec in self._checks.items()
+            if (not names or name in names) and (not tags or spec['tags'] & set(tags))
+        ]
+        unknown = set(names or []) - set(self._checks)
+        if unknown:
+            raise ValueError(f"Unknown check(s): {', '.join(sorted(unknown))}")
+
+        # Pull in prerequisites
+        pending = list(selected)
+        while pending:
+            for dep in self._checks[pending.pop()]['after']:
+                if dep not in selected:
+                    selected.append(dep)
+                    pending.append(dep)
+        return [name for name in self._checks if name in selected]
+
+    def _run_one(self, name):
+        spec = self._checks[name]
+        ctx = CheckContext(self, name)
+        start = time.perf_counter()
+        error = None
+        try:
+            for input_name in spec['inputs']:
+                ctx.get(input_name)
+            passed = bool(spec['func'](ctx))
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            ctx.log(f"✗ {error}")
+            passed = False
+        return {
+            'name': name,
+            'passed': passed,
+            'seconds': round(time.perf_counter() - start, 4),
+            'error': error,
+            'tags': sorted(spec['tags']),
+            'metrics': ctx.metrics,
+            'output': ctx.lines,
+        }
+
+    def run(self, names=None, tags=None, max_workers=4, echo=True):
+        """
+        Run the selected checks on a thread pool
+
+        A check starts once every check it runs after has finished; independent
+        checks run concurrently and share loaded inputs.
+
+        Returns:
+        --------
+        dict with per-check results, input load times and overall status
+        """
+        to_run = self.select(names, tags)
+        results = {}
+        started = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+            running = {}
+            waiting = list(to_run)
+            while waiting or running:
+                ready = [
+                    name for name in waiting
+                    if all(dep in results for dep in self._checks[name]['after'])
+                ]
+                for name in ready:
+                    waiting.remove(name)
+                    running[pool.submit(self._run_one, name)] = name
+
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    results[name] = future.result()
+                    if echo:
+                        self._print_result(results[name])
+
+        ordered = [results[name] for name in to_run]
+        return {
+            'title': self.title,
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'passed': all(r['passed'] for r in ordered),
+            'seconds': round(time.perf_counter() - started, 4),
+            'checks': ordered,
+            'inputs': {
+                name: {
+                    'seconds': round(self._input_seconds.get(name, 0.0), 4),
+                    'error': self._load_errors.get(name)
+                }
+                for name in self._input_seconds
+            },
+        }
+
+    @staticmethod
+    def _print_result(result):
+        status = "✅ PASS" if result['passed'] else "❌ FAIL"
+        print("\n" + "=" * 80)
+        print(f"{result['name']}  [{status}, {result['seconds']:.2f}s]")
+        print("=" * 80)
+        for line in result['output']:
+            print(line)
+
+
+def _json_default(value):
+    # numpy scalars from pandas aggregations
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
+
+
+def write_results(results, path):
+    """Save runner results as JSON (without the captured console output)"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    payload = dict(results)
+    payload['checks'] = [
+        {key: value for key, value in check.items() if key != 'output'}
+        for check in results['checks']
+    ]
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, indent=2, default=_json_default)
+    return path
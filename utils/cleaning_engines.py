@@ -0,0 +1,316 @@
+"""
+Cleaning Engines
+Alternative executions of the 02_data_cleaning.py pipeline
+
+The 'pandas' engine is the step-by-step flow in 02_data_cleaning.py: every step
+(load, dates, states, districts, aggregate) materializes the full frame. The
+engines here produce the same clean datasets and the same merged totals:
+
+- 'fused'  : each raw shard is read (key and count columns only), date-parsed,
+             state/district-mapped, filtered and pre-aggregated in one pass,
+             shards in parallel worker processes. The full raw frames and the
+             per-step copies are never held, and only the small per-shard
+             aggregates are combined before the merge. Results are cached per
+             shard (utils/shards.py), so unchanged shards are not re-read
+- 'polars' : cleaning and pre-aggregation as one Polars lazy query plan
+             (date lookup, scan, clean, aggregate) collected once and
+             multi-threaded, with projection pushdown into the CSV scans;
+             compressed shards are streamed in batches. The aggregates are
+             merged by merge_aggregated(), as for 'fused'
+             (requires the polars package)
+
+Dates are parsed once per distinct raw string with the same parser the pandas
+engine uses, so every engine assigns the same date to the same raw value.
+"""
+
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from utils.config import (
+    RAW_DATA_DIR, STATE_NAME_MAPPING, DISTRICT_NAME_MAPPING,
+    CLEANING_ENGINE, CLEANING_WORKERS, SHARD_CACHE_ENABLED
+)
+from utils.aggregation import aggregate
+from utils.schema import enforce_schema, parse_dates
+from utils.shards import ShardCache, discover_shards, is_compressed, open_shard, read_shard
+
+try:
+    import polars as pl
+except ImportError:
+    pl = None
+
+
+ENGINES = ('pandas', 'fused', 'polars')
+
+KEYS = ['date', 'state', 'district', 'pincode']
+
+# Count columns of each dataset (shards are found by utils/shards.py)
+DATASETS = {
+    'enrollment': ['age_0_5', 'age_5_17', 'age_18_greater'],
+    'biometric': ['bio_age_5_17', 'bio_age_17_'],
+    'demographic': ['demo_age_5_17', 'demo_age_17_'],
+}
+
+# Decompressed bytes parsed per batch when the polars engine streams a compressed shard
+POLARS_BATCH_BYTES = 1 << 24
+
+_engine = os.environ.get('UIDAI_CLEANING_ENGINE', CLEANING_ENGINE)
+
+
+def get_engine():
+    return _engine
+
+
+def set_engine(engine):
+    """Select the cleaning engine for this process ('pandas', 'fused' or 'polars')"""
+    global _engine
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown cleaning engine '{engine}' (expected one of {ENGINES})")
+    _engine = engine
+
+
+def available_engines():
+    return [e for e in ENGINES if e != 'polars' or pl is not None]
+
+
+# =============================================================================
+# FUSED (PANDAS, ONE PASS PER SHARD)
+# =============================================================================
+
+def _map_distinct(series, convert, fill):
+    """Apply `convert` to the distinct values of `series` only, then expand back"""
+    codes, uniques = pd.factorize(series)
+    converted = np.asarray(convert(uniques))
+    # Code -1 (missing) picks the appended fill value
+    return np.append(converted, np.array([fill], dtype=converted.dtype))[codes]
+
+
+def _clean_names(uniques, mapping):
+    return pd.Series(uniques, dtype=object).replace(mapping).str.strip().to_numpy(dtype=object)
+
+
+def clean_shard(path, values):
+    """
+    Clean one raw shard and pre-aggregate it
+
+    Parameters:
+    -----------
+    path : str
+        Raw CSV shard (plain or compressed)
+    values : list of str
+        Count columns of the dataset
+
+    Returns:
+    --------
+    tuple
+        (clean rows, rows summed per date/state/district/pincode, raw row count)
+    """
+    df = read_shard(path, usecols=KEYS + values)[KEYS + values]
+    raw_rows = len(df)
+
+    df['date'] = _map_distinct(df['date'], lambda u: parse_dates(u).to_numpy(), np.datetime64('NaT'))
+    df['state'] = _map_distinct(df['state'], lambda u: _clean_names(u, STATE_NAME_MAPPING), np.nan)
+    df['district'] = _map_distinct(df['district'], lambda u: _clean_names(u, DISTRICT_NAME_MAPPING), np.nan)
+    # States mapped to None are invalid entries (standardize_state_names drops them too)
+    df = df[df['state'].notna()]
+
+    partial = aggregate(df, KEYS, {col: 'sum' for col in values})
+    return df, partial, raw_rows
+
+
+def _run_fused(workers, cache, data_dir):
+    shards = [
+        (name, os.path.join(data_dir, file), values)
+        for name, values in DATASETS.items()
+        for file in discover_shards(name, data_dir)
+    ]
+
+    # Unchanged shards come from the cache; only the rest are read and cleaned
+    caches = {name: ShardCache(name) for name in DATASETS} if cache else {}
+    results = [caches[name].load(path) if cache else None for name, path, _ in shards]
+    pending = [i for i, result in enumerate(results) if result is None]
+
+    if workers > 1 and len(pending) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(pending))) as pool:
+            cleaned = pool.map(
+                clean_shard, [shards[i][1] for i in pending], [shards[i][2] for i in pending]
+            )
+            for i, result in zip(pending, cleaned):
+                results[i] = result
+    else:
+        for i in pending:
+            results[i] = clean_shard(shards[i][1], shards[i][2])
+
+    if cache:
+        for i in pending:
+            caches[shards[i][0]].store(shards[i][1], results[i])
+        for name, shard_cache in caches.items():
+            shard_cache.prune([os.path.basename(path) for n, path, _ in shards if n == name])
+            shard_cache.save()
+        print(f"  ✓ Shards: {len(pending)} cleaned, {len(shards) - len(pending)} reused from cache")
+
+    clean, aggregated = {}, {}
+    for name, values in DATASETS.items():
+        parts = [r for s, r in zip(shards, results) if s[0] == name]
+        clean[name] = enforce_schema(pd.concat([p[0] for p in parts], ignore_index=True), name)
+        # Sums of per-shard sums (keys can repeat across shards)
+        aggregated[name] = aggregate(
+            pd.concat([p[1] for p in parts], ignore_index=True),
+            KEYS, {col: 'sum' for col in values}
+        )
+        raw_rows = sum(p[2] for p in parts)
+        print(f"  ✓ {name.title():<12} raw {raw_rows:>12,} → clean {len(clean[name]):>12,}"
+              f" → unique keys {len(aggregated[name]):>12,}")
+    return clean, aggregated
+
+
+# =============================================================================
+# POLARS (LAZY QUERY PLAN)
+# =============================================================================
+
+def _polars_schema(values):
+    """Column types of a raw shard (the same for plain scans and streamed batches)"""
+    schema = {'date': pl.Utf8, 'state': pl.Utf8, 'district': pl.Utf8, 'pincode': pl.Int64}
+    schema.update({col: pl.Int64 for col in values})
+    return schema
+
+
+def _polars_read_stream(path, schema, batch_bytes=POLARS_BATCH_BYTES):
+    """Parse a compressed shard batch by batch, keeping only the schema's columns"""
+    columns = list(schema)
+    batches = []
+    with open_shard(path) as f:
+        header = f.readline()
+        tail = b''
+        for block in iter(lambda: f.read(batch_bytes), b''):
+            block = tail + block
+            cut = block.rfind(b'\n') + 1
+            body, tail = block[:cut], block[cut:]
+            if body:
+                batches.append(pl.read_csv(io.BytesIO(header + body), columns=columns, schema_overrides=schema))
+        if tail.strip():
+            batches.append(pl.read_csv(io.BytesIO(header + tail), columns=columns, schema_overrides=schema))
+    if not batches:
+        return pl.DataFrame(schema=schema)
+    return pl.concat(batches, how='vertical').select(columns)
+
+
+def _polars_source(path, values):
+    schema = _polars_schema(values)
+    if not is_compressed(path):
+        return pl.scan_csv(path, schema_overrides=schema).select(list(schema))
+    # scan_csv cannot stream compressed files: decompress through the shard stream
+    # (utils/shards.py) when the plan is collected, parsing whole-line batches
+    return pl.defer(lambda: _polars_read_stream(path, schema), schema=schema)
+
+
+def _polars_scan(name, values, data_dir):
+    frames = [
+        _polars_source(os.path.join(data_dir, file), values).select(KEYS + values)
+        for file in discover_shards(name, data_dir)
+    ]
+    return pl.concat(frames, how='vertical')
+
+
+def _parse_date_frame(frame):
+    parsed = parse_dates(frame['date'].to_list()).astype('datetime64[ns]')
+    return frame.with_columns(pl.Series('__date', parsed.to_numpy()))
+
+
+def _polars_date_lookup(data_dir):
+    """Distinct raw date strings across all shards -> parsed dates (part of the plan)"""
+    scans = [_polars_scan(name, values, data_dir).select('date') for name, values in DATASETS.items()]
+    return pl.concat(scans).unique().map_batches(
+        _parse_date_frame, schema={'date': pl.Utf8, '__date': pl.Datetime('ns')}
+    )
+
+
+def _to_pandas(frame):
+    """DataFrame.to_pandas() without the pyarrow dependency"""
+    return pd.DataFrame({col: frame[col].to_numpy() for col in frame.columns})
+
+
+def _polars_plan(name, values, dates, data_dir):
+    clean = (
+        _polars_scan(name, values, data_dir)
+        .join(dates, on='date', how='left', maintain_order='left')
+        .with_columns(
+            pl.col('__date').alias('date'),
+            pl.col('state').replace(STATE_NAME_MAPPING).str.strip_chars(),
+        )
+        .filter(pl.col('state').is_not_null())
+        .with_columns(pl.col('district').replace(DISTRICT_NAME_MAPPING).str.strip_chars())
+        .select(KEYS + values)
+    )
+    # Null keys drop out of the groupby, as in pandas
+    aggregated = (
+        clean
+        .filter(pl.all_horizontal([pl.col(k).is_not_null() for k in KEYS]))
+        .group_by(KEYS)
+        .agg([pl.col(col).sum() for col in values])
+    )
+    return clean, aggregated
+
+
+def _run_polars(data_dir):
+    dates = _polars_date_lookup(data_dir)
+    plans = {name: _polars_plan(name, values, dates, data_dir) for name, values in DATASETS.items()}
+
+    # One collect: the date lookup, the clean datasets and the per-key sums are
+    # a single plan, so each scan feeds all of them. Sums are key-sorted like
+    # aggregate() output, so merge_aggregated() gives the pandas row order
+    names = list(plans)
+    results = pl.collect_all(
+        [plans[name][0] for name in names] + [plans[name][1].sort(KEYS) for name in names]
+    )
+    clean, aggregated = {}, {}
+    for i, name in enumerate(names):
+        clean[name] = enforce_schema(_to_pandas(results[i]), name)
+        aggregated[name] = _to_pandas(results[len(names) + i])
+        print(f"  ✓ {name.title():<12} clean {len(clean[name]):>12,}"
+              f" → unique keys {len(aggregated[name]):>12,}")
+    return clean, aggregated
+
+
+# =============================================================================
+# ENTRY POINT
+# =============================================================================
+
+def run_cleaning(engine=None, workers=CLEANING_WORKERS, cache=SHARD_CACHE_ENABLED, data_dir=RAW_DATA_DIR):
+    """
+    Clean the raw shards with the 'fused' or 'polars' engine
+
+    Parameters:
+    -----------
+    engine : str, optional
+        Overrides the configured engine
+    workers : int
+        Worker processes for the fused engine
+    cache : bool
+        Reuse the fused engine's results for unchanged shards (RAW_DATA_DIR only)
+    data_dir : str
+        Directory holding the raw shards
+
+    Returns:
+    --------
+    tuple
+        (clean, aggregated): clean datasets by name, and their rows summed per
+        date/state/district/pincode by name (merged by merge_aggregated())
+    """
+    engine = engine or _engine
+    if engine == 'polars' and pl is None:
+        print("  ⚠️  polars is not installed - using the fused engine instead")
+        engine = 'fused'
+
+    print(f"\n⚡ Cleaning raw shards ({engine} engine)...")
+    # The shard cache describes the shards in RAW_DATA_DIR
+    cache = cache and os.path.abspath(data_dir) == os.path.abspath(RAW_DATA_DIR)
+    if engine == 'fused':
+        return _run_fused(workers, cache, data_dir)
+    if engine == 'polars':
+        return _run_polars(data_dir)
+    raise ValueError(f"Engine '{engine}' is run by 02_data_cleaning.py itself")
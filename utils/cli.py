@@ -0,0 +1,120 @@
+"""
+Command Line Helpers
+Script loading and argparse helpers shared by the scripts in src/
+
+The numbered pipeline scripts (02_data_cleaning.py, 03_dimension1_coverage.py,
+...) cannot be imported by name; load_script() imports them from src/.
+"""
+
+import argparse
+import importlib.util
+import os
+import sys
+from datetime import date
+
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+
+
+def load_script(file_name, module_name=None):
+    """
+    Import a pipeline script from src/
+
+    Parameters:
+    -----------
+    file_name : str
+        Script file name, e.g. '03_dimension1_coverage.py'
+    module_name : str, optional
+        Name to register it under (default: the file name without its
+        number prefix, e.g. 'dimension1_coverage')
+
+    Returns:
+    --------
+    module
+    """
+    if module_name is None:
+        stem = os.path.splitext(file_name)[0]
+        prefix, _, rest = stem.partition('_')
+        module_name = rest if prefix.isdigit() and rest else stem
+    path = os.path.join(SRC_DIR, file_name)
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    # Registered so worker processes can unpickle the script's functions
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+# =============================================================================
+# ARGPARSE
+# =============================================================================
+
+def comma_list(text):
+    """'a, b,' -> ['a', 'b']"""
+    items = [item.strip() for item in text.split(',') if item.strip()]
+    if not items:
+        raise argparse.ArgumentTypeError("expected a comma-separated list")
+    return items
+
+
+def float_list(text):
+    """'0.1,1' -> [0.1, 1.0]"""
+    try:
+        return [float(item) for item in comma_list(text)]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected comma-separated numbers, got '{text}'")
+
+
+def positive_int(text):
+    try:
+        value = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected a whole number, got '{text}'")
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"expected a number >= 1, got {value}")
+    return value
+
+
+def positive_float(text):
+    try:
+        value = float(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected a number, got '{text}'")
+    if value <= 0:
+        raise argparse.ArgumentTypeError(f"expected a number > 0, got {value:g}")
+    return value
+
+
+def iso_date(text):
+    """'2025-04-01', checked but kept as a string"""
+    try:
+        date.fromisoformat(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected a date as YYYY-MM-DD, got '{text}'")
+    return text
+
+
+def add_window_arguments(parser):
+    """--start / --end: the analysis window (see lake.resolve_window)"""
+    parser.add_argument('--start', type=iso_date, metavar='YYYY-MM-DD', help="first day of the analysis window")
+    parser.add_argument('--end', type=iso_date, metavar='YYYY-MM-DD', help="last day of the analysis window")
+    return parser
+
+
+def stage_parser(description):
+    """Parser with the flags every dimension script takes: --force and the window"""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('--force', action='store_true', help="rerun even if outputs are up to date")
+    return add_window_arguments(parser)
+
+
+def parse_window_args(parser, argv=None):
+    """parse_args(), rejecting a window that ends before it starts"""
+    from utils.lake import resolve_window
+
+    args = parser.parse_args(argv)
+    try:
+        resolve_window(args.start, args.end)
+    except ValueError as e:
+        parser.error(str(e))
+    return args
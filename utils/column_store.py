@@ -0,0 +1,188 @@
+"""
+Column Store
+Binary on-disk copy of merged_data.csv that opens without parsing
+
+02_data_cleaning.py writes the merged dataset twice: as merged_data.csv and
+as data/processed/merged_data_store/:
+- one raw np.memmap file per column (counts, totals, ratios, pincode, and
+  dates as int64 nanoseconds)
+- categorical and text key columns (state, district) dictionary-encoded:
+  integer codes on disk, categories / distinct values in the schema
+- schema.json: row count, column layout, and the size/mtime of the CSV it was
+  written alongside
+
+read_merged() returns the store when it still matches merged_data.csv. Numeric
+columns are read-only views of the mapped files, so opening is near-instant and
+processes reading the same store share pages through the OS cache. If the store
+is missing or the CSV has changed since, read_merged() parses the CSV instead.
+"""
+
+import os
+import json
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from utils.config import PROCESSED_DATA_DIR, COLUMN_STORE_ENABLED
+from utils.schema import enforce_schema, read_dataset
+
+
+MERGED_PATH = os.path.join(PROCESSED_DATA_DIR, 'merged_data.csv')
+SCHEMA_FILE = 'schema.json'
+STORE_VERSION = 1
+
+
+def store_path(csv_path):
+    """Store directory kept next to a CSV (merged_data.csv -> merged_data_store/)"""
+    return os.path.splitext(csv_path)[0] + '_store'
+
+
+def source_stat(path):
+    stat = os.stat(path)
+    return {'file': os.path.basename(path), 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def _encode(series):
+    """Column -> (array written to disk, schema fields)"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy(), {
+            'kind': 'category',
+            'values': series.cat.categories.tolist(),
+            'ordered': bool(series.cat.ordered),
+        }
+    if series.dtype == object:
+        codes, uniques = pd.factorize(series)
+        return codes.astype(np.int32), {'kind': 'dictionary', 'values': uniques.tolist()}
+    if pd.api.types.is_datetime64_any_dtype(series.dtype):
+        return series.to_numpy().view('int64'), {'kind': 'datetime', 'datetime_dtype': str(series.dtype)}
+    return series.to_numpy(), {'kind': 'numeric'}
+
+
+def write_store(df, directory, source=None):
+    """
+    Write `df` as a column store (replaces any existing store atomically)
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Frame to store (categorical, text, numeric, bool and datetime columns)
+    directory : str
+        Store directory
+    source : str, optional
+        CSV holding the same data; its size/mtime mark the store as current
+
+    Returns:
+    --------
+    dict
+        The schema written
+    """
+    staging = directory + '.tmp'
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+
+    columns = []
+    for i, column in enumerate(df.columns):
+        values, entry = _encode(df[column])
+        values = np.ascontiguousarray(values)
+        entry.update(name=column, file=f"{i:03d}.bin", dtype=values.dtype.str)
+        values.tofile(os.path.join(staging, entry['file']))
+        columns.append(entry)
+
+    schema = {
+        'version': STORE_VERSION,
+        'rows': len(df),
+        'columns': columns,
+        'source': source_stat(source) if source else None,
+    }
+    with open(os.path.join(staging, SCHEMA_FILE), 'w', encoding='utf-8') as f:
+        json.dump(schema, f, indent=2)
+
+    shutil.rmtree(directory, ignore_errors=True)
+    os.replace(staging, directory)
+    return schema
+
+
+def read_schema(directory):
+    path = os.path.join(directory, SCHEMA_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        schema = json.load(f)
+    return schema if schema.get('version') == STORE_VERSION else None
+
+
+def open_store(directory, columns=None):
+    """
+    Open a column store as a DataFrame without copying numeric data
+
+    Parameters:
+    -----------
+    directory : str
+        Store directory
+    columns : list of str, optional
+        Subset of columns (kept in stored order, like read_csv usecols)
+
+    Returns:
+    --------
+    pd.DataFrame
+        Numeric and date columns are read-only memory-mapped views
+    """
+    schema = read_schema(directory)
+    if schema is None:
+        raise FileNotFoundError(f"No column store at {directory}")
+
+    rows = schema['rows']
+    wanted = None if columns is None else set(columns)
+    data = {}
+    for entry in schema['columns']:
+        if wanted is not None and entry['name'] not in wanted:
+            continue
+        dtype = np.dtype(entry['dtype'])
+        if rows:
+            values = np.memmap(os.path.join(directory, entry['file']), dtype=dtype, mode='r', shape=(rows,))
+        else:
+            values = np.empty(0, dtype=dtype)
+
+        if entry['kind'] == 'category':
+            data[entry['name']] = pd.Categorical.from_codes(
+                values, categories=entry['values'], ordered=entry['ordered']
+            )
+        elif entry['kind'] == 'dictionary':
+            # Code -1 (missing) picks the appended NaN
+            lookup = np.array(entry['values'] + [np.nan], dtype=object)
+            data[entry['name']] = lookup[values]
+        elif entry['kind'] == 'datetime':
+            data[entry['name']] = values.view(entry['datetime_dtype'])
+        else:
+            data[entry['name']] = values
+    return pd.DataFrame(data, copy=False)
+
+
+def store_is_current(csv_path, directory=None):
+    """True if the store next to `csv_path` was written with the CSV as it is now"""
+    schema = read_schema(directory or store_path(csv_path))
+    if schema is None or not schema.get('source') or not os.path.exists(csv_path):
+        return False
+    return schema['source'] == source_stat(csv_path)
+
+
+def read_merged(columns=None, path=MERGED_PATH):
+    """
+    Merged dataset from the column store when current, else from the CSV
+
+    Parameters:
+    -----------
+    columns : list of str, optional
+        Subset of columns
+    path : str
+        merged_data.csv
+
+    Returns:
+    --------
+    pd.DataFrame
+        With the 'merged' schema applied (see utils/schema.py)
+    """
+    if COLUMN_STORE_ENABLED and store_is_current(path):
+        return enforce_schema(open_store(store_path(path), columns), 'merged')
+    return read_dataset(path, 'merged', columns)
@@ -16,6 +16,7 @@ PROCESSED_DATA_DIR = os.path.join(PROJECT_ROOT, 'data', 'processed')
 OUTPUTS_DIR = os.path.join(PROJECT_ROOT, 'outputs')
 FIGURES_DIR = os.path.join(OUTPUTS_DIR, 'figures')
 TABLES_DIR = os.path.join(OUTPUTS_DIR, 'tables')
+QUARANTINE_DIR = os.path.join(PROCESSED_DATA_DIR, 'quarantine')
 
 os.makedirs(PROCESSED_DATA_DIR, exist_ok=True)
 os.makedirs(FIGURES_DIR, exist_ok=True)
@@ -46,13 +47,426 @@ DEMOGRAPHIC_FILES = [
     'api_data_aadhar_demographic_2000000_2071700.csv'
 ]
 
+# Loaders discover raw shards with these patterns (utils/shards.py), so new
+# extracts are picked up without editing the lists above; the lists record the
+# 2025 extract layout that the synthetic data generator reproduces
+RAW_FILE_PATTERNS = {
+    'enrollment': 'api_data_aadhar_enrolment_*',
+    'biometric': 'api_data_aadhar_biometric_*',
+    'demographic': 'api_data_aadhar_demographic_*',
+}
+
+# Accepted shard file types, in order of preference when a shard exists in
+# several. Compressed shards are decompressed on a background thread while the
+# CSV parser consumes them (.csv.zst requires the zstandard package)
+RAW_FILE_SUFFIXES = ['.csv', '.csv.zst', '.csv.gz', '.csv.xz']
+
+# Decompressed bytes per block, and blocks buffered ahead of the parser
+DECOMPRESS_BLOCK_SIZE = 1 << 20
+DECOMPRESS_PREFETCH_BLOCKS = 8
+
 # =============================================================================
 # ANALYSIS PERIOD
 # =============================================================================
 
+# Default analysis window; 03-05 accept --start/--end for other windows
 START_DATE = '2025-01-01'
 END_DATE = '2025-12-31'
-ANALYSIS_MONTHS = 12
+ANALYSIS_MONTHS = (int(END_DATE[:4]) - int(START_DATE[:4])) * 12 + int(END_DATE[5:7]) - int(START_DATE[5:7]) + 1
+
+# =============================================================================
+# VALIDITY RULES
+# =============================================================================
+
+# Valid Indian pincode range (6 digits)
+PINCODE_MIN = 100001
+PINCODE_MAX = 855555
+
+# =============================================================================
+# DATA SCHEMAS
+# =============================================================================
+
+# Column dtypes enforced by every loader of cleaned data (utils/schema.py).
+# Counts fit in int32, geography is categorical, and merged totals stay integer
+GEOGRAPHY_DTYPES = {
+    'date': 'datetime64[ns]',
+    'state': 'category',
+    'district': 'category',
+    'pincode': 'int32',
+}
+
+DATASET_SCHEMAS = {
+    'enrollment': dict(GEOGRAPHY_DTYPES, age_0_5='int32', age_5_17='int32', age_18_greater='int32'),
+    'biometric': dict(GEOGRAPHY_DTYPES, bio_age_5_17='int32', bio_age_17_='int32'),
+    'demographic': dict(GEOGRAPHY_DTYPES, demo_age_5_17='int32', demo_age_17_='int32'),
+}
+
+DATASET_SCHEMAS['merged'] = dict(
+    {**DATASET_SCHEMAS['enrollment'], **DATASET_SCHEMAS['biometric'], **DATASET_SCHEMAS['demographic']},
+    total_enrollment='int32',
+    total_biometric_updates='int32',
+    total_demographic_updates='int32',
+    total_updates='int32',
+    ue_ratio='float64',
+)
+
+# =============================================================================
+# STATE NAMES
+# =============================================================================
+
+# COMPREHENSIVE STATE NAME MAPPING
+# Covers all variations, typos, and invalid entries
+STATE_NAME_MAPPING = {
+    # Odisha variations
+    'ODISHA': 'Odisha',
+    'odisha': 'Odisha',
+    'Orissa': 'Odisha',
+
+    # West Bengal variations (most problematic)
+    'WEST BENGAL': 'West Bengal',
+    'WESTBENGAL': 'West Bengal',
+    'Westbengal': 'West Bengal',
+    'west Bengal': 'West Bengal',
+    'West Bangal': 'West Bengal',
+    'West Bengli': 'West Bengal',
+    'West  Bengal': 'West Bengal',  # double space
+    'west bengal': 'West Bengal',
+    'West bengal': 'West Bengal',
+
+    # Chhattisgarh variations
+    'Chhatisgarh': 'Chhattisgarh',
+    'CHHATTISGARH': 'Chhattisgarh',
+
+    # Tamil Nadu variations
+    'Tamilnadu': 'Tamil Nadu',
+    'TAMIL NADU': 'Tamil Nadu',
+
+    # Andhra Pradesh variations
+    'andhra pradesh': 'Andhra Pradesh',
+    'ANDHRA PRADESH': 'Andhra Pradesh',
+
+    # Jammu and Kashmir variations
+    'Jammu And Kashmir': 'Jammu and Kashmir',
+    'Jammu & Kashmir': 'Jammu and Kashmir',
+    'JAMMU AND KASHMIR': 'Jammu and Kashmir',
+
+    # Uttarakhand variations
+    'Uttaranchal': 'Uttarakhand',
+    'UTTARAKHAND': 'Uttarakhand',
+
+    # Puducherry variations
+    'Pondicherry': 'Puducherry',
+    'PUDUCHERRY': 'Puducherry',
+
+    # Andaman & Nicobar variations
+    'Andaman and Nicobar Islands': 'Andaman & Nicobar Islands',
+    'Andaman & Nicobar': 'Andaman & Nicobar Islands',
+    'A & N Islands': 'Andaman & Nicobar Islands',
+    'ANDAMAN & NICOBAR ISLANDS': 'Andaman & Nicobar Islands',
+
+    # Dadra & Nagar Haveli and Daman & Diu (merged UT in 2020)
+    'Dadra & Nagar Haveli': 'Dadra & Nagar Haveli and Daman & Diu',
+    'Daman & Diu': 'Dadra & Nagar Haveli and Daman & Diu',
+    'Dadra and Nagar Haveli': 'Dadra & Nagar Haveli and Daman & Diu',
+    'Daman and Diu': 'Dadra & Nagar Haveli and Daman & Diu',
+    'The Dadra And Nagar Haveli And Daman And Diu': 'Dadra & Nagar Haveli and Daman & Diu',
+    'Dadra and Nagar Haveli and Daman and Diu': 'Dadra & Nagar Haveli and Daman & Diu',
+
+    # Delhi variations
+    'NCT of Delhi': 'Delhi',
+    'New Delhi': 'Delhi',
+    'DELHI': 'Delhi',
+
+    # Other case variations
+    'MANIPUR': 'Manipur',
+    'TRIPURA': 'Tripura',
+    'ASSAM': 'Assam',
+    'BIHAR': 'Bihar',
+    'GOA': 'Goa',
+    'GUJARAT': 'Gujarat',
+    'HARYANA': 'Haryana',
+    'HIMACHAL PRADESH': 'Himachal Pradesh',
+    'JHARKHAND': 'Jharkhand',
+    'KARNATAKA': 'Karnataka',
+    'KERALA': 'Kerala',
+    'MADHYA PRADESH': 'Madhya Pradesh',
+    'MAHARASHTRA': 'Maharashtra',
+    'MEGHALAYA': 'Meghalaya',
+    'MIZORAM': 'Mizoram',
+    'NAGALAND': 'Nagaland',
+    'PUNJAB': 'Punjab',
+    'RAJASTHAN': 'Rajasthan',
+    'SIKKIM': 'Sikkim',
+    'TELANGANA': 'Telangana',
+    'UTTAR PRADESH': 'Uttar Pradesh',
+    'CHANDIGARH': 'Chandigarh',
+    'LADAKH': 'Ladakh',
+    'LAKSHADWEEP': 'Lakshadweep',
+
+    # INVALID ENTRIES - Districts/localities mistakenly in state column
+    # Map to correct state based on known geography
+    'BALANAGAR': 'Telangana',
+    'Darbhanga': 'Bihar',
+    'Jaipur': 'Rajasthan',
+    'Madanapalle': 'Andhra Pradesh',
+    'Nagpur': 'Maharashtra',
+    'Puttenahalli': 'Karnataka',
+    'Raja Annamalai Puram': 'Tamil Nadu',
+
+    # Invalid pincode/numeric entries - will be removed
+    '100000': None,
+}
+
+# =============================================================================
+# DISTRICT NAMES
+# =============================================================================
+
+# COMPREHENSIVE DISTRICT NAME MAPPING
+# Organized by state for clarity
+DISTRICT_NAME_MAPPING = {
+    # Andaman & Nicobar Islands
+    'Nicobars': 'Nicobar',
+
+    # Andhra Pradesh
+    'Ananthapur': 'Anantapur',
+    'Ananthapuramu': 'Anantapur',
+    'chittoor': 'Chittoor',
+    'K.v. Rangareddy': 'K.V.Rangareddy',
+    'Karim Nagar': 'Karimnagar',
+    'Mahabub Nagar': 'Mahbubnagar',
+    'Mahabubnagar': 'Mahbubnagar',
+    'rangareddi': 'Rangareddi',
+    'Visakhapatanam': 'Visakhapatnam',
+
+    # Arunachal Pradesh
+    # East/West variations are DIFFERENT districts - keep separate
+
+    # Assam
+    # Karbi Anglong and West Karbi Anglong are DIFFERENT - keep separate
+    'Sivasagar': 'Sibsagar',
+
+    # Bihar
+    'Aurangabad(BH)': 'Aurangabad',
+    'Aurangabad(bh)': 'Aurangabad',
+    'Pashchim Champaran': 'West Champaran',
+    'Purba Champaran': 'East Champaran',
+    'Purbi Champaran': 'East Champaran',
+    'Purnia': 'Purnea',
+    'Samstipur': 'Samastipur',
+    'Sheikpura': 'Sheikhpura',
+
+    # Chhattisgarh
+    'Gaurella Pendra Marwahi': 'Gaurela-pendra-marwahi',
+    'Janjgir Champa': 'Janjgir - Champa',
+    'Janjgir-champa': 'Janjgir - Champa',
+    'Manendragarh–Chirmiri–Bharatpur': 'ManendragarhChirmiriBharatpur',
+    'Mohla-Manpur-Ambagarh Chouki': 'Mohalla-Manpur-Ambagarh Chowki',
+
+    # Dadra & Nagar Haveli and Daman & Diu
+    'Dadra And Nagar Haveli': 'Dadra & Nagar Haveli',
+    'Dadra and Nagar Haveli': 'Dadra & Nagar Haveli',
+
+    # Delhi
+    'North East   *': 'North East',
+    # Note: East/West/North/South Delhi are DIFFERENT districts
+
+    # Gujarat
+    'Ahmedabad': 'Ahmadabad',
+    'Banaskantha': 'Banas Kantha',
+    'Panchmahals': 'Panch Mahals',
+    'Sabarkantha': 'Sabar Kantha',
+    'Surendranagar': 'Surendra Nagar',
+
+    # Haryana
+    'Jhajjar *': 'Jhajjar',
+    'Yamunanagar': 'Yamuna Nagar',
+
+    # Himachal Pradesh
+    'Lahul & Spiti': 'Lahaul and Spiti',
+    'Lahul and Spiti': 'Lahaul and Spiti',
+
+    # Jammu and Kashmir
+    'Budgam': 'Badgam',
+    'Bandipur': 'Bandipore',
+    'punch': 'Punch',
+    'Rajouri': 'Rajauri',
+    'udhampur': 'Udhampur',
+
+    # Jharkhand
+    'Bokaro *': 'Bokaro',
+    'East Singhbum': 'East Singhbhum',
+    'Garhwa *': 'Garhwa',
+    'Hazaribagh': 'Hazaribag',
+    'Koderma': 'Kodarma',
+    'Pakur': 'Pakaur',
+    'Palamu': 'Palamau',
+    'Sahibganj': 'Sahebganj',
+    'Seraikela-kharsawan': 'Seraikela-Kharsawan',
+
+    # Karnataka
+    'Bagalkot *': 'Bagalkot',
+    'Chamarajanagar *': 'Chamarajanagar',
+    'Chamrajanagar': 'Chamarajanagar',
+    'Chamrajnagar': 'Chamarajanagar',
+    'Chikkamagaluru': 'Chickmagalur',
+    'Chikmagalur': 'Chickmagalur',
+    'Davangere': 'Davanagere',
+    'Gadag *': 'Gadag',
+    'Hassan': 'Hasan',
+    'Haveri *': 'Haveri',
+    'Ramanagara': 'Ramanagar',
+    'Shivamogga': 'Shimoga',
+    'Tumkur': 'Tumakuru',
+    'Udupi *': 'Udupi',
+    'yadgir': 'Yadgir',
+
+    # Kerala
+    'Kasargod': 'Kasaragod',
+
+    # Madhya Pradesh
+    'Ashoknagar': 'Ashok Nagar',
+    'Harda *': 'Harda',
+    'Narsinghpur': 'Narsimhapur',
+
+    # Maharashtra
+    'Ahmed Nagar': 'Ahmadnagar',
+    'Ahmednagar': 'Ahmadnagar',
+    'Buldhana': 'Buldana',
+    'Chhatrapati Sambhajinagar': 'Chatrapati Sambhaji Nagar',
+    'Gondiya': 'Gondia',
+    'Hingoli *': 'Hingoli',
+    'Mumbai( Sub Urban )': 'Mumbai Suburban',
+    'Nandurbar *': 'Nandurbar',
+    'Washim *': 'Washim',
+
+    # Manipur
+    # Imphal East and West are DIFFERENT - keep separate
+
+    # Meghalaya
+    # Multiple Hills districts are DIFFERENT - keep separate
+
+    # Mizoram
+    'Mammit': 'Mamit',
+
+    # Odisha
+    'ANGUL': 'Angul',
+    'ANUGUL': 'Angul',
+    'Anugul': 'Angul',
+    'BALANGIR': 'Balangir',
+    'Baleswar': 'Baleshwar',
+    'Bhadrak(R)': 'Bhadrak',
+    'JAJPUR': 'Jajpur',
+    'Jajapur': 'Jajpur',
+    'jajpur': 'Jajpur',
+    'Jagatsinghpur': 'Jagatsinghapur',
+    'Kendrapara *': 'Kendrapara',
+    'Khordha': 'Khorda',
+    'NAYAGARH': 'Nayagarh',
+    'NUAPADA': 'Nuapada',
+    'Nabarangpur': 'Nabarangapur',
+    'Sundergarh': 'Sundargarh',
+
+    # Punjab
+    'Firozpur': 'Ferozepur',
+    'SAS Nagar (Mohali)': 'S.A.S Nagar(Mohali)',
+
+    # Rajasthan
+    'Chittorgarh': 'Chittaurgarh',
+    'Deeg\xa0': 'Deeg',  # Remove non-breaking space
+    'Jalore': 'Jalor',
+    'Jhunjhunun': 'Jhunjhunu',
+
+    # Sikkim
+    # East/West/North/South are DIFFERENT - keep separate
+
+    # Tamil Nadu
+    'Kanchipuram': 'Kancheepuram',
+    'Kanyakumari': 'Kanniyakumari',
+    'Thiruvarur': 'Thiruvallur',
+    'Tiruvallur': 'Thiruvallur',
+    'Tirupattur': 'Tirupathur',
+    'Viluppuram': 'Villupuram',
+
+    # Telangana
+    'Jangoan': 'Jangaon',
+    'Medchal-malkajgiri': 'Medchal Malkajgiri',
+    'Medchal?malkajgiri': 'Medchal Malkajgiri',
+    'Medchalâ\x88\x92malkajgiri': 'Medchal Malkajgiri',
+    'Medchal−malkajgiri': 'Medchal Malkajgiri',
+    'Rangareddy': 'Ranga Reddy',
+    'Warangal Urban': 'Warangal (urban)',
+    # Note: Sangareddy is DIFFERENT from Rangareddy
+
+    # Tripura
+    # North/South are DIFFERENT - keep separate
+
+    # Uttar Pradesh
+    'Auraiya *': 'Auraiya',
+    'Baghpat *': 'Baghpat',
+    'Bagpat': 'Baghpat',
+    'Barabanki': 'Bara Banki',
+    'Bulandshahr': 'Bulandshahar',
+    'Chandauli *': 'Chandauli',
+    'Chitrakoot *': 'Chitrakoot',
+    'Gautam Buddha Nagar *': 'Gautam Buddha Nagar',
+    'Jyotiba Phule Nagar *': 'Jyotiba Phule Nagar',
+    'Kushinagar': 'Kushi Nagar',
+    'Kushinagar *': 'Kushi Nagar',
+    'Mahrajganj': 'Maharajganj',
+    'Mahoba *': 'Mahoba',
+    'Raebareli': 'Rae Bareli',
+    'Sant Ravidas Nagar Bhadohi': 'Sant Ravidas Nagar',
+    'Shrawasti': 'Shravasti',
+    'Siddharthnagar': 'Siddharth Nagar',
+    # Note: Faizabad and Firozabad are DIFFERENT districts
+
+    # Uttarakhand
+    'Haridwar': 'Hardwar',
+    'Udham Singh Nagar *': 'Udham Singh Nagar',
+
+    # West Bengal
+    'Bardhaman': 'Barddhaman',
+    'Coochbehar': 'Cooch Behar',
+    'Darjiling': 'Darjeeling',
+    'East Midnapur': 'East Midnapore',
+    'East midnapore': 'East Midnapore',
+    'east midnapore': 'East Midnapore',
+    'HOOGHLY': 'Hooghly',
+    'Hooghiy': 'Hooghly',
+    'hooghly': 'Hooghly',
+    'HOWRAH': 'Howrah',
+    'Hawrah': 'Howrah',
+    'KOLKATA': 'Kolkata',
+    'MALDA': 'Malda',
+    'Maldah': 'Malda',
+    'NADIA': 'Nadia',
+    'nadia': 'Nadia',
+    'South 24 Pargana': 'South 24 Parganas',
+    'South 24 pargana': 'South 24 Parganas',
+    'South 24 parganas': 'South 24 Parganas',
+    'South  Twenty Four Parganas': 'South Twenty Four Parganas',
+    'Puruliya': 'Purulia',
+
+
+
+    # West Bengal
+    'Medinipur West': 'Paschim Medinipur',
+    'West Midnapore': 'Paschim Medinipur',
+    'West Medinipur': 'Paschim Medinipur',
+    'East Midnapore': 'Purba Medinipur',
+
+    # Sikkim
+    'East': 'East Sikkim',
+    'South': 'South Sikkim',
+    'North': 'North Sikkim',
+    'West': 'West Sikkim',
+
+    # Jharkhand
+    'Purbi Singhbhum': 'East Singhbhum',
+    'Pashchimi Singhbhum': 'West Singhbhum',
+
+    # Special characters cleanup
+}
 
 # =============================================================================
 # UE RATIO THRESHOLDS (Verified: 119.06M updates ÷ 5.44M enrollments = 21.90)
@@ -63,6 +477,12 @@ LOW_UE_RATIO = 10.0
 HIGH_UE_RATIO = 30.0
 ANOMALY_UE_RATIO = 40.0
 
+# District UE ratio bands published by dimension 1 (right-closed pd.cut bins)
+UE_CATEGORY_BANDS = {
+    'bins': [0, LOW_UE_RATIO, NATIONAL_UE_RATIO, HIGH_UE_RATIO, float('inf')],
+    'labels': ['Low', 'Normal', 'High', 'Very High'],
+}
+
 # =============================================================================
 # READINESS THRESHOLDS
 # =============================================================================
@@ -71,6 +491,19 @@ GOOD_READINESS = 30
 MODERATE_READINESS = 15
 CRITICAL_READINESS = 10
 
+# District readiness bands published by dimension 2 (right-closed pd.cut bins);
+# the 'Low' band only exists while MODERATE_READINESS is above CRITICAL_READINESS
+if MODERATE_READINESS == CRITICAL_READINESS:
+    READINESS_CATEGORY_BANDS = {
+        'bins': [0, CRITICAL_READINESS, GOOD_READINESS, 100],
+        'labels': ['Critical', 'Moderate', 'Good'],
+    }
+else:
+    READINESS_CATEGORY_BANDS = {
+        'bins': [0, CRITICAL_READINESS, MODERATE_READINESS, GOOD_READINESS, 100],
+        'labels': ['Critical', 'Low', 'Moderate', 'Good'],
+    }
+
 # =============================================================================
 # ANOMALY DETECTION
 # =============================================================================
@@ -93,6 +526,132 @@ HIGH_CHILD_ENROLLMENT = 0.98
 NATIONAL_BIRTH_RATE = 16.5
 MBU_AGES = [5, 15]
 
+# =============================================================================
+# PROFILING
+# =============================================================================
+
+# Rows per chunk when streaming raw shards, and shards profiled in parallel
+PROFILE_CHUNKSIZE = 250_000
+PROFILE_WORKERS = min(4, os.cpu_count() or 1)
+
+# Threads used by validation_test.py to run independent checks concurrently
+VALIDATION_WORKERS = 4
+
+# =============================================================================
+# CLEANING
+# =============================================================================
+
+# Cleaning engine for 02_data_cleaning.py: 'fused' (one pass per raw shard,
+# cached per shard), 'pandas' (step by step, no shard cache) or 'polars' (lazy
+# query plan, requires polars); all give the same results
+# (check_cleaning_engines.py). Overridden by the UIDAI_CLEANING_ENGINE env var
+CLEANING_ENGINE = 'fused'
+
+# Shards cleaned in parallel by the fused engine (1 = in-process)
+CLEANING_WORKERS = min(4, os.cpu_count() or 1)
+
+# Keep each raw shard's cleaned rows and aggregates (data/processed/shard_cache)
+# so the fused engine only reprocesses new or changed shards
+SHARD_CACHE_ENABLED = True
+
+# =============================================================================
+# COLUMN STORE
+# =============================================================================
+
+# Also write merged data as memory-mapped columns (data/processed/merged_data_store)
+# and read it from there instead of parsing merged_data.csv
+COLUMN_STORE_ENABLED = True
+
+# =============================================================================
+# DATA LAKE
+# =============================================================================
+
+# Also write merged data partitioned by month (data/processed/merged_lake/
+# year=YYYY/month=MM), so reads for a date window open only the months in it
+LAKE_ENABLED = True
+
+# Split each month further by state (year=/month=/state=)
+LAKE_PARTITION_BY_STATE = False
+
+# =============================================================================
+# PARTITIONING
+# =============================================================================
+
+# Worker processes for state-partitioned dimension analyses (1 = in-process),
+# and the smallest merged frame worth splitting
+PARTITION_WORKERS = min(32, os.cpu_count() or 1)
+PARTITION_MIN_ROWS = 500_000
+
+# Worker processes for run_dimensions.py (dimensions 1-3 side by side); each
+# worker's partition and figure pools share the remaining cores
+# (os.cpu_count() // workers each)
+DIMENSION_WORKERS = min(3, os.cpu_count() or 1)
+
+# =============================================================================
+# AGGREGATION
+# =============================================================================
+
+# Group-by backend: 'pandas', 'chunked' (streams CSV sources) or 'duckdb'
+# (overridden by the UIDAI_AGG_BACKEND env var)
+AGGREGATION_BACKEND = 'pandas'
+AGGREGATION_CHUNKSIZE = 1_000_000
+
+# DuckDB settings (None = DuckDB defaults: all cores, 80% of RAM)
+DUCKDB_THREADS = None
+DUCKDB_MEMORY_LIMIT = None
+
+# =============================================================================
+# TELEMETRY
+# =============================================================================
+
+# Per-stage run logs (JSON) and Prometheus textfiles; UIDAI_TELEMETRY=0 disables
+TELEMETRY_DIR = os.path.join(OUTPUTS_DIR, 'telemetry')
+TELEMETRY_ENABLED = True
+
+# None, 'cprofile' or 'pyinstrument' (overridden by the UIDAI_PROFILE env var)
+TELEMETRY_PROFILE = None
+
+# =============================================================================
+# BENCHMARKS
+# =============================================================================
+
+BENCHMARK_DIR = os.path.join(OUTPUTS_DIR, 'benchmarks')
+
+# Synthetic data scales (1.0 = 4.94M raw rows) and allowed slowdown vs baseline
+BENCHMARK_SCALES = [0.01, 0.05]
+BENCHMARK_TOLERANCE = 0.25
+
+# =============================================================================
+# METRICS SERVICE
+# =============================================================================
+
+# Address of src/metrics_service.py (local only by default)
+METRICS_SERVICE_HOST = '127.0.0.1'
+METRICS_SERVICE_PORT = 8765
+
+# Query results kept in the LRU cache, and seconds between checks for new tables
+METRICS_CACHE_SIZE = 1024
+METRICS_RELOAD_SECONDS = 2.0
+
+# =============================================================================
+# AD-HOC QUERIES
+# =============================================================================
+
+# Keep src/query.py results (data/processed/query_cache), newest first, until
+# merged data or utils/ change
+QUERY_CACHE_ENABLED = True
+QUERY_CACHE_ENTRIES = 500
+
+# =============================================================================
+# STATE REPORTS
+# =============================================================================
+
+# Per-state tables, figures and PDFs from run_state_reports.py (one directory per state)
+STATE_REPORTS_DIR = os.path.join(OUTPUTS_DIR, 'states')
+
+# Worker processes building state reports (ReportLab builds are single-threaded)
+STATE_REPORT_WORKERS = min(4, os.cpu_count() or 1)
+
 # =============================================================================
 # VISUALIZATION
 # =============================================================================
@@ -111,6 +670,15 @@ FIG_SIZE_LARGE = (12, 8)
 FIG_SIZE_WIDE = (14, 6)
 DPI = 300
 
+# Worker processes used to render figures in parallel (1 = serial)
+FIGURE_WORKERS = min(4, os.cpu_count() or 1)
+
+# Figures embedded in the PDF report are resampled to their printed size at this DPI
+REPORT_IMAGE_DPI = 150
+
+# Also save figures as SVG and embed those as vectors (requires svglib)
+REPORT_VECTOR_FIGURES = False
+
 # =============================================================================
 # HELPER FUNCTIONS
 # =============================================================================
@@ -146,4 +714,10 @@ def classify_readiness_score(score):
     elif score >= MODERATE_READINESS:
         return 'Moderate'
     else:
-        return 'Critical'
\ No newline at end of file
+        return 'Critical'
+
+
+def analysis_months(start_date, end_date):
+    """Calendar months touched by an analysis window (dates as 'YYYY-MM-DD')"""
+    start, end = str(start_date)[:10], str(end_date)[:10]
+    return (int(end[:4]) - int(start[:4])) * 12 + int(end[5:7]) - int(start[5:7]) + 1
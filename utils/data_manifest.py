@@ -0,0 +1,145 @@
+"""
+Data Manifest
+Row counts, column sums, distinct counts and content hashes of raw and processed
+data files, recorded when the files are read or written
+"""
+
+import os
+import json
+import mmap
+from datetime import datetime
+
+import numpy as np
+
+from utils.config import PROCESSED_DATA_DIR, PROJECT_ROOT
+from utils.artifact_cache import file_fingerprint
+from utils.shards import is_compressed, open_shard
+
+
+MANIFEST_PATH = os.path.join(PROCESSED_DATA_DIR, 'data_manifest.json')
+
+# Columns whose distinct counts are recorded for every file that has them
+DISTINCT_COLUMNS = ['state', 'district', 'pincode', 'date']
+
+
+def count_rows(path, header=True, block_size=1 << 24):
+    """
+    Count CSV data rows by counting newlines in a memory-mapped file
+
+    Assumes no newlines inside quoted fields (true for the UIDAI exports).
+    A final line without a trailing newline is counted. Compressed raw shards
+    are counted as they are decompressed.
+    """
+    if is_compressed(path):
+        return _count_stream_rows(path, header, block_size)
+    if os.path.getsize(path) == 0:
+        return 0
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        lines = 0
+        for start in range(0, len(mm), block_size):
+            lines += mm[start:start + block_size].count(b'\n')
+        if mm[-1:] != b'\n':
+            lines += 1
+    return max(0, lines - 1) if header else lines
+
+
+def _count_stream_rows(path, header, block_size):
+    lines, last = 0, b''
+    with open_shard(path) as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            lines += block.count(b'\n')
+            last = block[-1:]
+    if last and last != b'\n':
+        lines += 1
+    return max(0, lines - 1) if header else lines
+
+
+def _builtin(value):
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def describe_frame(df, distinct_columns=DISTINCT_COLUMNS):
+    """Row count, numeric column sums and distinct counts of a loaded frame"""
+    numeric = df.select_dtypes('number')
+    return {
+        'rows': int(len(df)),
+        'columns': list(df.columns),
+        'sums': {col: _builtin(numeric[col].sum()) for col in numeric.columns},
+        'distinct': {col: int(df[col].nunique()) for col in distinct_columns if col in df.columns},
+    }
+
+
+class DataManifest:
+    """
+    JSON manifest of data files, keyed by path relative to the project root
+
+    An entry is current while the file's size and mtime match what was recorded,
+    so readers can trust its numbers without opening the file.
+    """
+
+    def __init__(self, path=MANIFEST_PATH):
+        self.path = path
+        self.files = self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f).get('files', {})
+        except (OSError, ValueError):
+            return {}
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'files': self.files}, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    @staticmethod
+    def _rel(path):
+        return os.path.relpath(os.path.abspath(path), PROJECT_ROOT).replace(os.sep, '/')
+
+    def record(self, stage, path, df):
+        """Record a file together with the frame that was read from / written to it"""
+        st = os.stat(path)
+        entry = describe_frame(df)
+        entry.update({
+            'stage': stage,
+            'size': st.st_size,
+            'mtime_ns': st.st_mtime_ns,
+            'hash': file_fingerprint(path),
+            'recorded_at': datetime.now().isoformat(timespec='seconds'),
+        })
+        self.files[self._rel(path)] = entry
+        return entry
+
+    def entry(self, path):
+        """The recorded entry for path, or None if missing or the file has changed"""
+        entry = self.files.get(self._rel(path))
+        if entry is None or not os.path.exists(path):
+            return None
+        st = os.stat(path)
+        if entry.get('size') != st.st_size or entry.get('mtime_ns') != st.st_mtime_ns:
+            return None
+        return entry
+
+    def row_count(self, path):
+        """
+        Data rows in a CSV: from the manifest when current, else a newline count
+
+        Returns:
+        --------
+        (rows, source) where source is 'manifest' or 'counted'
+        """
+        entry = self.entry(path)
+        if entry is not None:
+            return entry['rows'], 'manifest'
+        return count_rows(path), 'counted'
+
+    def distinct(self, path, column):
+        entry = self.entry(path)
+        if entry is None:
+            return None
+        return entry['distinct'].get(column)
@@ -0,0 +1,234 @@
+"""
+Data Quality Rules
+Declarative row-level validity rules evaluated as vectorized masks, one pass per chunk
+"""
+
+import os
+from functools import reduce
+
+import numpy as np
+import pandas as pd
+
+from utils.config import (
+    TABLES_DIR, QUARANTINE_DIR,
+    START_DATE, END_DATE, PINCODE_MIN, PINCODE_MAX
+)
+
+
+KEY_COLUMNS = ['date', 'state', 'district', 'pincode']
+
+
+class RuleContext:
+    """
+    One chunk plus the derived columns rules share, computed once per chunk
+
+    Parameters:
+    -----------
+    chunk : pd.DataFrame
+        Raw rows (index = row offset within the source file)
+    dates : pd.Series
+        Parsed dates (NaT where unparseable)
+    values : pd.DataFrame
+        Count columns coerced to numeric (NaN where not numeric)
+    pincodes : pd.Series
+        Pincode coerced to numeric
+    """
+
+    def __init__(self, chunk, dates, values, pincodes):
+        self.chunk = chunk
+        self.dates = dates
+        self.values = values
+        self.pincodes = pincodes
+
+
+class Rule:
+    """
+    A named row-level rule
+
+    `check(ctx, **params)` returns a boolean Series that is True for rows
+    VIOLATING the rule. Checks are module-level functions so rules (and the
+    profiles holding them) can be sent to worker processes.
+    """
+
+    def __init__(self, rule_id, description, check, **params):
+        self.rule_id = rule_id
+        self.description = description
+        self.check = check
+        self.params = params
+
+    def evaluate(self, ctx):
+        return self.check(ctx, **self.params).fillna(False).astype(bool)
+
+
+# =============================================================================
+# CHECKS
+# =============================================================================
+
+def missing_key(ctx):
+    return ctx.chunk[KEY_COLUMNS].isna().any(axis=1)
+
+
+def pincode_not_six_digits(ctx):
+    pin = ctx.pincodes
+    return ctx.chunk['pincode'].notna() & (
+        pin.isna() | (pin % 1 != 0) | (pin < 100000) | (pin > 999999)
+    )
+
+
+def pincode_out_of_range(ctx, low, high):
+    return ctx.pincodes.notna() & ((ctx.pincodes < low) | (ctx.pincodes > high))
+
+
+def non_numeric_count(ctx):
+    raw = ctx.chunk[ctx.values.columns]
+    return (raw.notna() & ctx.values.isna()).any(axis=1)
+
+
+def negative_count(ctx):
+    return (ctx.values < 0).any(axis=1)
+
+
+def unparseable_date(ctx):
+    return ctx.chunk['date'].notna() & ctx.dates.isna()
+
+
+def date_outside_period(ctx, start, end):
+    return ctx.dates.notna() & ((ctx.dates < pd.Timestamp(start)) | (ctx.dates > pd.Timestamp(end)))
+
+
+ROW_RULES = [
+    Rule('DQ001', 'Date, state, district or pincode missing', missing_key),
+    Rule('DQ002', 'Pincode is not a 6-digit number', pincode_not_six_digits),
+    Rule('DQ003', f'Pincode outside {PINCODE_MIN}-{PINCODE_MAX}', pincode_out_of_range,
+         low=PINCODE_MIN, high=PINCODE_MAX),
+    Rule('DQ004', 'Count column is not numeric', non_numeric_count),
+    Rule('DQ005', 'Count column is negative', negative_count),
+    Rule('DQ006', 'Date could not be parsed', unparseable_date),
+    Rule('DQ007', f'Date outside analysis period {START_DATE} to {END_DATE}', date_outside_period,
+         start=START_DATE, end=END_DATE),
+]
+
+
+# =============================================================================
+# RESULTS
+# =============================================================================
+
+class RuleResults:
+    """
+    Mergeable per-rule counts, violation rows and quarantined rows
+
+    violations has one row per (rule, offending row): rule_id, source file,
+    row offset within that file and a 'date|pincode' key.
+    """
+
+    def __init__(self, rules=ROW_RULES):
+        self.descriptions = {rule.rule_id: rule.description for rule in rules}
+        self.counts = dict.fromkeys(self.descriptions, 0)
+        self.rows_checked = 0
+        self.violations = []
+        self.quarantine = []
+
+    def update(self, rules, ctx, source):
+        chunk = ctx.chunk
+        masks = pd.DataFrame({rule.rule_id: rule.evaluate(ctx) for rule in rules}, index=chunk.index)
+
+        self.rows_checked += len(chunk)
+        for rule_id, count in masks.sum().items():
+            self.counts[rule_id] += int(count)
+
+        bad = masks.any(axis=1)
+        if not bad.any():
+            return
+        masks = masks[bad]
+        rows = chunk[bad]
+
+        hits = masks.to_numpy()
+        row_pos, rule_pos = np.nonzero(hits)
+        keys = (rows['date'].astype(str) + '|' + rows['pincode'].astype(str)).to_numpy()
+        self.violations.append(pd.DataFrame({
+            'rule_id': masks.columns.to_numpy()[rule_pos],
+            'source': source,
+            'row': masks.index.to_numpy()[row_pos],
+            'key': keys[row_pos],
+        }))
+
+        labels = [np.where(masks[rule_id], rule_id + ';', '') for rule_id in masks.columns]
+        self.quarantine.append(rows.assign(
+            dq_source=source,
+            dq_row=rows.index,
+            dq_rules=pd.Series(reduce(np.char.add, labels), index=rows.index).str.rstrip(';')
+        ))
+
+    def merge(self, other):
+        for rule_id, count in other.counts.items():
+            self.counts[rule_id] = self.counts.get(rule_id, 0) + count
+        self.descriptions.update(other.descriptions)
+        self.rows_checked += other.rows_checked
+        self.violations.extend(other.violations)
+        self.quarantine.extend(other.quarantine)
+        return self
+
+    def count_table(self, dataset):
+        return pd.DataFrame([
+            {
+                'dataset': dataset,
+                'rule_id': rule_id,
+                'description': self.descriptions[rule_id],
+                'violations': count,
+                'rows_checked': self.rows_checked,
+                'violation_pct': round(count / self.rows_checked * 100, 4) if self.rows_checked else 0.0
+            }
+            for rule_id, count in self.counts.items()
+        ])
+
+    def violation_table(self, dataset):
+        if not self.violations:
+            return pd.DataFrame(columns=['dataset', 'rule_id', 'source', 'row', 'key'])
+        table = pd.concat(self.violations, ignore_index=True)
+        table.insert(0, 'dataset', dataset)
+        return table
+
+    def quarantined_rows(self):
+        return pd.concat(self.quarantine, ignore_index=True) if self.quarantine else None
+
+
+def write_rule_outputs(results_by_dataset):
+    """
+    Save per-rule counts, the violation table and quarantined rows
+
+    Parameters:
+    -----------
+    results_by_dataset : dict
+        Dataset name -> RuleResults
+
+    Returns:
+    --------
+    pd.DataFrame
+        Per-rule counts for all datasets
+    """
+    counts = pd.concat(
+        [results.count_table(name) for name, results in results_by_dataset.items()],
+        ignore_index=True
+    )
+    counts.to_csv(os.path.join(TABLES_DIR, 'dq_rule_counts.csv'), index=False)
+    print(f"  ✓ Saved: dq_rule_counts.csv")
+
+    violations = pd.concat(
+        [results.violation_table(name) for name, results in results_by_dataset.items()],
+        ignore_index=True
+    )
+    violations.to_csv(os.path.join(TABLES_DIR, 'dq_violations.csv'), index=False)
+    print(f"  ✓ Saved: dq_violations.csv ({len(violations):,} violations)")
+
+    os.makedirs(QUARANTINE_DIR, exist_ok=True)
+    for name, results in results_by_dataset.items():
+        path = os.path.join(QUARANTINE_DIR, f'{name.lower()}_quarantine.csv')
+        quarantined = results.quarantined_rows()
+        if quarantined is None:
+            if os.path.exists(path):
+                os.remove(path)
+            continue
+        quarantined.to_csv(path, index=False)
+        print(f"  ✓ Quarantined: {len(quarantined):,} {name.lower()} rows -> {os.path.basename(path)}")
+
+    return counts
@@ -0,0 +1,161 @@
+"""
+Figure Rendering
+Collect figure specs (plotting function + data) and render them on a process pool
+"""
+
+import os
+import time
+import pickle
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+from utils.config import FIGURES_DIR, DPI, FIGURE_WORKERS, REPORT_VECTOR_FIGURES
+from utils.artifact_cache import get_artifact_cache, hash_values, code_fingerprint
+
+
+# Config that changes rendered figures (stages include it in their cache keys)
+FIGURE_CONFIG = ['DPI', 'REPORT_VECTOR_FIGURES']
+
+_workers = FIGURE_WORKERS
+
+
+def set_workers(workers):
+    """Limit render_figures() pools in this process (e.g. inside a run_dimensions worker)"""
+    global _workers
+    _workers = max(1, min(FIGURE_WORKERS, int(workers)))
+
+
+class FigureSpec:
+    """
+    One independent figure
+
+    Parameters:
+    -----------
+    filename : str
+        Output file name inside FIGURES_DIR (or the directory passed to
+        render_figures)
+    plot_func : callable
+        Module-level function that draws onto the current pyplot figure
+        (it must not call savefig/close; the renderer does that)
+    data : dict
+        Keyword arguments passed to plot_func - the only inputs it may use
+    """
+
+    def __init__(self, filename, plot_func, **data):
+        self.filename = filename
+        self.plot_func = plot_func
+        self.data = data
+        self.directory = FIGURES_DIR
+
+    @property
+    def path(self):
+        return os.path.join(self.directory, self.filename)
+
+    def input_hash(self):
+        """Hash of the plotting code, its data and the output DPI"""
+        return hash_values(
+            f"{self.plot_func.__module__}.{self.plot_func.__qualname__}|{DPI}",
+            code_fingerprint(self.plot_func),
+            self.data
+        )
+
+
+def _init_worker():
+    """Process pool initializer: force the non-interactive Agg backend"""
+    import matplotlib
+    matplotlib.use('Agg', force=True)
+
+
+def _render(spec):
+    """Draw one spec and save it; runs inside a worker (or in-process)"""
+    import matplotlib.pyplot as plt
+
+    start = time.perf_counter()
+    try:
+        spec.plot_func(**spec.data)
+        plt.savefig(spec.path, dpi=DPI)
+        if REPORT_VECTOR_FIGURES:
+            plt.savefig(os.path.splitext(spec.path)[0] + '.svg')
+    finally:
+        plt.close('all')
+    return spec.filename, time.perf_counter() - start
+
+
+def render_figures(specs, group, max_workers=None, force=False, directory=None):
+    """
+    Render figure specs in parallel, skipping those whose inputs are unchanged
+
+    Parameters:
+    -----------
+    specs : list of FigureSpec
+    group : str
+        Artifact cache group (one per dimension script, so scripts running
+        concurrently never write the same manifest)
+    max_workers : int, optional
+        Process pool size; 1 renders serially in this process (default:
+        FIGURE_WORKERS, or the set_workers() limit)
+    force : bool
+        Re-render everything regardless of the artifact cache
+    directory : str, optional
+        Save into this directory instead of FIGURES_DIR
+
+    Returns:
+    --------
+    dict with 'rendered' and 'skipped' file name lists
+    """
+    if directory is not None:
+        os.makedirs(directory, exist_ok=True)
+        for spec in specs:
+            spec.directory = directory
+
+    cache = get_artifact_cache(group)
+    pending = []
+    skipped = []
+
+    for spec in specs:
+        key = cache.key(spec.input_hash())
+        if not force and cache.is_fresh(spec.path, key):
+            skipped.append(spec.filename)
+            print(f"  ↺ Unchanged: {spec.filename}")
+        else:
+            pending.append((spec, key))
+
+    rendered = []
+    if pending:
+        workers = max(1, min(_workers if max_workers is None else max_workers, len(pending)))
+        results = _run(pending, workers)
+        for spec, key in pending:
+            if spec.filename in results:
+                cache.record(spec.path, key)
+                rendered.append(spec.filename)
+                print(f"  ✓ Saved: {spec.filename} ({results[spec.filename]:.1f}s)")
+
+    cache.save()
+    return {'rendered': rendered, 'skipped': skipped}
+
+
+def _run(pending, workers):
+    """
+    Render pending specs; fall back to serial rendering if the pool is unusable
+
+    Only pool failures (workers that cannot start, die, or cannot be sent a
+    spec) trigger the fallback. An error raised by a plot function is
+    re-raised as is, without rendering the batch a second time.
+    """
+    if workers > 1:
+        try:
+            results = {}
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+                try:
+                    futures = [pool.submit(_render, spec) for spec, _ in pending]
+                except OSError as e:
+                    # Worker processes could not be started (fork/spawn limits)
+                    raise BrokenProcessPool(str(e)) from e
+                for future in as_completed(futures):
+                    filename, elapsed = future.result()
+                    results[filename] = elapsed
+            return results
+        except (BrokenProcessPool, pickle.PicklingError) as e:
+            print(f"  ⚠️  Parallel rendering unavailable ({type(e).__name__}: {e}) - rendering serially")
+
+    return dict(_render(spec) for spec, _ in pending)
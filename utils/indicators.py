@@ -0,0 +1,109 @@
+"""
+Indicators
+Vectorized UE ratio and transition readiness calculations
+
+Array versions of the scalar helpers in utils/config.py: they take NumPy
+arrays or Series (a Series keeps its index) and give the same result as the
+scalar helper element by element. Classes are returned as ordered categoricals.
+
+The classifiers also take `bands`, the published district bands of a
+dimension (e.g. UE_CATEGORY_BANDS, READINESS_CATEGORY_BANDS in config): bins
+are right-closed as in pd.cut, and values outside them get no class.
+"""
+
+import numpy as np
+import pandas as pd
+
+from utils.config import (
+    LOW_UE_RATIO, HIGH_UE_RATIO, ANOMALY_UE_RATIO,
+    GOOD_READINESS, MODERATE_READINESS
+)
+
+
+UE_RATIO_CLASSES = ['Critical', 'Low', 'Normal', 'High', 'Anomaly']
+READINESS_CLASSES = ['Critical', 'Moderate', 'Good']
+
+
+def _like(values, result):
+    if isinstance(values, pd.Series):
+        return pd.Series(result, index=values.index)
+    return result
+
+
+def _safe_divide(numerator, denominator, scale=1.0):
+    """numerator / denominator * scale, and 0.0 where the denominator is 0"""
+    numerator = np.asarray(numerator, dtype=float)
+    denominator = np.asarray(denominator, dtype=float)
+    out = np.zeros(np.broadcast(numerator, denominator).shape)
+    np.divide(numerator, denominator, out=out, where=denominator != 0)
+    return out * scale if scale != 1.0 else out
+
+
+def _classes(values, thresholds, categories):
+    """Index into `categories` of the last threshold test each value passes (NaN -> 0)"""
+    codes = np.select(
+        [test(values) for test in reversed(thresholds)],
+        np.arange(len(thresholds), 0, -1),
+        default=0
+    )
+    return pd.Categorical.from_codes(codes, categories=categories, ordered=True)
+
+
+def _bands(values, bands):
+    return pd.cut(values, bins=bands['bins'], labels=bands['labels'])
+
+
+def calculate_ue_ratios(total_updates, total_enrollments):
+    return _like(total_enrollments, _safe_divide(total_updates, total_enrollments))
+
+
+def classify_ue_ratios(ue_ratios, bands=None):
+    """
+    UE ratio classes
+
+    Parameters:
+    -----------
+    ue_ratios : array-like or pd.Series
+    bands : dict, optional
+        {'bins': [...], 'labels': [...]} to use instead of UE_RATIO_CLASSES
+
+    Returns:
+    --------
+    pd.Categorical (pd.Series for a Series input)
+    """
+    values = np.asarray(ue_ratios, dtype=float)
+    if bands is not None:
+        return _like(ue_ratios, _bands(values, bands))
+    return _like(ue_ratios, _classes(values, [
+        lambda v: v > 0,
+        lambda v: v >= LOW_UE_RATIO,
+        lambda v: v >= HIGH_UE_RATIO,
+        lambda v: v >= ANOMALY_UE_RATIO,
+    ], UE_RATIO_CLASSES))
+
+
+def calculate_transition_readiness_scores(bio_updates_5_17, total_bio_updates):
+    return _like(total_bio_updates, _safe_divide(bio_updates_5_17, total_bio_updates, 100))
+
+
+def classify_readiness_scores(scores, bands=None):
+    """
+    Transition readiness classes
+
+    Parameters:
+    -----------
+    scores : array-like or pd.Series
+    bands : dict, optional
+        {'bins': [...], 'labels': [...]} to use instead of READINESS_CLASSES
+
+    Returns:
+    --------
+    pd.Categorical (pd.Series for a Series input)
+    """
+    values = np.asarray(scores, dtype=float)
+    if bands is not None:
+        return _like(scores, _bands(values, bands))
+    return _like(scores, _classes(values, [
+        lambda v: v >= MODERATE_READINESS,
+        lambda v: v >= GOOD_READINESS,
+    ], READINESS_CLASSES))
@@ -0,0 +1,224 @@
+"""
+Merged Data Lake
+Merged dataset partitioned by month (optionally by state), read by date window
+
+02_data_cleaning.py writes data/processed/merged_lake/ alongside
+merged_data.csv:
+
+    merged_lake/_lake.json                   partition list + source CSV stat
+    merged_lake/year=2025/month=01/          one column store per partition
+    merged_lake/year=2025/month=01/state=Bihar/   (LAKE_PARTITION_BY_STATE)
+
+read_window() opens only the partitions whose month overlaps the requested
+window (and whose state is requested), then trims the boundary months to the
+exact dates. Comparing 2025 with 2026 therefore never touches other years. If
+the lake is missing or older than merged_data.csv, the merged dataset is read
+in full and filtered instead.
+
+resolve_window() turns --start/--end into the window bounds and the number of
+calendar months it covers (used for per-month rates in place of the fixed
+ANALYSIS_MONTHS).
+"""
+
+import os
+import json
+import shutil
+from urllib.parse import quote
+
+import numpy as np
+import pandas as pd
+
+from utils.config import (
+    PROCESSED_DATA_DIR, LAKE_ENABLED, LAKE_PARTITION_BY_STATE,
+    START_DATE, END_DATE, ANALYSIS_MONTHS, analysis_months
+)
+from utils.column_store import MERGED_PATH, write_store, open_store, source_stat, read_merged
+from utils.schema import enforce_schema
+
+
+LAKE_DIR = os.path.join(PROCESSED_DATA_DIR, 'merged_lake')
+LAKE_FILE = '_lake.json'
+LAKE_VERSION = 1
+
+# Position of each row in merged_data.csv, so reads spanning partitions keep its order
+ROW_COLUMN = '__row'
+
+
+def _partition_dir(year, month, state=None):
+    parts = [f"year={year:04d}", f"month={month:02d}"]
+    if state is not None:
+        parts.append(f"state={quote(str(state), safe='')}")
+    return '/'.join(parts)
+
+
+def write_lake(df, directory=LAKE_DIR, source=None, by_state=LAKE_PARTITION_BY_STATE):
+    """
+    Write `df` partitioned by year/month (and state), replacing any existing lake
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Merged dataset (date column parsed)
+    directory : str
+        Lake directory
+    source : str, optional
+        CSV holding the same data; its size/mtime mark the lake as current
+    by_state : bool
+        Add a state level under each month
+
+    Returns:
+    --------
+    dict
+        The lake manifest written
+    """
+    staging = directory + '.tmp'
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+
+    keys = [df['date'].dt.year.rename('year'), df['date'].dt.month.rename('month')]
+    if by_state:
+        keys.append(df['state'])
+    df = df.assign(**{ROW_COLUMN: np.arange(len(df), dtype=np.int64)})
+
+    partitions = []
+    # Partitions share the frame's categories, so concatenating them keeps categoricals
+    for key, part in df.groupby(keys, observed=True, sort=True):
+        year, month = int(key[0]), int(key[1])
+        state = key[2] if by_state else None
+        rel = _partition_dir(year, month, state)
+        write_store(part, os.path.join(staging, rel))
+        partitions.append({'dir': rel, 'year': year, 'month': month, 'state': state, 'rows': len(part)})
+
+    manifest = {
+        'version': LAKE_VERSION,
+        'by_state': bool(by_state),
+        'rows': len(df),
+        'partitions': partitions,
+        'source': source_stat(source) if source else None,
+    }
+    with open(os.path.join(staging, LAKE_FILE), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+
+    shutil.rmtree(directory, ignore_errors=True)
+    os.replace(staging, directory)
+    return manifest
+
+
+def read_manifest(directory=LAKE_DIR):
+    path = os.path.join(directory, LAKE_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        manifest = json.load(f)
+    return manifest if manifest.get('version') == LAKE_VERSION else None
+
+
+def lake_is_current(csv_path=MERGED_PATH, directory=LAKE_DIR):
+    """True if the lake was written with merged_data.csv as it is now"""
+    manifest = read_manifest(directory)
+    if manifest is None or not manifest.get('source') or not os.path.exists(csv_path):
+        return False
+    return manifest['source'] == source_stat(csv_path)
+
+
+def select_partitions(manifest, start=None, end=None, states=None):
+    """Partitions overlapping [start, end] (inclusive dates) and in `states`"""
+    first = (start.year, start.month) if start is not None else None
+    last = (end.year, end.month) if end is not None else None
+    wanted = None if states is None else set(states)
+    selected = []
+    for partition in manifest['partitions']:
+        month = (partition['year'], partition['month'])
+        if first is not None and month < first:
+            continue
+        if last is not None and month > last:
+            continue
+        if wanted is not None and manifest['by_state'] and partition['state'] not in wanted:
+            continue
+        selected.append(partition)
+    return selected
+
+
+def resolve_window(start=None, end=None):
+    """
+    Bounds and month count of an analysis window
+
+    Parameters:
+    -----------
+    start, end : str or Timestamp, optional
+        Window bounds; a missing bound defaults to START_DATE / END_DATE
+
+    Returns:
+    --------
+    tuple
+        (start, end, months); (None, None, ANALYSIS_MONTHS) when neither bound
+        is given, meaning all merged data over the configured period
+    """
+    if start is None and end is None:
+        return None, None, ANALYSIS_MONTHS
+    start = pd.Timestamp(start if start is not None else START_DATE)
+    end = pd.Timestamp(end if end is not None else END_DATE)
+    if end < start:
+        raise ValueError(f"Analysis window ends before it starts: {start.date()} to {end.date()}")
+    return start, end, analysis_months(start, end)
+
+
+def _in_window(df, start, end, states):
+    mask = pd.Series(True, index=df.index)
+    if start is not None:
+        mask &= df['date'] >= start
+    if end is not None:
+        mask &= df['date'] <= end
+    if states is not None:
+        mask &= df['state'].isin(states)
+    return mask
+
+
+def read_window(start=None, end=None, states=None, columns=None, path=MERGED_PATH, directory=LAKE_DIR):
+    """
+    Merged dataset restricted to a date window (and states)
+
+    Parameters:
+    -----------
+    start, end : str or Timestamp, optional
+        Inclusive window; None leaves that side open (both None = everything)
+    states : list of str, optional
+        Only these states
+    columns : list of str, optional
+        Subset of columns ('date' and 'state' are read for filtering anyway)
+    path : str
+        merged_data.csv
+    directory : str
+        Lake directory
+
+    Returns:
+    --------
+    pd.DataFrame
+        With the 'merged' schema applied
+    """
+    start = pd.Timestamp(start) if start is not None else None
+    end = pd.Timestamp(end) if end is not None else None
+    if start is None and end is None and states is None:
+        return read_merged(columns, path)
+
+    needed = None if columns is None else list(dict.fromkeys(list(columns) + ['date', 'state']))
+    manifest = read_manifest(directory) if LAKE_ENABLED and lake_is_current(path, directory) else None
+
+    if manifest is not None and manifest['partitions']:
+        partitions = select_partitions(manifest, start, end, states)
+        # An empty selection still opens one partition for the column layout
+        chosen = partitions or manifest['partitions'][:1]
+        df = pd.concat(
+            [open_store(os.path.join(directory, p['dir']), needed and needed + [ROW_COLUMN])
+             for p in chosen],
+            ignore_index=True
+        )
+        if not partitions:
+            df = df.iloc[0:0]
+        df = df.sort_values(ROW_COLUMN, kind='mergesort', ignore_index=True).drop(columns=ROW_COLUMN)
+        df = enforce_schema(df, 'merged')
+    else:
+        df = read_merged(needed, path)
+
+    df = df[_in_window(df, start, end, states)].reset_index(drop=True)
+    return df if columns is None else df[[c for c in df.columns if c in columns]]
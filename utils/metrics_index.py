@@ -0,0 +1,189 @@
+"""
+Metrics Index
+District and pincode metrics from the dimension tables, indexed in memory
+
+Built from the full lookup tables written by stages 03-05:
+- dim1_district_metrics.csv    UE ratio, velocities, quadrant, child shares
+- dim2_district_readiness.csv  readiness score and category, at-risk youth
+- dim3_pincode_metrics.csv     pincode totals, UE ratio, risk score and level
+
+District rows of dim1 and dim2 are joined into one record per district, with
+the number of anomalous pincodes (dim3) added. Records are plain Python dicts,
+ready for JSON. Lookups:
+- point:  district by (state, district), pincode by number (dict lookups)
+- range:  pincodes between two numbers, or districts / pincodes whose metric
+          lies in [low, high] (bisect over arrays sorted once at build time)
+
+An index is immutable once built; metrics_service.py builds a new one when
+signature() changes and swaps it in.
+"""
+
+import os
+from bisect import bisect_left, bisect_right
+
+import numpy as np
+import pandas as pd
+
+from utils.config import TABLES_DIR
+
+
+METRIC_TABLES = {
+    'district_metrics': 'dim1_district_metrics.csv',
+    'district_readiness': 'dim2_district_readiness.csv',
+    'pincode_metrics': 'dim3_pincode_metrics.csv',
+}
+
+
+def _key(name):
+    return str(name).strip().casefold()
+
+
+def _records(df):
+    """DataFrame -> list of dicts of builtins (NaN -> None)"""
+    return df.astype(object).where(df.notna(), None).to_dict('records')
+
+
+def table_signature(tables_dir=TABLES_DIR):
+    """(table, mtime_ns) of each metric table (None if missing)"""
+    signature = []
+    for name, file_name in METRIC_TABLES.items():
+        path = os.path.join(tables_dir, file_name)
+        signature.append((name, os.stat(path).st_mtime_ns if os.path.exists(path) else None))
+    return tuple(signature)
+
+
+class _RangeIndex:
+    """Records sorted by one numeric field, for [low, high] lookups"""
+
+    def __init__(self, records, field):
+        values = np.array([r[field] if r[field] is not None else np.nan for r in records], dtype=float)
+        order = np.argsort(values, kind='stable')
+        order = order[~np.isnan(values[order])]
+        self.values = values[order].tolist()
+        self.records = [records[i] for i in order]
+
+    def between(self, low=None, high=None):
+        first = 0 if low is None else bisect_left(self.values, low)
+        last = len(self.values) if high is None else bisect_right(self.values, high)
+        return self.records[first:last]
+
+
+class MetricsIndex:
+    """
+    In-memory lookups over the dimension metric tables
+
+    Parameters:
+    -----------
+    tables_dir : str
+        Directory holding the tables (missing tables leave their lookups empty)
+    """
+
+    def __init__(self, tables_dir=TABLES_DIR):
+        self.tables_dir = tables_dir
+        self.signature = table_signature(tables_dir)
+        frames = {
+            name: pd.read_csv(os.path.join(tables_dir, METRIC_TABLES[name]))
+            for name, mtime in self.signature if mtime is not None
+        }
+        self.rows = {name: len(df) for name, df in frames.items()}
+
+        pincodes = frames.get('pincode_metrics')
+        self._build_districts(frames.get('district_metrics'), frames.get('district_readiness'), pincodes)
+        self._build_pincodes(pincodes)
+
+    # -------------------------------------------------------------------------
+    # Build
+    # -------------------------------------------------------------------------
+
+    def _build_districts(self, metrics, readiness, pincodes):
+        parts = [df for df in (metrics, readiness) if df is not None]
+        if not parts:
+            districts = pd.DataFrame(columns=['state', 'district'])
+        else:
+            districts = parts[0]
+            for df in parts[1:]:
+                extra = [c for c in df.columns if c not in districts.columns]
+                districts = districts.merge(df[['state', 'district'] + extra], on=['state', 'district'], how='outer')
+        if pincodes is not None and 'risk_level' in pincodes.columns:
+            anomalous = (pincodes[pincodes['risk_level'].notna()]
+                         .groupby(['state', 'district']).size().rename('anomalous_pincodes').reset_index())
+            districts = districts.merge(anomalous, on=['state', 'district'], how='left')
+            districts['anomalous_pincodes'] = districts['anomalous_pincodes'].fillna(0).astype(int)
+        districts = districts.sort_values(['state', 'district'], ignore_index=True)
+
+        records = _records(districts)
+        self.districts = {(_key(r['state']), _key(r['district'])): r for r in records}
+        self.states = {}
+        for r in records:
+            self.states.setdefault(_key(r['state']), []).append(r)
+        self.district_metrics = self._numeric_fields(districts)
+        self._district_ranges = {field: _RangeIndex(records, field) for field in self.district_metrics}
+
+    def _build_pincodes(self, pincodes):
+        if pincodes is None:
+            pincodes = pd.DataFrame(columns=['pincode', 'state', 'district'])
+        pincodes = pincodes.sort_values('pincode', ignore_index=True)
+        records = _records(pincodes)
+        self.pincodes = {int(r['pincode']): r for r in records}
+        self._pincode_keys = [int(r['pincode']) for r in records]
+        self._pincode_records = records
+        self.pincode_metrics = [f for f in self._numeric_fields(pincodes) if f != 'pincode']
+        self._pincode_ranges = {field: _RangeIndex(records, field) for field in self.pincode_metrics}
+
+    @staticmethod
+    def _numeric_fields(df):
+        return [c for c in df.columns
+                if pd.api.types.is_numeric_dtype(df[c]) and not pd.api.types.is_bool_dtype(df[c])]
+
+    # -------------------------------------------------------------------------
+    # Lookups
+    # -------------------------------------------------------------------------
+
+    def state_names(self):
+        """(state, number of districts), alphabetical"""
+        return [(records[0]['state'], len(records)) for _, records in sorted(self.states.items())]
+
+    def district(self, state, district):
+        """District record, or None"""
+        return self.districts.get((_key(state), _key(district)))
+
+    def state_districts(self, state):
+        """District records of a state (empty if unknown)"""
+        return self.states.get(_key(state), [])
+
+    def pincode(self, pincode):
+        """Pincode record, or None"""
+        return self.pincodes.get(int(pincode))
+
+    def pincode_range(self, first, last):
+        """Pincode records with first <= pincode <= last, in pincode order"""
+        lo = bisect_left(self._pincode_keys, int(first))
+        hi = bisect_right(self._pincode_keys, int(last))
+        return self._pincode_records[lo:hi]
+
+    def metric_range(self, level, metric, low=None, high=None, state=None):
+        """
+        Records whose `metric` lies in [low, high], in ascending metric order
+
+        Parameters:
+        -----------
+        level : str
+            'district' or 'pincode'
+        metric : str
+            Numeric field (see district_metrics / pincode_metrics)
+        low, high : float, optional
+            Inclusive bounds (None = open)
+        state : str, optional
+            Only records of this state
+
+        Returns:
+        --------
+        list of dict
+        """
+        ranges = self._district_ranges if level == 'district' else self._pincode_ranges
+        if metric not in ranges:
+            raise KeyError(metric)
+        records = ranges[metric].between(low, high)
+        if state is not None:
+            records = [r for r in records if _key(r['state']) == _key(state)]
+        return records
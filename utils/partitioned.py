@@ -0,0 +1,106 @@
+"""
+Partitioned Execution
+Run a per-group computation on state partitions of the merged data in parallel
+
+Most dimension aggregates group by keys that include the state (district,
+pincode, date-pincode), so they can be computed on each state's rows
+independently and concatenated. map_partitions() splits the frame by `state`,
+runs the function on a process pool (largest partitions first), and returns
+the concatenated results in the same order a national groupby would produce.
+
+National statistics (medians, z-scores, category shares) are not partitionable;
+callers compute them on the combined result.
+
+Statistics keyed by something that can cross states (e.g. a per-pincode
+baseline, where a pincode is listed under two states) stay exact with
+keep_together: rows of such keys go into one shared partition.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from utils.config import PARTITION_WORKERS, PARTITION_MIN_ROWS
+
+
+SHARED_PARTITION = '__shared__'
+
+_workers = PARTITION_WORKERS
+
+
+def set_workers(workers):
+    """Limit map_partitions() pools in this process (e.g. inside a run_dimensions worker)"""
+    global _workers
+    _workers = max(1, min(PARTITION_WORKERS, int(workers)))
+
+
+def split_partitions(df, by='state', keep_together=None):
+    """
+    Split `df` into partitions by `by`, largest first
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Merged data
+    by : str
+        Partition column
+    keep_together : str, optional
+        Column whose values must not be split across partitions; rows of values
+        seen under more than one `by` value go into a single shared partition
+
+    Returns:
+    --------
+    list of pd.DataFrame
+    """
+    labels = df[by].astype(object)
+    if keep_together is not None:
+        spread = df.groupby(keep_together)[by].nunique()
+        crossing = spread.index[spread > 1]
+        if len(crossing) > 0:
+            labels = labels.mask(df[keep_together].isin(crossing), SHARED_PARTITION)
+
+    partitions = [group for _, group in df.groupby(labels, sort=False)]
+    return sorted(partitions, key=len, reverse=True)
+
+
+def map_partitions(func, df, keys, by='state', keep_together=None,
+                   workers=None, min_rows=PARTITION_MIN_ROWS):
+    """
+    Apply `func` to each state partition of `df` and combine the results
+
+    Runs `func(df)` directly when there is one worker or fewer than `min_rows`
+    rows (pool start-up and pickling cost more than they save on small data).
+
+    Parameters:
+    -----------
+    func : callable
+        Module-level function DataFrame -> DataFrame, grouping by `keys`
+    df : pd.DataFrame
+        Merged data
+    keys : list of str
+        Group keys of func's result; the combined result is sorted by them
+    by, keep_together : str
+        See split_partitions()
+    workers : int, optional
+        Worker processes (default: PARTITION_WORKERS, or the set_workers() limit)
+    min_rows : int
+        Smallest frame worth partitioning
+
+    Returns:
+    --------
+    pd.DataFrame
+        Same as func(df)
+    """
+    workers = _workers if workers is None else workers
+    if workers <= 1 or len(df) < min_rows:
+        return func(df)
+
+    partitions = split_partitions(df, by=by, keep_together=keep_together)
+    if len(partitions) <= 1:
+        return func(df)
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(partitions))) as pool:
+        results = list(pool.map(func, partitions))
+
+    combined = pd.concat(results, ignore_index=True)
+    return combined.sort_values(keys, kind='mergesort').reset_index(drop=True)
@@ -0,0 +1,412 @@
+"""
+Streaming Data Profiler
+Single-pass, chunked profiling of raw shards with mergeable accumulators
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from utils.config import PROFILE_CHUNKSIZE, PROFILE_WORKERS
+from utils.dq_rules import RuleContext, RuleResults
+from utils.schema import parse_dates
+from utils.shards import iter_shard_chunks
+
+
+# =============================================================================
+# HELPERS
+# =============================================================================
+
+def date_pincode_key(dates, pincodes):
+    """Exact int64 key for (date, pincode): days since epoch * 1e6 + pincode"""
+    days = dates.to_numpy(dtype='datetime64[D]').astype(np.int64)
+    return days * 1_000_000 + pincodes.to_numpy(dtype=np.int64)
+
+
+def _bit_length(values):
+    """Vectorized int.bit_length() for uint64 arrays"""
+    x = values.copy()
+    length = np.zeros(len(x), dtype=np.int64)
+    for shift in (32, 16, 8, 4, 2, 1):
+        mask = x >= (np.uint64(1) << np.uint64(shift))
+        length[mask] += shift
+        x[mask] >>= np.uint64(shift)
+    return length + (x > 0)
+
+
+# =============================================================================
+# ACCUMULATORS
+# =============================================================================
+# Each accumulator has update(chunk_values) and merge(other), so shards can be
+# profiled independently (or in parallel) and combined afterwards.
+
+class NumericStats:
+    """Count / nulls / sum / min / max of a numeric column"""
+
+    def __init__(self):
+        self.count = 0
+        self.nulls = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def update(self, values):
+        values = pd.to_numeric(values, errors='coerce')
+        valid = values.dropna()
+        self.nulls += len(values) - len(valid)
+        if valid.empty:
+            return
+        self.count += len(valid)
+        self.total += valid.sum()
+        lo, hi = valid.min(), valid.max()
+        self.min = lo if self.min is None else min(self.min, lo)
+        self.max = hi if self.max is None else max(self.max, hi)
+
+    def merge(self, other):
+        self.count += other.count
+        self.nulls += other.nulls
+        self.total += other.total
+        for attr, pick in (('min', min), ('max', max)):
+            mine, theirs = getattr(self, attr), getattr(other, attr)
+            setattr(self, attr, theirs if mine is None else mine if theirs is None else pick(mine, theirs))
+        return self
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else float('nan')
+
+
+class DateCoverage:
+    """Records per calendar date plus the number of unparseable dates"""
+
+    def __init__(self):
+        self.counts = pd.Series(dtype='int64', index=pd.DatetimeIndex([]))
+        self.unparseable = 0
+
+    def update(self, raw, parsed):
+        self.unparseable += int((parsed.isna() & raw.notna()).sum())
+        self.counts = self.counts.add(parsed.value_counts(), fill_value=0).astype('int64')
+
+    def merge(self, other):
+        self.counts = self.counts.add(other.counts, fill_value=0).astype('int64')
+        self.unparseable += other.unparseable
+        return self
+
+    @property
+    def per_date(self):
+        return self.counts.sort_index()
+
+    @property
+    def first(self):
+        return self.counts.index.min() if len(self.counts) else None
+
+    @property
+    def last(self):
+        return self.counts.index.max() if len(self.counts) else None
+
+    def day_of_week_counts(self):
+        """Records per weekday, derived from the per-date counts (not per row)"""
+        counts = self.per_date
+        return counts.groupby(counts.index.day_name()).sum().sort_values(ascending=False)
+
+    def missing_dates(self):
+        if not len(self.counts):
+            return pd.DatetimeIndex([]), pd.DatetimeIndex([])
+        calendar = pd.date_range(start=self.first, end=self.last, freq='D')
+        return calendar.difference(self.counts.index), calendar
+
+
+class HyperLogLog:
+    """
+    Distinct-count sketch (HyperLogLog, 2**p registers)
+
+    p=14 uses 16 KB per sketch with ~0.8% standard error; sketches merge by
+    taking the register-wise maximum.
+    """
+
+    def __init__(self, p=14):
+        self.p = p
+        self.registers = np.zeros(1 << p, dtype=np.uint8)
+
+    def update(self, values):
+        if len(values) == 0:
+            return
+        hashes = pd.util.hash_pandas_object(values, index=False).to_numpy(dtype=np.uint64)
+        idx = (hashes >> np.uint64(64 - self.p)).astype(np.intp)
+        rest = hashes & np.uint64((1 << (64 - self.p)) - 1)
+        rank = ((64 - self.p) - _bit_length(rest) + 1).astype(np.uint8)
+        np.maximum.at(self.registers, idx, rank)
+
+    def merge(self, other):
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def count(self):
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.power(2.0, -self.registers.astype(np.float64)))
+        zeros = int((self.registers == 0).sum())
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * np.log(m / zeros)  # linear counting for small cardinalities
+        return int(round(estimate))
+
+
+class Histogram:
+    """Counts in right-closed bins (same intervals as pd.cut)"""
+
+    def __init__(self, bins):
+        self.bins = np.asarray(bins, dtype=np.float64)
+        self.counts = np.zeros(len(bins) - 1, dtype=np.int64)
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        idx = np.searchsorted(self.bins, values[~np.isnan(values)], side='left')
+        idx = idx[(idx >= 1) & (idx < len(self.bins))]
+        self.counts += np.bincount(idx - 1, minlength=len(self.counts))
+
+    def merge(self, other):
+        self.counts += other.counts
+        return self
+
+    def items(self):
+        for lo, hi, count in zip(self.bins[:-1], self.bins[1:], self.counts):
+            yield f"({lo:g}, {hi:g}]", int(count)
+
+
+class DuplicateCounter:
+    """Exact duplicate count over key columns, tracked as unique 64-bit row hashes"""
+
+    def __init__(self):
+        self.rows = 0
+        self.hashes = np.empty(0, dtype=np.uint64)
+
+    def update(self, keys):
+        self.rows += len(keys)
+        hashes = pd.util.hash_pandas_object(keys, index=False).to_numpy(dtype=np.uint64)
+        self.hashes = np.union1d(self.hashes, hashes)
+
+    def merge(self, other):
+        self.rows += other.rows
+        self.hashes = np.union1d(self.hashes, other.hashes)
+        return self
+
+    @property
+    def duplicates(self):
+        return self.rows - len(self.hashes)
+
+
+class KeyedTotals:
+    """Sum of a value per int64 key, collapsed every few chunks to bound memory"""
+
+    def __init__(self, collapse_every=8):
+        self.parts = []
+        self.collapse_every = collapse_every
+
+    def update(self, keys, values):
+        part = pd.Series(np.asarray(values, dtype=np.float64), index=keys)
+        self.parts.append(part.groupby(level=0).sum())
+        if len(self.parts) >= self.collapse_every:
+            self._collapse()
+
+    def merge(self, other):
+        self.parts.extend(other.parts)
+        self._collapse()
+        return self
+
+    def _collapse(self):
+        if len(self.parts) > 1:
+            self.parts = [pd.concat(self.parts).groupby(level=0).sum()]
+
+    @property
+    def totals(self):
+        self._collapse()
+        return self.parts[0] if self.parts else pd.Series(dtype=np.float64)
+
+
+# =============================================================================
+# DATASET PROFILES
+# =============================================================================
+
+class DatasetProfile:
+    """
+    All quality-check metrics for one dataset, accumulated chunk by chunk
+
+    Parameters:
+    -----------
+    name : str
+        Dataset name (for logging)
+    value_columns : list
+        Count columns; each gets NumericStats and their row total is summed
+        per (date, pincode)
+    rules : list of Rule, optional
+        Row-level data quality rules evaluated on the same chunks
+    """
+
+    key_columns = ['date', 'state', 'district', 'pincode']
+
+    def __init__(self, name, value_columns, rules=None):
+        self.name = name
+        self.value_columns = list(value_columns)
+        self.rules = list(rules or [])
+        self.rows = 0
+        self.files = 0
+        self.source = None
+        self.sample = None
+        self.rule_results = RuleResults(self.rules)
+        self.stats = {col: NumericStats() for col in self.value_columns}
+        self.dates = DateCoverage()
+        self.pincodes = HyperLogLog()
+        self.duplicates = DuplicateCounter()
+        self.totals = KeyedTotals()
+
+    @property
+    def columns(self):
+        return self.key_columns + self.value_columns
+
+    def update(self, chunk):
+        if self.sample is None:
+            self.sample = chunk.head(10).copy()
+        self.rows += len(chunk)
+
+        values = chunk[self.value_columns].apply(pd.to_numeric, errors='coerce')
+        for col in self.value_columns:
+            self.stats[col].update(values[col])
+
+        # Normalise pincodes so int and float (NaN-bearing) chunks hash alike
+        numeric_pincodes = pd.to_numeric(chunk['pincode'], errors='coerce')
+        pincodes = numeric_pincodes.where(numeric_pincodes % 1 == 0).astype('Int64')
+        dates = parse_dates(chunk['date'])
+
+        self.dates.update(chunk['date'], dates)
+        self.pincodes.update(pincodes.dropna())
+        self.duplicates.update(chunk[['date', 'state', 'district']].assign(pincode=pincodes))
+
+        valid = dates.notna() & pincodes.notna()
+        self.totals.update(
+            date_pincode_key(dates[valid], pincodes[valid]),
+            values.loc[valid].fillna(0).sum(axis=1)
+        )
+
+        if self.rules:
+            ctx = RuleContext(chunk, dates, values, numeric_pincodes)
+            self.rule_results.update(self.rules, ctx, self.source)
+
+    def merge(self, other):
+        self.rows += other.rows
+        self.files += other.files
+        if self.sample is None:
+            self.sample = other.sample
+        for col in self.value_columns:
+            self.stats[col].merge(other.stats[col])
+        self.dates.merge(other.dates)
+        self.pincodes.merge(other.pincodes)
+        self.duplicates.merge(other.duplicates)
+        self.totals.merge(other.totals)
+        self.rule_results.merge(other.rule_results)
+        return self
+
+    def total(self, columns=None):
+        return sum(self.stats[col].total for col in (columns or self.value_columns))
+
+
+class EnrollmentProfile(DatasetProfile):
+    """Enrollment profile plus record-level age-share metrics"""
+
+    AGE_COLUMNS = ['age_0_5', 'age_5_17', 'age_18_greater']
+    CHILD_PCT_BINS = [0, 10, 20, 30, 40, 50, 60, 70, 80, 90, 100]
+
+    def __init__(self, name='ENROLLMENT', rules=None):
+        super().__init__(name, self.AGE_COLUMNS, rules)
+        self.share_sums = dict.fromkeys(self.AGE_COLUMNS + ['child'], 0.0)
+        self.share_rows = 0
+        self.child_pct = Histogram(self.CHILD_PCT_BINS)
+
+    def update(self, chunk):
+        super().update(chunk)
+        ages = chunk[self.AGE_COLUMNS].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float64)
+        total = ages.sum(axis=1)
+        valid = total > 0
+        pct = ages[valid] / total[valid, None] * 100
+
+        self.share_rows += int(valid.sum())
+        for i, col in enumerate(self.AGE_COLUMNS):
+            self.share_sums[col] += pct[:, i].sum()
+        child = pct[:, 0] + pct[:, 1]
+        self.share_sums['child'] += child.sum()
+        self.child_pct.update(child)
+
+    def merge(self, other):
+        super().merge(other)
+        self.share_rows += other.share_rows
+        for key in self.share_sums:
+            self.share_sums[key] += other.share_sums[key]
+        self.child_pct.merge(other.child_pct)
+        return self
+
+    def mean_share(self, key):
+        """Average per-record percentage (records with zero enrollments excluded)"""
+        return self.share_sums[key] / self.share_rows if self.share_rows else float('nan')
+
+
+# =============================================================================
+# RUNNERS
+# =============================================================================
+
+def profile_file(path, profile_factory, chunksize=PROFILE_CHUNKSIZE):
+    """Profile one CSV shard in chunks"""
+    profile = profile_factory()
+    profile.source = os.path.basename(path)
+    reader = iter_shard_chunks(path, chunksize, usecols=profile.columns, dtype={'date': 'object'})
+    for chunk in reader:
+        profile.update(chunk)
+    profile.files = 1
+    return profile
+
+
+def profile_shards(file_list, data_dir, profile_factory, chunksize=PROFILE_CHUNKSIZE,
+                   max_workers=PROFILE_WORKERS):
+    """
+    Profile a dataset split across several shards and merge the results
+
+    Parameters:
+    -----------
+    file_list : list
+        Shard file names
+    data_dir : str
+        Directory containing the shards
+    profile_factory : callable
+        Module-level class/function returning an empty profile (must be
+        picklable when max_workers > 1)
+    chunksize : int
+        Rows per chunk
+    max_workers : int
+        Shards profiled in parallel; 1 profiles them serially in this process
+
+    Returns:
+    --------
+    (profile, seconds)
+    """
+    start = time.perf_counter()
+    paths = []
+    for filename in file_list:
+        path = os.path.join(data_dir, filename)
+        if os.path.exists(path):
+            paths.append(path)
+        else:
+            print(f"⚠️  WARNING: File not found: {filename}")
+
+    profile = profile_factory()
+    workers = max(1, min(max_workers, len(paths)))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(profile_file, path, profile_factory, chunksize) for path in paths]
+            for future in futures:
+                profile.merge(future.result())
+    else:
+        for path in paths:
+            profile.merge(profile_file(path, profile_factory, chunksize))
+
+    return profile, time.perf_counter() - start
@@ -0,0 +1,402 @@
+"""
+Report Data Layer
+Cached access to pipeline output tables and the headline metrics quoted in the report
+"""
+
+import os
+import glob
+import json
+import pandas as pd
+
+from utils.config import TABLES_DIR, PROCESSED_DATA_DIR, RAW_DATA_DIR, OUTPUTS_DIR, COLUMN_STORE_ENABLED
+from utils.column_store import open_store, store_is_current, store_path
+from utils.data_manifest import DataManifest, MANIFEST_PATH
+from utils.schema import enforce_schema
+from utils.shards import discover_shards
+
+
+# Columns needed from merged_data.csv to compute the dataset-level headline numbers
+MERGED_METRIC_COLUMNS = [
+    'date', 'state', 'district', 'pincode',
+    'age_0_5', 'age_5_17', 'age_18_greater',
+    'bio_age_5_17', 'bio_age_17_',
+    'demo_age_5_17', 'demo_age_17_'
+]
+
+# Raw datasets whose shard names and row counts the report lists
+RAW_DATASETS = ['enrollment', 'biometric', 'demographic']
+
+# Results written by src/validation_test.py
+VALIDATION_RESULTS_PATH = os.path.join(OUTPUTS_DIR, 'validation_results.json')
+
+# Report metric -> (check, metrics recorded by that check and summed)
+VALIDATION_METRICS = {
+    'states': ('phase0_auth_numbers', ['states']),
+    'unique_districts': ('phase0_auth_numbers', ['districts']),
+    'pincodes': ('phase0_auth_numbers', ['pincodes']),
+    'merged_records': ('phase0_auth_numbers', ['merged_records']),
+    'total_enrollments': ('phase0_auth_numbers', ['enrollments']),
+    'total_bio_updates': ('phase0_auth_numbers', ['bio_updates']),
+    'total_demo_updates': ('phase0_auth_numbers', ['demo_updates']),
+    'total_updates': ('phase0_auth_numbers', ['total_updates']),
+    'national_ue_ratio': ('phase0_auth_numbers', ['ue_ratio']),
+    'child_enrollment_pct': ('phase0_auth_numbers', ['child_pct']),
+    'coverage_gap_districts': ('phase2_dimension1', ['dim1_coverage_gap_districts.csv']),
+    'crisis_zone_districts': ('phase2_dimension1', ['dim1_crisis_zone_districts.csv']),
+    'critical_readiness_districts': ('phase3_dimension2', ['critical_districts']),
+    'low_readiness_districts': ('phase3_dimension2', ['low_districts']),
+    'anomalous_pincodes': ('phase4_dimension3', ['anomalous_pincodes']),
+    'critical_high_pincodes': ('phase4_dimension3', ['critical_risk', 'high_risk']),
+}
+
+
+class TableCache:
+    """
+    In-memory cache of CSV tables keyed by (path, mtime)
+
+    A table is parsed the first time it is requested and served from memory
+    afterwards until the file on disk changes. Cached frames are shared between
+    callers and must be treated as read-only.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self.hits = 0
+        self.misses = 0
+
+    def read(self, path, **read_kwargs):
+        """Return the parsed CSV at `path`, re-reading only if its mtime changed"""
+        path = os.path.abspath(path)
+        mtime = os.stat(path).st_mtime_ns
+        key = (path, repr(sorted(read_kwargs.items())))
+
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == mtime:
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        df = pd.read_csv(path, **read_kwargs)
+        self._entries[key] = (mtime, df)
+        return df
+
+    def signature(self):
+        """(path, mtime) pairs of everything currently cached"""
+        return tuple(sorted((key[0], entry[0]) for key, entry in self._entries.items()))
+
+    def clear(self):
+        self._entries.clear()
+
+
+class ReportData:
+    """
+    Tables and computed metrics consumed by the report section builders
+
+    Parameters:
+    -----------
+    tables_dir : str
+        Directory holding the dimension output CSVs
+    merged_path : str
+        Path to merged_data.csv (dataset-level totals)
+    cache : TableCache, optional
+        Shared cache; a private one is created when omitted
+    raw_dir : str
+        Directory holding the raw shards (row counts come from the data
+        manifest while it is current)
+    state : str, optional
+        Restrict the dataset-level metrics to this state's merged records
+    validation_path : str
+        Results of src/validation_test.py (the independent values Appendix C
+        checks the metrics against)
+    """
+
+    def __init__(self, tables_dir=TABLES_DIR, merged_path=None, cache=None, raw_dir=RAW_DATA_DIR, state=None,
+                 validation_path=VALIDATION_RESULTS_PATH):
+        self.tables_dir = tables_dir
+        self.validation_path = validation_path
+        self.raw_dir = raw_dir
+        self.state = state
+        self.merged_path = merged_path or os.path.join(PROCESSED_DATA_DIR, 'merged_data.csv')
+        self.cache = cache or TableCache()
+        self._metrics = None
+        self._metrics_signature = None
+
+    # -------------------------------------------------------------------------
+    # Table access
+    # -------------------------------------------------------------------------
+
+    def table_path(self, name):
+        return name if os.path.isabs(name) else os.path.join(self.tables_dir, name)
+
+    def preload(self):
+        """Load every CSV in the tables directory into the cache"""
+        paths = sorted(glob.glob(os.path.join(self.tables_dir, '*.csv')))
+        for path in paths:
+            self.cache.read(path)
+        return len(paths)
+
+    def table(self, name):
+        """Return a cached table by file name (or absolute path), None if missing"""
+        path = self.table_path(name)
+        if not os.path.exists(path):
+            return None
+        return self.cache.read(path)
+
+    def row_count(self, name):
+        df = self.table(name)
+        return None if df is None else len(df)
+
+    def summary(self, name):
+        """First row of a *_summary_statistics.csv table as a dict"""
+        df = self.table(name)
+        if df is None or df.empty:
+            return {}
+        return {col: df[col].iloc[0] for col in df.columns}
+
+    def merged(self):
+        """Merged dataset restricted to the columns used for headline metrics"""
+        if not os.path.exists(self.merged_path):
+            return None
+        if COLUMN_STORE_ENABLED and store_is_current(self.merged_path):
+            # Mapping the column store is cheaper than parsing, even once
+            df = open_store(store_path(self.merged_path), columns=MERGED_METRIC_COLUMNS)
+        else:
+            df = self.cache.read(self.merged_path, usecols=MERGED_METRIC_COLUMNS)
+        # Idempotent, so re-applying it to a cached frame costs nothing
+        df = enforce_schema(df, 'merged')
+        if self.state is not None:
+            df = df[df['state'] == self.state]
+        return df
+
+    # -------------------------------------------------------------------------
+    # Metrics
+    # -------------------------------------------------------------------------
+
+    @property
+    def metrics(self):
+        """Headline metrics, recomputed only when an underlying file changes"""
+        signature = self._source_signature()
+        if self._metrics is None or signature != self._metrics_signature:
+            self._metrics = self.compute_metrics()
+            self._metrics_signature = signature
+        return self._metrics
+
+    def _source_signature(self):
+        paths = glob.glob(os.path.join(self.tables_dir, '*.csv')) + [self.merged_path, MANIFEST_PATH]
+        return tuple(
+            (path, os.stat(path).st_mtime_ns) for path in sorted(paths) if os.path.exists(path)
+        )
+
+    def compute_metrics(self):
+        """
+        Compute every number the report quotes
+
+        Missing inputs leave the corresponding metrics as None so the report
+        still builds (with 'N/A') before the full pipeline has been run.
+        """
+        m = {}
+        m.update(self._dataset_metrics())
+        m.update(self._raw_metrics())
+        # Duplicate (date, state, district, pincode) records summed in cleaning,
+        # plus rows of different datasets joined into one merged row
+        m['records_consolidated'] = difference(m['raw_records'], m['merged_records'])
+
+        dim1 = self.summary('dim1_summary_statistics.csv')
+        m['districts_analyzed'] = dim1.get('Total Districts Analyzed')
+        m['coverage_gap_districts'] = dim1.get('Coverage Gap Districts', self.row_count('dim1_coverage_gap_districts.csv'))
+        m['crisis_zone_districts'] = dim1.get('Crisis Zone Districts', self.row_count('dim1_crisis_zone_districts.csv'))
+        m['healthy_growing_districts'] = dim1.get('Healthy & Growing Districts')
+        m['new_users_districts'] = dim1.get('New Users Need Engagement Districts')
+        m['low_child_districts'] = dim1.get('Low Child Enrollment Districts', self.row_count('dim1_low_child_enrollment_districts.csv'))
+        m['avg_district_ue_ratio'] = dim1.get('Average UE Ratio')
+        m['median_district_ue_ratio'] = dim1.get('Median UE Ratio')
+
+        dim2 = self.summary('dim2_summary_statistics.csv')
+        m['readiness_districts'] = dim2.get('Total Districts Analyzed')
+        m['critical_readiness_districts'] = dim2.get('Critical Readiness Districts', self.row_count('dim2_critical_readiness_districts.csv'))
+        m['low_readiness_districts'] = dim2.get('Low Readiness Districts', self.row_count('dim2_low_readiness_districts.csv'))
+        m['at_risk_districts'] = dim2.get('All At-Risk Districts (Low+Critical)', self.row_count('dim2_all_at_risk_districts.csv'))
+        m['good_readiness_districts'] = dim2.get('Good Readiness Districts')
+        m['moderate_readiness_districts'] = dim2.get('Moderate Readiness Districts')
+        m['mean_readiness_score'] = dim2.get('Average Readiness Score')
+        m['median_readiness_score'] = dim2.get('Median Readiness Score')
+        m['states_ranked'] = self.row_count('dim2_state_readiness_ranking.csv')
+
+        dim3 = self.summary('dim3_summary_statistics.csv')
+        m['pincodes_analyzed'] = dim3.get('Total Pincodes Analyzed')
+        m['anomalous_pincodes'] = dim3.get('Anomalous Pincodes', self.row_count('dim3_all_anomalous_pincodes.csv'))
+        m['critical_risk_pincodes'] = dim3.get('Critical Risk (All)', self.row_count('dim3_all_critical_risk_pincodes.csv'))
+        m['high_risk_pincodes'] = dim3.get('High Risk', self.row_count('dim3_high_risk_pincodes.csv'))
+        m['medium_risk_pincodes'] = dim3.get('Medium Risk')
+        m['low_risk_pincodes'] = dim3.get('Low Risk')
+        m['clustered_districts'] = dim3.get('Districts with Clustering', self.row_count('dim3_clustered_districts.csv'))
+
+        if m['critical_risk_pincodes'] is not None and m['high_risk_pincodes'] is not None:
+            m['critical_high_pincodes'] = m['critical_risk_pincodes'] + m['high_risk_pincodes']
+        else:
+            m['critical_high_pincodes'] = None
+
+        return {key: _to_builtin(value) for key, value in m.items()}
+
+    def validation_metrics(self):
+        """
+        The report metrics as measured by src/validation_test.py
+
+        Returns:
+        --------
+        dict
+            Same keys as VALIDATION_METRICS; None where the validation run is
+            missing, did not record the value, or (state reports) is national
+        """
+        values = {key: None for key in VALIDATION_METRICS}
+        if self.state is not None or not os.path.exists(self.validation_path):
+            return values
+        with open(self.validation_path, encoding='utf-8') as f:
+            checks = {check['name']: check.get('metrics', {}) for check in json.load(f).get('checks', [])}
+        for key, (check, names) in VALIDATION_METRICS.items():
+            recorded = checks.get(check, {})
+            if all(name in recorded for name in names):
+                values[key] = sum(recorded[name] for name in names)
+        return values
+
+    def _raw_metrics(self):
+        """
+        Shard file names and row counts of each raw dataset (None if not found)
+
+        Raw shards are not split by state, so a state's ReportData leaves them None
+        """
+        m = {}
+        manifest = DataManifest()
+        for dataset in RAW_DATASETS:
+            if self.state is not None:
+                m[f'{dataset}_raw_files'] = None
+                m[f'{dataset}_raw_records'] = None
+                continue
+            try:
+                files = discover_shards(dataset, self.raw_dir)
+            except FileNotFoundError:
+                m[f'{dataset}_raw_files'] = None
+                m[f'{dataset}_raw_records'] = None
+                continue
+            m[f'{dataset}_raw_files'] = files
+            m[f'{dataset}_raw_records'] = sum(
+                manifest.row_count(os.path.join(self.raw_dir, f))[0] for f in files
+            )
+        counts = [m[f'{dataset}_raw_records'] for dataset in RAW_DATASETS]
+        m['raw_records'] = None if None in counts else sum(counts)
+        return m
+
+    def _dataset_metrics(self):
+        keys = [
+            'merged_records', 'unique_dates', 'first_date', 'last_date', 'date_span_days', 'states',
+            'state_districts', 'unique_districts', 'pincodes', 'total_enrollments',
+            'total_bio_updates', 'total_demo_updates', 'total_updates', 'national_ue_ratio',
+            'child_enrollment_pct', 'age_0_5_pct', 'age_5_17_pct', 'youth_bio_updates',
+            'youth_bio_share_pct'
+        ]
+        df = self.merged()
+        if df is None:
+            return dict.fromkeys(keys)
+
+        enrollments = df['age_0_5'].sum() + df['age_5_17'].sum() + df['age_18_greater'].sum()
+        bio = df['bio_age_5_17'].sum() + df['bio_age_17_'].sum()
+        demo = df['demo_age_5_17'].sum() + df['demo_age_17_'].sum()
+        dates = pd.to_datetime(df['date'])
+
+        def pct(part, whole):
+            return part / whole * 100 if whole else 0.0
+
+        return {
+            'merged_records': len(df),
+            'unique_dates': dates.nunique(),
+            'first_date': dates.min(),
+            'last_date': dates.max(),
+            'date_span_days': (dates.max() - dates.min()).days,
+            'states': df['state'].nunique(),
+            'state_districts': len(df[['state', 'district']].drop_duplicates()),
+            'unique_districts': df['district'].nunique(),
+            'pincodes': df['pincode'].nunique(),
+            'total_enrollments': enrollments,
+            'total_bio_updates': bio,
+            'total_demo_updates': demo,
+            'total_updates': bio + demo,
+            'national_ue_ratio': (bio + demo) / enrollments if enrollments else 0.0,
+            'child_enrollment_pct': pct(df['age_0_5'].sum() + df['age_5_17'].sum(), enrollments),
+            'age_0_5_pct': pct(df['age_0_5'].sum(), enrollments),
+            'age_5_17_pct': pct(df['age_5_17'].sum(), enrollments),
+            'youth_bio_updates': df['bio_age_5_17'].sum(),
+            'youth_bio_share_pct': pct(df['bio_age_5_17'].sum(), bio),
+        }
+
+
+def _to_builtin(value):
+    """Convert numpy scalars / NaN from summary rows into plain Python values"""
+    if value is None or isinstance(value, list):
+        return value
+    if hasattr(value, 'item'):
+        value = value.item()
+    if isinstance(value, float) and value != value:
+        return None
+    return value
+
+
+# =============================================================================
+# FORMATTING HELPERS
+# =============================================================================
+
+def fmt_int(value, missing='N/A'):
+    """12345 -> '12,345'"""
+    return missing if value is None else f"{int(round(value)):,}"
+
+
+def fmt_float(value, decimals=2, missing='N/A'):
+    return missing if value is None else f"{value:,.{decimals}f}"
+
+
+def fmt_millions(value, decimals=2, missing='N/A'):
+    """5435484 -> '5.44M'"""
+    return missing if value is None else f"{value / 1e6:.{decimals}f}M"
+
+
+def fmt_pct(part, whole, decimals=1, missing='N/A'):
+    """Share of `part` in `whole` as '6.4%'"""
+    if part is None or not whole:
+        return missing
+    return f"{part / whole * 100:.{decimals}f}%"
+
+
+def fmt_date_span(first, last, missing='N/A'):
+    """Two timestamps -> 'Jan 3 - Dec 31, 2025'"""
+    if first is None or last is None:
+        return missing
+    return f"{first:%b} {first.day} - {last:%b} {last.day}, {last.year}"
+
+
+def fmt_month_span(first, last, missing='N/A'):
+    """Two timestamps -> 'January - December 2025' (or 'December 2024 - March 2025')"""
+    if first is None or last is None:
+        return missing
+    if first.year != last.year:
+        return f"{first:%B %Y} - {last:%B %Y}"
+    if first.month == last.month:
+        return f"{last:%B %Y}"
+    return f"{first:%B} - {last:%B %Y}"
+
+
+def fmt_long_date_span(first, last, missing='N/A'):
+    """Two timestamps -> 'January 3, 2025 - December 31, 2025'"""
+    if first is None or last is None:
+        return missing
+    return f"{first:%B} {first.day}, {first.year} - {last:%B} {last.day}, {last.year}"
+
+
+def fmt_years(first, last, missing='N/A'):
+    """Two timestamps -> '2025' (or '2024-2025')"""
+    if first is None or last is None:
+        return missing
+    return str(last.year) if first.year == last.year else f"{first.year}-{last.year}"
+
+
+def difference(a, b):
+    """a - b, propagating missing values"""
+    return None if a is None or b is None else a - b
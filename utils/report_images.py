@@ -0,0 +1,99 @@
+"""
+Report Images
+Resample figures to their printed size before embedding them in the PDF report
+"""
+
+import os
+import hashlib
+
+from PIL import Image as PILImage
+from reportlab.platypus import Image
+
+from utils.config import OUTPUTS_DIR, REPORT_IMAGE_DPI, REPORT_VECTOR_FIGURES
+
+try:
+    from svglib.svglib import svg2rlg
+except ImportError:
+    svg2rlg = None
+
+
+REPORT_IMAGE_CACHE_DIR = os.path.join(OUTPUTS_DIR, '.report_images')
+
+_stats = {'vector': 0, 'resampled': 0, 'cached': 0, 'original': 0, 'bytes_saved': 0}
+
+
+def vector_path(path):
+    """SVG written next to a PNG figure when REPORT_VECTOR_FIGURES is on"""
+    return os.path.splitext(path)[0] + '.svg'
+
+
+def target_pixels(width, height, dpi=REPORT_IMAGE_DPI):
+    """Printed size in points -> pixel size at `dpi`"""
+    return max(1, round(width / 72 * dpi)), max(1, round(height / 72 * dpi))
+
+
+def prepare_image(path, width, height, dpi=REPORT_IMAGE_DPI):
+    """
+    Path of a copy of `path` resampled to width x height points at `dpi`
+
+    Resized copies are cached in REPORT_IMAGE_CACHE_DIR under a name derived
+    from the source file's path, size and mtime, so they are only rebuilt when
+    the figure changes. Images already at or below the target size are used
+    as they are.
+    """
+    st = os.stat(path)
+    target = target_pixels(width, height, dpi)
+    digest = hashlib.blake2b(
+        repr((os.path.abspath(path), st.st_size, st.st_mtime_ns, target)).encode(),
+        digest_size=8
+    ).hexdigest()
+    stem = os.path.splitext(os.path.basename(path))[0]
+    cached_path = os.path.join(REPORT_IMAGE_CACHE_DIR, f'{stem}_{target[0]}x{target[1]}_{digest}.png')
+
+    if os.path.exists(cached_path):
+        _stats['cached'] += 1
+        return cached_path
+
+    with PILImage.open(path) as img:
+        if img.width <= target[0] and img.height <= target[1]:
+            _stats['original'] += 1
+            return path
+
+        # Figures have white backgrounds; flattening drops the alpha soft mask
+        img = img.convert('RGBA')
+        flat = PILImage.new('RGB', img.size, 'white')
+        flat.paste(img, mask=img.getchannel('A'))
+        resized = flat.resize(target, PILImage.LANCZOS)
+
+    os.makedirs(REPORT_IMAGE_CACHE_DIR, exist_ok=True)
+    tmp_path = cached_path + '.tmp'
+    resized.save(tmp_path, format='PNG', optimize=True)
+    os.replace(tmp_path, cached_path)
+
+    _stats['resampled'] += 1
+    _stats['bytes_saved'] += st.st_size - os.path.getsize(cached_path)
+    return cached_path
+
+
+def report_image(path, width, height, dpi=REPORT_IMAGE_DPI, vector=REPORT_VECTOR_FIGURES):
+    """
+    Flowable for a figure drawn at width x height points
+
+    Uses the figure's SVG as a vector drawing when `vector` is set, svglib is
+    installed and the SVG exists; otherwise a bitmap resampled to `dpi`.
+    """
+    if vector and svg2rlg is not None and os.path.exists(vector_path(path)):
+        drawing = svg2rlg(vector_path(path))
+        if drawing is not None and drawing.width and drawing.height:
+            sx, sy = width / drawing.width, height / drawing.height
+            drawing.width, drawing.height = width, height
+            drawing.scale(sx, sy)
+            _stats['vector'] += 1
+            return drawing
+
+    return Image(prepare_image(path, width, height, dpi), width=width, height=height)
+
+
+def image_stats():
+    """Counts of embedded images by how they were prepared"""
+    return dict(_stats)
@@ -0,0 +1,139 @@
+"""
+Schema Enforcement
+Apply the column dtypes from DATASET_SCHEMAS (utils/config.py) to loaded data
+
+- count and pincode columns become int32 (refused if a value is missing,
+  fractional or out of range, instead of silently wrapping or truncating)
+- geography columns become categorical with sorted categories, so sorting
+  and group order match the plain-string columns they replace
+- dates become datetime64 (raw date strings are parsed by parse_dates)
+
+Group-bys on the categorical columns must pass observed=True; otherwise
+pandas adds a row for every unused combination of categories.
+"""
+
+import numpy as np
+import pandas as pd
+
+from utils.config import DATASET_SCHEMAS
+
+
+class SchemaError(ValueError):
+    """Raised when a column cannot take its schema dtype without losing data"""
+
+
+def parse_dates(values):
+    """
+    Parse raw date strings (dd-mm-yyyy, with a day-first fallback for the
+    other layouts) by parsing each distinct string once
+
+    Used by cleaning and profiling alike, so 03-01-2025 is 3 January everywhere.
+    Raw shards repeat ~100 distinct dates across millions of rows, so parsing
+    the uniques and mapping them back is far cheaper than parsing every row.
+
+    Parameters:
+    -----------
+    values : pd.Series or array-like
+        Raw date strings (missing values stay NaT)
+
+    Returns:
+    --------
+    pd.Series of datetime64[ns]
+    """
+    if not isinstance(values, pd.Series):
+        values = pd.Series(values, dtype=object)
+    codes, uniques = pd.factorize(values, sort=False)
+    if len(uniques) == 0:
+        return pd.Series(pd.NaT, index=values.index, dtype='datetime64[ns]')
+    uniques = pd.Series(uniques, dtype='object')
+    parsed = pd.to_datetime(uniques, format='%d-%m-%Y', errors='coerce')
+    retry = parsed.isna() & uniques.notna()
+    if retry.any():
+        parsed[retry] = pd.to_datetime(uniques[retry], format='mixed', dayfirst=True, errors='coerce')
+
+    out = parsed.to_numpy(dtype='datetime64[ns]')[codes]
+    out[codes == -1] = np.datetime64('NaT')
+    return pd.Series(out, index=values.index)
+
+
+def _to_category(series):
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        categories = series.cat.categories
+        if categories.is_monotonic_increasing:
+            return series
+        return series.cat.reorder_categories(sorted(categories))
+    return pd.Categorical(series, categories=sorted(series.dropna().unique()))
+
+
+def _to_integer(series, dtype, label):
+    if series.isna().any():
+        raise SchemaError(f"{label}: {series.isna().sum():,} missing values cannot be stored as {dtype}")
+    values = series.to_numpy()
+    if values.dtype.kind == 'f' and (np.mod(values, 1) != 0).any():
+        raise SchemaError(f"{label}: fractional values cannot be stored as {dtype}")
+    info = np.iinfo(dtype)
+    if len(values) and (values.min() < info.min or values.max() > info.max):
+        raise SchemaError(f"{label}: values outside the {dtype} range [{info.min}, {info.max}]")
+    return series.astype(dtype)
+
+
+def enforce_schema(df, name):
+    """
+    Cast the columns of `df` that appear in schema `name` (other columns untouched)
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Loaded data (modified in place)
+    name : str
+        'enrollment', 'biometric', 'demographic' or 'merged'
+
+    Returns:
+    --------
+    pd.DataFrame
+        The same frame, for chaining
+    """
+    for column, dtype in DATASET_SCHEMAS[name].items():
+        if column not in df.columns:
+            continue
+        series = df[column]
+        if dtype == 'category':
+            df[column] = _to_category(series)
+        elif dtype.startswith('datetime64'):
+            if series.dtype != dtype:
+                df[column] = pd.to_datetime(series).astype(dtype)
+        elif series.dtype != dtype:
+            if np.issubdtype(np.dtype(dtype), np.integer):
+                df[column] = _to_integer(series, dtype, f"{name}.{column}")
+            else:
+                df[column] = series.astype(dtype)
+    return df
+
+
+def numeric_dtypes(name):
+    """read_csv dtype= mapping for the schema's numeric columns (usable on raw shards)"""
+    return {
+        column: dtype for column, dtype in DATASET_SCHEMAS[name].items()
+        if dtype != 'category' and not dtype.startswith('datetime64')
+    }
+
+
+def read_dataset(path, name, columns=None):
+    """
+    Read a cleaned CSV and enforce its schema
+
+    Parameters:
+    -----------
+    path : str
+        CSV path
+    name : str
+        Schema name (see enforce_schema)
+    columns : list of str, optional
+        Subset of columns
+
+    Returns:
+    --------
+    pd.DataFrame
+    """
+    df = pd.read_csv(path, usecols=columns)
+    return enforce_schema(df, name)
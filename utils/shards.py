@@ -0,0 +1,334 @@
+"""
+Raw Shards
+Discover, read and cache the raw API shards
+
+discover_shards() finds a dataset's shards with RAW_FILE_PATTERNS (config), so
+a refresh that adds shards needs no config edit. Shards named
+'<prefix>_<first row>_<last row>.csv' are returned in row order.
+
+Shards may be plain or compressed (.csv.gz, .csv.zst, .csv.xz). read_shard()
+and iter_shard_chunks() stream a compressed shard through a background thread
+that decompresses block by block while pandas parses the blocks already
+decompressed; the decompressed file is never written out or held whole
+(gzip, lzma and zstandard release the GIL, so the two overlap).
+
+ShardCache keeps, per shard, the cleaned rows and the per-key sums returned by
+clean_shard() as column stores (utils/column_store.py), together with the
+shard's fingerprint:
+- size and mtime match the cached entry  -> reused without reading the shard
+- size matches but mtime differs         -> content hash compared; a shard
+                                            rewritten byte-for-byte is reused
+- anything else, or a new shard          -> cleaned again
+
+Only the fused cleaning engine uses the cache (one manifest per dataset).
+Its version is the fingerprint of CACHE_CONFIG (name mappings, schemas) and
+code_fingerprint(CLEANING_CODE): cleaning_engines.py and the utils modules it
+imports. A manifest with another version is discarded, so every shard is
+cleaned again. Entries of shards that no longer exist are removed.
+"""
+
+import io
+import os
+import re
+import glob
+import gzip
+import json
+import lzma
+import queue
+import shutil
+import threading
+
+import pandas as pd
+
+from utils.config import (
+    RAW_DATA_DIR, PROCESSED_DATA_DIR, RAW_FILE_PATTERNS, RAW_FILE_SUFFIXES,
+    DECOMPRESS_BLOCK_SIZE, DECOMPRESS_PREFETCH_BLOCKS
+)
+from utils.artifact_cache import file_fingerprint, config_fingerprint, code_fingerprint, hash_values
+from utils.column_store import write_store, open_store
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+SHARD_CACHE_DIR = os.path.join(PROCESSED_DATA_DIR, 'shard_cache')
+
+# Config that changes what clean_shard() produces
+CACHE_CONFIG = ['STATE_NAME_MAPPING', 'DISTRICT_NAME_MAPPING', 'DATASET_SCHEMAS']
+
+# Module defining clean_shard() (hashed with the utils modules it imports)
+CLEANING_CODE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cleaning_engines.py')
+
+
+# =============================================================================
+# DISCOVERY
+# =============================================================================
+
+def _suffix(file_name):
+    for suffix in sorted(RAW_FILE_SUFFIXES, key=len, reverse=True):
+        if file_name.endswith(suffix):
+            return suffix
+    return None
+
+
+def _shard_order(file_name):
+    match = re.search(r'_(\d+)_(\d+)\.csv(\.\w+)?$', file_name)
+    if match:
+        return (0, int(match.group(1)), int(match.group(2)), file_name)
+    return (1, 0, 0, file_name)
+
+
+def discover_shards(dataset, data_dir=RAW_DATA_DIR):
+    """
+    Raw shard file names of a dataset
+
+    Parameters:
+    -----------
+    dataset : str
+        'enrollment', 'biometric' or 'demographic'
+    data_dir : str
+        Directory holding the shards
+
+    Returns:
+    --------
+    list of str
+        File names (relative to data_dir), in row order; a shard present in
+        several formats is listed once, in the first of RAW_FILE_SUFFIXES
+    """
+    pattern = RAW_FILE_PATTERNS[dataset]
+    shards = {}
+    for path in glob.glob(os.path.join(data_dir, pattern)):
+        file_name = os.path.basename(path)
+        suffix = _suffix(file_name)
+        if suffix is None:
+            continue
+        rank = RAW_FILE_SUFFIXES.index(suffix)
+        stem = file_name[:-len(suffix)]
+        if stem not in shards or rank < shards[stem][0]:
+            shards[stem] = (rank, file_name)
+    if not shards:
+        raise FileNotFoundError(f"No {dataset} shards matching '{pattern}' in {data_dir}")
+    return sorted((file_name for _, file_name in shards.values()), key=_shard_order)
+
+
+# =============================================================================
+# READING
+# =============================================================================
+
+def is_compressed(path):
+    return path.endswith(('.gz', '.zst', '.xz'))
+
+
+def _open_compressed(path):
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rb')
+    if path.endswith('.xz'):
+        return lzma.open(path, 'rb')
+    if path.endswith('.zst'):
+        # All frames, in case the shard was compressed in pieces
+        return zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), read_across_frames=True)
+    raise ValueError(f"Unsupported shard compression: {path}")
+
+
+class _DecompressingReader(io.RawIOBase):
+    """Raw stream of a compressed shard, decompressed ahead by a background thread"""
+
+    def __init__(self, path, block_size=DECOMPRESS_BLOCK_SIZE, prefetch=DECOMPRESS_PREFETCH_BLOCKS):
+        super().__init__()
+        self._queue = queue.Queue(maxsize=prefetch)
+        self._stop = threading.Event()
+        self._pending = memoryview(b'')
+        self._finished = False
+        self._thread = threading.Thread(target=self._produce, args=(path, block_size), daemon=True)
+        self._thread.start()
+
+    def _put(self, item):
+        # Gives up once the reader is closed, so an abandoned read cannot hang the thread
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce(self, path, block_size):
+        try:
+            with _open_compressed(path) as f:
+                while True:
+                    block = f.read(block_size)
+                    if not self._put(block) or not block:
+                        return
+        except Exception as e:
+            self._put(e)
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while not self._pending and not self._finished:
+            item = self._queue.get()
+            if isinstance(item, Exception):
+                self._finished = True
+                raise item
+            if not item:
+                self._finished = True
+            else:
+                self._pending = memoryview(item)
+        n = min(len(buffer), len(self._pending))
+        buffer[:n] = self._pending[:n]
+        self._pending = self._pending[n:]
+        return n
+
+    def close(self):
+        if not self.closed:
+            self._stop.set()
+            self._thread.join()
+        super().close()
+
+
+def open_shard(path):
+    """
+    Binary file object with the (decompressed) contents of a raw shard
+
+    Parameters:
+    -----------
+    path : str
+        .csv, .csv.gz, .csv.zst or .csv.xz file
+
+    Returns:
+    --------
+    io.BufferedIOBase
+        Close it (or use it as a context manager) when done
+    """
+    if not is_compressed(path):
+        return open(path, 'rb')
+    if path.endswith('.zst') and zstandard is None:
+        raise ImportError(f"Reading {os.path.basename(path)} requires the zstandard package")
+    return io.BufferedReader(_DecompressingReader(path), buffer_size=DECOMPRESS_BLOCK_SIZE)
+
+
+def read_shard(path, **read_kwargs):
+    """pd.read_csv of a raw shard, streaming compressed shards through open_shard()"""
+    if not is_compressed(path):
+        return pd.read_csv(path, **read_kwargs)
+    with open_shard(path) as f:
+        return pd.read_csv(f, **read_kwargs)
+
+
+def iter_shard_chunks(path, chunksize, **read_kwargs):
+    """Chunks of a raw shard (pd.read_csv with chunksize), closing the shard afterwards"""
+    if not is_compressed(path):
+        with pd.read_csv(path, chunksize=chunksize, **read_kwargs) as reader:
+            yield from reader
+        return
+    with open_shard(path) as f, pd.read_csv(f, chunksize=chunksize, **read_kwargs) as reader:
+        yield from reader
+
+
+# =============================================================================
+# CACHE
+# =============================================================================
+
+
+class ShardCache:
+    """
+    Per-shard clean_shard() results of one dataset
+
+    Parameters:
+    -----------
+    dataset : str
+        Dataset name (one manifest and subdirectory per dataset)
+    directory : str
+        Cache root
+    """
+
+    def __init__(self, dataset, directory=SHARD_CACHE_DIR):
+        self.dataset = dataset
+        self.root = os.path.join(directory, dataset)
+        self.manifest_path = os.path.join(directory, f'{dataset}.json')
+        self.version = hash_values(config_fingerprint(CACHE_CONFIG), code_fingerprint(CLEANING_CODE))
+        self._manifest = self._load()
+        self.hits = 0
+        self.misses = 0
+
+    def _load(self):
+        empty = {'version': self.version, 'shards': {}}
+        if not os.path.exists(self.manifest_path):
+            return empty
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return empty
+        return manifest if manifest.get('version') == self.version else empty
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.manifest_path), exist_ok=True)
+        tmp_path = self.manifest_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
+
+    def _shard_dir(self, file_name):
+        return os.path.join(self.root, file_name)
+
+    def _unchanged(self, entry, path):
+        st = os.stat(path)
+        if entry['size'] != st.st_size:
+            return False
+        if entry['mtime_ns'] != st.st_mtime_ns:
+            if entry['hash'] != file_fingerprint(path):
+                return False
+            # Same bytes, new mtime (re-downloaded or copied): remember the new mtime
+            entry['mtime_ns'] = st.st_mtime_ns
+        return True
+
+    def load(self, path):
+        """
+        Cached result for a shard, or None if it is new or has changed
+
+        Returns:
+        --------
+        tuple or None
+            (clean rows, per-key sums, raw row count), as from clean_shard()
+        """
+        file_name = os.path.basename(path)
+        entry = self._manifest['shards'].get(file_name)
+        directory = self._shard_dir(file_name)
+        if entry is None or not self._unchanged(entry, path):
+            self.misses += 1
+            return None
+        try:
+            clean = open_store(os.path.join(directory, 'clean')).copy()
+            partial = open_store(os.path.join(directory, 'partial')).copy()
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return clean, partial, entry['raw_rows']
+
+    def store(self, path, result):
+        """Cache the clean_shard() result of a shard"""
+        clean, partial, raw_rows = result
+        file_name = os.path.basename(path)
+        directory = self._shard_dir(file_name)
+        write_store(clean, os.path.join(directory, 'clean'))
+        write_store(partial, os.path.join(directory, 'partial'))
+        st = os.stat(path)
+        self._manifest['shards'][file_name] = {
+            'size': st.st_size,
+            'mtime_ns': st.st_mtime_ns,
+            'hash': file_fingerprint(path),
+            'raw_rows': int(raw_rows),
+        }
+
+    def prune(self, file_names):
+        """Forget shards not in `file_names` (deleted or renamed raw files)"""
+        keep = set(file_names)
+        for file_name in list(self._manifest['shards']):
+            if file_name not in keep:
+                del self._manifest['shards'][file_name]
+                shutil.rmtree(self._shard_dir(file_name), ignore_errors=True)
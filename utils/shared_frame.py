@@ -0,0 +1,117 @@
+"""
+Shared Frame
+Place a DataFrame in one shared-memory block so worker processes can attach to it
+without the frame being pickled
+
+share_frame() copies each column into a single multiprocessing.shared_memory
+block and returns the block plus a small picklable layout. attach_frame() in a
+worker maps the block and rebuilds the frame around it:
+
+- numeric, bool and datetime columns are zero-copy views of the block
+- text columns are stored as integer codes; only the distinct values travel in
+  the layout and each worker expands them locally
+- categorical columns keep their codes in the block and their categories in
+  the layout
+
+The creating process owns the block and must call release() when the workers
+are done.
+"""
+
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+
+ALIGNMENT = 64
+
+
+def _aligned(offset):
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def _encode(series):
+    """Column -> (kind, array to place in the block, extra layout fields)"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return 'category', series.cat.codes.to_numpy(), {
+            'categories': series.cat.categories.tolist(), 'ordered': series.cat.ordered
+        }
+    if series.dtype == object:
+        codes, uniques = pd.factorize(series)
+        return 'object', codes.astype(np.int32), {'categories': list(uniques)}
+    if pd.api.types.is_datetime64_any_dtype(series.dtype):
+        return 'datetime', series.to_numpy().view('int64'), {'dtype': str(series.dtype)}
+    return 'array', series.to_numpy(), {}
+
+
+def share_frame(df):
+    """
+    Copy `df` into a new shared-memory block
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Frame with a default RangeIndex
+
+    Returns:
+    --------
+    tuple
+        (SharedMemory block, layout dict to pass to attach_frame)
+    """
+    encoded, offset = [], 0
+    for column in df.columns:
+        kind, values, extra = _encode(df[column])
+        values = np.ascontiguousarray(values)
+        offset = _aligned(offset)
+        encoded.append((column, kind, values, offset, extra))
+        offset += values.nbytes
+
+    block = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+    layout = {'name': block.name, 'rows': len(df), 'columns': []}
+    for column, kind, values, start, extra in encoded:
+        target = np.ndarray(values.shape, dtype=values.dtype, buffer=block.buf, offset=start)
+        target[:] = values
+        layout['columns'].append(dict(
+            extra, name=column, kind=kind, dtype_str=values.dtype.str, offset=start
+        ))
+    return block, layout
+
+
+def attach_frame(layout):
+    """
+    Rebuild a shared frame in a worker process
+
+    Returns:
+    --------
+    tuple
+        (pd.DataFrame, SharedMemory handle); keep the handle open while the
+        frame is in use
+    """
+    block = shared_memory.SharedMemory(name=layout['name'])
+    rows = layout['rows']
+    columns = {}
+    for spec in layout['columns']:
+        values = np.ndarray((rows,), dtype=np.dtype(spec['dtype_str']), buffer=block.buf,
+                            offset=spec['offset'])
+        # Other workers read the same memory, so in-place writes must fail loudly
+        values.flags.writeable = False
+        kind = spec['kind']
+        if kind == 'category':
+            columns[spec['name']] = pd.Categorical.from_codes(
+                values, categories=spec['categories'], ordered=spec['ordered']
+            )
+        elif kind == 'object':
+            # Code -1 (missing) picks the appended NaN
+            lookup = np.array(spec['categories'] + [np.nan], dtype=object)
+            columns[spec['name']] = lookup[values]
+        elif kind == 'datetime':
+            columns[spec['name']] = values.view(spec['dtype'])
+        else:
+            columns[spec['name']] = values
+    return pd.DataFrame(columns, copy=False), block
+
+
+def release(block):
+    """Free a block created by share_frame (call once every worker has finished)"""
+    block.close()
+    block.unlink()
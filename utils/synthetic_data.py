@@ -0,0 +1,392 @@
+"""
+Synthetic Data
+UIDAI-shaped enrollment, biometric and demographic shards for scale benchmarks
+
+The output has the raw api_data_aadhar_* schemas and shard names, so the pipeline runs
+on it unchanged. It includes:
+- 36 states/UTs with districts and 6-digit pincodes drawn from each state's
+  real postal prefixes
+- skewed volumes (state population x lognormal pincode activity)
+- duplicate (date, state, district, pincode) keys
+- district names shared across state borders
+- messy state-name variants taken from STATE_NAME_MAPPING
+- mixed date formats
+
+Scale 1 = the 4.94M-row baseline (same rows per shard as the real export).
+"""
+
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from utils.config import (
+    ENROLLMENT_FILES, BIOMETRIC_FILES, DEMOGRAPHIC_FILES,
+    START_DATE, END_DATE, STATE_NAME_MAPPING
+)
+
+
+# =============================================================================
+# GEOGRAPHY
+# =============================================================================
+
+# (state, population in millions, districts, 3-digit pincode prefix ranges)
+STATES = [
+    ('Uttar Pradesh', 240, 95, [(201, 245), (270, 285)]),
+    ('Maharashtra', 125, 46, [(400, 402), (404, 445)]),
+    ('Bihar', 125, 48, [(800, 813), (841, 854)]),
+    ('West Bengal', 100, 33, [(700, 736), (738, 743)]),
+    ('Madhya Pradesh', 85, 65, [(450, 488)]),
+    ('Rajasthan', 80, 60, [(301, 345)]),
+    ('Tamil Nadu', 77, 48, [(600, 604), (606, 643)]),
+    ('Gujarat', 70, 35, [(360, 395)]),
+    ('Karnataka', 68, 41, [(560, 591)]),
+    ('Andhra Pradesh', 53, 36, [(515, 535)]),
+    ('Odisha', 46, 40, [(751, 770)]),
+    ('Jharkhand', 39, 24, [(814, 835)]),
+    ('Telangana', 38, 33, [(500, 509)]),
+    ('Kerala', 35, 14, [(670, 681), (683, 695)]),
+    ('Assam', 35, 35, [(781, 788)]),
+    ('Punjab', 30, 23, [(140, 152)]),
+    ('Chhattisgarh', 29, 33, [(490, 497)]),
+    ('Haryana', 29, 22, [(121, 136)]),
+    ('Delhi', 21, 11, [(110, 110)]),
+    ('Jammu and Kashmir', 13, 20, [(180, 193)]),
+    ('Uttarakhand', 11, 13, [(246, 263)]),
+    ('Himachal Pradesh', 7.5, 12, [(171, 177)]),
+    ('Tripura', 4, 8, [(799, 799)]),
+    ('Meghalaya', 3.3, 12, [(793, 794)]),
+    ('Manipur', 3, 16, [(795, 795)]),
+    ('Nagaland', 2.2, 16, [(797, 798)]),
+    ('Goa', 1.5, 2, [(403, 403)]),
+    ('Arunachal Pradesh', 1.5, 26, [(790, 792)]),
+    ('Puducherry', 1.4, 4, [(605, 605)]),
+    ('Mizoram', 1.2, 11, [(796, 796)]),
+    ('Chandigarh', 1.2, 1, [(160, 160)]),
+    ('Sikkim', 0.7, 6, [(737, 737)]),
+    ('Dadra & Nagar Haveli and Daman & Diu', 0.6, 3, [(396, 396)]),
+    ('Andaman & Nicobar Islands', 0.4, 3, [(744, 744)]),
+    ('Ladakh', 0.3, 2, [(194, 194)]),
+    ('Lakshadweep', 0.07, 1, [(682, 682)]),
+]
+
+BASELINE_PINCODES = 19_814
+
+# Share of districts whose name also exists in another state (888 combinations vs
+# 865 unique names in the real data)
+SHARED_DISTRICT_RATE = 0.026
+
+
+# =============================================================================
+# DATASETS
+# =============================================================================
+
+KEY_COLUMNS = ['date', 'state', 'district', 'pincode']
+
+# value columns, mean count per row, mean share of each column
+DATASETS = {
+    'enrollment': {
+        'files': ENROLLMENT_FILES,
+        'columns': ['age_0_5', 'age_5_17', 'age_18_greater'],
+        'mean_per_row': 5.4,
+        'shares': [0.653, 0.317, 0.030],
+    },
+    'biometric': {
+        'files': BIOMETRIC_FILES,
+        'columns': ['bio_age_5_17', 'bio_age_17_'],
+        'mean_per_row': 37.4,
+        'shares': [0.491, 0.509],
+    },
+    'demographic': {
+        'files': DEMOGRAPHIC_FILES,
+        'columns': ['demo_age_5_17', 'demo_age_17_'],
+        'mean_per_row': 23.8,
+        'shares': [0.10, 0.90],
+    },
+}
+
+# Date formats and how often each appears
+DATE_FORMATS = {
+    '%d-%m-%Y': 0.94,
+    '%d/%m/%Y': 0.03,
+    '%Y-%m-%d': 0.02,
+    '%d-%m-%y': 0.01,
+}
+
+DEFAULT_OPTIONS = {
+    'duplicate_rate': 0.03,       # rows re-using another row's key
+    'messy_state_rate': 0.005,    # rows with a STATE_NAME_MAPPING variant
+    'invalid_state_rate': 1e-5,   # rows with the invalid '100000' state
+}
+
+
+def shard_rows(file_name):
+    """Rows in a baseline shard, from its '<start>_<end>.csv' suffix"""
+    match = re.search(r'_(\d+)_(\d+)\.csv$', file_name)
+    if not match:
+        raise ValueError(f"Cannot read row range from shard name: {file_name}")
+    return int(match.group(2)) - int(match.group(1))
+
+
+BASELINE_ROWS = sum(shard_rows(f) for spec in DATASETS.values() for f in spec['files'])
+
+
+def build_geography(seed=0, n_pincodes=BASELINE_PINCODES):
+    """
+    Pincode -> district -> state hierarchy with activity weights
+
+    Returns:
+    --------
+    pd.DataFrame
+        One row per pincode: state, district, pincode, weight (sums to 1)
+        and per-pincode share multipliers for each dataset
+    """
+    rng = np.random.default_rng([seed, 0])
+    population = np.array([s[1] for s in STATES])
+
+    # Pincodes per state grow sub-linearly with population; small UTs keep a floor
+    alloc = population ** 0.6
+    per_state = np.maximum(10, np.round(alloc / alloc.sum() * n_pincodes)).astype(int)
+
+    frames = []
+    for (state, pop, n_districts, ranges), n_pins in zip(STATES, per_state):
+        prefixes = np.concatenate([np.arange(lo, hi + 1) for lo, hi in ranges])
+        n_pins = min(n_pins, len(prefixes) * 998)
+        codes = rng.choice(len(prefixes) * 998, n_pins, replace=False)
+        pincodes = prefixes[codes // 998] * 1000 + codes % 998 + 1
+
+        # Districts are contiguous pincode blocks of Zipf-like size
+        pincodes.sort()
+        n_districts = min(n_districts, n_pins)
+        sizes = 1.0 / np.arange(1, n_districts + 1) ** 0.5
+        rng.shuffle(sizes)
+        bounds = np.round(np.cumsum(sizes) / sizes.sum() * n_pins).astype(int)
+        district_idx = np.searchsorted(bounds, np.arange(n_pins), side='right')
+        district_idx = np.minimum(district_idx, n_districts - 1)
+
+        frames.append(pd.DataFrame({
+            'state': state,
+            'district': [f"{state.split()[0]} District {i + 1:02d}" for i in district_idx],
+            'pincode': pincodes,
+            'state_weight': pop / population.sum(),
+        }))
+
+    geo = pd.concat(frames, ignore_index=True)
+
+    # Cross-border districts: some names also appear in a neighbouring state
+    districts = geo[['state', 'district']].drop_duplicates()
+    n_shared = int(round(len(districts) * SHARED_DISTRICT_RATE))
+    picks = districts.sample(n_shared * 2, random_state=seed)
+    renames = {}
+    for (state_a, district_a), (state_b, district_b) in zip(
+        picks.iloc[:n_shared].itertuples(index=False), picks.iloc[n_shared:].itertuples(index=False)
+    ):
+        if state_a != state_b:
+            renames[(state_b, district_b)] = district_a
+    keys = list(zip(geo['state'], geo['district']))
+    geo['district'] = [renames.get(key, key[1]) for key in keys]
+
+    # Skewed volumes: state share x heavy-tailed pincode activity within the state
+    activity = rng.lognormal(0.0, 1.2, len(geo))
+    state_activity = pd.Series(activity).groupby(geo['state']).transform('sum').to_numpy()
+    geo['weight'] = geo['state_weight'].to_numpy() * activity / state_activity
+    geo['weight'] /= geo['weight'].sum()
+
+    # Per-pincode age mix varies around the national shares
+    for name in DATASETS:
+        geo[f'{name}_mix'] = rng.beta(8, 8, len(geo)) * 2
+
+    return geo.drop(columns='state_weight')
+
+
+def _date_table():
+    """All dates in the analysis period, formatted every supported way"""
+    dates = pd.date_range(START_DATE, END_DATE, freq='D')
+    table = np.array([dates.strftime(fmt).to_numpy() for fmt in DATE_FORMATS], dtype=object)
+
+    # Far fewer transactions on Sundays
+    day_weight = np.where(dates.dayofweek == 6, 0.2, 1.0)
+    return table, day_weight / day_weight.sum()
+
+
+def _state_variants():
+    """Canonical state -> list of messy spellings that map back to it"""
+    variants = {}
+    for variant, target in STATE_NAME_MAPPING.items():
+        if target is not None:
+            variants.setdefault(target, []).append(variant)
+    return variants
+
+
+# =============================================================================
+# GENERATION
+# =============================================================================
+
+def generate_chunk(dataset, n_rows, geo, rng, options=None):
+    """
+    Generate n_rows raw records of one dataset
+
+    Parameters:
+    -----------
+    dataset : str
+        'enrollment', 'biometric' or 'demographic'
+    n_rows : int
+        Rows to generate
+    geo : pd.DataFrame
+        Output of build_geography()
+    rng : np.random.Generator
+        Random source (seed it per chunk for reproducible shards)
+    options : dict, optional
+        Overrides for DEFAULT_OPTIONS
+
+    Returns:
+    --------
+    pd.DataFrame
+        Columns date, state, district, pincode followed by the dataset's count columns
+    """
+    spec = DATASETS[dataset]
+    opts = dict(DEFAULT_OPTIONS, **(options or {}))
+    date_table, day_weight = _date_table()
+
+    # Keys: pincodes by activity weight, dates by day weight, format by frequency
+    pin_idx = rng.choice(len(geo), n_rows, p=geo['weight'].to_numpy())
+    day_idx = rng.choice(len(day_weight), n_rows, p=day_weight)
+    fmt_idx = rng.choice(len(DATE_FORMATS), n_rows, p=list(DATE_FORMATS.values()))
+
+    # Duplicate keys: a share of rows repeats another row's (date, pincode)
+    n_dup = int(n_rows * opts['duplicate_rate'])
+    if n_dup and n_rows > 1:
+        rows = rng.choice(n_rows, n_dup, replace=False)
+        sources = rng.integers(0, n_rows, n_dup)
+        pin_idx[rows] = pin_idx[sources]
+        day_idx[rows] = day_idx[sources]
+        fmt_idx[rows] = fmt_idx[sources]
+
+    states = geo['state'].to_numpy()[pin_idx]
+
+    # Messy state spellings that STATE_NAME_MAPPING is expected to repair
+    messy = np.flatnonzero(rng.random(n_rows) < opts['messy_state_rate'])
+    if len(messy):
+        variants = _state_variants()
+        states = states.copy()
+        for i in messy:
+            options_for_state = variants.get(states[i])
+            if options_for_state:
+                states[i] = options_for_state[rng.integers(len(options_for_state))]
+    invalid = rng.random(n_rows) < opts['invalid_state_rate']
+    if invalid.any():
+        states = states.copy()
+        states[invalid] = '100000'
+
+    df = pd.DataFrame({
+        'date': date_table[fmt_idx, day_idx],
+        'state': states,
+        'district': geo['district'].to_numpy()[pin_idx],
+        'pincode': geo['pincode'].to_numpy()[pin_idx],
+    })
+
+    # Counts: overdispersed totals split across the age columns
+    intensity = rng.lognormal(-0.5, 1.0, n_rows)
+    totals = rng.poisson(spec['mean_per_row'] * intensity)
+
+    shares = np.array(spec['shares'])
+    first = np.clip(shares[0] * geo[f'{dataset}_mix'].to_numpy()[pin_idx], 0.0, 1.0)
+    remaining = totals
+    for i, column in enumerate(spec['columns']):
+        if i == len(spec['columns']) - 1:
+            df[column] = remaining
+            break
+        if i == 0:
+            p = first
+        else:
+            rest = shares[i:].sum()
+            p = np.full(n_rows, shares[i] / rest if rest else 0.0)
+        df[column] = rng.binomial(remaining, p)
+        remaining = remaining - df[column].to_numpy()
+
+    return df
+
+
+def _shard_plan(scale):
+    """(dataset, dataset index, file index, file name, rows) for every shard"""
+    plan = []
+    for d, (dataset, spec) in enumerate(DATASETS.items()):
+        for f, file_name in enumerate(spec['files']):
+            plan.append((dataset, d, f, file_name, max(1, int(round(shard_rows(file_name) * scale)))))
+    return plan
+
+
+def generate_frames(scale=0.01, seed=0, options=None):
+    """
+    Generate all three datasets in memory (for benchmarks at small scales)
+
+    Returns:
+    --------
+    dict
+        Dataset name -> raw DataFrame
+    """
+    geo = build_geography(seed)
+    parts = {dataset: [] for dataset in DATASETS}
+    for dataset, d, f, _, rows in _shard_plan(scale):
+        rng = np.random.default_rng([seed, 1, d, f])
+        parts[dataset].append(generate_chunk(dataset, rows, geo, rng, options))
+    return {dataset: pd.concat(frames, ignore_index=True) for dataset, frames in parts.items()}
+
+
+def write_shard(dataset, d, f, path, rows, seed=0, chunksize=500_000, options=None, geo=None):
+    """Write one shard in chunks so any scale fits in memory"""
+    geo = build_geography(seed) if geo is None else geo
+    tmp_path = path + '.tmp'
+    written = 0
+    chunk_no = 0
+    with open(tmp_path, 'w', newline='', encoding='utf-8') as out:
+        while written < rows or chunk_no == 0:
+            n = min(chunksize, rows - written)
+            rng = np.random.default_rng([seed, 1, d, f, chunk_no])
+            chunk = generate_chunk(dataset, n, geo, rng, options)
+            chunk.to_csv(out, index=False, header=(chunk_no == 0))
+            written += n
+            chunk_no += 1
+    os.replace(tmp_path, path)
+    return path, rows
+
+
+def _write_shard_task(args):
+    return write_shard(*args)
+
+
+def write_shards(out_dir, scale=1.0, seed=0, chunksize=500_000, max_workers=1, options=None,
+                 on_shard=None):
+    """
+    Write every enrollment, biometric and demographic shard to out_dir
+
+    Shards keep the configured file names so 00/01/02 read them unchanged;
+    each holds its baseline row count x scale.
+
+    Returns:
+    --------
+    list of (path, rows)
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    plan = _shard_plan(scale)
+    tasks = [
+        (dataset, d, f, os.path.join(out_dir, file_name), rows, seed, chunksize, options)
+        for dataset, d, f, file_name, rows in plan
+    ]
+
+    written = []
+    if max_workers <= 1:
+        geo = build_geography(seed)
+        for task in tasks:
+            written.append(write_shard(*task, geo=geo))
+            if on_shard:
+                on_shard(*written[-1])
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            for result in pool.map(_write_shard_task, tasks):
+                written.append(result)
+                if on_shard:
+                    on_shard(*result)
+    return written
@@ -0,0 +1,341 @@
+"""
+Telemetry
+Per-stage timing, CPU, memory and row-count records for pipeline runs
+
+Decorate stage functions with @instrument (or wrap a block in
+`with stage('name'):`). Every call records:
+- start and end time, wall time and CPU time
+- peak RSS reached during the call
+- rows in (DataFrame arguments) and rows out (DataFrames returned)
+- nesting under the calling stage
+
+When the script exits, the run is written to:
+- outputs/telemetry/runs/<script>_<timestamp>.json   (one record per call)
+- outputs/telemetry/<script>.prom                    (Prometheus textfile
+  format, aggregated per stage; point node_exporter's textfile collector
+  at outputs/telemetry)
+
+Set UIDAI_PROFILE=cprofile (or pyinstrument, if installed) to also profile
+each top-level stage into outputs/telemetry/profiles/. Set UIDAI_TELEMETRY=0 to
+turn recording off.
+"""
+
+import os
+import sys
+import json
+import time
+import atexit
+import functools
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+import pandas as pd
+
+from utils.config import TELEMETRY_DIR, TELEMETRY_ENABLED, TELEMETRY_PROFILE
+
+
+# =============================================================================
+# MEMORY
+# =============================================================================
+
+def current_rss_mb():
+    """Resident set size of this process (Linux /proc; falls back to peak RSS)"""
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') / 1024**2
+    except (OSError, ValueError, AttributeError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 1024**2 if sys.platform == 'darwin' else peak / 1024
+
+
+class RSSSampler:
+    """Track the peak RSS reached while a block runs (sampled on a thread)"""
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.start_mb = 0.0
+        self.peak_mb = 0.0
+        self._stop = threading.Event()
+
+    def _sample(self):
+        while not self._stop.is_set():
+            self.peak_mb = max(self.peak_mb, current_rss_mb())
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self.start_mb = self.peak_mb = current_rss_mb()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak_mb = max(self.peak_mb, current_rss_mb())
+        return False
+
+    @property
+    def growth_mb(self):
+        return self.peak_mb - self.start_mb
+
+
+# =============================================================================
+# RUN RECORDER
+# =============================================================================
+
+def count_rows(value):
+    """Rows in a DataFrame/Series, or summed over the frames in a tuple/list/dict"""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return len(value)
+    if isinstance(value, dict):
+        value = list(value.values())
+    if isinstance(value, (tuple, list)):
+        counts = [count_rows(item) for item in value]
+        counts = [c for c in counts if c is not None]
+        return sum(counts) if counts else None
+    return None
+
+
+def _script_name():
+    return os.path.splitext(os.path.basename(sys.argv[0] or 'interactive'))[0] or 'interactive'
+
+
+class RunTelemetry:
+    """Stage records for one process; written out once at exit"""
+
+    def __init__(self, script=None, enabled=TELEMETRY_ENABLED, profile=TELEMETRY_PROFILE):
+        self.script = script or _script_name()
+        self.enabled = enabled
+        self.profile = profile
+        self.started = time.time()
+        self.records = []
+        self._stack = []
+        self._lock = threading.Lock()
+        self._registered = False
+
+    def reset(self, script):
+        """Start a fresh run under another script name (e.g. in a worker process)"""
+        self.script = script
+        self.started = time.time()
+        self.records = []
+        self._stack = []
+
+    def _register_exit(self):
+        if not self._registered:
+            atexit.register(self.finish)
+            self._registered = True
+
+    @contextmanager
+    def stage(self, name, rows_in=None):
+        """Record one stage; yields a dict where 'rows_out' can be set"""
+        if not self.enabled:
+            yield {}
+            return
+        self._register_exit()
+
+        record = {
+            'stage': name,
+            'parent': self._stack[-1]['stage'] if self._stack else None,
+            'depth': len(self._stack),
+            'rows_in': rows_in,
+            'rows_out': None,
+            'status': 'ok',
+        }
+        profiler = self._start_profiler() if not self._stack else None
+        self._stack.append(record)
+
+        record['start'] = time.time()
+        cpu_start = time.process_time()
+        wall_start = time.perf_counter()
+        try:
+            with RSSSampler() as rss:
+                yield record
+        except BaseException as e:
+            record['status'] = 'error'
+            record['error'] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            record['end'] = time.time()
+            record['wall_s'] = round(time.perf_counter() - wall_start, 6)
+            record['cpu_s'] = round(time.process_time() - cpu_start, 6)
+            record['peak_rss_mb'] = round(rss.peak_mb, 2)
+            record['rss_growth_mb'] = round(rss.growth_mb, 2)
+            self._stack.pop()
+            if profiler is not None:
+                record['profile'] = self._stop_profiler(profiler, name)
+            with self._lock:
+                self.records.append(record)
+
+    # -------------------------------------------------------------------------
+    # Optional profilers (outermost stage only; they cannot nest)
+    # -------------------------------------------------------------------------
+
+    def _start_profiler(self):
+        if self.profile == 'cprofile':
+            import cProfile
+            profiler = cProfile.Profile()
+            profiler.enable()
+            return ('cprofile', profiler)
+        if self.profile == 'pyinstrument':
+            try:
+                from pyinstrument import Profiler
+            except ImportError:
+                print("⚠️  pyinstrument not installed - profiling disabled")
+                self.profile = None
+                return None
+            profiler = Profiler()
+            profiler.start()
+            return ('pyinstrument', profiler)
+        return None
+
+    def _stop_profiler(self, profiler, name):
+        kind, profiler = profiler
+        profile_dir = os.path.join(TELEMETRY_DIR, 'profiles')
+        os.makedirs(profile_dir, exist_ok=True)
+        base = os.path.join(profile_dir, f"{self.script}.{name}")
+        if kind == 'cprofile':
+            profiler.disable()
+            path = base + '.prof'
+            profiler.dump_stats(path)
+        else:
+            profiler.stop()
+            path = base + '.html'
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(profiler.output_html())
+        return path
+
+    # -------------------------------------------------------------------------
+    # Output
+    # -------------------------------------------------------------------------
+
+    def summary(self):
+        """Per-stage totals: calls, wall/cpu seconds, rows, max peak RSS"""
+        stages = {}
+        for r in self.records:
+            s = stages.setdefault(r['stage'], {
+                'calls': 0, 'wall_s': 0.0, 'cpu_s': 0.0, 'rows_in': 0, 'rows_out': 0,
+                'peak_rss_mb': 0.0, 'errors': 0
+            })
+            s['calls'] += 1
+            s['wall_s'] += r['wall_s']
+            s['cpu_s'] += r['cpu_s']
+            s['rows_in'] += r['rows_in'] or 0
+            s['rows_out'] += r['rows_out'] or 0
+            s['peak_rss_mb'] = max(s['peak_rss_mb'], r['peak_rss_mb'])
+            s['errors'] += r['status'] == 'error'
+        return stages
+
+    def prometheus_text(self):
+        """Stage summary in the Prometheus text exposition format"""
+        metrics = [
+            ('stage_duration_seconds', 'wall_s', 'Wall time spent in the stage'),
+            ('stage_cpu_seconds', 'cpu_s', 'CPU time spent in the stage'),
+            ('stage_peak_rss_bytes', 'peak_rss_mb', 'Peak resident memory during the stage'),
+            ('stage_rows_in', 'rows_in', 'Rows passed into the stage'),
+            ('stage_rows_out', 'rows_out', 'Rows returned by the stage'),
+            ('stage_calls', 'calls', 'Times the stage ran'),
+            ('stage_errors', 'errors', 'Stage calls that raised'),
+        ]
+        summary = self.summary()
+        script = self.script.replace('"', '')
+        lines = []
+        for metric, field, help_text in metrics:
+            lines.append(f"# HELP uidai_{metric} {help_text}")
+            lines.append(f"# TYPE uidai_{metric} gauge")
+            for name, s in summary.items():
+                value = s[field]
+                if field == 'peak_rss_mb':
+                    value = int(value * 1024**2)
+                value = f"{value:.6f}" if isinstance(value, float) else str(int(value))
+                lines.append(f'uidai_{metric}{{script="{script}",stage="{name}"}} {value}')
+
+        failed = any(r['status'] == 'error' for r in self.records)
+        lines += [
+            "# HELP uidai_run_last_timestamp_seconds When the run finished",
+            "# TYPE uidai_run_last_timestamp_seconds gauge",
+            f'uidai_run_last_timestamp_seconds{{script="{script}"}} {time.time():.3f}',
+            "# HELP uidai_run_duration_seconds Wall time of the whole run",
+            "# TYPE uidai_run_duration_seconds gauge",
+            f'uidai_run_duration_seconds{{script="{script}"}} {time.time() - self.started:.6f}',
+            "# HELP uidai_run_success 1 if no stage raised",
+            "# TYPE uidai_run_success gauge",
+            f'uidai_run_success{{script="{script}"}} {0 if failed else 1}',
+        ]
+        return "\n".join(lines) + "\n"
+
+    def finish(self):
+        """Write the JSON run log and the Prometheus textfile (once, at exit)"""
+        if not self.enabled or not self.records:
+            return None
+        runs_dir = os.path.join(TELEMETRY_DIR, 'runs')
+        os.makedirs(runs_dir, exist_ok=True)
+
+        stamp = datetime.fromtimestamp(self.started).strftime('%Y%m%d_%H%M%S')
+        log_path = os.path.join(runs_dir, f"{self.script}_{stamp}.json")
+        with open(log_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'script': self.script,
+                'argv': sys.argv[1:],
+                'pid': os.getpid(),
+                'started': datetime.fromtimestamp(self.started).isoformat(timespec='seconds'),
+                'duration_s': round(time.time() - self.started, 3),
+                'stages': sorted(self.records, key=lambda r: r['start']),
+                'summary': self.summary(),
+            }, f, indent=2, default=str)
+
+        # Textfile collectors read whole files, so replace atomically
+        prom_path = os.path.join(TELEMETRY_DIR, f"{self.script}.prom")
+        with open(prom_path + '.tmp', 'w', encoding='utf-8') as f:
+            f.write(self.prometheus_text())
+        os.replace(prom_path + '.tmp', prom_path)
+
+        self.records = []
+        return log_path
+
+
+_telemetry = RunTelemetry(
+    enabled=TELEMETRY_ENABLED and os.environ.get('UIDAI_TELEMETRY', '1') != '0',
+    profile=os.environ.get('UIDAI_PROFILE', TELEMETRY_PROFILE)
+)
+
+
+def get_telemetry():
+    return _telemetry
+
+
+def set_enabled(enabled):
+    """Turn recording on/off for this process (benchmarks switch it off)"""
+    _telemetry.enabled = enabled
+
+
+def stage(name, rows_in=None):
+    """Context manager recording a block as a stage"""
+    return _telemetry.stage(name, rows_in=rows_in)
+
+
+def instrument(func=None, name=None):
+    """
+    Decorator recording every call of a stage function
+
+    Rows in are counted from DataFrame arguments, rows out from the return value.
+    Usable bare (@instrument) or with a stage name (@instrument(name='...')).
+    """
+    if func is None:
+        return functools.partial(instrument, name=name)
+
+    stage_name = name or func.__name__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _telemetry.enabled:
+            return func(*args, **kwargs)
+        rows_in = count_rows(list(args) + list(kwargs.values()))
+        with _telemetry.stage(stage_name, rows_in=rows_in) as record:
+            result = func(*args, **kwargs)
+            record['rows_out'] = count_rows(result)
+        return result
+
+    return wrapper